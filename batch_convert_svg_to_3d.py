@@ -2,6 +2,9 @@
 Batch Convert SVG to 3D Models
 
 This script converts multiple SVG files to 3D models in batch mode.
+
+With --blender-batch the files are sharded across a few long-lived Blender
+processes instead of launching Blender once per file.
 """
 
 import os
@@ -104,12 +107,91 @@ def batch_convert(input_dir, max_workers=4, debug=False):
     logger.info(f"Successfully converted {len(results)} out of {len(svg_files)} SVG files")
     return results
 
+def batch_convert_in_blender(input_dir, output_dir=None, processes=2, blender_path=None, debug=False,
+                             merge_meshes=False, instance_shapes=False, cache_glyphs=False, bake_labels=False):
+    """
+    Convert all SVG files in the input directory inside a few Blender processes.
+    
+    Args:
+        input_dir: Directory to search for SVG files
+        output_dir: Directory for the .blend files (defaults to next to each SVG)
+        processes: Number of Blender processes to run in parallel
+        blender_path: Path to the Blender executable (defaults to BLENDER_PATH)
+        debug: Enable debug output
+        merge_meshes: Join elements sharing materials into single meshes
+        instance_shapes: Share mesh data between identical shapes
+        cache_glyphs: Build text labels from cached glyph meshes
+        bake_labels: Bake all text labels into a single mesh
+    
+    Returns:
+        List of paths to converted 3D models
+    """
+    # Add the project root to the Python path
+    project_dir = os.path.abspath(os.path.dirname(__file__))
+    sys.path.insert(0, project_dir)
+    
+    from genai_agent_project.genai_agent.svg_to_video.batch_converter import BlenderBatchConverter
+    
+    # Find SVG files
+    svg_files = find_svg_files(input_dir)
+    if not svg_files:
+        logger.error(f"No SVG files found in {input_dir}")
+        return []
+    
+    logger.info(f"Found {len(svg_files)} SVG files to convert")
+    
+    jobs = []
+    for svg in svg_files:
+        if output_dir:
+            relative = os.path.relpath(svg, input_dir)
+            output_path = os.path.join(output_dir, os.path.splitext(relative)[0] + ".blend")
+        else:
+            output_path = os.path.splitext(svg)[0] + ".blend"
+        jobs.append({"svg_path": svg, "output_path": output_path})
+    
+    converter = BlenderBatchConverter(
+        blender_path=blender_path,
+        processes=processes,
+        options={
+            "debug": debug,
+            "merge_meshes": merge_meshes,
+            "instance_shapes": instance_shapes,
+            "cache_glyphs": cache_glyphs,
+            "bake_labels": bake_labels
+        }
+    )
+    
+    # Results stream in as each file finishes
+    results = []
+    for result in converter.convert(jobs):
+        if result["status"] == "success":
+            logger.info(f"Conversion successful: {result['output_path']} ({result['elapsed']}s)")
+            results.append(result["output_path"])
+        else:
+            logger.error(f"Conversion failed for {result['svg_path']}: {result['error']}")
+    
+    logger.info(f"Successfully converted {len(results)} out of {len(svg_files)} SVG files")
+    return results
+
 def main():
     """Main function."""
     parser = argparse.ArgumentParser(description="Batch convert SVG files to 3D models")
     parser.add_argument("input_dir", help="Directory containing SVG files")
     parser.add_argument("--max-workers", type=int, default=4, help="Maximum number of parallel conversions")
     parser.add_argument("--debug", action="store_true", help="Enable debug output")
+    parser.add_argument("--blender-batch", action="store_true",
+                        help="Convert many files per Blender process instead of one process per file")
+    parser.add_argument("--processes", type=int, default=2, help="Number of Blender processes in batch mode")
+    parser.add_argument("--output-dir", help="Output directory for .blend files in batch mode")
+    parser.add_argument("--blender-path", help="Path to the Blender executable in batch mode")
+    parser.add_argument("--merge-meshes", action="store_true",
+                        help="Join elements sharing materials into single meshes in batch mode")
+    parser.add_argument("--instance-shapes", action="store_true",
+                        help="Share mesh data between identical shapes in batch mode")
+    parser.add_argument("--cache-glyphs", action="store_true",
+                        help="Build text labels from cached glyph meshes in batch mode")
+    parser.add_argument("--bake-labels", action="store_true",
+                        help="Bake all text labels into a single mesh in batch mode")
     args = parser.parse_args()
     
     # Validate input directory
@@ -119,7 +201,13 @@ def main():
         return
     
     # Convert SVG files
-    output_models = batch_convert(input_dir, args.max_workers, args.debug)
+    if args.blender_batch:
+        output_dir = os.path.abspath(args.output_dir) if args.output_dir else None
+        output_models = batch_convert_in_blender(input_dir, output_dir, args.processes,
+                                                 args.blender_path, args.debug, args.merge_meshes,
+                                                 args.instance_shapes, args.cache_glyphs, args.bake_labels)
+    else:
+        output_models = batch_convert(input_dir, args.max_workers, args.debug)
     
     # Print summary
     if output_models:
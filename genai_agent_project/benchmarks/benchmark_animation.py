@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark animation stage time vs. object count.
+
+Measures how long the keyframe baking takes for each ModelAnimator
+animation type as the number of objects grows. If Blender is available
+(BLENDER_PATH or --blender), the full animation stage is also timed on a
+synthetic OBJ model made of N cubes, together with the size of the saved
+.blend file (which no longer grows with one material per object).
+
+Usage:
+    python benchmarks/benchmark_animation.py --counts 10 100 500 1000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import importlib.util
+
+import numpy as np
+
+# Add parent directory to Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+ANIMATION_DIR = os.path.join(PROJECT_ROOT, "genai_agent", "svg_to_video", "animation")
+
+
+def load_module(name):
+    """Load a module from the animation package without importing Blender dependencies"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ANIMATION_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_metadata(count, seed=0):
+    """Create object metadata for a diagram-like grid of boxes and thin connectors"""
+    rng = np.random.default_rng(seed)
+    locations = np.zeros((count, 3))
+    locations[:, 0] = rng.uniform(-10, 10, count)
+    locations[:, 1] = rng.uniform(-10, 10, count)
+
+    dimensions = np.ones((count, 3)) * 0.1
+    dimensions[:, :2] = rng.uniform(0.5, 2.0, (count, 2))
+    dimensions[::3, 0] *= 10  # every third object is a long connector
+
+    corners = np.array([[x, y, z] for x in (-0.5, 0.5) for y in (-0.5, 0.5) for z in (-0.5, 0.5)])
+    bound_boxes = corners[None, :, :] * dimensions[:, None, :]
+    matrices = np.tile(np.eye(4), (count, 1, 1))
+    matrices[:, :3, 3] = locations
+
+    return locations, dimensions, bound_boxes, matrices
+
+
+def benchmark_baking(baker, counts, total_frames, repeat):
+    """Time the NumPy keyframe computation for each animation type"""
+    print(f"{'objects':>8} {'bounds':>10} {'simple':>10} {'explode':>10} {'flow':>10} {'network':>10}  (ms)")
+    for count in counts:
+        locations, dimensions, bound_boxes, matrices = synthetic_metadata(count)
+        timings = {}
+
+        def timed(name, func):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                result = func()
+            timings[name] = (time.perf_counter() - start) * 1000 / repeat
+            return result
+
+        _, _, center, size = timed("bounds", lambda: baker.combined_bounds(bound_boxes, matrices))
+        timed("simple", lambda: baker.simple_keyframes(count, total_frames))
+        timed("explode", lambda: baker.explode_keyframes(count, center, size, total_frames, seed=0))
+        timed("flow", lambda: baker.flow_keyframes(locations, total_frames, size))
+        timed("network", lambda: baker.network_keyframes(dimensions, total_frames))
+
+        print(f"{count:>8} " + " ".join(f"{timings[name]:>10.2f}" for name in
+                                       ["bounds", "simple", "explode", "flow", "network"]))
+
+
+def write_cube_grid(path, count):
+    """Write an OBJ file with count separate cube objects"""
+    cube = [(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)]
+    faces = [(1, 2, 4, 3), (5, 7, 8, 6), (1, 5, 6, 2), (3, 4, 8, 7), (1, 3, 7, 5), (2, 6, 8, 4)]
+    side = int(np.ceil(np.sqrt(count)))
+
+    with open(path, "w") as f:
+        for i in range(count):
+            ox, oy = (i % side) * 2, (i // side) * 2
+            f.write(f"o Cube_{i}\n")
+            for x, y, z in cube:
+                f.write(f"v {x + ox} {y + oy} {z * 0.2}\n")
+            for face in faces:
+                f.write("f " + " ".join(str(v + i * 8) for v in face) + "\n")
+
+
+def benchmark_blender(blender_path, counts, animation_types, duration):
+    """Time the full animation stage in Blender"""
+    model_animator = load_module("model_animator")
+    animator = model_animator.ModelAnimator(blender_path=blender_path)
+
+    print(f"\n{'objects':>8} " + " ".join(f"{t:>16}" for t in animation_types) + "  (s / .blend KB, full Blender run)")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for count in counts:
+            model_path = os.path.join(temp_dir, f"grid_{count}.obj")
+            write_cube_grid(model_path, count)
+
+            timings = []
+            for animation_type in animation_types:
+                output_path = os.path.join(temp_dir, f"grid_{count}_{animation_type}.blend")
+                start = time.perf_counter()
+                result = animator.animate_model(model_path, output_path=output_path,
+                                                animation_type=animation_type, duration=duration)
+                elapsed = time.perf_counter() - start
+                if result:
+                    size_kb = os.path.getsize(output_path) / 1024
+                    timings.append(f"{elapsed:>7.2f} / {size_kb:>6.0f}")
+                else:
+                    timings.append(f"{'failed':>16}")
+
+            print(f"{count:>8} " + " ".join(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark animation stage time vs. object count")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 500, 1000, 5000])
+    parser.add_argument("--duration", type=float, default=10.0, help="Animation duration in seconds")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions for the baking benchmark")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER_PATH"), help="Path to Blender")
+    parser.add_argument("--types", nargs="+", default=["simple", "explode", "flow", "network"])
+    args = parser.parse_args()
+
+    baker = load_module("keyframe_baker")
+    benchmark_baking(baker, args.counts, int(args.duration * args.fps), args.repeat)
+
+    if args.blender and os.path.exists(args.blender):
+        benchmark_blender(args.blender, args.counts, args.types, args.duration)
+    else:
+        print("\nBlender not found, skipping full animation stage benchmark (set BLENDER_PATH)")
+
+
+if __name__ == "__main__":
+    main()
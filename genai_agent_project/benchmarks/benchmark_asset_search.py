@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark asset search: full metadata scan vs. inverted index.
+
+Fills an empty Redis database with synthetic asset metadata, indexes it and
+compares the previous search (KEYS asset:*, GET and parse every asset,
+substring match in Python) with the inverted index for a few typical UI
+queries. The database must be empty and is flushed afterwards.
+
+Usage:
+    python benchmarks/benchmark_asset_search.py --assets 1000 10000 100000 --db 15
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+
+# Add parent directory to Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from genai_agent.services.asset_manager import AssetManager
+
+WORDS = ["oak", "pine", "rock", "granite", "crate", "barrel", "lamp", "chair", "table", "tree",
+         "robot", "car", "wheel", "window", "door", "brick", "metal", "wood", "glass", "fabric"]
+EXTENSIONS = ["glb", "fbx", "obj", "png", "exr", "blend"]
+QUERIES = ["oak", "gran", "metal door", "robot wheel 12"]
+
+
+class BenchmarkRedisBus:
+    """Minimal bus holding a Redis connection to a dedicated database"""
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def connect(self):
+        return True
+
+
+def synthetic_asset(index, rng):
+    """Create metadata for one synthetic asset"""
+    words = rng.sample(WORDS, 3)
+    extension = rng.choice(EXTENSIONS)
+    return {
+        'id': f"asset-{index:07d}",
+        'filename': f"{words[0]}_{words[1]}_{index % 100}.{extension}",
+        'extension': extension,
+        'category': 'texture' if extension in ('png', 'exr') else 'model',
+        'tags': words[1:],
+        'description': f"A {words[2]} {words[0]} asset",
+        'file_size': rng.randint(1000, 10 ** 7)
+    }
+
+
+async def scan_search(manager, query):
+    """The search as it was before the index: scan and substring-match every asset"""
+    query = query.lower()
+    results = []
+    for asset in await manager.list_assets():
+        for value in asset.values():
+            if isinstance(value, str) and query in value.lower():
+                results.append(asset)
+                break
+    return results
+
+
+async def fill(manager, count, start, rng):
+    """Store metadata for assets start..count and index them, in pipelined batches"""
+    redis = manager.redis_bus.redis
+    for batch_start in range(start, count, 1000):
+        pipe = redis.pipeline(transaction=False)
+        for index in range(batch_start, min(batch_start + 1000, count)):
+            metadata = synthetic_asset(index, rng)
+            pipe.set(f"{manager.key_prefix}{metadata['id']}", json.dumps(metadata))
+            await manager.index.add(metadata['id'], metadata, pipe=pipe)
+        await pipe.execute()
+    await manager.index.mark_built()
+
+
+async def run(args):
+    import redis.asyncio as redis_asyncio
+
+    redis = redis_asyncio.Redis(host=args.host, port=args.port, db=args.db, decode_responses=True)
+    try:
+        await redis.ping()
+    except Exception as e:
+        print(f"Redis not available at {args.host}:{args.port} ({e}), cannot run benchmark")
+        return
+
+    if await redis.dbsize():
+        print(f"Redis database {args.db} is not empty, choose an empty one with --db")
+        return
+
+    storage_dir = tempfile.TemporaryDirectory()
+    manager = AssetManager(BenchmarkRedisBus(redis), {'storage_path': storage_dir.name})
+    rng = random.Random(0)
+
+    try:
+        print(f"{'assets':>8} {'query':>16} {'matches':>8} {'scan ms':>10} {'index ms':>10}")
+        filled = 0
+        for count in sorted(args.assets):
+            await fill(manager, count, filled, rng)
+            filled = count
+
+            for query in QUERIES:
+                start = time.perf_counter()
+                await scan_search(manager, query)
+                scan_time = (time.perf_counter() - start) * 1000
+
+                start = time.perf_counter()
+                results = await manager.search_assets(query)
+                index_time = (time.perf_counter() - start) * 1000
+
+                print(f"{count:>8} {query:>16} {len(results):>8} {scan_time:>10.1f} {index_time:>10.1f}")
+    finally:
+        await redis.flushdb()
+        await redis.aclose()
+        storage_dir.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark asset search")
+    parser.add_argument("--assets", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--host", default=os.environ.get("REDIS_HOST", "localhost"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("REDIS_PORT", 6379)))
+    parser.add_argument("--db", type=int, default=15, help="Empty Redis database to use")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
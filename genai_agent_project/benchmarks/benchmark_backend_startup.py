@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark backend startup with `python -X importtime`.
+
+Imports web/backend/main.py in a fresh interpreter (in test mode, so no
+services are contacted) and parses the import time report. FastAPI is
+imported first so the reported time of `main` is the time spent in the
+backend's own imports, which lazy routers and tools keep small. Reports
+the best of several runs, the slowest modules below main, and any heavy
+module that should only be imported on first use.
+
+Usage:
+    python benchmarks/benchmark_backend_startup.py --runs 5 --top 15
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BACKEND_DIR = os.path.join(PROJECT_ROOT, "web", "backend")
+
+# Modules that must not be imported until a request or tool needs them
+HEAVY_MODULES = (
+    "genai_agent.agent",
+    "genai_agent.tools",
+    "genai_agent.svg_to_video",
+    "routes",
+    "langchain",
+    "anthropic",
+    "openai",
+)
+
+
+def parse_importtime(stderr):
+    """
+    Parse an -X importtime report
+
+    Returns:
+        List of (module, self_us, cumulative_us, depth) in report order
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def import_backend():
+    """
+    Import the backend once in a fresh interpreter
+
+    Returns:
+        Parsed import time report
+    """
+    env = dict(os.environ, GENAI_TEST_MODE="true")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import fastapi, main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_startup(runs=3):
+    """
+    Import the backend several times
+
+    Returns:
+        (best cumulative microseconds of main, report of the best run)
+    """
+    best = None
+    for _ in range(runs):
+        modules = import_backend()
+        total = next(cumulative for name, _, cumulative, _ in modules if name == "main")
+        if best is None or total < best[0]:
+            best = (total, modules)
+    return best
+
+
+def backend_imports(modules):
+    """Modules imported by main: its subtree, which precedes it in the report"""
+    end = next(index for index, module in enumerate(modules) if module[0] == "main")
+    start = end
+    while start > 0 and modules[start - 1][3] > 0:
+        start -= 1
+    return modules[start:end + 1]
+
+
+def heavy_imports(modules):
+    """Heavy modules imported at startup"""
+    return sorted({name for name, _, _, _ in modules
+                   if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY_MODULES)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend startup import time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    total, modules = measure_startup(args.runs)
+    print(f"main imports: {total / 1000:.1f} ms (best of {args.runs})")
+
+    print(f"\n{'module':<60} {'self ms':>8} {'cumul ms':>9}")
+    direct = [module for module in backend_imports(modules) if module[3] == 1]
+    for name, self_us, cumulative_us, _ in sorted(direct, key=lambda m: -m[2])[:args.top]:
+        print(f"{name:<60} {self_us / 1000:>8.1f} {cumulative_us / 1000:>9.1f}")
+
+    heavy = heavy_imports(modules)
+    print(f"\nheavy modules imported at startup: {', '.join(heavy) if heavy else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
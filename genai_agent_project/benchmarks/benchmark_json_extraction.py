@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON extraction from LLM responses.
+
+Runs the previous multi-strategy extractor (direct parse, code block, regex
+for objects nested up to two levels, brace counting) and the single-pass
+extract_json over the captured responses in benchmarks/llm_responses, and
+over synthetic responses whose scene has N objects. Reports the time per
+response and whether a value was found; the synthetic responses show how
+each extractor scales with response length.
+
+Usage:
+    python benchmarks/benchmark_json_extraction.py --counts 10 100 1000
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+# Add parent directory to Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from genai_agent.services.llm_json import extract_json
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_responses")
+
+
+def _clean(text):
+    text = re.sub(r'//.*?(?:\n|$)', '', text, flags=re.MULTILINE)
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
+    text = re.sub(r',\s*\}', '}', text)
+    text = re.sub(r"'([^']*)'\s*:", r'"\1":', text)
+    return re.sub(r":\s*'([^']*)'([,\}])", r':"\1"\2', text)
+
+
+def legacy_extract(response):
+    """The extractor SceneGenerator used before extract_json"""
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError:
+        pass
+
+    match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response, re.DOTALL)
+    if match:
+        try:
+            text = re.sub(r'//.*?(?:\n|$)', '', match.group(1), flags=re.MULTILINE)
+            return json.loads(re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL))
+        except json.JSONDecodeError:
+            pass
+
+    candidates = []
+    for match in re.finditer(r'\{([^{}]|\{[^{}]*\})*\}', response):
+        try:
+            cleaned = _clean(match.group(0))
+            json.loads(cleaned)
+            candidates.append(cleaned)
+        except json.JSONDecodeError:
+            continue
+    if candidates:
+        return json.loads(max(candidates, key=len))
+
+    start = response.find('{')
+    if start >= 0:
+        depth = 0
+        for i in range(start, len(response)):
+            if response[i] == '{':
+                depth += 1
+            elif response[i] == '}':
+                depth -= 1
+                if depth == 0:
+                    try:
+                        return json.loads(_clean(response[start:i + 1]))
+                    except json.JSONDecodeError:
+                        return None
+    return None
+
+
+def load_corpus():
+    """Captured responses by file name"""
+    corpus = {}
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        with open(os.path.join(CORPUS_DIR, name), encoding="utf-8") as f:
+            corpus[name] = f.read()
+    return corpus
+
+
+def synthetic_response(count):
+    """A fenced scene with count objects, comments and trailing commas"""
+    objects = ",\n".join(
+        f'    {{"id": "obj-{i}", "type": "cube", "name": "Box {i}", // object {i}\n'
+        f'     "position": [{i}, 0, 0], "rotation": [0, 0, 0], "scale": [1, 1, 1],\n'
+        f'     "properties": {{"material": {{"name": "M{i}", "color": [0.5, 0.5, 0.5, 1],}}}},}}'
+        for i in range(count)
+    )
+    return ("Here is the scene {as requested}:\n\n```json\n"
+            f'{{"name": "Grid", "description": "{count} boxes",\n  "objects": [\n{objects}\n  ],\n}}\n```\n')
+
+
+def measure(extractor, text, repeat):
+    """Seconds per call and the extracted value"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        value = extractor(text)
+    return (time.perf_counter() - start) / repeat, value
+
+
+def describe(value):
+    if value is None:
+        return "none"
+    if isinstance(value, dict) and "objects" in value:
+        return f"scene, {len(value['objects'])} objects"
+    if isinstance(value, dict):
+        return f"object, {len(value)} keys"
+    return f"array, {len(value)} items"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON extraction from LLM responses")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    cases = list(load_corpus().items())
+    cases += [(f"synthetic-{count}", synthetic_response(count)) for count in args.counts]
+
+    print(f"{'response':<28} {'chars':>8} {'legacy ms':>10} {'legacy result':<20} {'scan ms':>9} {'scan result':<20}")
+    for name, text in cases:
+        legacy_time, legacy_value = measure(legacy_extract, text, args.repeat)
+        scan_time, scan_value = measure(extract_json, text, args.repeat)
+        print(f"{name:<28} {len(text):>8} {legacy_time * 1000:>10.3f} {describe(legacy_value):<20} "
+              f"{scan_time * 1000:>9.3f} {describe(scan_value):<20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark SVG generation modes: LLM-written SVG markup vs. graph mode.
+
+For a few typical diagram requests, asks the provider for SVG markup (the
+existing mode) and for a compact JSON graph that the local layout engine
+renders (graph mode), and reports response size, estimated output tokens
+(about 4 characters per token), LLM time and local layout time for each.
+
+Needs a configured LLM provider (e.g. ANTHROPIC_API_KEY for claude-direct).
+
+Usage:
+    python benchmarks/benchmark_svg_generation_modes.py --provider claude-direct --runs 3
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+# Add parent directory to Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from genai_agent.svg_to_video.llm_integrations.llm_factory import get_llm_factory
+from genai_agent.svg_to_video.svg_generator.graph_layout import (
+    graph_prompt, parse_graph_spec, graph_to_svg, GRAPH_MAX_TOKENS
+)
+
+CONCEPTS = [
+    ("flowchart", "User login: enter credentials, validate, on failure show an error and retry "
+                  "up to three times, on success load the profile and show the dashboard"),
+    ("network", "Web application with a load balancer, three web servers, a Redis cache, "
+                "a primary database with a read replica and a background worker queue"),
+    ("sequence", "Checkout: browser posts the cart to the API, the API reserves stock in the "
+                 "inventory service, charges the payment service and confirms the order by email"),
+]
+
+
+async def run(args):
+    factory = get_llm_factory()
+    await factory.initialize()
+
+    providers = [p["id"] for p in factory.get_providers()]
+    if args.provider not in providers:
+        print(f"Provider {args.provider} not available (available: {providers}), cannot run benchmark")
+        return
+
+    print(f"{'diagram':>10} {'mode':>6} {'chars':>8} {'~tokens':>8} {'llm s':>8} {'layout ms':>10}")
+    try:
+        for diagram_type, concept in CONCEPTS:
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                svg = await factory.generate_svg(args.provider, concept, diagram_type, temperature=0.4, mode="svg")
+                llm_time = time.perf_counter() - start
+                print(f"{diagram_type:>10} {'svg':>6} {len(svg):>8} {len(svg) // 4:>8} {llm_time:>8.2f} {'-':>10}")
+
+                start = time.perf_counter()
+                response = await factory.generate_text(args.provider, graph_prompt(concept, diagram_type),
+                                                       temperature=0.4, max_tokens=GRAPH_MAX_TOKENS)
+                llm_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                graph_to_svg(parse_graph_spec(response, diagram_type))
+                layout_time = (time.perf_counter() - start) * 1000
+                print(f"{diagram_type:>10} {'graph':>6} {len(response):>8} {len(response) // 4:>8} "
+                      f"{llm_time:>8.2f} {layout_time:>10.1f}")
+    finally:
+        await factory.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SVG generation modes")
+    parser.add_argument("--provider", default="claude-direct", help="LLM provider ID")
+    parser.add_argument("--runs", type=int, default=1, help="Runs per diagram and mode")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark SVG to 3D output modes.
+
+Converts synthetic diagram SVGs of increasing density with the standard
+one-object-per-element output, the merged-mesh output and the instanced
+output (identical shapes share one mesh), the glyph-cached text output and
+the glyph-cached output with all labels baked into one mesh, and reports
+object and mesh datablock counts, conversion time, .blend size and the time
+to render a single low-resolution Cycles frame.
+
+The script drives itself: run it with Python and it generates the SVGs and
+launches Blender (BLENDER_PATH or --blender) with this file as the Blender
+script, which performs the measurements.
+
+Usage:
+    python benchmarks/benchmark_svg_output_modes.py --counts 100 500 2000
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import tempfile
+import subprocess
+
+# Add parent directory to Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+RESULT_PREFIX = "[BENCHMARK] "
+
+LABELS = ["Start", "Process", "Decision", "End", "Input", "Output", "API", "DB"]
+
+MODES = {
+    "objects": {"merge_meshes": False},
+    "merged": {"merge_meshes": True},
+    "instanced": {"instance_shapes": True},
+    "glyphs": {"cache_glyphs": True},
+    "baked": {"cache_glyphs": True, "bake_labels": True},
+}
+
+
+def write_diagram_svg(path, count, labels=True):
+    """Write a flowchart-like SVG with count elements, each with a short label"""
+    colors = ["#4285F4", "#EA4335", "#FBBC05", "#34A853"]
+    side = max(1, math.ceil(count ** 0.5))
+    rows = math.ceil(count / side)
+    width, height = side * 60 + 40, rows * 60 + 40
+
+    lines = [f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">']
+    for i in range(count):
+        x, y = 20 + (i % side) * 60, 20 + (i // side) * 60
+        color = colors[i % len(colors)]
+        kind = i % 4
+        if kind == 0:
+            lines.append(f'<rect x="{x}" y="{y}" width="40" height="30" fill="{color}" />')
+        elif kind == 1:
+            lines.append(f'<circle cx="{x + 20}" cy="{y + 15}" r="15" fill="{color}" />')
+        elif kind == 2:
+            lines.append(f'<line x1="{x}" y1="{y}" x2="{x + 40}" y2="{y + 30}" stroke="#333333" stroke-width="2" />')
+        else:
+            lines.append(f'<polygon points="{x},{y + 30} {x + 20},{y} {x + 40},{y + 30}" fill="{color}" />')
+        if labels:
+            lines.append(f'<text x="{x}" y="{y + 45}" font-size="10" fill="#333333">{LABELS[i % len(LABELS)]}</text>')
+    lines.append('</svg>')
+
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+
+
+def measure_in_blender(svg_path, mode, output_path):
+    """Convert one SVG inside Blender and print the measurements"""
+    import bpy
+
+    try:
+        from genai_agent.svg_to_video.svg_to_3d.enhanced_converter import get_svg_converter
+    except ImportError:
+        sys.path.append(os.path.join(PROJECT_ROOT, 'genai_agent', 'svg_to_video'))
+        from svg_to_3d.enhanced_converter import get_svg_converter
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    converter = get_svg_converter(svg_path, use_enhanced=False, **MODES[mode])
+    start = time.perf_counter()
+    success = converter.convert()
+    convert_time = time.perf_counter() - start
+
+    object_count = len([obj for obj in bpy.data.objects if obj.type not in ('CAMERA', 'LIGHT', 'EMPTY')])
+    data_count = len(bpy.data.meshes) + len(bpy.data.curves)
+
+    start = time.perf_counter()
+    bpy.ops.wm.save_as_mainfile(filepath=output_path)
+    save_time = time.perf_counter() - start
+
+    scene = bpy.context.scene
+    scene.render.engine = 'CYCLES'
+    scene.cycles.samples = 1
+    scene.render.resolution_x = 320
+    scene.render.resolution_y = 180
+    render_time = None
+    if scene.camera:
+        start = time.perf_counter()
+        bpy.ops.render.render(write_still=False)
+        render_time = time.perf_counter() - start
+
+    print(RESULT_PREFIX + json.dumps({
+        "success": success,
+        "objects": object_count,
+        "datablocks": data_count,
+        "convert": convert_time,
+        "save": save_time,
+        "render": render_time,
+        "size_kb": os.path.getsize(output_path) / 1024
+    }), flush=True)
+
+
+def run_blender(blender_path, svg_path, mode, output_path):
+    """Run one measurement in a fresh Blender process"""
+    completed = subprocess.run(
+        [blender_path, "--background", "--factory-startup", "--python", os.path.abspath(__file__),
+         "--", "--measure", svg_path, mode, output_path],
+        capture_output=True, text=True, errors="replace"
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    return None
+
+
+def main():
+    # Inside Blender: measure a single conversion
+    if "--measure" in sys.argv:
+        svg_path, mode, output_path = sys.argv[sys.argv.index("--measure") + 1:][:3]
+        measure_in_blender(svg_path, mode, output_path)
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark SVG to 3D output modes")
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--blender", default=os.environ.get("BLENDER_PATH"), help="Path to Blender")
+    args = parser.parse_args()
+
+    if not args.blender or not os.path.exists(args.blender):
+        print("Blender not found, cannot run benchmark (set BLENDER_PATH)")
+        return
+
+    print(f"{'elements':>8} {'mode':>10} {'objects':>8} {'meshes':>8} {'convert s':>10} {'save s':>8} {'render s':>9} {'.blend KB':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for count in args.counts:
+            svg_path = os.path.join(temp_dir, f"diagram_{count}.svg")
+            write_diagram_svg(svg_path, count)
+
+            for mode in MODES:
+                result = run_blender(args.blender, svg_path, mode, os.path.join(temp_dir, f"diagram_{count}_{mode}.blend"))
+                if not result or not result["success"]:
+                    print(f"{count:>8} {mode:>10} {'failed':>8}")
+                    continue
+                render = f"{result['render']:>9.2f}" if result["render"] is not None else f"{'-':>9}"
+                print(f"{count:>8} {mode:>10} {result['objects']:>8} {result['datablocks']:>8} {result['convert']:>10.2f} "
+                      f"{result['save']:>8.2f} {render} {result['size_kb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
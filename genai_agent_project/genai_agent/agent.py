@@ -76,7 +76,7 @@ class GenAIAgent:
     
     def _register_tool(self, tool_name: str, tool_config: Dict[str, Any]):
         """
-        Register a tool
+        Register a tool by name; its module is imported on first use
         
         Args:
             tool_name: Tool name
@@ -90,21 +90,18 @@ class GenAIAgent:
                 logger.warning(f"Invalid tool configuration for {tool_name}: missing module or class")
                 return
             
-            # Import tool class
-            import importlib
-            module = importlib.import_module(module_path, package=__package__)
-            tool_class = getattr(module, class_name)
+            if tool_config.get('enabled') is False:
+                logger.info(f"Tool {tool_name} disabled")
+                return
             
-            # Create tool instance
-            tool = tool_class(
+            # Register tool
+            self.tool_registry.register_lazy_tool(
+                tool_name,
+                module_path,
+                class_name,
                 redis_bus=self.redis_bus,
                 config=tool_config.get('config', {})
             )
-            
-            # Register tool
-            self.tool_registry.register_tool(tool)
-            
-            logger.info(f"Registered tool: {tool_name}")
         except Exception as e:
             logger.error(f"Error registering tool {tool_name}: {str(e)}")
     
@@ -68,19 +68,28 @@ class ContextManager:
         Returns:
             Dictionary with all context values
         """
-        # Get all context from memory service
-        memory_keys = await self.memory_service.list_keys("context:")
+        # Get all context from memory service in one round trip
+        stored = await self.memory_service.retrieve_matching("context:*")
         
-        # Load any missing keys from memory
-        for key in memory_keys:
-            short_key = key.replace("context:", "")
+        # Add any keys missing from the active context
+        for key, value in stored.items():
+            short_key = key[len("context:"):]
             if short_key not in self.active_context:
-                value = await self.memory_service.retrieve(key)
-                if value is not None:
-                    self.active_context[short_key] = value
+                self.active_context[short_key] = value
         
         return self.active_context
     
+    async def update_contexts(self, values: Dict[str, Any]):
+        """
+        Update several context values at once
+        
+        Args:
+            values: Dictionary mapping context keys to values
+        """
+        self.active_context.update(values)
+        await self.memory_service.store_many({f"context:{key}": value for key, value in values.items()})
+        logger.debug(f"Updated context: {', '.join(values)}")
+    
     async def clear_context(self):
         """
         Clear all context
@@ -88,8 +97,7 @@ class ContextManager:
         self.active_context = {}
         
         # Clear context in memory
-        memory_keys = await self.memory_service.list_keys("context:")
-        for key in memory_keys:
-            await self.memory_service.delete(key)
+        memory_keys = await self.memory_service.list_keys("context:*")
+        await self.memory_service.delete_many(memory_keys)
             
         logger.info("Context cleared")
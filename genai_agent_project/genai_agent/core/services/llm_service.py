@@ -14,6 +14,8 @@ import requests
 from typing import Dict, Any, Optional, List, Generator, Union, Callable
 from pathlib import Path
 
+from genai_agent.services.llm_limiter import estimate_tokens, get_llm_limiter, retry_after_seconds
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -37,6 +39,11 @@ class LLMService:
         self.max_retries = int(self.config.get("LLM_MAX_RETRIES", 3))
         self.retry_delay = float(self.config.get("LLM_RETRY_DELAY", 1.0))
         self.timeout = float(self.config.get("LLM_TIMEOUT", 60.0))
+        # How long Ollama keeps a model loaded after a request
+        self.ollama_keep_alive = self.config.get("OLLAMA_KEEP_ALIVE", "30m")
+        
+        # Shared concurrency and rate limits across all LLM clients
+        self.limiter = get_llm_limiter()
         
         # Provider-specific configuration
         self.api_keys = {
@@ -60,6 +67,7 @@ class LLMService:
                  max_tokens: int = 2048, 
                  temperature: float = 0.7,
                  output_file: Optional[str] = None,
+                 priority: Optional[str] = None,
                  **kwargs) -> str:
         """
         Generate text from an LLM using the specified provider.
@@ -71,6 +79,7 @@ class LLMService:
             max_tokens: Maximum tokens to generate
             temperature: Temperature for generation (higher = more creative)
             output_file: If specified, save output to this file
+            priority: "interactive" (default) or "batch" admission priority
             **kwargs: Additional provider-specific parameters
             
         Returns:
@@ -81,14 +90,17 @@ class LLMService:
         
         # Select the appropriate method based on provider
         if provider == "ollama":
-            response = self._generate_ollama(prompt, model, max_tokens, temperature, **kwargs)
+            generate = self._generate_ollama
         elif provider == "openai":
-            response = self._generate_openai(prompt, model, max_tokens, temperature, **kwargs)
+            generate = self._generate_openai
         elif provider == "anthropic":
-            response = self._generate_anthropic(prompt, model, max_tokens, temperature, **kwargs)
+            generate = self._generate_anthropic
         else:
             raise ValueError(f"Unsupported LLM provider: {provider}")
         
+        with self.limiter.limit_sync(provider, model, estimate_tokens(prompt, max_tokens), priority):
+            response = generate(prompt, model, max_tokens, temperature, **kwargs)
+        
         # Save to file if specified
         if output_file:
             self._save_to_file(response, output_file)
@@ -103,6 +115,7 @@ class LLMService:
                        temperature: float = 0.7,
                        output_file: Optional[str] = None,
                        callback: Optional[Callable[[str], None]] = None,
+                       priority: Optional[str] = None,
                        **kwargs) -> Generator[str, None, str]:
         """
         Generate text from an LLM with streaming responses.
@@ -115,6 +128,7 @@ class LLMService:
             temperature: Temperature for generation
             output_file: If specified, save complete output to this file
             callback: Optional function to call with each chunk of text
+            priority: "interactive" (default) or "batch" admission priority
             **kwargs: Additional provider-specific parameters
             
         Returns:
@@ -136,12 +150,13 @@ class LLMService:
         # Initialize complete text for file output
         complete_text = ""
         
-        # Process stream chunks
-        for chunk in stream_gen:
-            complete_text += chunk
-            if callback:
-                callback(chunk)
-            yield chunk
+        # Process stream chunks; the admission is held until the stream ends
+        with self.limiter.limit_sync(provider, model, estimate_tokens(prompt, max_tokens), priority):
+            for chunk in stream_gen:
+                complete_text += chunk
+                if callback:
+                    callback(chunk)
+                yield chunk
         
         # Save complete text to file if specified
         if output_file:
@@ -163,6 +178,7 @@ class LLMService:
             "model": model,
             "prompt": prompt,
             "stream": False,
+            "keep_alive": self.ollama_keep_alive,
             "options": {
                 "temperature": temperature,
                 "num_predict": max_tokens,
@@ -194,7 +210,7 @@ class LLMService:
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Ollama request failed (attempt {attempt+1}/{self.max_retries}): {str(e)}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                    time.sleep(self._retry_delay(e, "ollama", model))
                 else:
                     logger.error(f"Ollama request failed after {self.max_retries} attempts")
                     raise RuntimeError(f"Failed to generate text using Ollama: {str(e)}")
@@ -213,6 +229,7 @@ class LLMService:
             "model": model,
             "prompt": prompt,
             "stream": True,
+            "keep_alive": self.ollama_keep_alive,
             "options": {
                 "temperature": temperature,
                 "num_predict": max_tokens,
@@ -260,7 +277,7 @@ class LLMService:
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Ollama streaming request failed (attempt {attempt+1}/{self.max_retries}): {str(e)}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                    time.sleep(self._retry_delay(e, "ollama", model))
                 else:
                     logger.error(f"Ollama streaming request failed after {self.max_retries} attempts")
                     raise RuntimeError(f"Failed to stream text from Ollama: {str(e)}")
@@ -326,7 +343,7 @@ class LLMService:
             except requests.exceptions.RequestException as e:
                 logger.warning(f"OpenAI request failed (attempt {attempt+1}/{self.max_retries}): {str(e)}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                    time.sleep(self._retry_delay(e, "openai", model))
                 else:
                     logger.error(f"OpenAI request failed after {self.max_retries} attempts")
                     raise RuntimeError(f"Failed to generate text using OpenAI: {str(e)}")
@@ -412,7 +429,7 @@ class LLMService:
             except requests.exceptions.RequestException as e:
                 logger.warning(f"OpenAI streaming request failed (attempt {attempt+1}/{self.max_retries}): {str(e)}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                    time.sleep(self._retry_delay(e, "openai", model))
                 else:
                     logger.error(f"OpenAI streaming request failed after {self.max_retries} attempts")
                     raise RuntimeError(f"Failed to stream text from OpenAI: {str(e)}")
@@ -486,7 +503,7 @@ class LLMService:
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Anthropic request failed (attempt {attempt+1}/{self.max_retries}): {str(e)}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                    time.sleep(self._retry_delay(e, "anthropic", model))
                 else:
                     logger.error(f"Anthropic request failed after {self.max_retries} attempts")
                     raise RuntimeError(f"Failed to generate text using Anthropic: {str(e)}")
@@ -579,11 +596,34 @@ class LLMService:
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Anthropic streaming request failed (attempt {attempt+1}/{self.max_retries}): {str(e)}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                    time.sleep(self._retry_delay(e, "anthropic", model))
                 else:
                     logger.error(f"Anthropic streaming request failed after {self.max_retries} attempts")
                     raise RuntimeError(f"Failed to stream text from Anthropic: {str(e)}")
     
+    def _retry_delay(self, error: Exception, provider: str, model: str) -> float:
+        """
+        Delay before retrying a failed request.
+        
+        Rate limit responses (429, or 529 overloaded) pause the provider in the
+        shared limiter for their Retry-After and wait that long; other errors
+        use the configured retry delay.
+        
+        Args:
+            error: The request exception
+            provider: The LLM provider
+            model: The model that was requested
+            
+        Returns:
+            Seconds to sleep before the next attempt
+        """
+        response = getattr(error, "response", None)
+        if response is None or response.status_code not in (429, 529):
+            return self.retry_delay
+        delay = retry_after_seconds(response.headers, self.retry_delay)
+        self.limiter.backoff(provider, model, delay)
+        return delay
+    
     def _save_to_file(self, content: str, file_path: str) -> None:
         """Save content to a file."""
         try:
@@ -3,7 +3,6 @@ Task Manager for planning and executing tasks
 """
 
 import logging
-import json
 from typing import Dict, Any, List, Optional
 
 from genai_agent.services.llm import LLMService
@@ -66,59 +65,29 @@ class TaskManager:
         logger.info(f"Planning execution for: {instruction}")
         
         # Get available tools
-        available_tools = self.tool_registry.list_tools()
+        available_tools = list(self.tool_registry.get_all_tools())
         
-        # Create prompt for task planning
-        planning_prompt = f"""
-        I need to break down the following instruction into a series of tasks that can be executed by available tools.
+        # The plan is constrained to the tools' parameter schemas, so every
+        # step names an available tool
+        task = {'instruction': instruction}
+        if context:
+            task['context'] = context
+        steps = await self.llm_service.plan_task_execution(task, self.tool_registry.get_tool_info())
         
-        Instruction: {instruction}
-        
-        Available tools: {', '.join(available_tools)}
-        
-        For each tool, here's what it can do:
-        {self._get_tool_descriptions()}
-        
-        Please break down this instruction into a series of sequential tasks.
-        For each task, specify:
-        1. The tool to use (must be one of the available tools)
-        2. The parameters to pass to the tool
-        3. A brief description of what this task accomplishes
-        
-        Format your response as a JSON array of tasks, where each task has 'tool_name', 'parameters', and 'description' fields.
-        """
-        
-        # Use LLM to generate plan
-        plan_json = await self.llm_service.generate(planning_prompt, context)
-        
-        # Parse plan
-        try:
-            tasks_data = json.loads(plan_json)
-            
-            # Validate and create tasks
-            tasks = []
-            for task_data in tasks_data:
-                tool_name = task_data.get('tool_name')
-                parameters = task_data.get('parameters', {})
-                description = task_data.get('description', '')
-                
-                # Ensure tool exists
-                if tool_name not in available_tools:
-                    logger.warning(f"Task references unknown tool: {tool_name}")
-                    continue
-                
-                tasks.append(Task(tool_name, parameters, description))
-            
-            return ExecutionPlan(tasks, instruction)
-            
-        except Exception as e:
-            logger.error(f"Error parsing task plan: {str(e)}")
+        if steps is None:
+            logger.error("Could not generate a task plan")
             # Fallback to a simple plan
             default_tool = available_tools[0] if available_tools else "unknown_tool"
             return ExecutionPlan(
                 [Task(default_tool, {'instruction': instruction}, 'Process the instruction')],
                 instruction
             )
+        
+        tasks = [
+            Task(step['tool_name'], step.get('parameters', {}), step.get('description', ''))
+            for step in steps
+        ]
+        return ExecutionPlan(tasks, instruction)
     
     async def execute_plan(self, plan: ExecutionPlan) -> Dict[str, Any]:
         """
@@ -172,13 +141,3 @@ class TaskManager:
             'tasks_failed': sum(1 for r in results if r['status'] == 'error'),
             'results': results
         }
-    
-    def _get_tool_descriptions(self) -> str:
-        """Get descriptions of all available tools"""
-        descriptions = []
-        
-        for tool_name in self.tool_registry.list_tools():
-            tool = self.tool_registry.get_tool(tool_name)
-            descriptions.append(f"- {tool_name}: {tool.description}")
-        
-        return "\n".join(descriptions)
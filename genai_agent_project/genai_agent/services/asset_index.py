@@ -0,0 +1,209 @@
+"""
+Inverted search index for asset metadata
+"""
+
+import re
+import logging
+from typing import Dict, Any, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Metadata fields that are identifiers rather than searchable text
+UNINDEXED_FIELDS = {'id', 'md5_hash', 'content_hash'}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase alphanumeric tokens
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+def metadata_tokens(metadata: Dict[str, Any]) -> Set[str]:
+    """
+    Get the searchable tokens of asset metadata
+
+    Args:
+        metadata: Asset metadata
+
+    Returns:
+        Tokens of the filename, tags and other text fields
+    """
+    tokens = set()
+    for key, value in metadata.items():
+        if key in UNINDEXED_FIELDS:
+            continue
+        if isinstance(value, str):
+            tokens.update(tokenize(value))
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                if isinstance(item, str):
+                    tokens.update(tokenize(item))
+    return tokens
+
+class AssetIndex:
+    """
+    Inverted index over asset metadata stored in Redis
+
+    Every token maps to a set of asset IDs, every category to a set of asset
+    IDs, and every asset to the set of its tokens and its category (used to
+    unindex it). All
+    tokens are also kept in a sorted set so prefix queries can enumerate the
+    matching tokens with ZRANGEBYLEX instead of scanning assets.
+    """
+
+    def __init__(self, redis_bus, key_prefix: str = 'asset_index:', max_prefix_tokens: int = 1000):
+        """
+        Initialize the index
+
+        Args:
+            redis_bus: Redis Message Bus instance
+            key_prefix: Prefix of all index keys
+            max_prefix_tokens: Maximum tokens a single query prefix expands to
+        """
+        self.redis_bus = redis_bus
+        self.key_prefix = key_prefix
+        self.max_prefix_tokens = max_prefix_tokens
+
+        self.tokens_key = f"{key_prefix}tokens"
+        self.built_key = f"{key_prefix}built"
+
+    def _token_key(self, token: str) -> str:
+        return f"{self.key_prefix}token:{token}"
+
+    def _category_key(self, category: str) -> str:
+        return f"{self.key_prefix}category:{category}"
+
+    def _asset_key(self, asset_id: str) -> str:
+        return f"{self.key_prefix}asset:{asset_id}"
+
+    async def add(self, asset_id: str, metadata: Dict[str, Any], pipe=None):
+        """
+        Index a new asset
+
+        Args:
+            asset_id: Asset ID
+            metadata: Asset metadata
+            pipe: Pipeline to queue the commands on (executed here if None)
+        """
+        tokens = metadata_tokens(metadata)
+        category = metadata.get('category', 'other')
+
+        own_pipe = pipe is None
+        if own_pipe:
+            pipe = self.redis_bus.redis.pipeline(transaction=False)
+
+        for token in tokens:
+            pipe.sadd(self._token_key(token), asset_id)
+        if tokens:
+            pipe.zadd(self.tokens_key, {token: 0 for token in tokens})
+
+        # The asset's own set also records its category; "@" never occurs in tokens
+        pipe.sadd(self._asset_key(asset_id), f"@{category}", *tokens)
+        pipe.sadd(self._category_key(category), asset_id)
+
+        if own_pipe:
+            await pipe.execute()
+
+    async def remove(self, asset_id: str):
+        """
+        Remove an asset from the index
+
+        Args:
+            asset_id: Asset ID
+        """
+        redis = self.redis_bus.redis
+        members = await redis.smembers(self._asset_key(asset_id))
+        if not members:
+            return
+
+        tokens = [member for member in members if not member.startswith('@')]
+        categories = [member[1:] for member in members if member.startswith('@')]
+
+        pipe = redis.pipeline(transaction=False)
+        for token in tokens:
+            pipe.srem(self._token_key(token), asset_id)
+        for category in categories:
+            pipe.srem(self._category_key(category), asset_id)
+        pipe.delete(self._asset_key(asset_id))
+        for token in tokens:
+            pipe.scard(self._token_key(token))
+        results = await pipe.execute()
+
+        # Drop tokens no asset uses anymore from the prefix set
+        counts = results[len(results) - len(tokens):] if tokens else []
+        empty = [token for token, count in zip(tokens, counts) if count == 0]
+        if empty:
+            await redis.zrem(self.tokens_key, *empty)
+
+    async def is_built(self) -> bool:
+        """
+        Check whether the index covers all assets
+
+        Returns:
+            True once the index has been built
+        """
+        return bool(await self.redis_bus.redis.exists(self.built_key))
+
+    async def mark_built(self):
+        """Record that the index covers all assets"""
+        await self.redis_bus.redis.set(self.built_key, 1)
+
+    async def update(self, asset_id: str, metadata: Dict[str, Any]):
+        """
+        Re-index an asset after its metadata changed
+
+        Args:
+            asset_id: Asset ID
+            metadata: New asset metadata
+        """
+        await self.remove(asset_id)
+        await self.add(asset_id, metadata)
+
+    async def search(self, query: str, category: Optional[str] = None) -> List[str]:
+        """
+        Find assets matching every query token as a token prefix
+
+        Args:
+            query: Search query
+            category: Filter by category
+
+        Returns:
+            Sorted list of matching asset IDs
+        """
+        redis = self.redis_bus.redis
+        terms = sorted(set(tokenize(query)), key=len, reverse=True)
+
+        matches: Optional[Set[str]] = None
+        for term in terms:
+            # Longer terms are more selective, so they narrow the set first
+            tokens = await redis.zrangebylex(self.tokens_key, f"[{term}", f"[{term}\xff",
+                                             start=0, num=self.max_prefix_tokens)
+            if not tokens:
+                return []
+
+            pipe = redis.pipeline(transaction=False)
+            for token in tokens:
+                pipe.smembers(self._token_key(token))
+            ids = set().union(*await pipe.execute())
+
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+
+        if matches is None:
+            if category is None:
+                return []
+            matches = await redis.smembers(self._category_key(category))
+        elif category is not None:
+            candidates = list(matches)
+            flags = await redis.smismember(self._category_key(category), candidates)
+            matches = {asset_id for asset_id, flag in zip(candidates, flags) if flag}
+
+        return sorted(matches)
@@ -8,13 +8,29 @@ import shutil
 import json
 import uuid
 import zipfile
-import hashlib
-from typing import Dict, Any, List, Optional, BinaryIO, Union
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, BinaryIO, Union, AsyncIterable
 
 from genai_agent.services.redis_bus import RedisMessageBus
+from genai_agent.services.content_store import ContentStore, iter_file, iter_bytes, CHUNK_SIZE
+from genai_agent.services.asset_index import AssetIndex
 
 logger = logging.getLogger(__name__)
 
+# Drops a content reference and deletes the count once it reaches zero, in
+# one step so a reference added concurrently is never deleted with it.
+# Returns 1 if the count was deleted.
+RELEASE_SCRIPT = """
+local references = redis.call('DECR', KEYS[1])
+if references > 0 then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+return 1
+"""
+
 class AssetManager:
     """
     Service for managing 3D assets
@@ -40,6 +56,19 @@ class AssetManager:
         # Redis key prefix for asset metadata
         self.key_prefix = 'asset:'
         
+        # Redis key prefix for content reference counts
+        self.blob_prefix = 'asset_blob:'
+        self._release_script = None
+        
+        # Inverted index used by search_assets
+        self.index = AssetIndex(redis_bus)
+        
+        # Worker threads used to import asset packs
+        self.import_workers = self.config.get('import_workers', min(4, os.cpu_count() or 1))
+        
+        # Formats that are already compressed and are stored as-is in asset packs
+        self.precompressed_extensions = {'png', 'jpg', 'jpeg', 'webp', 'exr', 'ktx2', 'zip', 'gz', 'mp4', 'mp3', 'ogg'}
+        
         # Asset categories
         self.categories = {
             'model': ['obj', 'fbx', 'glb', 'gltf', 'blend', 'dae'],
@@ -60,6 +89,9 @@ class AssetManager:
             category_path = os.path.join(self.storage_path, category)
             if not os.path.exists(category_path):
                 os.makedirs(category_path)
+        
+        # Content-addressed store shared by assets with identical content
+        self.content_store = ContentStore(os.path.join(self.storage_path, 'blobs'))
     
     async def store_asset(self, file_path: str, metadata: Optional[Dict[str, Any]] = None,
                         category: Optional[str] = None) -> Optional[str]:
@@ -79,41 +111,7 @@ class AssetManager:
             logger.error(f"Asset file not found: {file_path}")
             return None
         
-        try:
-            # Generate asset ID
-            asset_id = str(uuid.uuid4())
-            
-            # Determine category from extension if not provided
-            if category is None:
-                ext = os.path.splitext(file_path)[1].lower()[1:]  # Remove dot
-                category = self._get_category(ext)
-            
-            # Create metadata
-            if metadata is None:
-                metadata = {}
-            
-            # Add basic metadata
-            metadata.update({
-                'id': asset_id,
-                'filename': os.path.basename(file_path),
-                'extension': os.path.splitext(file_path)[1].lower()[1:],
-                'category': category,
-                'file_size': os.path.getsize(file_path),
-                'md5_hash': self._calculate_file_hash(file_path)
-            })
-            
-            # Store asset file
-            dest_path = os.path.join(self.storage_path, category, f"{asset_id}{os.path.splitext(file_path)[1]}")
-            shutil.copy2(file_path, dest_path)
-            
-            # Store metadata
-            await self._store_metadata(asset_id, metadata)
-            
-            logger.info(f"Stored asset: {metadata['filename']} ({asset_id})")
-            return asset_id
-        except Exception as e:
-            logger.error(f"Error storing asset: {str(e)}")
-            return None
+        return await self.store_asset_stream(iter_file(file_path), os.path.basename(file_path), metadata, category)
     
     async def store_asset_from_memory(self, file_data: bytes, filename: str, 
                                     metadata: Optional[Dict[str, Any]] = None,
@@ -127,6 +125,27 @@ class AssetManager:
             metadata: Asset metadata
             category: Asset category (auto-detected if None)
             
+        Returns:
+            Asset ID or None if failed
+        """
+        return await self.store_asset_stream(iter_bytes(file_data), filename, metadata, category)
+    
+    async def store_asset_stream(self, chunks: AsyncIterable[bytes], filename: str,
+                                 metadata: Optional[Dict[str, Any]] = None,
+                                 category: Optional[str] = None) -> Optional[str]:
+        """
+        Store an asset from a stream of chunks
+        
+        The content is written to the content-addressed store while it is
+        hashed, so it is never buffered in memory or read twice. Assets with
+        identical content share one stored file, which is reference counted.
+        
+        Args:
+            chunks: Asset file chunks
+            filename: Asset filename
+            metadata: Asset metadata
+            category: Asset category (auto-detected if None)
+            
         Returns:
             Asset ID or None if failed
         """
@@ -135,36 +154,36 @@ class AssetManager:
             asset_id = str(uuid.uuid4())
             
             # Determine category from extension if not provided
+            extension = os.path.splitext(filename)[1].lower()[1:]  # Remove dot
             if category is None:
-                ext = os.path.splitext(filename)[1].lower()[1:]  # Remove dot
-                category = self._get_category(ext)
+                category = self._get_category(extension)
+            
+            # Stream the content into the store
+            content = await self.content_store.ingest(chunks, extension)
             
             # Create metadata
-            if metadata is None:
-                metadata = {}
-            
-            # Add basic metadata
-            metadata.update({
-                'id': asset_id,
-                'filename': filename,
-                'extension': os.path.splitext(filename)[1].lower()[1:],
-                'category': category,
-                'file_size': len(file_data),
-                'md5_hash': hashlib.md5(file_data).hexdigest()
-            })
-            
-            # Store asset file
-            dest_path = os.path.join(self.storage_path, category, f"{asset_id}{os.path.splitext(filename)[1]}")
-            with open(dest_path, 'wb') as f:
-                f.write(file_data)
-            
-            # Store metadata
-            await self._store_metadata(asset_id, metadata)
-            
-            logger.info(f"Stored asset from memory: {filename} ({asset_id})")
+            metadata = self._content_metadata(asset_id, filename, category, content, metadata)
+            
+            # Reference the content and store metadata
+            if not await self._add_content_reference(content['content_hash'], extension):
+                if content['created']:
+                    self.content_store.remove(content['content_hash'], extension)
+                return None
+            
+            if not await self._store_metadata(asset_id, metadata):
+                await self._release_content(content['content_hash'], extension)
+                return None
+            
+            try:
+                await self.index.add(asset_id, metadata)
+            except Exception as e:
+                logger.error(f"Error indexing asset: {str(e)}")
+            
+            logger.info(f"Stored asset: {filename} ({asset_id}"
+                        f"{'' if content['created'] else ', deduplicated'})")
             return asset_id
         except Exception as e:
-            logger.error(f"Error storing asset from memory: {str(e)}")
+            logger.error(f"Error storing asset: {str(e)}")
             return None
     
     async def get_asset_path(self, asset_id: str) -> Optional[str]:
@@ -181,9 +200,7 @@ class AssetManager:
         if not metadata:
             return None
         
-        category = metadata.get('category', 'other')
-        extension = metadata.get('extension', '')
-        path = os.path.join(self.storage_path, category, f"{asset_id}.{extension}")
+        path = self._asset_file_path(asset_id, metadata)
         
         if not os.path.exists(path):
             return None
@@ -242,7 +259,14 @@ class AssetManager:
         existing.update(metadata)
         
         # Store updated metadata
-        return await self._store_metadata(asset_id, existing)
+        if not await self._store_metadata(asset_id, existing):
+            return False
+        
+        try:
+            await self.index.update(asset_id, existing)
+        except Exception as e:
+            logger.error(f"Error indexing asset metadata: {str(e)}")
+        return True
     
     async def delete_asset(self, asset_id: str) -> bool:
         """
@@ -260,14 +284,6 @@ class AssetManager:
             return False
         
         try:
-            # Delete asset file
-            category = metadata.get('category', 'other')
-            extension = metadata.get('extension', '')
-            file_path = os.path.join(self.storage_path, category, f"{asset_id}.{extension}")
-            
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            
             # Delete metadata
             if not await self.redis_bus.connect():
                 logger.error("Cannot delete asset metadata: Redis connection failed")
@@ -275,6 +291,15 @@ class AssetManager:
             
             key = f"{self.key_prefix}{asset_id}"
             await self.redis_bus.redis.delete(key)
+            await self.index.remove(asset_id)
+            
+            # Release shared content, or delete a file stored per asset
+            if metadata.get('content_hash'):
+                await self._release_content(metadata['content_hash'], metadata.get('extension', ''))
+            else:
+                file_path = self._asset_file_path(asset_id, metadata)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
             
             logger.info(f"Deleted asset: {metadata.get('filename')} ({asset_id})")
             return True
@@ -329,6 +354,11 @@ class AssetManager:
         """
         Import assets from a zip file
         
+        Members are streamed straight from the zip into the content store by
+        a bounded pool of worker threads, without extracting the pack first,
+        and the metadata of all imported assets is committed in one Redis
+        pipeline.
+        
         Args:
             zip_path: Path to zip file
             
@@ -339,53 +369,67 @@ class AssetManager:
             return {'status': 'error', 'error': 'Zip file not found'}
         
         try:
-            imported = []
-            errors = []
-            
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # Extract to temp directory
-                temp_dir = os.path.join(self.storage_path, 'temp', str(uuid.uuid4()))
-                os.makedirs(temp_dir, exist_ok=True)
-                
                 # Check for manifest
                 manifest = None
                 if 'manifest.json' in zip_ref.namelist():
                     with zip_ref.open('manifest.json') as f:
                         manifest = json.load(f)
                 
-                # Extract all files
-                zip_ref.extractall(temp_dir)
+                members = [info.filename for info in zip_ref.infolist()
+                           if not info.is_dir() and info.filename != 'manifest.json']
+            
+            # Each worker thread reads through its own handle on the zip
+            local = threading.local()
+            handles = []
+            handles_lock = threading.Lock()
+            
+            def ingest_member(name: str) -> Dict[str, Any]:
+                zip_ref = getattr(local, 'zip_ref', None)
+                if zip_ref is None:
+                    zip_ref = local.zip_ref = zipfile.ZipFile(zip_path, 'r')
+                    with handles_lock:
+                        handles.append(zip_ref)
+                extension = os.path.splitext(name)[1].lower()[1:]
+                with zip_ref.open(name) as reader:
+                    return self.content_store.ingest_reader(reader, extension)
+            
+            loop = asyncio.get_running_loop()
+            try:
+                with ThreadPoolExecutor(max_workers=self.import_workers) as executor:
+                    contents = await asyncio.gather(
+                        *[loop.run_in_executor(executor, ingest_member, name) for name in members],
+                        return_exceptions=True
+                    )
+            finally:
+                for zip_ref in handles:
+                    zip_ref.close()
+            
+            imported = []
+            errors = []
+            for name, content in zip(members, contents):
+                filename = os.path.basename(name)
+                if isinstance(content, Exception):
+                    logger.error(f"Error importing {name}: {str(content)}")
+                    errors.append({'filename': filename, 'error': str(content)})
+                    continue
                 
-                # Import each file
-                for root, _, files in os.walk(temp_dir):
-                    for file in files:
-                        if file == 'manifest.json':
-                            continue
-                        
-                        file_path = os.path.join(root, file)
-                        
-                        # Get metadata from manifest if available
-                        metadata = None
-                        if manifest and file in manifest:
-                            metadata = manifest[file]
-                        
-                        # Import asset
-                        asset_id = await self.store_asset(file_path, metadata)
-                        
-                        if asset_id:
-                            imported.append({
-                                'asset_id': asset_id,
-                                'filename': file,
-                                'metadata': await self.get_asset_metadata(asset_id)
-                            })
-                        else:
-                            errors.append({
-                                'filename': file,
-                                'error': 'Failed to import asset'
-                            })
+                # Get metadata from manifest if available
+                metadata = None
+                if manifest:
+                    metadata = manifest.get(name) or manifest.get(filename)
                 
-                # Clean up temp directory
-                shutil.rmtree(temp_dir, ignore_errors=True)
+                asset_id = str(uuid.uuid4())
+                metadata = self._content_metadata(asset_id, filename, None, content, dict(metadata or {}))
+                imported.append({'asset_id': asset_id, 'filename': filename, 'metadata': metadata, 'content': content})
+            
+            if imported and not await self._commit_imported(imported):
+                errors.extend({'filename': item['filename'], 'error': 'Failed to store asset metadata'}
+                              for item in imported)
+                imported = []
+            
+            for item in imported:
+                del item['content']
             
             return {
                 'status': 'success',
@@ -398,10 +442,44 @@ class AssetManager:
             logger.error(f"Error importing asset pack: {str(e)}")
             return {'status': 'error', 'error': str(e)}
     
+    async def _commit_imported(self, imported: List[Dict[str, Any]]) -> bool:
+        """
+        Store metadata, content references and index entries of imported assets in one pipeline
+        
+        Args:
+            imported: Imported assets with asset_id, metadata and content
+            
+        Returns:
+            True if committed, False otherwise (newly stored content is removed)
+        """
+        try:
+            if not await self.redis_bus.connect():
+                raise ConnectionError("Redis connection failed")
+            
+            pipe = self.redis_bus.redis.pipeline(transaction=False)
+            for item in imported:
+                metadata = item['metadata']
+                pipe.set(f"{self.key_prefix}{item['asset_id']}", json.dumps(metadata))
+                pipe.incr(f"{self.blob_prefix}{metadata['content_hash']}.{metadata['extension']}")
+                await self.index.add(item['asset_id'], metadata, pipe=pipe)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Error storing imported asset metadata: {str(e)}")
+            for item in imported:
+                content = item['content']
+                if content['created']:
+                    self.content_store.remove(content['content_hash'], item['metadata']['extension'])
+            return False
+    
     async def export_asset_pack(self, asset_ids: List[str], output_path: str) -> Dict[str, Any]:
         """
         Export assets to a zip file
         
+        Metadata of all assets is fetched in one round trip. Members are
+        streamed into the zip in chunks by a worker thread, and formats that
+        are already compressed are stored without recompressing them.
+        
         Args:
             asset_ids: List of asset IDs to export
             output_path: Path to output zip file
@@ -413,42 +491,38 @@ class AssetManager:
             exported = []
             errors = []
             manifest = {}
+            members = []
             
-            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
-                for asset_id in asset_ids:
-                    # Get asset metadata
-                    metadata = await self.get_asset_metadata(asset_id)
-                    if not metadata:
-                        errors.append({
-                            'asset_id': asset_id,
-                            'error': 'Asset not found'
-                        })
-                        continue
-                    
-                    # Get asset path
-                    asset_path = await self.get_asset_path(asset_id)
-                    if not asset_path or not os.path.exists(asset_path):
-                        errors.append({
-                            'asset_id': asset_id,
-                            'error': 'Asset file not found'
-                        })
-                        continue
-                    
-                    # Add to zip
-                    filename = metadata.get('filename', f"{asset_id}.{metadata.get('extension', '')}")
-                    zip_ref.write(asset_path, filename)
-                    
-                    # Add to manifest
-                    manifest[filename] = metadata
-                    
-                    exported.append({
+            for asset_id, metadata in zip(asset_ids, await self._get_metadata_many(asset_ids)):
+                if not metadata:
+                    errors.append({
                         'asset_id': asset_id,
-                        'filename': filename,
-                        'metadata': metadata
+                        'error': 'Asset not found'
                     })
+                    continue
+                
+                # Get asset path
+                asset_path = self._asset_file_path(asset_id, metadata)
+                if not os.path.exists(asset_path):
+                    errors.append({
+                        'asset_id': asset_id,
+                        'error': 'Asset file not found'
+                    })
+                    continue
                 
-                # Add manifest
-                zip_ref.writestr('manifest.json', json.dumps(manifest, indent=2))
+                filename = metadata.get('filename', f"{asset_id}.{metadata.get('extension', '')}")
+                members.append((asset_path, filename, metadata.get('extension', '')))
+                
+                # Add to manifest
+                manifest[filename] = metadata
+                
+                exported.append({
+                    'asset_id': asset_id,
+                    'filename': filename,
+                    'metadata': metadata
+                })
+            
+            await asyncio.get_running_loop().run_in_executor(None, self._write_asset_pack, output_path, members, manifest)
             
             return {
                 'status': 'success',
@@ -462,10 +536,58 @@ class AssetManager:
             logger.error(f"Error exporting asset pack: {str(e)}")
             return {'status': 'error', 'error': str(e)}
     
+    def _write_asset_pack(self, output_path: str, members: List[tuple], manifest: Dict[str, Any]):
+        """
+        Write an asset pack (blocking)
+        
+        Args:
+            output_path: Path to output zip file
+            members: (asset path, name in pack, extension) per asset
+            manifest: Manifest written as manifest.json
+        """
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+            for asset_path, filename, extension in members:
+                compress_type = zipfile.ZIP_STORED if extension in self.precompressed_extensions else zipfile.ZIP_DEFLATED
+                info = zipfile.ZipInfo.from_file(asset_path, filename)
+                info.compress_type = compress_type
+                with open(asset_path, 'rb') as source, zip_ref.open(info, 'w') as target:
+                    shutil.copyfileobj(source, target, CHUNK_SIZE)
+            
+            # Add manifest
+            zip_ref.writestr('manifest.json', json.dumps(manifest, indent=2))
+    
+    async def _get_metadata_many(self, asset_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get metadata of several assets in one round trip
+        
+        Args:
+            asset_ids: Asset IDs
+            
+        Returns:
+            Metadata per asset ID (None for unknown assets)
+        """
+        if not asset_ids:
+            return []
+        if not await self.redis_bus.connect():
+            logger.error("Cannot get asset metadata: Redis connection failed")
+            return [None] * len(asset_ids)
+        
+        values = await self.redis_bus.redis.mget([f"{self.key_prefix}{asset_id}" for asset_id in asset_ids])
+        results = []
+        for value in values:
+            if isinstance(value, bytes):
+                value = value.decode('utf-8')
+            results.append(json.loads(value) if value else None)
+        return results
+    
     async def search_assets(self, query: str, category: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Search assets by name or metadata
         
+        Every word of the query must match the start of a word in the
+        filename, tags or other metadata text of an asset. The search is
+        answered from the inverted index, which is built on first use.
+        
         Args:
             query: Search query
             category: Filter by category
@@ -473,24 +595,51 @@ class AssetManager:
         Returns:
             List of matching asset metadata
         """
-        assets = await self.list_assets(category)
-        results = []
+        if not query.strip():
+            return await self.list_assets(category)
         
-        query = query.lower()
+        if not await self.redis_bus.connect():
+            logger.error("Cannot search assets: Redis connection failed")
+            return []
         
-        for asset in assets:
-            # Check filename
-            if query in asset.get('filename', '').lower():
-                results.append(asset)
-                continue
+        try:
+            if not await self.index.is_built():
+                await self.rebuild_search_index()
+            
+            asset_ids = await self.index.search(query, category)
+            if not asset_ids:
+                return []
+            
+            # Fetch the metadata of all matches in one round trip
+            keys = [f"{self.key_prefix}{asset_id}" for asset_id in asset_ids]
+            results = []
+            for metadata_str in await self.redis_bus.redis.mget(keys):
+                if metadata_str is None:
+                    continue
+                if isinstance(metadata_str, bytes):
+                    metadata_str = metadata_str.decode('utf-8')
+                results.append(json.loads(metadata_str))
             
-            # Check other metadata fields
-            for key, value in asset.items():
-                if isinstance(value, str) and query in value.lower():
-                    results.append(asset)
-                    break
+            return results
+        except Exception as e:
+            logger.error(f"Error searching assets: {str(e)}")
+            return []
+    
+    async def rebuild_search_index(self) -> int:
+        """
+        Index all stored assets
         
-        return results
+        Returns:
+            Number of assets indexed
+        """
+        assets = await self.list_assets()
+        for metadata in assets:
+            await self.index.remove(metadata['id'])
+            await self.index.add(metadata['id'], metadata)
+        
+        await self.index.mark_built()
+        logger.info(f"Built asset search index for {len(assets)} assets")
+        return len(assets)
     
     def _get_category(self, extension: str) -> str:
         """
@@ -508,23 +657,106 @@ class AssetManager:
         
         return 'other'
     
-    def _calculate_file_hash(self, file_path: str) -> str:
+    def _content_metadata(self, asset_id: str, filename: str, category: Optional[str],
+                          content: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
-        Calculate MD5 hash of a file
+        Add the basic metadata of stored content to asset metadata
         
         Args:
-            file_path: Path to file
+            asset_id: Asset ID
+            filename: Asset filename
+            category: Asset category (auto-detected if None)
+            content: Result of a content store ingest
+            metadata: Asset metadata to extend
             
         Returns:
-            MD5 hash as hexadecimal string
+            Asset metadata
         """
-        hash_md5 = hashlib.md5()
+        extension = os.path.splitext(filename)[1].lower()[1:]  # Remove dot
+        if category is None:
+            category = self._get_category(extension)
+        
+        if metadata is None:
+            metadata = {}
+        
+        metadata.update({
+            'id': asset_id,
+            'filename': filename,
+            'extension': extension,
+            'category': category,
+            'file_size': content['size'],
+            'md5_hash': content['md5_hash'],
+            'content_hash': content['content_hash']
+        })
+        return metadata
+    
+    def _asset_file_path(self, asset_id: str, metadata: Dict[str, Any]) -> str:
+        """
+        Get the path of an asset's file from its metadata
         
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                hash_md5.update(chunk)
-                
-        return hash_md5.hexdigest()
+        Args:
+            asset_id: Asset ID
+            metadata: Asset metadata
+            
+        Returns:
+            Path in the content store, or the per-asset path of assets
+            stored before content addressing
+        """
+        extension = metadata.get('extension', '')
+        if metadata.get('content_hash'):
+            return self.content_store.blob_path(metadata['content_hash'], extension)
+        
+        category = metadata.get('category', 'other')
+        return os.path.join(self.storage_path, category, f"{asset_id}.{extension}")
+    
+    async def _add_content_reference(self, content_hash: str, extension: str) -> bool:
+        """
+        Add a reference to stored content
+        
+        Args:
+            content_hash: SHA-256 hex digest
+            extension: File extension
+            
+        Returns:
+            True if the reference was added, False otherwise
+        """
+        if not await self.redis_bus.connect():
+            logger.error("Cannot reference asset content: Redis connection failed")
+            return False
+        
+        try:
+            await self.redis_bus.redis.incr(f"{self.blob_prefix}{content_hash}.{extension}")
+            return True
+        except Exception as e:
+            logger.error(f"Error referencing asset content: {str(e)}")
+            return False
+    
+    async def _release_content(self, content_hash: str, extension: str) -> bool:
+        """
+        Drop a reference to stored content, deleting it when it is unreferenced
+        
+        Args:
+            content_hash: SHA-256 hex digest
+            extension: File extension
+            
+        Returns:
+            True if the content was deleted, False otherwise
+        """
+        if not await self.redis_bus.connect():
+            logger.error("Cannot release asset content: Redis connection failed")
+            return False
+        
+        key = f"{self.blob_prefix}{content_hash}.{extension}"
+        try:
+            if self._release_script is None:
+                self._release_script = self.redis_bus.redis.register_script(RELEASE_SCRIPT)
+            if not await self._release_script(keys=[key]):
+                return False
+            
+            return self.content_store.remove(content_hash, extension)
+        except Exception as e:
+            logger.error(f"Error releasing asset content: {str(e)}")
+            return False
     
     async def _store_metadata(self, asset_id: str, metadata: Dict[str, Any]) -> bool:
         """
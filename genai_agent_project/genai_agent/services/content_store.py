@@ -0,0 +1,221 @@
+"""
+Content-addressed file store with streaming ingest
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+import hashlib
+from typing import Dict, Any, AsyncIterable, AsyncIterator, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+# Bytes read or written per chunk while streaming
+CHUNK_SIZE = 1024 * 1024
+
+async def iter_file(file_path: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Stream a file in chunks, read in a worker thread
+
+    Args:
+        file_path: Path to file
+        chunk_size: Bytes per chunk
+
+    Yields:
+        File chunks
+    """
+    loop = asyncio.get_running_loop()
+    f = await loop.run_in_executor(None, open, file_path, 'rb')
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, f.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        await loop.run_in_executor(None, f.close)
+
+async def iter_upload(upload, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Stream an uploaded file (anything with an async read(size)) in chunks
+
+    Args:
+        upload: Uploaded file, e.g. a FastAPI UploadFile
+        chunk_size: Bytes per chunk
+
+    Yields:
+        File chunks
+    """
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+async def iter_bytes(data: bytes) -> AsyncIterator[bytes]:
+    """
+    Stream data that is already in memory
+
+    Args:
+        data: File data
+
+    Yields:
+        The data as a single chunk
+    """
+    if data:
+        yield data
+
+class ContentStore:
+    """
+    Content-addressed file store
+
+    Files are stored under their SHA-256 digest in hash-prefixed directories
+    (ab/cd/abcd....ext), so identical content is kept once. Ingest streams
+    chunks into a temporary file while hashing them in the same pass and
+    then moves the file into place, so content is never fully buffered in
+    memory and never read twice. Async ingest hashes and writes in a worker
+    thread so large uploads do not block the event loop.
+    """
+
+    def __init__(self, root: str):
+        """
+        Initialize the store
+
+        Args:
+            root: Store directory
+        """
+        self.root = root
+        self.temp_path = os.path.join(root, 'tmp')
+        os.makedirs(self.temp_path, exist_ok=True)
+
+    def blob_path(self, content_hash: str, extension: str = '') -> str:
+        """
+        Get the path of stored content
+
+        Args:
+            content_hash: SHA-256 hex digest
+            extension: File extension without dot (kept so tools can detect the format)
+
+        Returns:
+            Path of the content in the store
+        """
+        name = f"{content_hash}.{extension}" if extension else content_hash
+        return os.path.join(self.root, content_hash[:2], content_hash[2:4], name)
+
+    async def ingest(self, chunks: AsyncIterable[bytes], extension: str = '') -> Dict[str, Any]:
+        """
+        Stream content into the store
+
+        Args:
+            chunks: Content chunks
+            extension: File extension without dot
+
+        Returns:
+            Dictionary with content_hash, md5_hash, size, path and created
+            (False if identical content was already stored)
+        """
+        sha256 = hashlib.sha256()
+        md5 = hashlib.md5()
+        size = 0
+
+        def write(f, chunk):
+            sha256.update(chunk)
+            md5.update(chunk)
+            f.write(chunk)
+
+        loop = asyncio.get_running_loop()
+        temp_file = os.path.join(self.temp_path, f"{uuid.uuid4()}.part")
+        try:
+            f = await loop.run_in_executor(None, open, temp_file, 'wb')
+            try:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    await loop.run_in_executor(None, write, f, chunk)
+            finally:
+                await loop.run_in_executor(None, f.close)
+            return await loop.run_in_executor(
+                None, self._commit, temp_file, sha256.hexdigest(), md5.hexdigest(), size, extension
+            )
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+
+    def ingest_reader(self, reader: BinaryIO, extension: str = '', chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+        """
+        Stream content from a file object into the store (blocking, thread safe)
+
+        Args:
+            reader: Readable binary file object, e.g. a zip member
+            extension: File extension without dot
+            chunk_size: Bytes per chunk
+
+        Returns:
+            Same dictionary as ingest()
+        """
+        sha256 = hashlib.sha256()
+        md5 = hashlib.md5()
+        size = 0
+
+        temp_file = os.path.join(self.temp_path, f"{uuid.uuid4()}.part")
+        try:
+            with open(temp_file, 'wb') as f:
+                for chunk in iter(lambda: reader.read(chunk_size), b''):
+                    sha256.update(chunk)
+                    md5.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+            return self._commit(temp_file, sha256.hexdigest(), md5.hexdigest(), size, extension)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+
+    def _commit(self, temp_file: str, content_hash: str, md5_hash: str, size: int, extension: str) -> Dict[str, Any]:
+        """Move a fully written temp file into place, or drop it if the content exists"""
+        path = self.blob_path(content_hash, extension)
+        created = not os.path.exists(path)
+        if created:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp_file, path)
+        else:
+            os.remove(temp_file)
+
+        return {
+            'content_hash': content_hash,
+            'md5_hash': md5_hash,
+            'size': size,
+            'path': path,
+            'created': created
+        }
+
+    def remove(self, content_hash: str, extension: str = '') -> bool:
+        """
+        Remove stored content
+
+        Args:
+            content_hash: SHA-256 hex digest
+            extension: File extension without dot
+
+        Returns:
+            True if the content was removed, False if it was not stored
+        """
+        path = self.blob_path(content_hash, extension)
+        if not os.path.exists(path):
+            return False
+        os.remove(path)
+        return True
+
+    def exists(self, content_hash: str, extension: str = '') -> bool:
+        """
+        Check whether content is stored
+
+        Args:
+            content_hash: SHA-256 hex digest
+            extension: File extension without dot
+
+        Returns:
+            True if the content is stored
+        """
+        return os.path.exists(self.blob_path(content_hash, extension))
@@ -11,11 +11,41 @@ from typing import Dict, Any, List, Optional
 
 # Import the enhanced environment loader
 from .enhanced_env_loader import get_api_key_for_provider, get_llm_config_from_env
+from .llm_limiter import RateLimitedError, estimate_tokens, get_llm_limiter, retry_after_seconds
+from .ollama_models import get_ollama_manager
+from .prompt_prefix import PrefixedPrompt, anthropic_messages, get_prefix_stats, split_prompt
+from .structured_output import (
+    TASK_CLASSIFICATION_SCHEMA, JSONStreamValidator, StructuredOutputError,
+    anthropic_tool, execution_plan_schema, ollama_format, openai_response_format
+)
 from ..config import get_settings
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Fixed instructions of the structured calls; the schemas describe the output
+CLASSIFY_PROMPT_PREFIX = """Classify the instruction given to a 3D content generation agent. Give the task type, \
+a one-sentence description of what is wanted and the parameters stated in the instruction \
+(such as style, name or format).
+
+"""
+
+PLAN_PROMPT_PREFIX = """Plan the steps that carry out the task below, using only these tools. Each step calls \
+one tool with parameters for it and says in a short description what it accomplishes.
+
+Tools:
+"""
+
+async def _sse_events(response: httpx.Response):
+    """Yield the JSON events of a server-sent event stream"""
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        yield json.loads(data)
+
 class LLMService:
     """Service for interacting with language models"""
     
@@ -25,6 +55,13 @@ class LLMService:
         self.config = self.settings.llm
         self.initialized = False
         self.providers = {}
+        self.limiter = get_llm_limiter()
+        self.rate_limit_retries = 2
+        
+        # Keep-alive, preloading and model-affinity scheduling for Ollama,
+        # shared by every LLMService in the process
+        ollama_config = self.config.get("providers", {}).get("ollama", {})
+        self.ollama = get_ollama_manager(ollama_config.get("base_url", "http://127.0.0.1:11434"), ollama_config)
         
         # Ensure API key is loaded from environment if needed
         if not self.config.get("api_key") and self.config.get("provider") != "ollama":
@@ -49,6 +86,10 @@ class LLMService:
         except Exception as e:
             logger.error(f"Failed to initialize LLM service: {str(e)}")
             raise
+        
+        # Load the configured Ollama models so the first requests do not wait
+        # for them (only the first service to initialize does)
+        await self.ollama.preload()
     
     async def _discover_providers(self):
         """Discover available LLM providers"""
@@ -57,7 +98,7 @@ class LLMService:
             "ollama": {
                 "name": "Ollama",
                 "is_local": True,
-                "base_url": "http://127.0.0.1:11434",
+                "base_url": self.ollama.base_url,
                 "models": []
             }
         }
@@ -144,9 +185,25 @@ class LLMService:
         prompt: str, 
         provider: Optional[str] = None,
         model: Optional[str] = None,
-        parameters: Optional[Dict[str, Any]] = None
+        parameters: Optional[Dict[str, Any]] = None,
+        priority: Optional[str] = None
     ) -> str:
-        """Generate text from a prompt using the specified LLM"""
+        """
+        Generate text from a prompt using the specified LLM
+
+        Requests are admitted through the shared LLM limiter; rate-limited
+        requests back off for the provider's Retry-After and are retried.
+
+        Args:
+            prompt: Prompt text
+            provider: Provider name (defaults to the configured provider)
+            model: Model name (defaults to the configured model)
+            parameters: Generation parameters (temperature, max_tokens)
+            priority: "interactive" (default) or "batch"
+
+        Returns:
+            Generated text, or an "Error: ..." message
+        """
         if not self.initialized:
             await self.initialize()
         
@@ -162,26 +219,177 @@ class LLMService:
             parameters["max_tokens"] = 2048
         
         # Generate based on provider
-        if provider.lower() == "ollama":
-            return await self._generate_ollama(prompt, model, parameters)
-        elif provider.lower() == "anthropic":
-            return await self._generate_anthropic(prompt, model, parameters)
-        elif provider.lower() == "openai":
-            return await self._generate_openai(prompt, model, parameters)
-        elif provider.lower() == "hunyuan3d":
-            return await self._generate_hunyuan3d(prompt, model, parameters)
-        else:
+        generators = {
+            "ollama": self._generate_ollama,
+            "anthropic": self._generate_anthropic,
+            "openai": self._generate_openai,
+            "hunyuan3d": self._generate_hunyuan3d
+        }
+        generator = generators.get(provider.lower())
+        if generator is None:
             raise ValueError(f"Unsupported provider: {provider}")
+        
+        tokens = estimate_tokens(prompt, parameters["max_tokens"])
+        try:
+            return await self._run_limited(provider.lower(), model, tokens, priority,
+                                           lambda: generator(prompt, model, parameters))
+        except RateLimitedError as e:
+            return f"Error: {str(e)}"
+    
+    async def _run_limited(self, provider: str, model: str, tokens: int, priority: Optional[str], call):
+        """
+        Run a provider request through the shared limiter
+        
+        Rate-limited requests back off for the provider's Retry-After and are
+        retried; Ollama requests are also grouped by model.
+        
+        Args:
+            provider: Provider name (lower case)
+            model: Model name
+            tokens: Estimated tokens of the request
+            priority: "interactive" or "batch"
+            call: Coroutine function performing the request
+            
+        Returns:
+            The request's result
+            
+        Raises:
+            RateLimitedError: If the provider is still rate limited after the retries
+        """
+        async def request():
+            for attempt in range(self.rate_limit_retries + 1):
+                async with self.limiter.limit(provider, model, tokens, priority):
+                    try:
+                        return await call()
+                    except RateLimitedError as e:
+                        self.limiter.backoff(provider, model, e.retry_after)
+                        if attempt == self.rate_limit_retries:
+                            logger.error(f"{provider} still rate limited after {attempt + 1} attempts")
+                            raise
+        
+        if provider == "ollama":
+            # Group queued Ollama requests by model to avoid reloading weights
+            return await self.ollama.run(model, request, priority)
+        return await request()
+    
+    async def generate_structured(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        name: str = "result",
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        priority: Optional[str] = None
+    ) -> Optional[Any]:
+        """
+        Generate a JSON value constrained to a schema
+        
+        The schema is enforced by the provider (Ollama format, OpenAI
+        response_format, Anthropic tool input) and the response is validated
+        while it streams, so the prompt does not need to describe the output
+        format and malformed output never needs a parse retry.
+        
+        Args:
+            prompt: Prompt text
+            schema: JSON schema of the result (an object or array)
+            name: Name of the result, used as the OpenAI schema and Anthropic tool name
+            provider: Provider name (defaults to the configured provider)
+            model: Model name (defaults to the configured model)
+            parameters: Generation parameters (temperature, max_tokens)
+            priority: "interactive" (default) or "batch"
+            
+        Returns:
+            The validated value, or None if the provider failed or returned an invalid value
+        """
+        if not self.initialized:
+            await self.initialize()
+        
+        provider = (provider or self.config.get("provider", "ollama")).lower()
+        model = model or self.config.get("model", "llama3:latest")
+        parameters = {"temperature": 0.7, "max_tokens": 2048, **(parameters or {})}
+        
+        generators = {
+            "ollama": self._structured_ollama,
+            "anthropic": self._structured_anthropic,
+            "openai": self._structured_openai
+        }
+        generator = generators.get(provider)
+        if generator is None:
+            raise ValueError(f"Structured output is not supported by provider: {provider}")
+        
+        tokens = estimate_tokens(prompt, parameters["max_tokens"])
+        validator = JSONStreamValidator(schema)
+        try:
+            await self._run_limited(provider, model, tokens, priority,
+                                    lambda: generator(prompt, model, parameters, schema, name, validator))
+            return validator.result()
+        except (StructuredOutputError, RateLimitedError) as e:
+            logger.error(f"Structured {name} from {provider} failed: {str(e)}")
+            return None
+    
+    async def classify_task(
+        self,
+        instruction: str,
+        provider: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Classify a user instruction into a structured task
+        
+        Args:
+            instruction: User instruction
+            provider: Provider name (defaults to the configured provider)
+            model: Model name (defaults to the configured model)
+            
+        Returns:
+            Dictionary with task_type, description and parameters, or None on failure
+        """
+        prompt = PrefixedPrompt(CLASSIFY_PROMPT_PREFIX, f"Instruction: {instruction}\n")
+        return await self.generate_structured(
+            prompt, TASK_CLASSIFICATION_SCHEMA, "task_classification", provider, model,
+            {"temperature": 0.2, "max_tokens": 512}
+        )
+    
+    async def plan_task_execution(
+        self,
+        task: Dict[str, Any],
+        available_tools: List[Dict[str, Any]],
+        provider: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Plan the tool calls that carry out a task
+        
+        Args:
+            task: Structured task (e.g. from classify_task, with the instruction)
+            available_tools: Tool information with parameter schemas, from ToolRegistry.get_tool_info
+            provider: Provider name (defaults to the configured provider)
+            model: Model name (defaults to the configured model)
+            
+        Returns:
+            List of steps with tool_name, parameters and description, or None on failure
+        """
+        tools = "\n".join(f"- {tool['name']}: {tool['description']}" for tool in available_tools)
+        # The tool list is the same for every plan, so it belongs to the cached prefix
+        prompt = PrefixedPrompt(PLAN_PROMPT_PREFIX + tools + "\n\n",
+                                f"Task: {json.dumps(task, default=str)}\n")
+        plan = await self.generate_structured(
+            prompt, execution_plan_schema(available_tools), "execution_plan", provider, model,
+            {"temperature": 0.2, "max_tokens": 1024}
+        )
+        return plan["steps"] if plan else None
     
     async def _generate_ollama(self, prompt: str, model: str, parameters: Dict[str, Any]) -> str:
         """Generate text using Ollama API"""
-        base_url = self.providers.get("ollama", {}).get("base_url", "http://127.0.0.1:11434")
+        base_url = self.ollama.base_url
         
         # Map our generic parameters to Ollama specific ones
         ollama_params = {
             "model": model,
             "prompt": prompt,
             "stream": False,
+            "keep_alive": self.ollama.keep_alive_for(model),
             "options": {
                 "temperature": parameters.get("temperature", 0.7),
                 "num_predict": parameters.get("max_tokens", 2048)
@@ -197,6 +405,8 @@ class LLMService:
                 
                 if response.status_code == 200:
                     data = response.json()
+                    self.ollama.record_request(model, data)
+                    self.ollama.record_prefix(model, prompt, data)
                     return data.get("response", "")
                 else:
                     error_msg = f"Ollama API error: {response.status_code} - {response.text}"
@@ -237,9 +447,7 @@ class LLMService:
             # Messages API format (newer and recommended)
             messages_body = {
                 "model": model,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
+                **anthropic_messages(prompt),  # Fixed prefixes are marked for prompt caching
                 "max_tokens": max_tokens,
                 "temperature": temperature
             }
@@ -254,7 +462,8 @@ class LLMService:
                 if response.status_code == 200:
                     data = response.json()
                     logger.debug(f"Claude API response: {data}")
-                    data = response.json()
+                    if split_prompt(prompt)[0]:
+                        get_prefix_stats().record_anthropic_usage(data.get("usage"))
                     # Extract the message content from the response
                     if "content" in data and len(data["content"]) > 0:
                         # Messages API returns an array of content blocks
@@ -263,9 +472,14 @@ class LLMService:
                         return "".join(text_blocks)
                     return "".join(text_blocks)
                     return ""
+                elif response.status_code in (429, 529):
+                    raise RateLimitedError(f"Anthropic API error: {response.status_code} - {response.text}",
+                                           retry_after_seconds(response.headers))
                 else:
                     error_msg = f"Anthropic API error: {response.status_code} - {response.text}"
                     logger.error(error_msg)
+        except RateLimitedError:
+            raise
         except Exception as e:
             logger.warning(f"Messages API failed, falling back to Completion API: {str(e)}")
             # Fall back to the older Completion API
@@ -289,10 +503,15 @@ class LLMService:
                 if response.status_code == 200:
                     data = response.json()
                     return data.get("completion", "")
+                elif response.status_code in (429, 529):
+                    raise RateLimitedError(f"Anthropic API error: {response.status_code} - {response.text}",
+                                           retry_after_seconds(response.headers))
                 else:
                     error_msg = f"Anthropic API error: {response.status_code} - {response.text}"
                     logger.error(error_msg)
                     return f"Error: {error_msg}"
+        except RateLimitedError:
+            raise
         except Exception as e:
             error_msg = f"Error generating text with Anthropic: {str(e)}"
             logger.error(error_msg)
@@ -338,15 +557,132 @@ class LLMService:
                 if response.status_code == 200:
                     data = response.json()
                     return data.get("choices", [{}])[0].get("message", {}).get("content", "")
+                elif response.status_code == 429:
+                    raise RateLimitedError(f"OpenAI API error: {response.status_code} - {response.text}",
+                                           retry_after_seconds(response.headers))
                 else:
                     error_msg = f"OpenAI API error: {response.status_code} - {response.text}"
                     logger.error(error_msg)
                     return f"Error: {error_msg}"
+        except RateLimitedError:
+            raise
         except Exception as e:
             error_msg = f"Error generating text with OpenAI: {str(e)}"
             logger.error(error_msg)
             return f"Error: {error_msg}"
 
+    async def _structured_ollama(self, prompt: str, model: str, parameters: Dict[str, Any],
+                                 schema: Dict[str, Any], name: str, validator: JSONStreamValidator):
+        """Stream a schema-constrained Ollama response into a validator"""
+        ollama_params = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": self.ollama.keep_alive_for(model),
+            **ollama_format(schema),
+            "options": {
+                "temperature": parameters.get("temperature", 0.7),
+                "num_predict": parameters.get("max_tokens", 2048)
+            }
+        }
+        
+        try:
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                async with client.stream("POST", f"{self.ollama.base_url}/api/generate", json=ollama_params) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        raise StructuredOutputError(f"Ollama API error: {response.status_code} - {response.text}")
+                    data = {}
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        data = json.loads(line)
+                        # Stop reading (and generating) once the value is closed
+                        if validator.feed(data.get("response", "")) or data.get("done"):
+                            break
+                    self.ollama.record_request(model, data)
+                    self.ollama.record_prefix(model, prompt, data)
+        except (httpx.HTTPError, ValueError) as e:
+            raise StructuredOutputError(f"Error generating {name} with Ollama: {str(e)}")
+    
+    async def _structured_anthropic(self, prompt: str, model: str, parameters: Dict[str, Any],
+                                    schema: Dict[str, Any], name: str, validator: JSONStreamValidator):
+        """Stream a forced Anthropic tool call whose input is the schema-constrained value"""
+        api_key = get_api_key_for_provider("anthropic") or self.config.get("api_key")
+        if not api_key:
+            raise StructuredOutputError("Anthropic API key not found. Set ANTHROPIC_API_KEY environment variable or configure in settings.")
+        
+        headers = {
+            "Content-Type": "application/json",
+            "X-API-Key": api_key,
+            "anthropic-version": "2023-06-01"
+        }
+        body = {
+            "model": model,
+            **anthropic_messages(prompt),
+            **anthropic_tool(name, schema),
+            "max_tokens": parameters.get("max_tokens", 2048),
+            "temperature": parameters.get("temperature", 0.7),
+            "stream": True
+        }
+        
+        try:
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                async with client.stream("POST", "https://api.anthropic.com/v1/messages",
+                                         headers=headers, json=body) as response:
+                    await self._check_stream_status(response, "Anthropic", (429, 529))
+                    async for event in _sse_events(response):
+                        if event.get("type") == "message_start" and split_prompt(prompt)[0]:
+                            get_prefix_stats().record_anthropic_usage(event.get("message", {}).get("usage"))
+                        delta = event.get("delta", {})
+                        if delta.get("type") == "input_json_delta" and validator.feed(delta.get("partial_json", "")):
+                            break
+        except (httpx.HTTPError, ValueError) as e:
+            raise StructuredOutputError(f"Error generating {name} with Anthropic: {str(e)}")
+    
+    async def _structured_openai(self, prompt: str, model: str, parameters: Dict[str, Any],
+                                 schema: Dict[str, Any], name: str, validator: JSONStreamValidator):
+        """Stream a schema-constrained OpenAI chat completion into a validator"""
+        api_key = get_api_key_for_provider("openai") or self.config.get("api_key")
+        if not api_key:
+            raise StructuredOutputError("OpenAI API key not found. Set OPENAI_API_KEY environment variable or configure in settings.")
+        
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        }
+        body = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            **openai_response_format(name, schema),
+            "max_tokens": parameters.get("max_tokens", 2048),
+            "temperature": parameters.get("temperature", 0.7),
+            "stream": True
+        }
+        
+        try:
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                async with client.stream("POST", "https://api.openai.com/v1/chat/completions",
+                                         headers=headers, json=body) as response:
+                    await self._check_stream_status(response, "OpenAI", (429,))
+                    async for event in _sse_events(response):
+                        choices = event.get("choices") or [{}]
+                        if validator.feed(choices[0].get("delta", {}).get("content") or ""):
+                            break
+        except (httpx.HTTPError, ValueError) as e:
+            raise StructuredOutputError(f"Error generating {name} with OpenAI: {str(e)}")
+    
+    @staticmethod
+    async def _check_stream_status(response: httpx.Response, provider: str, rate_limit_codes):
+        """Raise for an unsuccessful streamed response"""
+        if response.status_code == 200:
+            return
+        await response.aread()
+        message = f"{provider} API error: {response.status_code} - {response.text}"
+        if response.status_code in rate_limit_codes:
+            raise RateLimitedError(message, retry_after_seconds(response.headers))
+        raise StructuredOutputError(message)
+    
     async def _generate_hunyuan3d(self, prompt: str, model: str, parameters: Dict[str, Any]) -> str:
         """Generate 3D content using Hunyuan3D API via fal.ai"""
         # Try to get API key from environment first, then config
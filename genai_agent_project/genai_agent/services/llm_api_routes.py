@@ -23,6 +23,7 @@ class GenerateRequest(BaseModel):
     provider: Optional[str] = None
     model: Optional[str] = None
     parameters: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    priority: Optional[str] = None  # "interactive" (default) or "batch"
 
 class TaskClassificationRequest(BaseModel):
     """Model for task classification request"""
@@ -128,7 +129,8 @@ async def generate_text(request: GenerateRequest):
             prompt=request.prompt,
             provider=request.provider,
             model=request.model,
-            parameters=request.parameters
+            parameters=request.parameters,
+            priority=request.priority
         )
         
         return {"text": result, "status": "success"}
@@ -136,21 +138,46 @@ async def generate_text(request: GenerateRequest):
         logger.error(f"Error generating text: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating text: {str(e)}")
 
+@router.get("/limits")
+async def get_limits():
+    """
+    Get concurrency and rate limit state with queue wait metrics per provider and model
+    """
+    from genai_agent.services.llm_limiter import get_llm_limiter
+    
+    return get_llm_limiter().snapshot()
+
+@router.get("/prefix-cache")
+async def get_prefix_cache_stats():
+    """
+    Get prompt prefix reuse statistics (requests, hits and hit rate) per provider
+    """
+    from genai_agent.services.prompt_prefix import get_prefix_stats
+    
+    return get_prefix_stats().snapshot()
+
+@router.get("/ollama/models")
+async def get_ollama_models():
+    """
+    Get loaded Ollama models, load/unload events and model scheduling state
+    """
+    llm_service = get_llm_service()
+    await llm_service.ollama.refresh()
+    return llm_service.ollama.snapshot()
+
 @router.post("/classify-task")
 async def classify_task(request: TaskClassificationRequest):
     """
     Classify a user instruction into a structured task
     """
     try:
-        # This is just a placeholder - the actual implementation would use the LLM
-        # to classify the task into a structured format
-        return {
-            "task_type": "unknown",
-            "confidence": 0.0,
-            "details": {
-                "instruction": request.instruction
-            }
-        }
+        llm_service = get_llm_service()
+        task = await llm_service.classify_task(request.instruction, request.provider, request.model)
+        if task is None:
+            raise HTTPException(status_code=502, detail="The LLM did not return a valid task classification")
+        return task
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error classifying task: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error classifying task: {str(e)}")
@@ -161,3 +188,14 @@ def add_llm_routes(app):
     Add LLM routes to the FastAPI application
     """
     app.include_router(router)
+    
+    @app.on_event("startup")
+    async def preload_llm_models():
+        """Initialize the LLM service in the background, preloading the configured Ollama models"""
+        async def initialize():
+            try:
+                await get_llm_service().initialize()
+            except Exception as e:
+                logger.error(f"Error initializing LLM service: {str(e)}")
+        
+        asyncio.ensure_future(initialize())
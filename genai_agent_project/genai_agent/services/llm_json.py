@@ -0,0 +1,183 @@
+"""
+Single-pass extraction of JSON and code blocks from LLM responses
+
+LLM responses wrap JSON in prose and code fences and add comments,
+trailing commas, single-quoted strings and Python literals. extract_json
+scans a response once: outside a candidate it jumps to the next { or [,
+a candidate that is valid JSON as written is read by the C decoder
+(json.JSONDecoder.raw_decode); any other candidate is tokenized (strings,
+comments, brackets) with non-backtracking patterns into a normalized
+copy, which is parsed with one json.loads call. If it does not parse, the
+nested values recorded during the scan are tried instead, so a stray
+bracket in the prose does not hide the object that follows it. The scan
+never backtracks; work is linear in the response length times the nesting
+depth.
+"""
+
+import json
+import logging
+import re
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OPEN = re.compile(r"[{\[]")
+TOKEN = re.compile(r"""
+    (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<single>'(?:[^'\\\n]|\\.)*')
+  | (?P<line_comment>//[^\n]*)
+  | (?P<block_comment>/\*.*?(?:\*/|\Z))
+  | (?P<fence>```)
+  | (?P<open>[{\[])
+  | (?P<close>[}\]])
+  | (?P<comma>,)
+  | (?P<other>[^"'/`{}\[\],]+|.)
+""", re.VERBOSE | re.DOTALL)
+LITERAL = re.compile(r"\b(True|False|None)\b")
+DECODER = json.JSONDecoder()
+FENCE = re.compile(r"```[ \t]*([\w+#.-]*)[^\n]*\n")
+
+PAIRS = {"{": "}", "[": "]"}
+LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+def _single_quoted(token: str) -> str:
+    """Convert a single-quoted string token to a JSON string."""
+    inner = token[1:-1].replace("\\'", "'").replace('"', '\\"')
+    return f'"{inner}"'
+
+def _parse(text: str, kind: Optional[type]) -> Tuple[bool, Any]:
+    try:
+        value = json.loads(text)
+    except (ValueError, RecursionError):
+        return False, None
+    return kind is None or isinstance(value, kind), value
+
+def _scan_candidate(text: str, pos: int) -> Tuple[int, List[str], List[Tuple[int, int]], bool]:
+    """
+    Tokenize one candidate starting at an opening bracket.
+
+    Returns:
+        Tuple of (end position, normalized parts, spans of closed values as
+        part indices, whether the candidate closed properly)
+    """
+    parts: List[str] = []
+    spans: List[Tuple[int, int]] = []
+    stack: List[Tuple[str, int]] = []
+    length = len(text)
+
+    while pos < length:
+        match = TOKEN.match(text, pos)
+        kind = match.lastgroup
+        token = match.group()
+        pos = match.end()
+
+        if kind == "open":
+            stack.append((PAIRS[token], len(parts)))
+            parts.append(token)
+        elif kind == "close":
+            if stack[-1][0] != token:
+                return pos, parts, spans, False
+            if parts and parts[-1].isspace():
+                parts.pop()
+            if parts and parts[-1] == ",":
+                # Trailing comma
+                parts.pop()
+            _, start = stack.pop()
+            parts.append(token)
+            spans.append((start, len(parts)))
+            if not stack:
+                return pos, parts, spans, True
+        elif kind in ("line_comment", "block_comment"):
+            # Keep a space so that adjacent tokens stay separate
+            parts.append(" ")
+        elif kind == "fence":
+            # The code block ended before the value did
+            return pos, parts, spans, False
+        elif kind == "single":
+            parts.append(_single_quoted(token))
+        elif kind == "other" and "e" in token:
+            # True, False or None (all contain an "e"), possibly after a colon
+            parts.append(LITERAL.sub(lambda literal: LITERALS[literal.group()], token))
+        else:
+            parts.append(token)
+
+    return pos, parts, spans, False
+
+def extract_json(text: str, kind: Optional[type] = None) -> Optional[Any]:
+    """
+    Find the largest valid JSON value in an LLM response.
+
+    Handles code fences, // and /* */ comments, trailing commas,
+    single-quoted strings and True/False/None.
+
+    Args:
+        text: LLM response
+        kind: dict or list to only accept objects or arrays (default: either)
+
+    Returns:
+        The parsed value, or None if the response contains none
+    """
+    if not text:
+        return None
+
+    best = None
+    best_size = -1
+    pos = 0
+    while True:
+        match = OPEN.search(text, pos)
+        if match is None:
+            break
+
+        # Most candidates are already valid JSON; let the C decoder read them
+        try:
+            value, end = DECODER.raw_decode(text, match.start())
+        except (ValueError, RecursionError):
+            pass
+        else:
+            if kind is None or isinstance(value, kind):
+                if end - match.start() > best_size:
+                    best, best_size = value, end - match.start()
+                pos = end
+                continue
+
+        pos, parts, spans, closed = _scan_candidate(text, match.start())
+
+        # The candidate as a whole, then its nested values from largest to smallest
+        candidates = [(0, len(parts))] if closed else []
+        candidates += sorted(spans[:-1] if closed else spans, key=lambda span: span[0] - span[1])
+        for start, end in candidates:
+            candidate = "".join(parts[start:end])
+            if len(candidate) <= best_size:
+                continue
+            ok, value = _parse(candidate, kind)
+            if ok:
+                best, best_size = value, len(candidate)
+                break
+
+    return best
+
+def extract_code_block(text: str, language: Optional[str] = None) -> Optional[str]:
+    """
+    Find the first fenced code block in an LLM response.
+
+    Args:
+        text: LLM response
+        language: Only accept blocks with this language tag (default: any block)
+
+    Returns:
+        The block's content, or None if there is no matching block (an
+        unclosed block runs to the end of the response)
+    """
+    pos = 0
+    while True:
+        match = FENCE.search(text, pos)
+        if match is None:
+            return None
+        end = text.find("```", match.end())
+        content = text[match.end():] if end < 0 else text[match.end():end]
+        if language is None or match.group(1).lower() == language.lower():
+            return content.strip()
+        if end < 0:
+            return None
+        # Skip past the closing fence
+        pos = end + 3
@@ -0,0 +1,486 @@
+"""
+Shared admission control for LLM requests
+
+Every LLM call goes through one LLMLimiter, which enforces per provider and
+per (provider, model) scopes:
+- a maximum number of requests in flight
+- request-per-minute and token-per-minute token buckets
+- a Retry-After backoff after 429 responses
+
+Requests that cannot be admitted wait in a priority queue: interactive
+requests are admitted ahead of batch requests, first come first served
+within a priority. The limiter is thread-safe and serves both async callers
+(acquire/limit) and synchronous callers running in threads
+(acquire_sync/limit_sync). Queue wait times are kept per scope as metrics.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import email.utils
+import itertools
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BATCH = 1
+PRIORITIES = {"interactive": INTERACTIVE, "batch": BATCH}
+
+# Default priority for requests that do not pass one; batch pipelines set it
+# with batch_priority() instead of threading a parameter through every call
+current_priority: contextvars.ContextVar = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+# Limits per scope: "provider" applies across all models of a provider,
+# "provider/model" to one model. Unknown providers get DEFAULT_LIMITS per model.
+DEFAULT_LIMITS = {"max_concurrent": 4, "requests_per_minute": 0, "tokens_per_minute": 0}
+PROVIDER_LIMITS = {
+    "anthropic": {"max_concurrent": 4, "requests_per_minute": 50, "tokens_per_minute": 40000},
+    "openai": {"max_concurrent": 4, "requests_per_minute": 60, "tokens_per_minute": 90000},
+    # A local Ollama serves one model at a time; concurrent requests for
+    # different models make it swap models in and out of memory
+    "ollama": {"max_concurrent": 1, "requests_per_minute": 0, "tokens_per_minute": 0},
+}
+
+def parse_priority(priority: Any) -> int:
+    """
+    Normalize a priority.
+
+    Args:
+        priority: "interactive", "batch", a priority number, or None for the context default
+
+    Returns:
+        Priority number (lower is admitted first)
+    """
+    if priority is None:
+        return current_priority.get()
+    if isinstance(priority, str):
+        return PRIORITIES.get(priority.lower(), INTERACTIVE)
+    return int(priority)
+
+@contextlib.contextmanager
+def batch_priority():
+    """Run LLM requests made inside the block at batch priority."""
+    token = current_priority.set(BATCH)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+def estimate_tokens(prompt: Any, max_tokens: int = 0) -> int:
+    """
+    Rough token cost of a request for the token-per-minute bucket.
+
+    Args:
+        prompt: Prompt text (or message list)
+        max_tokens: Maximum tokens to generate
+
+    Returns:
+        Estimated prompt tokens (about 4 characters per token) plus max_tokens
+    """
+    return len(str(prompt)) // 4 + (max_tokens or 0)
+
+def retry_after_seconds(headers: Any, default: float = 1.0) -> float:
+    """
+    Read the backoff delay from a Retry-After header.
+
+    Args:
+        headers: Response headers (any mapping, may be None)
+        default: Delay when the header is missing or unreadable
+
+    Returns:
+        Seconds to wait
+    """
+    value = None
+    if headers:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+class RateLimitedError(Exception):
+    """Raised by an LLM call that was answered with 429 (or 529 overloaded)."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (amounts above capacity wait for a full bucket)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+class LimitScope:
+    """Limits and state of one provider or (provider, model) scope."""
+
+    def __init__(self, name: str, max_concurrent: int = 0, requests_per_minute: float = 0,
+                 tokens_per_minute: float = 0):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.in_flight = 0
+        self.blocked_until = 0.0
+
+        self.queued = 0
+        self.admitted = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.rate_limited = 0
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        """Seconds until a request can be admitted (inf while waiting for a slot)."""
+        if self.max_concurrent and self.in_flight >= self.max_concurrent:
+            return math.inf
+        wait = max(self.blocked_until - now, 0.0)
+        if self.requests:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens and tokens:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+    def admit(self, tokens: int, now: float, waited: float):
+        self.in_flight += 1
+        if self.requests:
+            self.requests.take(1, now)
+        if self.tokens and tokens:
+            self.tokens.take(tokens, now)
+        self.admitted += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrent": self.max_concurrent,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "queue_wait_mean_seconds": self.wait_total / self.admitted if self.admitted else 0.0,
+            "queue_wait_max_seconds": self.wait_max,
+            "blocked_seconds": max(self.blocked_until - time.monotonic(), 0.0),
+        }
+
+class _Waiter:
+    """A request waiting for admission."""
+
+    def __init__(self, priority: int, sequence: int, scopes: List[LimitScope], tokens: int, wake):
+        self.priority = priority
+        self.sequence = sequence
+        self.scopes = scopes
+        self.tokens = tokens
+        self.wake = wake
+        self.enqueued = time.monotonic()
+        self.admitted = False
+        self.retry_in = math.inf
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+class Ticket:
+    """An admitted request; release it when the request finishes."""
+
+    def __init__(self, limiter: "LLMLimiter", scopes: List[LimitScope], waited: float):
+        self.limiter = limiter
+        self.scopes = scopes
+        self.waited = waited
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.limiter._release(self.scopes)
+
+class LLMLimiter:
+    """Per-provider concurrency limits, rate limits and prioritized admission."""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None,
+                 default_limits: Optional[Dict[str, float]] = None):
+        """
+        Create a limiter.
+
+        Args:
+            limits: Limits per scope name ("provider" or "provider/model"), each with
+                max_concurrent, requests_per_minute and tokens_per_minute (0 = unlimited)
+            default_limits: Limits for each (provider, model) without configured limits
+        """
+        self.limits = {key.lower(): value for key, value in (PROVIDER_LIMITS if limits is None else limits).items()}
+        self.default_limits = DEFAULT_LIMITS if default_limits is None else default_limits
+
+        self._lock = threading.Lock()
+        self._scopes: Dict[str, LimitScope] = {}
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+
+    def _scope(self, name: str, limits: Dict[str, float]) -> LimitScope:
+        scope = self._scopes.get(name)
+        if scope is None:
+            scope = self._scopes[name] = LimitScope(name, **limits)
+        return scope
+
+    def scopes_for(self, provider: str, model: Optional[str] = None) -> List[LimitScope]:
+        """
+        Scopes a request for a provider and model is counted against.
+
+        Args:
+            provider: Provider name
+            model: Model name
+
+        Returns:
+            The provider scope and/or the model scope that have limits configured,
+            or a per-model default scope
+        """
+        provider = (provider or "default").lower()
+        model_key = f"{provider}/{model or 'default'}".lower()
+        with self._lock:
+            scopes = [self._scope(key, self.limits[key]) for key in (provider, model_key) if key in self.limits]
+            if not scopes:
+                scopes = [self._scope(model_key, self.default_limits)]
+            return scopes
+
+    def _dispatch(self):
+        """Admit waiters in priority order; must hold the lock."""
+        now = time.monotonic()
+        blocked = set()
+        for waiter in sorted(self._waiters):
+            if any(scope.name in blocked for scope in waiter.scopes):
+                waiter.retry_in = math.inf
+                continue
+            wait = max(scope.wait_time(waiter.tokens, now) for scope in waiter.scopes)
+            if wait > 0:
+                if wait != math.inf and waiter.retry_in == math.inf:
+                    # Sleeping until woken; wake it to poll again when the wait ends
+                    waiter.wake()
+                # Lower-priority requests must not overtake this one in its scopes
+                waiter.retry_in = wait
+                blocked.update(scope.name for scope in waiter.scopes)
+                continue
+
+            waited = now - waiter.enqueued
+            for scope in waiter.scopes:
+                scope.admit(waiter.tokens, now, waited)
+                scope.queued -= 1
+            waiter.admitted = True
+            self._waiters.remove(waiter)
+            waiter.wake()
+
+    def _enqueue(self, scopes: List[LimitScope], tokens: int, priority: Any, wake) -> _Waiter:
+        waiter = _Waiter(parse_priority(priority), next(self._sequence), scopes, tokens, wake)
+        with self._lock:
+            for scope in scopes:
+                scope.queued += 1
+            self._waiters.append(waiter)
+            self._dispatch()
+        return waiter
+
+    def _cancel(self, waiter: _Waiter) -> bool:
+        """Remove a waiter that gave up; returns True if it had been admitted meanwhile."""
+        with self._lock:
+            if waiter.admitted:
+                return True
+            self._waiters.remove(waiter)
+            for scope in waiter.scopes:
+                scope.queued -= 1
+            self._dispatch()
+            return False
+
+    def _poll(self, waiter: _Waiter) -> float:
+        """Re-run admission; returns how long the waiter should sleep before polling again."""
+        with self._lock:
+            if not waiter.admitted:
+                self._dispatch()
+            return 0.0 if waiter.admitted else waiter.retry_in
+
+    def _release(self, scopes: List[LimitScope]):
+        with self._lock:
+            for scope in scopes:
+                scope.in_flight -= 1
+            self._dispatch()
+
+    async def acquire(self, provider: str, model: Optional[str] = None, tokens: int = 0,
+                      priority: Any = None) -> Ticket:
+        """
+        Wait until a request may be sent.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            tokens: Estimated tokens of the request (see estimate_tokens)
+            priority: "interactive" or "batch" (defaults to the context priority)
+
+        Returns:
+            Ticket to release when the request finishes
+        """
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass
+
+        scopes = self.scopes_for(provider, model)
+        waiter = self._enqueue(scopes, tokens, priority, wake)
+        try:
+            while True:
+                delay = self._poll(waiter)
+                if waiter.admitted:
+                    break
+                event.clear()
+                try:
+                    await asyncio.wait_for(event.wait(), None if delay == math.inf else delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            if self._cancel(waiter):
+                Ticket(self, scopes, 0.0).release()
+            raise
+        return Ticket(self, scopes, time.monotonic() - waiter.enqueued)
+
+    def acquire_sync(self, provider: str, model: Optional[str] = None, tokens: int = 0,
+                     priority: Any = None) -> Ticket:
+        """
+        Blocking variant of acquire for synchronous clients.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            tokens: Estimated tokens of the request
+            priority: "interactive" or "batch" (defaults to the context priority)
+
+        Returns:
+            Ticket to release when the request finishes
+        """
+        event = threading.Event()
+        scopes = self.scopes_for(provider, model)
+        waiter = self._enqueue(scopes, tokens, priority, event.set)
+        try:
+            while True:
+                delay = self._poll(waiter)
+                if waiter.admitted:
+                    break
+                event.clear()
+                event.wait(None if delay == math.inf else delay)
+        except BaseException:
+            if self._cancel(waiter):
+                Ticket(self, scopes, 0.0).release()
+            raise
+        return Ticket(self, scopes, time.monotonic() - waiter.enqueued)
+
+    @contextlib.asynccontextmanager
+    async def limit(self, provider: str, model: Optional[str] = None, tokens: int = 0, priority: Any = None):
+        """Hold an admission for the duration of an async block."""
+        ticket = await self.acquire(provider, model, tokens, priority)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    @contextlib.contextmanager
+    def limit_sync(self, provider: str, model: Optional[str] = None, tokens: int = 0, priority: Any = None):
+        """Hold an admission for the duration of a block."""
+        ticket = self.acquire_sync(provider, model, tokens, priority)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def backoff(self, provider: str, model: Optional[str] = None, retry_after: float = 1.0):
+        """
+        Pause a provider after a rate limit response.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            retry_after: Seconds from the Retry-After header
+        """
+        scopes = self.scopes_for(provider, model)
+        until = time.monotonic() + retry_after
+        with self._lock:
+            for scope in scopes:
+                scope.blocked_until = max(scope.blocked_until, until)
+                scope.rate_limited += 1
+        logger.warning(f"{provider} rate limited, pausing requests for {retry_after:.1f}s")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Current state and queue wait metrics.
+
+        Returns:
+            Dictionary of scope name to in-flight, queued and admitted counts,
+            mean and max queue wait, rate limit count and remaining backoff
+        """
+        with self._lock:
+            return {name: scope.snapshot() for name, scope in self._scopes.items()}
+
+def load_limits_from_env() -> Dict[str, Dict[str, float]]:
+    """
+    Provider limits, overridden by LLM_LIMIT_<SCOPE>_<SETTING> environment variables.
+
+    For example LLM_LIMIT_OLLAMA_MAX_CONCURRENT=2 or
+    LLM_LIMIT_ANTHROPIC_TOKENS_PER_MINUTE=80000.
+
+    Returns:
+        Limits per scope
+    """
+    limits = {scope: dict(values) for scope, values in PROVIDER_LIMITS.items()}
+    for key, value in os.environ.items():
+        if not key.startswith("LLM_LIMIT_"):
+            continue
+        rest = key[len("LLM_LIMIT_"):].lower()
+        for setting in ("max_concurrent", "requests_per_minute", "tokens_per_minute"):
+            if rest.endswith("_" + setting):
+                scope = rest[:-len(setting) - 1]
+                try:
+                    limits.setdefault(scope, dict(DEFAULT_LIMITS))[setting] = float(value)
+                except ValueError:
+                    logger.warning(f"Ignoring invalid {key}={value}")
+    return limits
+
+# Singleton instance
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_llm_limiter() -> LLMLimiter:
+    """
+    Get the process-wide LLM limiter.
+
+    Returns:
+        LLMLimiter instance
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = LLMLimiter(load_limits_from_env())
+        return _limiter
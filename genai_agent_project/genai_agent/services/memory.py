@@ -8,10 +8,26 @@ import os
 import time
 from typing import Dict, Any, List, Optional, Union
 
+from redis.exceptions import ResponseError
+
 from genai_agent.services.redis_bus import RedisMessageBus
+from genai_agent.services.memory_log import MemoryLog
 
 logger = logging.getLogger(__name__)
 
+# Returns all keys matching a pattern with their values in one round trip
+MATCH_SCRIPT = """
+local keys = redis.call('KEYS', ARGV[1])
+local values = {}
+for i = 1, #keys, 1000 do
+    local chunk = redis.call('MGET', unpack(keys, i, math.min(i + 999, #keys)))
+    for j = 1, #chunk do
+        values[#values + 1] = chunk[j]
+    end
+end
+return {keys, values}
+"""
+
 class MemoryService:
     """
     Service for storing and retrieving agent memory
@@ -33,10 +49,11 @@ class MemoryService:
         self.redis_bus = redis_bus
         self.config = config or {}
         
-        # Storage type: 'redis' or 'file'
+        # Storage type: 'redis', 'file' (one JSON file per key) or 'log'
+        # (single append-only log file with an in-memory index)
         self.storage_type = self.config.get('storage_type', 'redis')
         
-        # File storage path (only used if storage_type is 'file')
+        # File storage path (only used if storage_type is 'file' or 'log')
         self.file_path = self.config.get('file_path', 'data/memory/')
         
         # Time to live in seconds (0 = no expiration)
@@ -45,11 +62,30 @@ class MemoryService:
         # Redis key prefix
         self.key_prefix = 'memory:'
         
+        # Registered script used by retrieve_matching
+        self._match_script = None
+        
         logger.info(f"Memory Service initialized with {self.storage_type} storage")
         
         # Create file storage directory if needed
-        if self.storage_type == 'file' and not os.path.exists(self.file_path):
+        if self.storage_type in ('file', 'log') and not os.path.exists(self.file_path):
             os.makedirs(self.file_path)
+        
+        # Log storage replaces the per-key JSON files
+        self.log = None
+        if self.storage_type == 'log':
+            self.log = MemoryLog(
+                os.path.join(self.file_path, 'memory.log'),
+                fsync_interval=self.config.get('fsync_interval', 1.0),
+                sweep_interval=self.config.get('sweep_interval', 60.0)
+            )
+            if not len(self.log):
+                self._import_json_files()
+    
+    async def close(self):
+        """Flush and close file-based storage"""
+        if self.log:
+            self.log.close()
     
     async def store(self, key: str, value: Union[Dict[str, Any], List[Any], str], 
                   expiration: Optional[int] = None) -> bool:
@@ -125,6 +161,138 @@ class MemoryService:
         else:
             return self._list_keys_file(pattern)
     
+    async def store_many(self, values: Dict[str, Any], expiration: Optional[int] = None) -> bool:
+        """
+        Store several values at once
+        
+        Args:
+            values: Dictionary mapping memory keys to values
+            expiration: Expiration time in seconds (overrides default ttl)
+            
+        Returns:
+            True if all values were stored, False otherwise
+        """
+        ttl = expiration if expiration is not None else self.ttl
+        
+        if self.storage_type == 'redis':
+            return await self._store_many_redis(values, ttl)
+        else:
+            return all([self._store_file(key, value, ttl) for key, value in values.items()])
+    
+    async def retrieve_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Retrieve several values at once
+        
+        Args:
+            keys: Memory keys
+            
+        Returns:
+            Dictionary mapping the keys that were found to their values
+        """
+        if self.storage_type == 'redis':
+            return await self._retrieve_many_redis(keys)
+        
+        values = {key: self._retrieve_file(key) for key in keys}
+        return {key: value for key, value in values.items() if value is not None}
+    
+    async def retrieve_matching(self, pattern: str) -> Dict[str, Any]:
+        """
+        Retrieve all values whose keys match a pattern
+        
+        Args:
+            pattern: Key pattern
+            
+        Returns:
+            Dictionary mapping matching keys to their values
+        """
+        if self.storage_type == 'redis':
+            return await self._retrieve_matching_redis(pattern)
+        
+        return await self.retrieve_many(self._list_keys_file(pattern))
+    
+    async def delete_many(self, keys: List[str]) -> bool:
+        """
+        Delete several values at once
+        
+        Args:
+            keys: Memory keys
+            
+        Returns:
+            True if deleted successfully, False otherwise
+        """
+        if not keys:
+            return True
+        
+        if self.storage_type == 'redis':
+            return await self._delete_redis(*keys)
+        else:
+            return all([self._delete_file(key) for key in keys])
+    
+    async def append(self, key: str, items: List[Any], expiration: Optional[int] = None,
+                     max_length: Optional[int] = None) -> bool:
+        """
+        Append items to a list in memory
+        
+        In Redis the list is a native list, so appending does not read or
+        rewrite the existing entries.
+        
+        Args:
+            key: Memory key
+            items: Items to append
+            expiration: Expiration time in seconds (overrides default ttl)
+            max_length: Keep only the most recent entries (optional)
+            
+        Returns:
+            True if appended successfully, False otherwise
+        """
+        ttl = expiration if expiration is not None else self.ttl
+        
+        if self.storage_type == 'redis':
+            return await self._append_redis(key, items, ttl, max_length)
+        
+        values = (self._retrieve_file(key) or []) + list(items)
+        if max_length:
+            values = values[-max_length:]
+        return self._store_file(key, values, ttl)
+    
+    async def retrieve_list(self, key: str, start: int = 0, end: int = -1) -> List[Any]:
+        """
+        Retrieve a range of a list in memory
+        
+        Args:
+            key: Memory key
+            start: Index of the first entry (negative counts from the end)
+            end: Index of the last entry, inclusive (negative counts from the end)
+            
+        Returns:
+            List entries in the range
+        """
+        if self.storage_type == 'redis':
+            return await self._retrieve_list_redis(key, start, end)
+        
+        values = self._retrieve_file(key) or []
+        end = len(values) + end if end < 0 else end
+        return values[start:end + 1]
+    
+    async def store_list(self, key: str, items: List[Any], expiration: Optional[int] = None) -> bool:
+        """
+        Replace a list in memory
+        
+        Args:
+            key: Memory key
+            items: List entries
+            expiration: Expiration time in seconds (overrides default ttl)
+            
+        Returns:
+            True if stored successfully, False otherwise
+        """
+        ttl = expiration if expiration is not None else self.ttl
+        
+        if self.storage_type == 'redis':
+            return await self._store_list_redis(key, items, ttl)
+        else:
+            return self._store_file(key, list(items), ttl)
+    
     async def store_conversation(self, conversation_id: str, 
                                messages: List[Dict[str, Any]]) -> bool:
         """
@@ -138,20 +306,38 @@ class MemoryService:
             True if stored successfully, False otherwise
         """
         key = f"conversation:{conversation_id}"
-        return await self.store(key, messages)
+        return await self.store_list(key, messages)
     
-    async def retrieve_conversation(self, conversation_id: str) -> List[Dict[str, Any]]:
+    async def add_conversation_messages(self, conversation_id: str,
+                                        messages: List[Dict[str, Any]]) -> bool:
+        """
+        Append messages to conversation history
+        
+        Args:
+            conversation_id: Conversation ID
+            messages: Messages to append
+            
+        Returns:
+            True if added successfully, False otherwise
+        """
+        key = f"conversation:{conversation_id}"
+        return await self.append(key, messages)
+    
+    async def retrieve_conversation(self, conversation_id: str, start: int = 0,
+                                    end: int = -1) -> List[Dict[str, Any]]:
         """
         Retrieve conversation history
         
         Args:
             conversation_id: Conversation ID
+            start: Index of the first message (negative counts from the end)
+            end: Index of the last message, inclusive
             
         Returns:
             List of conversation messages
         """
         key = f"conversation:{conversation_id}"
-        return await self.retrieve(key) or []
+        return await self.retrieve_list(key, start, end)
     
     async def store_scene_history(self, scene_id: str, history: List[Dict[str, Any]]) -> bool:
         """
@@ -165,20 +351,23 @@ class MemoryService:
             True if stored successfully, False otherwise
         """
         key = f"scene_history:{scene_id}"
-        return await self.store(key, history)
+        return await self.store_list(key, history)
     
-    async def retrieve_scene_history(self, scene_id: str) -> List[Dict[str, Any]]:
+    async def retrieve_scene_history(self, scene_id: str, start: int = 0,
+                                     end: int = -1) -> List[Dict[str, Any]]:
         """
         Retrieve scene modification history
         
         Args:
             scene_id: Scene ID
+            start: Index of the first entry (negative counts from the end)
+            end: Index of the last entry, inclusive
             
         Returns:
             List of scene modifications
         """
         key = f"scene_history:{scene_id}"
-        return await self.retrieve(key) or []
+        return await self.retrieve_list(key, start, end)
     
     async def add_scene_history_entry(self, scene_id: str, entry: Dict[str, Any]) -> bool:
         """
@@ -191,9 +380,36 @@ class MemoryService:
         Returns:
             True if added successfully, False otherwise
         """
-        history = await self.retrieve_scene_history(scene_id)
-        history.append(entry)
-        return await self.store_scene_history(scene_id, history)
+        key = f"scene_history:{scene_id}"
+        return await self.append(key, [entry])
+    
+    def _encode(self, value: Any) -> str:
+        """Convert a value to the string stored in Redis"""
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return str(value)
+    
+    def _decode(self, value_str: Optional[Union[str, bytes]]) -> Optional[Any]:
+        """Convert a string stored in Redis back to a value"""
+        if value_str is None:
+            return None
+        
+        # Convert from bytes to string
+        if isinstance(value_str, bytes):
+            value_str = value_str.decode('utf-8')
+        
+        # Try to parse as JSON
+        try:
+            return json.loads(value_str)
+        except json.JSONDecodeError:
+            # Return as string if not JSON
+            return value_str
+    
+    def _strip_prefix(self, key: Union[str, bytes]) -> str:
+        """Remove the key prefix from a Redis key"""
+        if isinstance(key, bytes):
+            key = key.decode('utf-8')
+        return key[len(self.key_prefix):]
     
     async def _store_redis(self, key: str, value: Any, ttl: int) -> bool:
         """Store value in Redis"""
@@ -205,10 +421,7 @@ class MemoryService:
         
         try:
             # Convert value to JSON string
-            if isinstance(value, (dict, list)):
-                value_str = json.dumps(value)
-            else:
-                value_str = str(value)
+            value_str = self._encode(value)
             
             # Store in Redis
             if ttl > 0:
@@ -231,36 +444,22 @@ class MemoryService:
         
         try:
             # Get from Redis
-            value_str = await self.redis_bus.redis.get(full_key)
-            
-            if value_str is None:
-                return None
-            
-            # Convert from bytes to string
-            if isinstance(value_str, bytes):
-                value_str = value_str.decode('utf-8')
-            
-            # Try to parse as JSON
-            try:
-                return json.loads(value_str)
-            except json.JSONDecodeError:
-                # Return as string if not JSON
-                return value_str
+            return self._decode(await self.redis_bus.redis.get(full_key))
         except Exception as e:
             logger.error(f"Error retrieving from Redis: {str(e)}")
             return None
     
-    async def _delete_redis(self, key: str) -> bool:
-        """Delete value from Redis"""
+    async def _delete_redis(self, *keys: str) -> bool:
+        """Delete values from Redis"""
         if not await self.redis_bus.connect():
             logger.error("Cannot delete from Redis: connection failed")
             return False
         
-        full_key = f"{self.key_prefix}{key}"
+        full_keys = [f"{self.key_prefix}{key}" for key in keys]
         
         try:
             # Delete from Redis
-            await self.redis_bus.redis.delete(full_key)
+            await self.redis_bus.redis.delete(*full_keys)
             return True
         except Exception as e:
             logger.error(f"Error deleting from Redis: {str(e)}")
@@ -279,13 +478,172 @@ class MemoryService:
             keys = await self.redis_bus.redis.keys(full_pattern)
             
             # Remove prefix and convert to strings
-            return [key.decode('utf-8')[len(self.key_prefix):] for key in keys]
+            return [self._strip_prefix(key) for key in keys]
         except Exception as e:
             logger.error(f"Error listing keys from Redis: {str(e)}")
             return []
     
+    async def _store_many_redis(self, values: Dict[str, Any], ttl: int) -> bool:
+        """Store several values in Redis with one pipeline"""
+        if not await self.redis_bus.connect():
+            logger.error("Cannot store in Redis: connection failed")
+            return False
+        
+        try:
+            pipe = self.redis_bus.redis.pipeline(transaction=False)
+            for key, value in values.items():
+                if ttl > 0:
+                    pipe.setex(f"{self.key_prefix}{key}", ttl, self._encode(value))
+                else:
+                    pipe.set(f"{self.key_prefix}{key}", self._encode(value))
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Error storing in Redis: {str(e)}")
+            return False
+    
+    async def _retrieve_many_redis(self, keys: List[str]) -> Dict[str, Any]:
+        """Retrieve several values from Redis with one MGET"""
+        if not keys:
+            return {}
+        if not await self.redis_bus.connect():
+            logger.error("Cannot retrieve from Redis: connection failed")
+            return {}
+        
+        try:
+            values = await self.redis_bus.redis.mget([f"{self.key_prefix}{key}" for key in keys])
+            results = {key: self._decode(value) for key, value in zip(keys, values)}
+            return {key: value for key, value in results.items() if value is not None}
+        except Exception as e:
+            logger.error(f"Error retrieving from Redis: {str(e)}")
+            return {}
+    
+    async def _retrieve_matching_redis(self, pattern: str) -> Dict[str, Any]:
+        """Retrieve all values matching a pattern from Redis in one round trip"""
+        if not await self.redis_bus.connect():
+            logger.error("Cannot retrieve from Redis: connection failed")
+            return {}
+        
+        full_pattern = f"{self.key_prefix}{pattern}"
+        
+        try:
+            if self._match_script is None:
+                self._match_script = self.redis_bus.redis.register_script(MATCH_SCRIPT)
+            keys, values = await self._match_script(args=[full_pattern])
+        except Exception as e:
+            # Scripting can be disabled on managed Redis; fall back to two round trips
+            logger.debug(f"Match script unavailable, using KEYS and MGET: {str(e)}")
+            return await self._retrieve_many_redis(await self._list_keys_redis(pattern))
+        
+        results = {self._strip_prefix(key): self._decode(value) for key, value in zip(keys, values)}
+        return {key: value for key, value in results.items() if value is not None}
+    
+    async def _append_redis(self, key: str, items: List[Any], ttl: int, max_length: Optional[int]) -> bool:
+        """Append items to a Redis list"""
+        if not await self.redis_bus.connect():
+            logger.error("Cannot append in Redis: connection failed")
+            return False
+        
+        if not items:
+            return True
+        
+        full_key = f"{self.key_prefix}{key}"
+        
+        try:
+            for attempt in range(2):
+                pipe = self.redis_bus.redis.pipeline(transaction=True)
+                pipe.rpush(full_key, *[self._encode(item) for item in items])
+                if max_length:
+                    pipe.ltrim(full_key, -max_length, -1)
+                if ttl > 0:
+                    pipe.expire(full_key, ttl)
+                try:
+                    await pipe.execute()
+                    return True
+                except ResponseError as e:
+                    if attempt or not await self._migrate_legacy_list(full_key, e):
+                        raise
+        except Exception as e:
+            logger.error(f"Error appending in Redis: {str(e)}")
+            return False
+    
+    async def _retrieve_list_redis(self, key: str, start: int, end: int) -> List[Any]:
+        """Retrieve a range of a Redis list"""
+        if not await self.redis_bus.connect():
+            logger.error("Cannot retrieve from Redis: connection failed")
+            return []
+        
+        full_key = f"{self.key_prefix}{key}"
+        
+        try:
+            try:
+                values = await self.redis_bus.redis.lrange(full_key, start, end)
+            except ResponseError as e:
+                if not await self._migrate_legacy_list(full_key, e):
+                    raise
+                values = await self.redis_bus.redis.lrange(full_key, start, end)
+            return [self._decode(value) for value in values]
+        except Exception as e:
+            logger.error(f"Error retrieving from Redis: {str(e)}")
+            return []
+    
+    async def _store_list_redis(self, key: str, items: List[Any], ttl: int) -> bool:
+        """Replace a Redis list"""
+        if not await self.redis_bus.connect():
+            logger.error("Cannot store in Redis: connection failed")
+            return False
+        
+        full_key = f"{self.key_prefix}{key}"
+        
+        try:
+            pipe = self.redis_bus.redis.pipeline(transaction=True)
+            pipe.delete(full_key)
+            if items:
+                pipe.rpush(full_key, *[self._encode(item) for item in items])
+                if ttl > 0:
+                    pipe.expire(full_key, ttl)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Error storing in Redis: {str(e)}")
+            return False
+    
+    async def _migrate_legacy_list(self, full_key: str, error: Exception) -> bool:
+        """
+        Convert a list stored as one JSON string (the old layout) into a Redis list
+        
+        Args:
+            full_key: Redis key
+            error: Error raised by the list command
+            
+        Returns:
+            True if the key was migrated
+        """
+        if 'WRONGTYPE' not in str(error):
+            return False
+        
+        redis = self.redis_bus.redis
+        values = self._decode(await redis.get(full_key))
+        if not isinstance(values, list):
+            return False
+        
+        ttl = await redis.ttl(full_key)
+        pipe = redis.pipeline(transaction=True)
+        pipe.delete(full_key)
+        if values:
+            pipe.rpush(full_key, *[self._encode(value) for value in values])
+            if ttl > 0:
+                pipe.expire(full_key, ttl)
+        await pipe.execute()
+        
+        logger.info(f"Migrated {full_key} to a Redis list ({len(values)} entries)")
+        return True
+    
     def _store_file(self, key: str, value: Any, ttl: int) -> bool:
         """Store value in file"""
+        if self.log:
+            return self._store_log(key, value, time.time() + ttl if ttl > 0 else 0)
+        
         file_path = os.path.join(self.file_path, f"{key}.json")
         
         try:
@@ -310,6 +668,9 @@ class MemoryService:
     
     def _retrieve_file(self, key: str) -> Optional[Any]:
         """Retrieve value from file"""
+        if self.log:
+            return self._retrieve_log(key)
+        
         file_path = os.path.join(self.file_path, f"{key}.json")
         
         if not os.path.exists(file_path):
@@ -336,6 +697,10 @@ class MemoryService:
     
     def _delete_file(self, key: str) -> bool:
         """Delete value from file"""
+        if self.log:
+            self.log.delete(key)
+            return True
+        
         file_path = os.path.join(self.file_path, f"{key}.json")
         
         if not os.path.exists(file_path):
@@ -351,6 +716,9 @@ class MemoryService:
     
     def _list_keys_file(self, pattern: str) -> List[str]:
         """List keys from files"""
+        if self.log:
+            return self.log.keys(pattern)
+        
         try:
             # List files in directory
             files = os.listdir(self.file_path)
@@ -363,3 +731,48 @@ class MemoryService:
         except Exception as e:
             logger.error(f"Error listing keys from files: {str(e)}")
             return []
+    
+    def _store_log(self, key: str, value: Any, expiration: float) -> bool:
+        """Store value in the log"""
+        try:
+            self.log.put(key, json.dumps(value).encode('utf-8'), expiration)
+            return True
+        except Exception as e:
+            logger.error(f"Error storing in log: {str(e)}")
+            return False
+    
+    def _retrieve_log(self, key: str) -> Optional[Any]:
+        """Retrieve value from the log"""
+        try:
+            value = self.log.get(key)
+            return json.loads(value) if value is not None else None
+        except Exception as e:
+            logger.error(f"Error retrieving from log: {str(e)}")
+            return None
+    
+    def _import_json_files(self):
+        """Import values stored as JSON files by the 'file' storage type into an empty log"""
+        imported = 0
+        for root, _, files in os.walk(self.file_path):
+            for file in files:
+                if not file.endswith('.json'):
+                    continue
+                
+                path = os.path.join(root, file)
+                key = os.path.relpath(path, self.file_path)[:-len('.json')].replace(os.sep, '/')
+                try:
+                    with open(path, 'r') as f:
+                        data = json.load(f)
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable memory file {path}: {str(e)}")
+                    continue
+                
+                expiration = data.get('expiration', 0)
+                if expiration and expiration < time.time():
+                    continue
+                self._store_log(key, data.get('value'), expiration)
+                imported += 1
+        
+        if imported:
+            self.log.sync()
+            logger.info(f"Imported {imported} memory files into {self.log.path}")
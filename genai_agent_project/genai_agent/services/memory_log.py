@@ -0,0 +1,293 @@
+"""
+Append-only log storage for the Memory Service
+"""
+
+import atexit
+import fnmatch
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Record header: crc32, operation, key length, value length, expiration
+RECORD_HEADER = struct.Struct('<IBHId')
+
+OP_PUT = 1
+OP_DELETE = 2
+
+class MemoryLog:
+    """
+    Single-file, append-only key/value log with an in-memory index
+
+    Every write appends a binary record (header, key, JSON value) to one log
+    file and updates an in-memory index of key -> (value offset, length,
+    expiration), so reads are one seek and key listings never touch the
+    disk. Records carry a CRC so a torn write at the end of the log is
+    detected and truncated on open. A background thread fsyncs pending
+    writes in batches, drops expired keys from the index and compacts the
+    log once most of it is garbage.
+    """
+
+    def __init__(self, path: str, fsync_interval: float = 1.0, sweep_interval: float = 60.0,
+                 compact_ratio: float = 0.5, compact_min_bytes: int = 1024 * 1024):
+        """
+        Open (or create) a log
+
+        Args:
+            path: Log file path
+            fsync_interval: Seconds between batched fsyncs (0 to fsync every write)
+            sweep_interval: Seconds between expiry sweeps and compaction checks
+            compact_ratio: Fraction of garbage that triggers a compaction
+            compact_min_bytes: Logs smaller than this are never compacted
+        """
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.sweep_interval = sweep_interval
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+
+        self._lock = threading.RLock()
+        self._index: Dict[str, Tuple[int, int, float]] = {}
+        self._record_sizes: Dict[str, int] = {}
+        self._live_bytes = 0
+        self._end = 0
+        self._dirty = False
+        self._closed = False
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if not os.path.exists(path):
+            open(path, 'wb').close()
+        self._file = open(path, 'r+b')
+        self._load()
+
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._background, name="memory-log", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def _load(self):
+        """Rebuild the index by scanning the log"""
+        now = time.time()
+        offset = 0
+        self._file.seek(0)
+        data = self._file.read()
+
+        while offset + RECORD_HEADER.size <= len(data):
+            crc, op, key_length, value_length, expiration = RECORD_HEADER.unpack_from(data, offset)
+            end = offset + RECORD_HEADER.size + key_length + value_length
+            if end > len(data) or zlib.crc32(data[offset + 4:end]) != crc:
+                break
+
+            key_start = offset + RECORD_HEADER.size
+            key = data[key_start:key_start + key_length].decode('utf-8')
+            self._forget(key)
+            if op == OP_PUT and (expiration == 0 or expiration > now):
+                self._remember(key, key_start + key_length, value_length, expiration, end - offset)
+            offset = end
+
+        if offset < len(data):
+            logger.warning(f"Truncating {len(data) - offset} bytes of incomplete records from {self.path}")
+            self._file.truncate(offset)
+        self._end = offset
+
+        logger.info(f"Loaded memory log {self.path}: {len(self._index)} keys, {offset} bytes")
+
+    def _remember(self, key: str, value_offset: int, value_length: int, expiration: float, record_size: int):
+        self._index[key] = (value_offset, value_length, expiration)
+        self._record_sizes[key] = record_size
+        self._live_bytes += record_size
+
+    def _forget(self, key: str):
+        self._index.pop(key, None)
+        self._live_bytes -= self._record_sizes.pop(key, 0)
+
+    def _append(self, op: int, key: str, value: bytes, expiration: float) -> int:
+        """Append a record; returns the offset of its value"""
+        key_bytes = key.encode('utf-8')
+        body = RECORD_HEADER.pack(0, op, len(key_bytes), len(value), expiration)[4:] + key_bytes + value
+        record = struct.pack('<I', zlib.crc32(body)) + body
+
+        self._file.seek(self._end)
+        self._file.write(record)
+        value_offset = self._end + len(record) - len(value)
+        self._end += len(record)
+
+        if self.fsync_interval > 0:
+            self._dirty = True
+        else:
+            self._sync()
+        return value_offset
+
+    def put(self, key: str, value: bytes, expiration: float = 0):
+        """
+        Store a value
+
+        Args:
+            key: Key
+            value: Encoded value
+            expiration: Absolute expiration time (0 = never expires)
+        """
+        with self._lock:
+            value_offset = self._append(OP_PUT, key, value, expiration)
+            self._forget(key)
+            self._remember(key, value_offset, len(value), expiration,
+                           RECORD_HEADER.size + len(key.encode('utf-8')) + len(value))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a value
+
+        Args:
+            key: Key
+
+        Returns:
+            Encoded value, or None if the key is missing or expired
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+
+            value_offset, value_length, expiration = entry
+            if expiration and expiration < time.time():
+                self._forget(key)
+                return None
+
+            self._file.seek(value_offset)
+            return self._file.read(value_length)
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete a value
+
+        Args:
+            key: Key
+
+        Returns:
+            True if the key existed
+        """
+        with self._lock:
+            if key not in self._index:
+                return False
+            self._append(OP_DELETE, key, b'', 0)
+            self._forget(key)
+            return True
+
+    def keys(self, pattern: str = '*') -> List[str]:
+        """
+        List live keys matching a pattern
+
+        Args:
+            pattern: fnmatch pattern
+
+        Returns:
+            Matching keys
+        """
+        now = time.time()
+        with self._lock:
+            return [key for key, (_, _, expiration) in self._index.items()
+                    if (not expiration or expiration > now) and fnmatch.fnmatchcase(key, pattern)]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def sync(self):
+        """Write pending records to disk"""
+        with self._lock:
+            if self._dirty:
+                self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._dirty = False
+
+    def sweep(self) -> int:
+        """
+        Drop expired keys from the index
+
+        Expired records need no tombstone: their expiration is stored in the
+        record, so they are skipped when the log is loaded again.
+
+        Returns:
+            Number of keys dropped
+        """
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, _, expiration) in self._index.items() if expiration and expiration < now]
+            for key in expired:
+                self._forget(key)
+        return len(expired)
+
+    def garbage_ratio(self) -> float:
+        """Fraction of the log taken by overwritten, deleted or expired records"""
+        with self._lock:
+            return 1 - self._live_bytes / self._end if self._end else 0.0
+
+    def compact(self):
+        """Rewrite the log with only the live records"""
+        with self._lock:
+            temp_path = f"{self.path}.compact"
+            index = {}
+            sizes = {}
+            with open(temp_path, 'wb') as out:
+                offset = 0
+                for key, (value_offset, value_length, expiration) in self._index.items():
+                    self._file.seek(value_offset)
+                    value = self._file.read(value_length)
+                    key_bytes = key.encode('utf-8')
+                    body = RECORD_HEADER.pack(0, OP_PUT, len(key_bytes), len(value), expiration)[4:] + key_bytes + value
+                    record = struct.pack('<I', zlib.crc32(body)) + body
+                    out.write(record)
+                    index[key] = (offset + len(record) - len(value), value_length, expiration)
+                    sizes[key] = len(record)
+                    offset += len(record)
+                out.flush()
+                os.fsync(out.fileno())
+
+            before = self._end
+            self._file.close()
+            os.replace(temp_path, self.path)
+            self._file = open(self.path, 'r+b')
+            self._index = index
+            self._record_sizes = sizes
+            self._live_bytes = offset
+            self._end = offset
+            self._dirty = False
+
+        logger.info(f"Compacted memory log {self.path}: {before} -> {offset} bytes")
+
+    def maintain(self):
+        """Sweep expired keys and compact the log if enough of it is garbage"""
+        self.sweep()
+        if self._end >= self.compact_min_bytes and self.garbage_ratio() >= self.compact_ratio:
+            self.compact()
+
+    def _background(self):
+        """Batched fsync and periodic maintenance"""
+        interval = self.fsync_interval if self.fsync_interval > 0 else self.sweep_interval
+        next_sweep = time.time() + self.sweep_interval
+        while not self._stop.wait(interval):
+            try:
+                self.sync()
+                if time.time() >= next_sweep:
+                    self.maintain()
+                    next_sweep = time.time() + self.sweep_interval
+            except Exception as e:
+                logger.error(f"Error maintaining memory log: {str(e)}")
+
+    def close(self):
+        """Flush pending writes and close the log"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._stop.set()
+            self._sync()
+            self._file.close()
+        atexit.unregister(self.close)
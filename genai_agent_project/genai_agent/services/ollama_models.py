@@ -0,0 +1,383 @@
+"""
+Ollama model residency: warm-up, keep-alive and model-affinity scheduling
+
+A local Ollama server keeps a limited number of models in memory. Requests
+that alternate between models make it unload and reload multi-GB weights,
+which costs seconds per call. OllamaModelManager:
+- preloads the configured models at startup
+- sends a keep_alive with every request, configurable per model
+- queues requests per model and runs batches against the loaded model
+  before switching (ModelAffinityScheduler)
+- tracks load and unload events
+- records whether the runner served prompt prefixes from its KV cache
+
+Configuration (llm.yaml, providers.ollama):
+    keep_alive: 30m            # default for all models
+    model_keep_alive:          # per-model overrides
+      deepseek-coder:latest: 5m
+    preload: [llama3.2:latest] # loaded at startup
+    max_loaded_models: 1       # models Ollama keeps in memory at once
+    max_batch: 8               # requests per model before others get a turn
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+import httpx
+
+from .llm_limiter import parse_priority
+from .prompt_prefix import OllamaPrefixTracker, get_prefix_stats, split_prompt
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_KEEP_ALIVE = "30m"
+MAX_EVENTS = 200
+
+class ModelAffinityScheduler:
+    """
+    Run requests grouped by model.
+
+    Requests for the model that is currently loaded run first, up to
+    max_batch in a row while other models are waiting. Only then does the
+    scheduler switch to the model whose first waiting request has the
+    highest priority (earliest first). Requests for different models never
+    run at the same time.
+    """
+
+    def __init__(self, max_batch: int = 8, parallel: int = 1):
+        """
+        Create a scheduler.
+
+        Args:
+            max_batch: Requests per model before waiting models get a turn
+            parallel: Requests for the same model allowed to run at once
+        """
+        self.max_batch = max_batch
+        self.parallel = parallel
+
+        self.queues: Dict[str, Deque[List[Any]]] = {}
+        self.current: Optional[str] = None
+        self.running = 0
+        self.batch = 0
+        self.switches = 0
+        self._sequence = itertools.count()
+
+    def _waiting(self) -> List[str]:
+        return [model for model, queue in self.queues.items() if queue]
+
+    def _next_model(self) -> Optional[str]:
+        waiting = self._waiting()
+        if not waiting:
+            return None
+        current_waiting = self.current in waiting
+        if current_waiting and (self.batch < self.max_batch or waiting == [self.current]):
+            return self.current
+        if self.running:
+            # Let the current model drain before switching
+            return None
+        others = [model for model in waiting if model != self.current] or waiting
+        return min(others, key=lambda model: self.queues[model][0][:2])
+
+    def _dispatch(self):
+        while self.running < self.parallel:
+            model = self._next_model()
+            if model is None:
+                return
+            if model != self.current:
+                if self.current is not None:
+                    self.switches += 1
+                self.current = model
+                self.batch = 0
+            entry = self.queues[model].popleft()
+            if entry[2].done():
+                # Cancelled while waiting
+                continue
+            self.running += 1
+            self.batch += 1
+            entry[2].set_result(None)
+
+    async def run(self, model: str, request: Callable[[], Awaitable[T]], priority: Any = None) -> T:
+        """
+        Run a request when its model's turn comes.
+
+        Args:
+            model: Model the request needs
+            request: Coroutine function performing the request
+            priority: "interactive" or "batch" (defaults to the context priority)
+
+        Returns:
+            The request's result
+        """
+        turn = asyncio.get_running_loop().create_future()
+        entry = [parse_priority(priority), next(self._sequence), turn]
+        self.queues.setdefault(model, deque()).append(entry)
+        self._dispatch()
+        try:
+            await turn
+        except BaseException:
+            if turn.done() and not turn.cancelled():
+                # Cancelled right after being admitted
+                self.running -= 1
+            elif entry in self.queues[model]:
+                self.queues[model].remove(entry)
+            self._dispatch()
+            raise
+
+        try:
+            return await request()
+        finally:
+            self.running -= 1
+            self._dispatch()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current model, running count, queue lengths and model switches."""
+        return {
+            "current_model": self.current,
+            "running": self.running,
+            "queued": {model: len(queue) for model, queue in self.queues.items() if queue},
+            "switches": self.switches
+        }
+
+class OllamaModelManager:
+    """Keep-alive, preloading and load tracking for the models of one Ollama server."""
+
+    def __init__(self, base_url: str = "http://127.0.0.1:11434", config: Optional[Dict[str, Any]] = None):
+        """
+        Create a manager.
+
+        Args:
+            base_url: Ollama server URL
+            config: The providers.ollama section of the LLM configuration
+        """
+        config = config or {}
+        self.base_url = base_url.rstrip("/")
+        self.keep_alive = config.get("keep_alive", DEFAULT_KEEP_ALIVE)
+        self.model_keep_alive = config.get("model_keep_alive") or {}
+        self.preload_models = list(config.get("preload") or [])
+        self.max_loaded_models = int(config.get("max_loaded_models", 1))
+
+        self.scheduler = ModelAffinityScheduler(int(config.get("max_batch", 8)), int(config.get("parallel", 1)))
+        self.prefixes = OllamaPrefixTracker()
+        self.loaded: "OrderedDict[str, float]" = OrderedDict()
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=MAX_EVENTS)
+        self.loads = 0
+        self.unloads = 0
+        self._preloaded: Optional[List[str]] = None
+
+    def keep_alive_for(self, model: str) -> Any:
+        """
+        Keep-alive to send with requests for a model.
+
+        Args:
+            model: Model name
+
+        Returns:
+            Ollama keep_alive value (duration string or seconds; -1 keeps the model loaded)
+        """
+        return self.model_keep_alive.get(model, self.keep_alive)
+
+    def _event(self, event: str, model: str, reason: str, seconds: Optional[float] = None):
+        self.events.append({"event": event, "model": model, "reason": reason,
+                            "seconds": seconds, "time": time.time()})
+        if event == "load":
+            self.loads += 1
+            logger.info(f"Ollama loaded {model} ({reason}"
+                        + (f", {seconds:.2f}s)" if seconds is not None else ")"))
+        else:
+            self.unloads += 1
+            logger.info(f"Ollama unloaded {model} ({reason})")
+
+    def record_request(self, model: str, response: Optional[Dict[str, Any]] = None):
+        """
+        Update the loaded models after a request.
+
+        A request for a model that is not loaded makes Ollama load it, and
+        once more models are loaded than it keeps in memory, the least
+        recently used one is evicted.
+
+        Args:
+            model: Model the request used
+            response: Ollama response body (its load_duration is in nanoseconds)
+        """
+        if model in self.loaded:
+            self.loaded.move_to_end(model)
+        else:
+            load_duration = (response or {}).get("load_duration")
+            self._event("load", model, "request", load_duration / 1e9 if load_duration else None)
+            while len(self.loaded) >= self.max_loaded_models > 0:
+                evicted, _ = self.loaded.popitem(last=False)
+                self._event("unload", evicted, "evicted")
+        self.loaded[model] = time.time()
+
+    def record_prefix(self, model: str, prompt: str, response: Optional[Dict[str, Any]]):
+        """
+        Record whether a prefixed prompt's prefix came from the runner's KV cache.
+
+        Args:
+            model: Model the request used
+            prompt: Prompt sent (plain prompts are not recorded)
+            response: Final Ollama response body (with prompt_eval_count)
+        """
+        prefix, _ = split_prompt(prompt)
+        evaluated = (response or {}).get("prompt_eval_count")
+        if not prefix or evaluated is None:
+            return
+        hit, cached_tokens = self.prefixes.observe(model, prompt, evaluated)
+        get_prefix_stats().record("ollama", hit, cached_tokens)
+
+    async def run(self, model: str, request: Callable[[], Awaitable[T]], priority: Any = None) -> T:
+        """
+        Run a request for a model through the affinity scheduler.
+
+        Args:
+            model: Model name
+            request: Coroutine function performing the request
+            priority: "interactive" or "batch"
+
+        Returns:
+            The request's result
+        """
+        return await self.scheduler.run(model, request, priority)
+
+    async def warm_up(self, model: str) -> bool:
+        """
+        Load a model without generating anything.
+
+        Args:
+            model: Model name
+
+        Returns:
+            True if the model was loaded
+        """
+        async def load():
+            try:
+                async with httpx.AsyncClient(timeout=300.0) as client:
+                    response = await client.post(
+                        f"{self.base_url}/api/generate",
+                        json={"model": model, "prompt": "", "keep_alive": self.keep_alive_for(model)}
+                    )
+                if response.status_code != 200:
+                    logger.warning(f"Could not preload Ollama model {model}: {response.status_code} - {response.text}")
+                    return False
+                self.record_request(model, response.json())
+                return True
+            except httpx.HTTPError as e:
+                logger.warning(f"Could not preload Ollama model {model}: {str(e)}")
+                return False
+
+        return await self.run(model, load)
+
+    async def preload(self) -> List[str]:
+        """
+        Load the configured models, once per manager.
+
+        Returns:
+            Models that were loaded
+        """
+        if self._preloaded is not None:
+            return list(self._preloaded)
+        self._preloaded = []
+        for model in self.preload_models:
+            if await self.warm_up(model):
+                self._preloaded.append(model)
+        return list(self._preloaded)
+
+    async def unload(self, model: str) -> bool:
+        """
+        Ask Ollama to unload a model now.
+
+        Args:
+            model: Model name
+
+        Returns:
+            True if Ollama accepted the request
+        """
+        try:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                response = await client.post(f"{self.base_url}/api/generate",
+                                             json={"model": model, "keep_alive": 0})
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not unload Ollama model {model}: {str(e)}")
+            return False
+        if response.status_code != 200:
+            return False
+        if self.loaded.pop(model, None) is not None:
+            self._event("unload", model, "requested")
+        return True
+
+    async def refresh(self) -> List[str]:
+        """
+        Reconcile the tracked models with Ollama's running models (/api/ps).
+
+        Models that expired are recorded as unloaded, models loaded by other
+        clients as loaded.
+
+        Returns:
+            Models currently loaded
+        """
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.get(f"{self.base_url}/api/ps")
+            response.raise_for_status()
+            running = [model["name"] for model in response.json().get("models", [])]
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Could not list running Ollama models: {str(e)}")
+            return list(self.loaded)
+
+        for model in list(self.loaded):
+            if model not in running:
+                del self.loaded[model]
+                self._event("unload", model, "expired")
+        for model in running:
+            if model not in self.loaded:
+                self.loaded[model] = time.time()
+                self._event("load", model, "external")
+        return running
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Loaded models, load/unload counts, recent events and scheduler state.
+
+        Returns:
+            Dictionary of model residency statistics
+        """
+        return {
+            "loaded": list(self.loaded),
+            "loads": self.loads,
+            "unloads": self.unloads,
+            "events": list(self.events)[-20:],
+            "scheduler": self.scheduler.snapshot()
+        }
+
+# Process-wide managers by server URL
+_managers: Dict[str, OllamaModelManager] = {}
+_managers_lock = threading.Lock()
+
+def get_ollama_manager(base_url: str = "http://127.0.0.1:11434",
+                       config: Optional[Dict[str, Any]] = None) -> OllamaModelManager:
+    """
+    Get the process-wide manager of an Ollama server.
+
+    Every LLMService shares it, so requests from all services are grouped by
+    model and residency is tracked once. The configuration of the first
+    caller is used.
+
+    Args:
+        base_url: Ollama server URL
+        config: The providers.ollama section of the LLM configuration
+
+    Returns:
+        OllamaModelManager instance
+    """
+    key = base_url.rstrip("/")
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = OllamaModelManager(key, config)
+        return _managers[key]
@@ -0,0 +1,186 @@
+"""
+Prompt prefix reuse
+
+Tool and generator prompts are a large fixed instruction block followed by
+a short request-specific part. Builders return a PrefixedPrompt, a str
+whose text is prefix + suffix, so clients that know nothing about prefixes
+keep working. Clients that do know about them reuse the prefix:
+- Anthropic: the prefix is sent as a system block with a cache_control
+  marker, so repeated calls read it from the prompt cache
+- Ollama: the full prompt is sent unchanged; the runner reuses the KV
+  cache of a matching prompt prefix on its own, and prompt_eval_count in
+  the response shows how much of the prompt was evaluated
+
+PrefixCacheStats counts prefix hits per provider.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class PrefixedPrompt(str):
+    """A prompt made of a stable, cacheable prefix and a request-specific suffix."""
+
+    def __new__(cls, prefix: str, suffix: str):
+        prompt = super().__new__(cls, prefix + suffix)
+        prompt.prefix = prefix
+        prompt.suffix = suffix
+        return prompt
+
+def split_prompt(prompt: str) -> Tuple[str, str]:
+    """
+    Split a prompt into its cacheable prefix and its suffix.
+
+    Args:
+        prompt: Prompt text, a PrefixedPrompt or a plain str
+
+    Returns:
+        Tuple of (prefix, suffix); the prefix is empty for plain prompts
+    """
+    prefix = getattr(prompt, "prefix", "")
+    if not prefix:
+        return "", str(prompt)
+    return prefix, prompt.suffix
+
+def prefix_key(model: str, prefix: str) -> str:
+    """Key of a prefix evaluated by a model."""
+    return f"{model}:{hashlib.sha256(prefix.encode('utf-8')).hexdigest()}"
+
+def anthropic_messages(prompt: str) -> Dict[str, Any]:
+    """
+    Messages API fields for a prompt, marking the prefix for prompt caching.
+
+    Prefixes shorter than the model's minimum cacheable length are sent the
+    same way; the API simply does not cache them.
+
+    Args:
+        prompt: Prompt text or PrefixedPrompt
+
+    Returns:
+        Dictionary with "messages" and, for prefixed prompts, a cached "system" block
+    """
+    prefix, suffix = split_prompt(prompt)
+    fields: Dict[str, Any] = {"messages": [{"role": "user", "content": suffix}]}
+    if prefix:
+        fields["system"] = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+    return fields
+
+class PrefixCacheStats:
+    """Prefix hit counts per provider."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, provider: str, hit: bool, cached_tokens: int = 0):
+        """
+        Record a request that carried a cacheable prefix.
+
+        Args:
+            provider: Provider name
+            hit: Whether the prefix was served from the cache
+            cached_tokens: Prompt tokens read from the cache
+        """
+        with self._lock:
+            stats = self._stats.setdefault(provider, {"requests": 0, "hits": 0, "cached_tokens": 0})
+            stats["requests"] += 1
+            stats["hits"] += 1 if hit else 0
+            stats["cached_tokens"] += cached_tokens
+
+    def record_anthropic_usage(self, usage: Optional[Dict[str, Any]]):
+        """
+        Record a prefixed Anthropic request from the usage block of its response.
+
+        Args:
+            usage: The response's usage (cache_read_input_tokens counts cache hits)
+        """
+        cached = (usage or {}).get("cache_read_input_tokens") or 0
+        self.record("anthropic", cached > 0, cached)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Prefix statistics.
+
+        Returns:
+            Dictionary of provider to requests, hits, hit rate and cached tokens
+        """
+        with self._lock:
+            return {
+                provider: {**stats, "hit_rate": stats["hits"] / stats["requests"] if stats["requests"] else 0.0}
+                for provider, stats in self._stats.items()
+            }
+
+class OllamaPrefixTracker:
+    """
+    Prefix token counts per model, learned from Ollama's prompt_eval_count.
+
+    prompt_eval_count only counts the tokens the runner had to evaluate, so
+    a request that evaluated fewer tokens than its prefix holds read the
+    prefix from the KV cache.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._tokens: "OrderedDict[str, int]" = OrderedDict()
+
+    def observe(self, model: str, prompt: str, evaluated: int) -> Tuple[bool, int]:
+        """
+        Classify a prefixed request from its evaluated token count.
+
+        Args:
+            model: Model name
+            prompt: Prompt sent (a PrefixedPrompt)
+            evaluated: The response's prompt_eval_count
+
+        Returns:
+            Tuple of (hit, cached prefix tokens)
+        """
+        prefix, _ = split_prompt(prompt)
+        key = prefix_key(model, prefix)
+        tokens = self._tokens.get(key)
+        if tokens is not None:
+            self._tokens.move_to_end(key)
+            if evaluated < tokens:
+                return True, tokens
+
+        # Fully evaluated: estimate the prefix's share of the tokens
+        self._tokens[key] = max(1, evaluated * len(prefix) // max(len(prompt), 1))
+        self._tokens.move_to_end(key)
+        while len(self._tokens) > self.max_entries:
+            self._tokens.popitem(last=False)
+        return False, 0
+
+_templates = None
+
+def prompt_template(name: str, default: str = "") -> str:
+    """
+    A prompt template from the llm.prompt_templates section of config.yaml.
+
+    Args:
+        name: Template name (e.g. "json_generation")
+        default: Text to use when the template is not configured
+
+    Returns:
+        Template text
+    """
+    global _templates
+    if _templates is None:
+        from ..config import load_config
+        _templates = (load_config("config.yaml").get("llm") or {}).get("prompt_templates") or {}
+    return _templates.get(name) or default
+
+# Singleton instance
+_prefix_stats = PrefixCacheStats()
+
+def get_prefix_stats() -> PrefixCacheStats:
+    """
+    Get the process-wide prefix statistics.
+
+    Returns:
+        PrefixCacheStats instance
+    """
+    return _prefix_stats
@@ -5,6 +5,7 @@ Scene Manager for managing 3D scenes
 import logging
 import json
 import uuid
+import hashlib
 from typing import Dict, Any, List, Optional
 
 from genai_agent.services.redis_bus import RedisMessageBus
@@ -12,6 +13,55 @@ from genai_agent.models.scene import Scene, SceneObject
 
 logger = logging.getLogger(__name__)
 
+# Primitive object types: (size property, default size)
+PRIMITIVE_SIZE_PROPERTIES = {
+    'cube': (None, 1.0),
+    'plane': ('size', 1.0),
+    'sphere': ('radius', 1.0)
+}
+
+# Helpers emitted once at the top of every exported Blender script.
+# Meshes are created once per (type, size) and shared by all objects that
+# use them; materials are linked per object so shared meshes can differ.
+BLENDER_EXPORT_HELPERS = [
+    "_collection = bpy.context.scene.collection",
+    "_meshes = {}",
+    "",
+    "def _primitive_mesh(kind, size):",
+    "    key = (kind, size)",
+    "    if key not in _meshes:",
+    "        mesh = bpy.data.meshes.new(f'{kind}_{size}')",
+    "        bm = bmesh.new()",
+    "        if kind == 'cube':",
+    "            bmesh.ops.create_cube(bm, size=size)",
+    "        elif kind == 'plane':",
+    "            bmesh.ops.create_grid(bm, x_segments=1, y_segments=1, size=size / 2)",
+    "        elif kind == 'sphere':",
+    "            bmesh.ops.create_uvsphere(bm, u_segments=32, v_segments=16, radius=size)",
+    "        bm.to_mesh(mesh)",
+    "        bm.free()",
+    "        mesh.materials.append(None)",
+    "        _meshes[key] = mesh",
+    "    return _meshes[key]",
+    "",
+    "def _add_object(name, data, location, rotation=(0, 0, 0), scale=(1, 1, 1)):",
+    "    obj = bpy.data.objects.new(name, data)",
+    "    obj.location = location",
+    "    obj.rotation_euler = rotation",
+    "    obj.scale = scale",
+    "    _collection.objects.link(obj)",
+    "    return obj",
+    "",
+    "def _set_material(obj, name, color):",
+    "    mat = bpy.data.materials.get(name)",
+    "    if mat is None:",
+    "        mat = bpy.data.materials.new(name=name)",
+    "        mat.diffuse_color = color",
+    "    obj.material_slots[0].link = 'OBJECT'",
+    "    obj.material_slots[0].material = mat",
+    ""
+]
+
 class SceneManager:
     """
     Service for managing 3D scenes
@@ -34,6 +84,9 @@ class SceneManager:
         # Redis key prefix for scene storage
         self.key_prefix = "scene:"
         
+        # Cached Blender script fragments: scene ID -> object ID -> (hash, lines)
+        self._blender_fragments = {}
+        
         logger.info("Scene Manager initialized")
     
     async def create_scene(self, scene_data: Dict[str, Any]) -> str:
@@ -199,6 +252,7 @@ class SceneManager:
         # Remove from cache
         if scene_id in self.scenes:
             del self.scenes[scene_id]
+        self._blender_fragments.pop(scene_id, None)
         
         # Notify scene deletion
         await self.redis_bus.publish('scene:deleted', {
@@ -489,6 +543,12 @@ class SceneManager:
         """
         Export scene to Blender Python script format
         
+        The script creates data blocks directly through the bpy.data API
+        instead of bpy.ops operators. Objects of the same primitive type and
+        size share one mesh data block (linked duplicates), and each object's
+        script fragment is cached by content hash so only changed objects
+        are regenerated on the next export.
+        
         Args:
             scene: Scene instance
             
@@ -498,28 +558,44 @@ class SceneManager:
         # Create Blender script
         script_lines = [
             "import bpy",
+            "import bmesh",
             "import math",
             "",
             "# Clear existing objects",
-            "bpy.ops.object.select_all(action='SELECT')",
-            "bpy.ops.object.delete()",
+            "for _obj in list(bpy.data.objects):",
+            "    bpy.data.objects.remove(_obj, do_unlink=True)",
             "",
             f"# Scene: {scene.name}",
             f"# {scene.description}",
             ""
         ]
+        script_lines.extend(BLENDER_EXPORT_HELPERS)
+        
+        # Add objects, reusing cached fragments for unchanged objects
+        cached = self._blender_fragments.get(scene.id, {})
+        fragments = {}
+        hits = 0
         
-        # Add objects
         for obj in scene.objects:
-            script_lines.extend(self._object_to_blender(obj))
+            content_hash = self._object_hash(obj)
+            entry = cached.get(obj.id)
+            
+            if entry and entry[0] == content_hash:
+                hits += 1
+            else:
+                entry = (content_hash, self._object_to_blender(obj))
+            
+            fragments[obj.id] = entry
+            script_lines.extend(entry[1])
+        
+        # Only keep fragments of objects still in the scene
+        self._blender_fragments[scene.id] = fragments
         
         # Add camera and light if not present
         if not any(obj.type == 'camera' for obj in scene.objects):
             script_lines.extend([
                 "# Add default camera",
-                "bpy.ops.object.camera_add(location=(5, -5, 5))",
-                "camera = bpy.context.active_object",
-                "camera.rotation_euler = (math.radians(55), 0, math.radians(45))",
+                "camera = _add_object('Camera', bpy.data.cameras.new('Camera'), (5, -5, 5), (math.radians(55), 0, math.radians(45)))",
                 "bpy.context.scene.camera = camera",
                 ""
             ])
@@ -527,16 +603,33 @@ class SceneManager:
         if not any(obj.type == 'light' for obj in scene.objects):
             script_lines.extend([
                 "# Add default light",
-                "bpy.ops.object.light_add(type='SUN', radius=1, location=(0, 0, 10))",
+                "_add_object('Light', bpy.data.lights.new('Light', type='SUN'), (0, 0, 10))",
                 ""
             ])
         
         return {
             'script': "\n".join(script_lines),
             'scene_name': scene.name,
-            'object_count': len(scene.objects)
+            'object_count': len(scene.objects),
+            'cache': {
+                'hits': hits,
+                'misses': len(scene.objects) - hits
+            }
         }
     
+    def _object_hash(self, obj: SceneObject) -> str:
+        """
+        Get a content hash of a scene object
+        
+        Args:
+            obj: SceneObject instance
+            
+        Returns:
+            Hex digest of the object's serialized content
+        """
+        content = json.dumps(obj.to_dict(), sort_keys=True, default=str)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+    
     def _object_to_blender(self, obj: SceneObject) -> List[str]:
         """
         Convert a scene object to Blender Python script lines
@@ -549,89 +642,32 @@ class SceneManager:
         """
         lines = [f"# Object: {obj.name} (Type: {obj.type})"]
         
-        if obj.type == 'cube':
-            lines.extend([
-                f"bpy.ops.mesh.primitive_cube_add(size=1, location=({obj.position[0]}, {obj.position[1]}, {obj.position[2]}))",
-                f"cube = bpy.context.active_object",
-                f"cube.name = '{obj.name}'",
-                f"cube.rotation_euler = ({obj.rotation[0]}, {obj.rotation[1]}, {obj.rotation[2]})",
-                f"cube.scale = ({obj.scale[0]}, {obj.scale[1]}, {obj.scale[2]})",
-            ])
-            
-            # Add material if specified
-            if 'material' in obj.properties:
-                mat_name = obj.properties.get('material', {}).get('name', 'Material')
-                color = obj.properties.get('material', {}).get('color', [0.8, 0.8, 0.8, 1.0])
-                
-                lines.extend([
-                    f"# Add material to {obj.name}",
-                    f"if '{mat_name}' not in bpy.data.materials:",
-                    f"    mat = bpy.data.materials.new(name='{mat_name}')",
-                    f"    mat.diffuse_color = ({color[0]}, {color[1]}, {color[2]}, {color[3] if len(color) > 3 else 1.0})",
-                    f"else:",
-                    f"    mat = bpy.data.materials['{mat_name}']",
-                    f"",
-                    f"cube.data.materials.append(mat)"
-                ])
-        
-        elif obj.type == 'plane':
-            size = obj.properties.get('size', 1.0)
-            lines.extend([
-                f"bpy.ops.mesh.primitive_plane_add(size={size}, location=({obj.position[0]}, {obj.position[1]}, {obj.position[2]}))",
-                f"plane = bpy.context.active_object",
-                f"plane.name = '{obj.name}'",
-                f"plane.rotation_euler = ({obj.rotation[0]}, {obj.rotation[1]}, {obj.rotation[2]})",
-                f"plane.scale = ({obj.scale[0]}, {obj.scale[1]}, {obj.scale[2]})",
-            ])
+        location = f"({obj.position[0]}, {obj.position[1]}, {obj.position[2]})"
+        rotation = f"({obj.rotation[0]}, {obj.rotation[1]}, {obj.rotation[2]})"
+        scale = f"({obj.scale[0]}, {obj.scale[1]}, {obj.scale[2]})"
+        
+        if obj.type in PRIMITIVE_SIZE_PROPERTIES:
+            size_property, default_size = PRIMITIVE_SIZE_PROPERTIES[obj.type]
+            size = obj.properties.get(size_property, default_size) if size_property else default_size
             
-            # Add material if specified
-            if 'material' in obj.properties:
-                mat_name = obj.properties.get('material', {}).get('name', 'Material')
-                color = obj.properties.get('material', {}).get('color', [0.8, 0.8, 0.8, 1.0])
-                
-                lines.extend([
-                    f"# Add material to {obj.name}",
-                    f"if '{mat_name}' not in bpy.data.materials:",
-                    f"    mat = bpy.data.materials.new(name='{mat_name}')",
-                    f"    mat.diffuse_color = ({color[0]}, {color[1]}, {color[2]}, {color[3] if len(color) > 3 else 1.0})",
-                    f"else:",
-                    f"    mat = bpy.data.materials['{mat_name}']",
-                    f"",
-                    f"plane.data.materials.append(mat)"
-                ])
-        
-        elif obj.type == 'sphere':
-            radius = obj.properties.get('radius', 1.0)
-            lines.extend([
-                f"bpy.ops.mesh.primitive_uv_sphere_add(radius={radius}, location=({obj.position[0]}, {obj.position[1]}, {obj.position[2]}))",
-                f"sphere = bpy.context.active_object",
-                f"sphere.name = '{obj.name}'",
-                f"sphere.rotation_euler = ({obj.rotation[0]}, {obj.rotation[1]}, {obj.rotation[2]})",
-                f"sphere.scale = ({obj.scale[0]}, {obj.scale[1]}, {obj.scale[2]})",
-            ])
+            lines.append(
+                f"_obj = _add_object({obj.name!r}, _primitive_mesh({obj.type!r}, {size}), "
+                f"{location}, {rotation}, {scale})"
+            )
             
             # Add material if specified
             if 'material' in obj.properties:
                 mat_name = obj.properties.get('material', {}).get('name', 'Material')
                 color = obj.properties.get('material', {}).get('color', [0.8, 0.8, 0.8, 1.0])
+                alpha = color[3] if len(color) > 3 else 1.0
                 
-                lines.extend([
-                    f"# Add material to {obj.name}",
-                    f"if '{mat_name}' not in bpy.data.materials:",
-                    f"    mat = bpy.data.materials.new(name='{mat_name}')",
-                    f"    mat.diffuse_color = ({color[0]}, {color[1]}, {color[2]}, {color[3] if len(color) > 3 else 1.0})",
-                    f"else:",
-                    f"    mat = bpy.data.materials['{mat_name}']",
-                    f"",
-                    f"sphere.data.materials.append(mat)"
-                ])
+                lines.append(
+                    f"_set_material(_obj, {mat_name!r}, ({color[0]}, {color[1]}, {color[2]}, {alpha}))"
+                )
         
         elif obj.type == 'camera':
             lines.extend([
-                f"bpy.ops.object.camera_add(location=({obj.position[0]}, {obj.position[1]}, {obj.position[2]}))",
-                f"camera = bpy.context.active_object",
-                f"camera.name = '{obj.name}'",
-                f"camera.rotation_euler = ({obj.rotation[0]}, {obj.rotation[1]}, {obj.rotation[2]})",
+                f"camera = _add_object({obj.name!r}, bpy.data.cameras.new({obj.name!r}), {location}, {rotation})",
                 f"bpy.context.scene.camera = camera"
             ])
         
@@ -640,10 +676,9 @@ class SceneManager:
             energy = obj.properties.get('energy', 1.0)
             
             lines.extend([
-                f"bpy.ops.object.light_add(type='{light_type}', radius=1, location=({obj.position[0]}, {obj.position[1]}, {obj.position[2]}))",
-                f"light = bpy.context.active_object",
-                f"light.name = '{obj.name}'",
-                f"light.data.energy = {energy}"
+                f"_light = bpy.data.lights.new({obj.name!r}, type={light_type!r})",
+                f"_light.energy = {energy}",
+                f"_add_object({obj.name!r}, _light, {location})"
             ])
         
         else:
@@ -651,11 +686,8 @@ class SceneManager:
             lines.extend([
                 f"# Unknown object type: {obj.type}",
                 f"# Create an empty object as placeholder",
-                f"bpy.ops.object.empty_add(type='PLAIN_AXES', location=({obj.position[0]}, {obj.position[1]}, {obj.position[2]}))",
-                f"empty = bpy.context.active_object",
-                f"empty.name = '{obj.name}'",
-                f"empty.rotation_euler = ({obj.rotation[0]}, {obj.rotation[1]}, {obj.rotation[2]})",
-                f"empty.scale = ({obj.scale[0]}, {obj.scale[1]}, {obj.scale[2]})",
+                f"_obj = _add_object({obj.name!r}, None, {location}, {rotation}, {scale})",
+                f"_obj.empty_display_type = 'PLAIN_AXES'"
             ])
         
         lines.append("")  # Add empty line after each object
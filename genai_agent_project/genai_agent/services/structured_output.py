@@ -0,0 +1,278 @@
+"""
+Structured (schema-constrained) LLM output
+
+Planning, classification and scene generation calls need JSON. Instead of
+asking for JSON in the prompt and parsing free-form text, these calls send
+a JSON schema that the provider enforces while decoding:
+- Ollama: `format` set to the schema
+- OpenAI: `response_format` of type json_schema
+- Anthropic: a single tool whose input_schema is the schema, forced with
+  tool_choice, so the answer arrives as the tool's input
+
+The response is streamed into a JSONStreamValidator, which rejects output
+that cannot become a value of the schema's type as soon as it arrives,
+stops reading once the top-level value is closed, and validates the value
+against the schema. validate() covers the schema keywords used here (type,
+properties, required, items, enum, const, anyOf, minItems, maxItems).
+"""
+
+import json
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+class StructuredOutputError(Exception):
+    """A structured response that is missing, malformed or does not match its schema."""
+
+TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "null": type(None)
+}
+
+def validate(value: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """
+    Check a value against a JSON schema.
+
+    Args:
+        value: Parsed JSON value
+        schema: JSON schema
+        path: Location of the value, used in error messages
+
+    Returns:
+        List of errors (empty if the value matches)
+    """
+    if "anyOf" in schema:
+        options = [validate(value, option, path) for option in schema["anyOf"]]
+        if all(options):
+            return [f"{path}: matches none of the allowed schemas ({min(options, key=len)[0]})"]
+        return []
+    if "const" in schema and value != schema["const"]:
+        return [f"{path}: expected {schema['const']!r}"]
+    if "enum" in schema and value not in schema["enum"]:
+        return [f"{path}: {value!r} is not one of {schema['enum']}"]
+
+    expected = schema.get("type")
+    if expected:
+        types = expected if isinstance(expected, list) else [expected]
+        # bool is an int subclass but not a JSON number
+        if isinstance(value, bool) and "boolean" not in types:
+            return [f"{path}: expected {expected}"]
+        if not any(isinstance(value, TYPES[name]) for name in types):
+            return [f"{path}: expected {expected}"]
+
+    errors = []
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}: missing {key!r}")
+        for key, subschema in schema.get("properties", {}).items():
+            if key in value:
+                errors.extend(validate(value[key], subschema, f"{path}.{key}"))
+    elif isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            errors.append(f"{path}: expected at least {schema['minItems']} items")
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            errors.append(f"{path}: expected at most {schema['maxItems']} items")
+        if "items" in schema:
+            for i, item in enumerate(value):
+                errors.extend(validate(item, schema["items"], f"{path}[{i}]"))
+    return errors
+
+class JSONStreamValidator:
+    """
+    Validate a JSON response while it streams.
+
+    Feed the text as it arrives; feed() returns True once the top-level
+    value is closed, so the caller can stop reading. Output that cannot
+    become a value of the schema's top-level type raises
+    StructuredOutputError immediately instead of after the full response.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        """
+        Create a validator.
+
+        Args:
+            schema: JSON schema of the expected value (an object or array)
+        """
+        self.schema = schema
+        self.opening = "[" if schema.get("type") == "array" else "{"
+        self.buffer: List[str] = []
+        self.stack: List[str] = []
+        self.started = False
+        self.complete = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> bool:
+        """
+        Add streamed text.
+
+        Args:
+            text: Next piece of the response
+
+        Returns:
+            True once the top-level value is complete (later text is ignored)
+        """
+        if self.complete:
+            return True
+
+        for i, char in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                if not self.started and char != self.opening:
+                    raise StructuredOutputError(f"Expected a JSON {self.schema.get('type', 'object')}, got {char!r}")
+                self.started = True
+                self.stack.append("}" if char == "{" else "]")
+            elif char in "}]":
+                if not self.stack or self.stack.pop() != char:
+                    raise StructuredOutputError(f"Unbalanced {char!r} in structured response")
+                if not self.stack:
+                    self.buffer.append(text[:i + 1])
+                    self.complete = True
+                    return True
+            elif not self.started and not char.isspace():
+                raise StructuredOutputError(f"Structured response starts with {char!r}")
+
+        self.buffer.append(text)
+        return False
+
+    def result(self) -> Any:
+        """
+        The complete, validated value.
+
+        Returns:
+            Parsed value
+
+        Raises:
+            StructuredOutputError: If the value is incomplete, malformed or does not match the schema
+        """
+        if not self.complete:
+            raise StructuredOutputError("Structured response ended before the JSON value was complete")
+        try:
+            value = json.loads("".join(self.buffer))
+        except ValueError as e:
+            raise StructuredOutputError(f"Malformed structured response: {str(e)}")
+        errors = validate(value, self.schema)
+        if errors:
+            raise StructuredOutputError("Structured response does not match its schema: " + "; ".join(errors[:5]))
+        return value
+
+def ollama_format(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Ollama /api/generate fields constraining the output to a schema."""
+    return {"format": schema}
+
+def openai_response_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAI chat completion fields constraining the output to a schema."""
+    return {"response_format": {"type": "json_schema", "json_schema": {"name": name, "schema": schema}}}
+
+def anthropic_tool(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Anthropic Messages API fields forcing the answer into a tool call with the schema."""
+    return {
+        "tools": [{"name": name, "description": f"Return the {name.replace('_', ' ')}", "input_schema": schema}],
+        "tool_choice": {"type": "tool", "name": name}
+    }
+
+TASK_TYPES = ["scene_generation", "model_generation", "diagram_generation", "svg_generation",
+              "video_generation", "blender_script", "question", "unknown"]
+
+TASK_CLASSIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "task_type": {"type": "string", "enum": TASK_TYPES},
+        "description": {"type": "string"},
+        "parameters": {"type": "object"}
+    },
+    "required": ["task_type", "description", "parameters"]
+}
+
+VECTOR3 = {"type": "array", "items": {"type": "number"}, "minItems": 3, "maxItems": 3}
+
+SCENE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "description": {"type": "string"},
+        "objects": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "type": {"type": "string", "enum": ["cube", "sphere", "plane", "cylinder", "cone",
+                                                        "torus", "camera", "light"]},
+                    "name": {"type": "string"},
+                    "position": VECTOR3,
+                    "rotation": VECTOR3,
+                    "scale": VECTOR3,
+                    "properties": {
+                        "type": "object",
+                        "properties": {
+                            "material": {
+                                "type": "object",
+                                "properties": {
+                                    "name": {"type": "string"},
+                                    "color": {"type": "array", "items": {"type": "number"},
+                                              "minItems": 4, "maxItems": 4}
+                                }
+                            }
+                        }
+                    }
+                },
+                "required": ["id", "type", "name", "position", "rotation", "scale"]
+            }
+        }
+    },
+    "required": ["name", "description", "objects"]
+}
+
+def execution_plan_schema(tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Schema of an execution plan over the given tools.
+
+    Each step names one of the tools and carries parameters matching that
+    tool's parameter schema.
+
+    Args:
+        tools: Tool information (name and parameters schema), as returned by ToolRegistry.get_tool_info
+
+    Returns:
+        JSON schema of {"steps": [{"tool_name", "parameters", "description"}]}
+    """
+    steps = [
+        {
+            "type": "object",
+            "properties": {
+                "tool_name": {"const": tool["name"]},
+                "parameters": tool.get("parameters") or {"type": "object"},
+                "description": {"type": "string"}
+            },
+            "required": ["tool_name", "parameters", "description"]
+        }
+        for tool in tools
+    ]
+    if not steps:
+        # Nothing can be planned without tools
+        plan = {"type": "array", "maxItems": 0}
+    else:
+        plan = {"type": "array", "items": steps[0] if len(steps) == 1 else {"anyOf": steps}}
+    return {
+        "type": "object",
+        "properties": {"steps": plan},
+        "required": ["steps"]
+    }
@@ -0,0 +1,543 @@
+"""
+Precomputed keyframe baking for the ModelAnimator animation types.
+
+The animation scripts used to loop over every object and call
+``keyframe_insert`` once per key, and computed the scene bounds by
+transforming each bounding-box corner with ``matrix_world @ Vector(v)``.
+For diagrams with hundreds of objects that dominated animation time.
+
+This module computes all keyframe curves at once with NumPy from object
+metadata (locations, dimensions, bounding boxes) and applies them in bulk
+with ``fcurve.keyframe_points.foreach_set``.
+
+Fades, highlights and glows are driven through object-level attributes
+(the object color and custom properties) read by one shared material per
+animation type, instead of animating inputs of one material per object.
+That keeps shader compilation and .blend size constant in the number of
+objects.
+
+The module only depends on NumPy so it can be imported both by the host
+process (tests, benchmarks) and by the Blender scripts generated by
+``ModelAnimator``, which add this directory to ``sys.path``. Blender is
+only touched by the functions documented as "Must be called inside
+Blender".
+"""
+
+import numpy as np
+
+# Colors used by the animation types (RGBA)
+NEUTRAL_COLOR = (0.8, 0.8, 0.8, 1.0)
+SIMPLE_HIGHLIGHT_COLOR = (1.0, 0.6, 0.2, 1.0)
+FLOW_HIGHLIGHT_COLOR = (0.2, 0.6, 1.0, 1.0)
+NODE_PULSE_COLOR = (0.2, 0.8, 1.0, 1.0)
+CONNECTION_PULSE_COLOR = (1.0, 0.6, 0.2, 1.0)
+NO_EMISSION = (0.0, 0.0, 0.0, 1.0)
+
+# Object attributes read by the shared materials. The object color drives
+# base color (RGB) and alpha (A); emission uses custom properties.
+COLOR_PATH = "color"
+ALPHA_INDEX = 3
+EMISSION_COLOR_PROPERTY = "emission_color"
+EMISSION_STRENGTH_PROPERTY = "emission_strength"
+
+
+def make_channel(path, indices, frames, values, first_index=0):
+    """
+    Create a channel description.
+
+    Args:
+        path: Object data path (e.g. "scale", "color" or '["emission_strength"]')
+        indices: Object indices the channel applies to, shape (M,)
+        frames: Keyframe frame numbers, shape (M, K)
+        values: Keyframe values, shape (M, K, C) for C components
+        first_index: Array index written by the first component
+
+    Returns:
+        dict: Channel description used by ``apply_channels``
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    frames = np.asarray(frames, dtype=np.float64).reshape(len(indices), -1)
+    values = np.asarray(values, dtype=np.float64).reshape(frames.shape[0], frames.shape[1], -1)
+    return {
+        "path": path,
+        "first_index": first_index,
+        "indices": indices,
+        "frames": frames,
+        "values": values
+    }
+
+
+def alpha_channel(indices, frames, alphas):
+    """Create a channel animating object alpha (the object color's A)."""
+    return make_channel(COLOR_PATH, indices, frames, _constant_values(len(indices), alphas),
+                        first_index=ALPHA_INDEX)
+
+
+def color_channel(indices, frames, colors):
+    """Create a channel animating object base color (the object color's RGB)."""
+    colors = [color[:3] for color in colors]
+    return make_channel(COLOR_PATH, indices, frames, _constant_values(len(indices), colors))
+
+
+def _property_path(name):
+    """Get the data path of an object custom property."""
+    return f'["{name}"]'
+
+
+def _constant_values(count, keys):
+    """Broadcast a list of per-key values to shape (count, K, C)."""
+    keys = np.asarray(keys, dtype=np.float64)
+    if keys.ndim == 1:
+        keys = keys[:, None]
+    return np.broadcast_to(keys, (count,) + keys.shape)
+
+
+def combined_bounds(bound_boxes, matrices):
+    """
+    Compute the combined world-space bounds of a set of objects.
+
+    Args:
+        bound_boxes: Local bounding box corners, shape (N, 8, 3)
+        matrices: World matrices, shape (N, 4, 4)
+
+    Returns:
+        tuple: (min corner, max corner, center, size) where size is the
+            largest extent along any axis
+    """
+    bound_boxes = np.asarray(bound_boxes, dtype=np.float64)
+    matrices = np.asarray(matrices, dtype=np.float64)
+
+    world = np.einsum('nij,nkj->nki', matrices[:, :3, :3], bound_boxes) + matrices[:, None, :3, 3]
+    points = world.reshape(-1, 3)
+
+    bounds_min = points.min(axis=0)
+    bounds_max = points.max(axis=0)
+    center = (bounds_min + bounds_max) / 2
+    size = float((bounds_max - bounds_min).max())
+
+    return bounds_min, bounds_max, center, size
+
+
+def simple_keyframes(count, total_frames):
+    """
+    Compute the simple animation: fade in, then highlight objects in turn.
+
+    Args:
+        count: Number of mesh objects
+        total_frames: Total number of frames
+
+    Returns:
+        dict: "channels" list
+    """
+    indices = np.arange(count)
+    fade_in_frames = int(total_frames * 0.3)
+
+    channels = [
+        alpha_channel(indices, np.broadcast_to([1, fade_in_frames], (count, 2)), [0.0, 1.0])
+    ]
+
+    if count > 1:
+        highlight_duration = int(total_frames * 0.6 / count)
+        highlight_start = int(total_frames * 0.3) + indices * highlight_duration
+        highlight_mid = highlight_start + int(highlight_duration * 0.3)
+        highlight_end = highlight_start + highlight_duration
+
+        channels.append(color_channel(
+            indices,
+            np.stack([highlight_start, highlight_mid, highlight_end], axis=1),
+            [NEUTRAL_COLOR, SIMPLE_HIGHLIGHT_COLOR, NEUTRAL_COLOR]
+        ))
+
+    return {"channels": channels}
+
+
+def flow_keyframes(locations, total_frames, size):
+    """
+    Compute the flow animation: sequential appearance, highlight and a
+    slight movement towards the next object.
+
+    Objects are ordered top to bottom (descending Y), as in a typical
+    flowchart.
+
+    Args:
+        locations: Object locations, shape (N, 3)
+        total_frames: Total number of frames
+        size: Largest extent of the combined bounds
+
+    Returns:
+        dict: "order" (object indices, top to bottom) and "channels" list
+    """
+    locations = np.asarray(locations, dtype=np.float64)
+    count = len(locations)
+
+    order = np.argsort(-locations[:, 1], kind='stable')
+    rank = np.arange(count)
+
+    appear_frame_duration = max(1, int(total_frames * 0.7 / count))
+    highlight_frame_duration = int(appear_frame_duration * 0.7)
+
+    appear_start = rank * appear_frame_duration + 1
+    appear_end = appear_start + int(appear_frame_duration * 0.3)
+    highlight_start = appear_end
+    highlight_end = highlight_start + highlight_frame_duration
+
+    channels = [
+        alpha_channel(order, np.stack([appear_start, appear_end], axis=1), [0.0, 1.0]),
+        color_channel(order, np.stack([highlight_start, highlight_end], axis=1),
+                      [FLOW_HIGHLIGHT_COLOR, NEUTRAL_COLOR]),
+        make_channel("scale", order,
+                     np.stack([appear_start, appear_end], axis=1),
+                     _constant_values(count, [(0.1, 0.1, 0.1), (1.0, 1.0, 1.0)]))
+    ]
+
+    if count > 1:
+        # Move slightly towards the next object to simulate "flowing"
+        current = locations[order[:-1]]
+        following = locations[order[1:]]
+        direction = following - current
+        length = np.linalg.norm(direction, axis=1, keepdims=True)
+        direction = np.divide(direction, length, out=np.zeros_like(direction), where=length > 0)
+
+        flow_end = highlight_end[:-1] + int(appear_frame_duration * 0.3)
+        channels.append(make_channel(
+            "location", order[:-1],
+            np.stack([flow_end - int(appear_frame_duration * 0.15), flow_end], axis=1),
+            np.stack([current + direction * size * 0.1, current], axis=1)
+        ))
+
+    return {"order": order, "channels": channels}
+
+
+def explode_keyframes(count, center, size, total_frames, seed=None):
+    """
+    Compute the explode animation: objects move outward from the center
+    in random directions while spinning.
+
+    Args:
+        count: Number of mesh objects
+        center: Center of the combined bounds, shape (3,)
+        size: Largest extent of the combined bounds
+        total_frames: Total number of frames
+        seed: Optional random seed for reproducible output
+
+    Returns:
+        dict: "colors" (random RGBA per object) and "channels" list
+    """
+    rng = np.random.default_rng(seed)
+    center = np.asarray(center, dtype=np.float64)
+    indices = np.arange(count)
+
+    start_frame = int(total_frames * 0.1)
+    mid_frame = int(total_frames * 0.5)
+    frames = np.broadcast_to([start_frame, mid_frame], (count, 2))
+
+    direction = rng.uniform(-1, 1, (count, 3))
+    length = np.linalg.norm(direction, axis=1, keepdims=True)
+    direction = np.divide(direction, length, out=np.zeros_like(direction), where=length > 0)
+    explosion_location = center + direction * size * 1.5
+
+    rotation = rng.uniform(0, np.pi * 2, (count, 3))
+
+    colors = np.ones((count, 4))
+    colors[:, :3] = rng.uniform(0.5, 1.0, (count, 3))
+
+    channels = [
+        make_channel("location", indices, frames,
+                     np.stack([np.broadcast_to(center, (count, 3)), explosion_location], axis=1)),
+        make_channel("rotation_euler", indices, frames,
+                     np.stack([np.zeros((count, 3)), rotation], axis=1))
+    ]
+
+    return {"colors": colors, "channels": channels}
+
+
+def classify_network_objects(dimensions):
+    """
+    Split objects into nodes and connections.
+
+    Connections (lines, arrows) are long and thin; nodes are closer to
+    square or round. If that leaves too few nodes, the largest third of
+    the objects by volume are used as nodes instead.
+
+    Args:
+        dimensions: Object dimensions, shape (N, 3)
+
+    Returns:
+        tuple: (node indices, connection indices)
+    """
+    dimensions = np.asarray(dimensions, dtype=np.float64)
+    count = len(dimensions)
+
+    max_dim = dimensions.max(axis=1)
+    min_dim = dimensions.min(axis=1)
+    aspect_ratio = np.divide(max_dim, min_dim, out=np.full(count, np.inf), where=min_dim > 0)
+
+    is_connection = aspect_ratio > 3.0
+    nodes = np.flatnonzero(~is_connection)
+    connections = np.flatnonzero(is_connection)
+
+    if len(nodes) == 0 or len(nodes) < count * 0.2:
+        volumes = dimensions.prod(axis=1)
+        by_volume = np.argsort(-volumes, kind='stable')
+        node_count = max(1, count // 3)
+        nodes = by_volume[:node_count]
+        connections = by_volume[node_count:]
+
+    return nodes, connections
+
+
+def _pulse_channels(indices, offsets, pulse_start_frame, pulse_cycle_frames, pulse_count, color):
+    """Build the emission pulse channels for a set of objects."""
+    count = len(indices)
+    base = (pulse_start_frame + offsets)[:, None] + np.arange(pulse_count)[None, :] * pulse_cycle_frames
+    frames = (base[:, :, None] + np.array([0.0, 0.2, 0.4]) * pulse_cycle_frames).reshape(count, -1)
+
+    emission = [NO_EMISSION, color, NO_EMISSION] * pulse_count
+    strength = [0.0, 2.0, 0.0] * pulse_count
+
+    return [
+        make_channel(_property_path(EMISSION_COLOR_PROPERTY), indices, frames,
+                     _constant_values(count, emission)),
+        make_channel(_property_path(EMISSION_STRENGTH_PROPERTY), indices, frames,
+                     _constant_values(count, strength))
+    ]
+
+
+def network_keyframes(dimensions, total_frames, pulse_count=2):
+    """
+    Compute the network animation: nodes appear, connections are drawn,
+    then pulses travel through the network.
+
+    Args:
+        dimensions: Object dimensions, shape (N, 3)
+        total_frames: Total number of frames
+        pulse_count: Number of pulses to show
+
+    Returns:
+        dict: "nodes", "connections" (object indices) and "channels" list
+    """
+    dimensions = np.asarray(dimensions, dtype=np.float64)
+    nodes, connections = classify_network_objects(dimensions)
+    node_rank = np.arange(len(nodes))
+    connection_rank = np.arange(len(connections))
+    channels = []
+
+    # Fade in nodes
+    node_appear_duration = int(total_frames * 0.3)
+    node_fade_in_time = int(node_appear_duration * 0.6 / max(1, len(nodes)))
+    appear_start = node_rank * node_fade_in_time + 1
+    node_frames = np.stack([appear_start, appear_start + node_fade_in_time], axis=1)
+
+    channels.append(alpha_channel(nodes, node_frames, [0.0, 1.0]))
+    channels.append(make_channel("scale", nodes, node_frames,
+                                 _constant_values(len(nodes), [(0.1, 0.1, 0.1), (1.0, 1.0, 1.0)])))
+
+    # After nodes appear, draw connections along their main axis
+    connection_start_frame = node_appear_duration
+    connection_duration = int(total_frames * 0.3)
+    connection_fade_in_time = int(connection_duration * 0.8 / max(1, len(connections)))
+    appear_start = connection_start_frame + connection_rank * connection_fade_in_time
+    connection_frames = np.stack([appear_start, appear_start + connection_fade_in_time], axis=1)
+
+    dims = dimensions[connections]
+    main_axis = np.zeros(len(connections), dtype=np.int64)
+    main_axis[(dims[:, 1] > dims[:, 0]) & (dims[:, 1] > dims[:, 2])] = 1
+    main_axis[(dims[:, 2] > dims[:, 0]) & (dims[:, 2] > dims[:, 1])] = 2
+    start_scale = np.ones((len(connections), 3))
+    start_scale[connection_rank, main_axis] = 0.01
+
+    channels.append(alpha_channel(connections, connection_frames, [0.0, 1.0]))
+    channels.append(make_channel("scale", connections, connection_frames,
+                                 np.stack([start_scale, np.ones_like(start_scale)], axis=1)))
+
+    # Network pulse after all elements are visible
+    pulse_start_frame = connection_start_frame + connection_duration
+    pulse_duration = total_frames - pulse_start_frame - int(total_frames * 0.1)
+    pulse_cycle_frames = pulse_duration / pulse_count
+
+    node_offsets = node_rank * (pulse_cycle_frames * 0.8 / max(1, len(nodes)))
+    connection_offsets = (connection_rank + len(nodes) * 0.8) * (
+        pulse_cycle_frames * 0.8 / max(1, len(nodes) + len(connections))
+    )
+
+    channels.extend(_pulse_channels(nodes, node_offsets, pulse_start_frame,
+                                    pulse_cycle_frames, pulse_count, NODE_PULSE_COLOR))
+    channels.extend(_pulse_channels(connections, connection_offsets, pulse_start_frame,
+                                    pulse_cycle_frames, pulse_count, CONNECTION_PULSE_COLOR))
+
+    return {"nodes": nodes, "connections": connections, "channels": channels}
+
+
+def gather_object_metadata(objects):
+    """
+    Collect the metadata needed for baking from Blender objects.
+
+    Must be called inside Blender.
+
+    Args:
+        objects: Sequence of Blender objects
+
+    Returns:
+        dict: "locations" (N, 3), "dimensions" (N, 3), "bound_boxes"
+            (N, 8, 3) and "matrices" (N, 4, 4) arrays
+    """
+    return {
+        "locations": np.array([tuple(obj.location) for obj in objects], dtype=np.float64).reshape(-1, 3),
+        "dimensions": np.array([tuple(obj.dimensions) for obj in objects], dtype=np.float64).reshape(-1, 3),
+        "bound_boxes": np.array([[tuple(v) for v in obj.bound_box] for obj in objects],
+                                dtype=np.float64).reshape(-1, 8, 3),
+        "matrices": np.array([[tuple(row) for row in obj.matrix_world] for obj in objects],
+                             dtype=np.float64).reshape(-1, 4, 4)
+    }
+
+
+def _get_fcurve(id_data, data_path, index):
+    """Get or create the F-curve for a data path on an ID block."""
+    import bpy
+
+    anim_data = id_data.animation_data or id_data.animation_data_create()
+    if anim_data.action is None:
+        anim_data.action = bpy.data.actions.new(name=f"{id_data.name}Action")
+
+    fcurves = anim_data.action.fcurves
+    return fcurves.find(data_path, index=index) or fcurves.new(data_path, index=index)
+
+
+def bake_fcurve(id_data, data_path, index, frames, values):
+    """
+    Write keyframes to an F-curve in one bulk operation.
+
+    Existing keyframes on the curve are kept; keys on the same frame are
+    replaced by the new ones, matching ``keyframe_insert`` behaviour.
+
+    Must be called inside Blender.
+
+    Args:
+        id_data: ID block that owns the animation (object, node tree, ...)
+        data_path: RNA path of the animated property
+        index: Array index of the property component
+        frames: Keyframe frame numbers, shape (K,)
+        values: Keyframe values, shape (K,)
+    """
+    fcurve = _get_fcurve(id_data, data_path, index)
+    points = fcurve.keyframe_points
+
+    co = np.column_stack([frames, values]).astype(np.float32)
+    if len(points):
+        existing = np.empty(len(points) * 2, dtype=np.float32)
+        points.foreach_get("co", existing)
+        existing = existing.reshape(-1, 2)
+        co = np.concatenate([existing[~np.isin(existing[:, 0], co[:, 0])], co])
+        points.clear()
+
+    # Later keys on the same frame win
+    _, last = np.unique(co[::-1, 0], return_index=True)
+    co = co[::-1][last]
+
+    points.add(len(co))
+    points.foreach_set("co", co.ravel())
+    fcurve.update()
+
+
+def create_shared_material(name, metallic=0.5, roughness=0.3, transparent=True):
+    """
+    Create a material that takes its color, alpha and emission from the
+    object it is assigned to.
+
+    Base color and alpha come from the object color (Object Info node),
+    emission from the ``emission_color``/``emission_strength`` custom
+    properties (Attribute nodes). One such material is shared by all
+    objects of an animation.
+
+    Must be called inside Blender.
+
+    Args:
+        name: Material name
+        metallic: Metallic value of the Principled BSDF
+        roughness: Roughness value of the Principled BSDF
+        transparent: Whether alpha fades should be visible in Eevee
+
+    Returns:
+        bpy.types.Material: The shared material
+    """
+    import bpy
+
+    mat = bpy.data.materials.new(name=name)
+    mat.use_nodes = True
+    if transparent and hasattr(mat, "blend_method"):
+        mat.blend_method = 'BLEND'
+
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    principled = nodes.get('Principled BSDF')
+    principled.inputs['Metallic'].default_value = metallic
+    principled.inputs['Roughness'].default_value = roughness
+
+    object_info = nodes.new('ShaderNodeObjectInfo')
+    links.new(object_info.outputs['Color'], principled.inputs['Base Color'])
+    links.new(object_info.outputs['Alpha'], principled.inputs['Alpha'])
+
+    emission_input = principled.inputs.get('Emission Color') or principled.inputs.get('Emission')
+
+    emission_color = nodes.new('ShaderNodeAttribute')
+    emission_color.attribute_type = 'OBJECT'
+    emission_color.attribute_name = EMISSION_COLOR_PROPERTY
+    links.new(emission_color.outputs['Color'], emission_input)
+
+    emission_strength = nodes.new('ShaderNodeAttribute')
+    emission_strength.attribute_type = 'OBJECT'
+    emission_strength.attribute_name = EMISSION_STRENGTH_PROPERTY
+    links.new(emission_strength.outputs['Fac'], principled.inputs['Emission Strength'])
+
+    return mat
+
+
+def assign_shared_material(objects, material, color=NEUTRAL_COLOR, colors=None):
+    """
+    Assign a shared material and initialize the attributes it reads.
+
+    Must be called inside Blender.
+
+    Args:
+        objects: Sequence of Blender objects
+        material: Material from ``create_shared_material``
+        color: Initial RGBA object color (alpha 0 starts transparent)
+        colors: Optional per-object RGBA colors, shape (N, 4)
+    """
+    for i, obj in enumerate(objects):
+        obj.color = tuple(colors[i]) if colors is not None else color
+        obj[EMISSION_COLOR_PROPERTY] = list(NO_EMISSION)
+        obj[EMISSION_STRENGTH_PROPERTY] = 0.0
+
+        if obj.data.materials:
+            obj.data.materials[0] = material
+        else:
+            obj.data.materials.append(material)
+
+
+def apply_channels(objects, channels):
+    """
+    Apply baked channels to Blender objects.
+
+    Must be called inside Blender.
+
+    Args:
+        objects: Sequence of Blender objects indexed by the channels
+        channels: List of channel descriptions from the *_keyframes functions
+    """
+    for channel in channels:
+        frames = channel["frames"]
+        values = channel["values"]
+        path = channel["path"]
+
+        for row, obj_index in enumerate(channel["indices"]):
+            obj = objects[int(obj_index)]
+
+            if values.shape[2] == 1 and not hasattr(obj.path_resolve(path), "__len__"):
+                # Scalar properties are keyed without an array index
+                bake_fcurve(obj, path, 0, frames[row], values[row, :, 0])
+                continue
+
+            for component in range(values.shape[2]):
+                bake_fcurve(obj, path, channel["first_index"] + component,
+                            frames[row], values[row, :, component])
@@ -184,14 +184,22 @@ class ModelAnimator:
         rotation_axis = kwargs.get('rotation_axis', 'Z')
         rotation_speed = kwargs.get('rotation_speed', 1.0)
         
+        # Directory of keyframe_baker, imported by the generated script
+        animation_dir = os.path.dirname(os.path.abspath(__file__))
+        
         # Base script template
         base_script = f'''
 import bpy
 import os
+import sys
 import math
 import random
 from mathutils import Vector, Matrix, Quaternion
 
+# Keyframe curves are precomputed with NumPy and applied in bulk
+sys.path.insert(0, r"{animation_dir}")
+import keyframe_baker
+
 # Clear existing scene
 bpy.ops.wm.read_factory_settings(use_empty=True)
 for obj in bpy.data.objects:
@@ -235,7 +243,7 @@ elif ext == '.blend':
         if obj is not None:
             bpy.context.collection.objects.link(obj)
 else:
-    print(f"Unsupported file format: {ext}")
+    print(f"Unsupported file format: {{ext}}")
     import sys
     sys.exit(1)
 
@@ -323,24 +331,10 @@ for obj in mesh_objects:
 bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
 bpy.ops.object.location_clear()
 
-# Get the bounds of all objects combined
-min_x, min_y, min_z = float('inf'), float('inf'), float('inf')
-max_x, max_y, max_z = float('-inf'), float('-inf'), float('-inf')
-
-for obj in mesh_objects:
-    for v in obj.bound_box:
-        world_v = obj.matrix_world @ Vector(v)
-        min_x = min(min_x, world_v.x)
-        min_y = min(min_y, world_v.y)
-        min_z = min(min_z, world_v.z)
-        max_x = max(max_x, world_v.x)
-        max_y = max(max_y, world_v.y)
-        max_z = max(max_z, world_v.z)
-
-center_x = (min_x + max_x) / 2
-center_y = (min_y + max_y) / 2
-center_z = (min_z + max_z) / 2
-size = max(max_x - min_x, max_y - min_y, max_z - min_z)
+# Get the bounds of all objects combined (all bounding box corners at once)
+metadata = keyframe_baker.gather_object_metadata(mesh_objects)
+_, _, bounds_center, size = keyframe_baker.combined_bounds(metadata["bound_boxes"], metadata["matrices"])
+center_x, center_y, center_z = (float(c) for c in bounds_center)
 
 # Position camera to see the entire model
 camera.location = Vector((center_x, center_y - size * 2, center_z + size * 0.8))
@@ -360,46 +354,14 @@ for obj in mesh_objects:
     empty.select_set(False)
     obj.select_set(False)
 
-# Create material for objects
-for obj in mesh_objects:
-    # Create new material
-    mat_name = f"AnimMaterial_{obj.name}"
-    mat = bpy.data.materials.new(name=mat_name)
-    mat.use_nodes = True
-    
-    # Get the principled BSDF node
-    principled = mat.node_tree.nodes.get('Principled BSDF')
-    if principled:
-        # Set initial values
-        principled.inputs['Base Color'].default_value = (0.8, 0.8, 0.8, 1.0)  # White
-        principled.inputs['Metallic'].default_value = 0.5
-        principled.inputs['Roughness'].default_value = 0.3
-        principled.inputs['Alpha'].default_value = 0.0  # Start transparent
-    
-    # Assign material to object
-    if obj.data.materials:
-        obj.data.materials[0] = mat
-    else:
-        obj.data.materials.append(mat)
-
-# Animation: Fade in
-fade_in_frames = int(total_frames * 0.3)  # 30% of the animation is fade in
-for obj in mesh_objects:
-    mat = obj.data.materials[0]
-    principled = mat.node_tree.nodes.get('Principled BSDF')
-    
-    # Set alpha to 0 at frame 1
-    principled.inputs['Alpha'].default_value = 0
-    principled.inputs['Alpha'].keyframe_insert(data_path="default_value", frame=1)
-    
-    # Set alpha to 1 at end of fade in
-    principled.inputs['Alpha'].default_value = 1
-    principled.inputs['Alpha'].keyframe_insert(data_path="default_value", frame=fade_in_frames)
-    
-    # Add easing to the fade in
-    for fcurve in obj.data.materials[0].node_tree.animation_data.action.fcurves:
-        for kf in fcurve.keyframe_points:
-            kf.interpolation = 'EASE_IN_OUT'
+# One shared material; per-object fades and highlights are driven through
+# the object color, starting transparent
+material = keyframe_baker.create_shared_material("AnimMaterial", metallic=0.5, roughness=0.3)
+keyframe_baker.assign_shared_material(mesh_objects, material, color=(0.8, 0.8, 0.8, 0.0))
+
+# Animation: Fade in (first 30%), then highlight objects sequentially
+baked = keyframe_baker.simple_keyframes(len(mesh_objects), total_frames)
+keyframe_baker.apply_channels(mesh_objects, baked["channels"])
 
 # Animation: Rotate the empty
 rotate_start_frame = int(total_frames * 0.2)  # Start rotation at 20% of the animation
@@ -417,30 +379,6 @@ empty.keyframe_insert(data_path="rotation_euler", frame=rotate_end_frame)
 for fcurve in empty.animation_data.action.fcurves:
     for kf in fcurve.keyframe_points:
         kf.interpolation = 'EASE_IN_OUT'
-
-# Animation: Highlight objects sequentially
-if len(mesh_objects) > 1:
-    highlight_duration = int(total_frames * 0.6 / len(mesh_objects))
-    for i, obj in enumerate(mesh_objects):
-        mat = obj.data.materials[0]
-        principled = mat.node_tree.nodes.get('Principled BSDF')
-        
-        # Calculate highlight frames
-        highlight_start = int(total_frames * 0.3) + i * highlight_duration
-        highlight_mid = highlight_start + int(highlight_duration * 0.3)
-        highlight_end = highlight_start + highlight_duration
-        
-        # Set normal color before highlight
-        principled.inputs['Base Color'].default_value = (0.8, 0.8, 0.8, 1.0)
-        principled.inputs['Base Color'].keyframe_insert(data_path="default_value", frame=highlight_start)
-        
-        # Set highlight color at middle of highlight duration
-        principled.inputs['Base Color'].default_value = (1.0, 0.6, 0.2, 1.0)  # Orange highlight
-        principled.inputs['Base Color'].keyframe_insert(data_path="default_value", frame=highlight_mid)
-        
-        # Set back to normal color at end of highlight
-        principled.inputs['Base Color'].default_value = (0.8, 0.8, 0.8, 1.0)
-        principled.inputs['Base Color'].keyframe_insert(data_path="default_value", frame=highlight_end)
 '''
 
     def _get_rotate_animation_script(self, fps, total_frames, rotation_axis, rotation_speed, **kwargs):
@@ -456,24 +394,10 @@ for obj in mesh_objects:
 bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
 bpy.ops.object.location_clear()
 
-# Get the bounds of all objects combined
-min_x, min_y, min_z = float('inf'), float('inf'), float('inf')
-max_x, max_y, max_z = float('-inf'), float('-inf'), float('-inf')
-
-for obj in mesh_objects:
-    for v in obj.bound_box:
-        world_v = obj.matrix_world @ Vector(v)
-        min_x = min(min_x, world_v.x)
-        min_y = min(min_y, world_v.y)
-        min_z = min(min_z, world_v.z)
-        max_x = max(max_x, world_v.x)
-        max_y = max(max_y, world_v.y)
-        max_z = max(max_z, world_v.z)
-
-center_x = (min_x + max_x) / 2
-center_y = (min_y + max_y) / 2
-center_z = (min_z + max_z) / 2
-size = max(max_x - min_x, max_y - min_y, max_z - min_z)
+# Get the bounds of all objects combined (all bounding box corners at once)
+metadata = keyframe_baker.gather_object_metadata(mesh_objects)
+_, _, bounds_center, size = keyframe_baker.combined_bounds(metadata["bound_boxes"], metadata["matrices"])
+center_x, center_y, center_z = (float(c) for c in bounds_center)
 
 # Position camera to see the entire model
 camera.location = Vector((center_x, center_y - size * 2, center_z + size * 0.8))
@@ -493,26 +417,9 @@ for obj in mesh_objects:
     empty.select_set(False)
     obj.select_set(False)
 
-# Apply materials
-for obj in mesh_objects:
-    # Create new material
-    mat_name = f"RotateMaterial_{obj.name}"
-    mat = bpy.data.materials.new(name=mat_name)
-    mat.use_nodes = True
-    
-    # Get the principled BSDF node
-    principled = mat.node_tree.nodes.get('Principled BSDF')
-    if principled:
-        # Set values
-        principled.inputs['Base Color'].default_value = (0.8, 0.8, 0.8, 1.0)
-        principled.inputs['Metallic'].default_value = 0.7
-        principled.inputs['Roughness'].default_value = 0.2
-    
-    # Assign material to object
-    if obj.data.materials:
-        obj.data.materials[0] = mat
-    else:
-        obj.data.materials.append(mat)
+# Apply one shared material
+material = keyframe_baker.create_shared_material("RotateMaterial", metallic=0.7, roughness=0.2, transparent=False)
+keyframe_baker.assign_shared_material(mesh_objects, material, color=(0.8, 0.8, 0.8, 1.0))
 
 # Animation: Rotate the empty
 num_rotations = {rotation_speed} * (duration / 10.0)  # Scale rotation speed with duration
@@ -572,101 +479,33 @@ for obj in mesh_objects:
 bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
 bpy.ops.object.location_clear()
 
-# Get the bounds of all objects combined
-min_x, min_y, min_z = float('inf'), float('inf'), float('inf')
-max_x, max_y, max_z = float('-inf'), float('-inf'), float('-inf')
-
-for obj in mesh_objects:
-    for v in obj.bound_box:
-        world_v = obj.matrix_world @ Vector(v)
-        min_x = min(min_x, world_v.x)
-        min_y = min(min_y, world_v.y)
-        min_z = min(min_z, world_v.z)
-        max_x = max(max_x, world_v.x)
-        max_y = max(max_y, world_v.y)
-        max_z = max(max_z, world_v.z)
-
-center_x = (min_x + max_x) / 2
-center_y = (min_y + max_y) / 2
-center_z = (min_z + max_z) / 2
-size = max(max_x - min_x, max_y - min_y, max_z - min_z)
+# Get the bounds of all objects combined (all bounding box corners at once)
+metadata = keyframe_baker.gather_object_metadata(mesh_objects)
+_, _, bounds_center, size = keyframe_baker.combined_bounds(metadata["bound_boxes"], metadata["matrices"])
+center_x, center_y, center_z = (float(c) for c in bounds_center)
 center = Vector((center_x, center_y, center_z))
 
 # Position camera to see the entire animation
 camera.location = Vector((center_x, center_y - size * 3, center_z + size))
 camera.rotation_euler = (math.radians(60), 0, 0)
 
-# Apply materials
-for obj in mesh_objects:
-    # Create new material
-    mat_name = f"ExplodeMaterial_{obj.name}"
-    mat = bpy.data.materials.new(name=mat_name)
-    mat.use_nodes = True
-    
-    # Get the principled BSDF node
-    principled = mat.node_tree.nodes.get('Principled BSDF')
-    if principled:
-        # Set values
-        color = (random.uniform(0.5, 1.0), random.uniform(0.5, 1.0), random.uniform(0.5, 1.0), 1.0)
-        principled.inputs['Base Color'].default_value = color
-        principled.inputs['Metallic'].default_value = 0.5
-        principled.inputs['Roughness'].default_value = 0.3
-    
-    # Assign material to object
-    if obj.data.materials:
-        obj.data.materials[0] = mat
-    else:
-        obj.data.materials.append(mat)
-
-# Animation: Move objects outward from center
-# Calculate start frame for explosion (after a brief pause)
+# Precompute explosion directions, rotations and colors
+baked = keyframe_baker.explode_keyframes(len(mesh_objects), bounds_center, size, total_frames)
+
+# Apply one shared material with a random color per object
+material = keyframe_baker.create_shared_material("ExplodeMaterial", metallic=0.5, roughness=0.3, transparent=False)
+keyframe_baker.assign_shared_material(mesh_objects, material, colors=baked["colors"])
+
+# Animation: Move objects outward from center, spinning as they go
 start_frame = int(total_frames * 0.1)
 mid_frame = int(total_frames * 0.5)
 end_frame = total_frames
 
-# Define the explosion strength
-explosion_strength = size * 1.5
-
-# Move objects to center at start
 for obj in mesh_objects:
     # Store original location
     obj["original_location"] = obj.location.copy()
-    
-    # Move to center at start_frame
-    obj.location = center
-    obj.keyframe_insert(data_path="location", frame=start_frame)
-    
-    # Calculate explosion direction (random but outward)
-    direction = Vector((
-        random.uniform(-1, 1),
-        random.uniform(-1, 1),
-        random.uniform(-1, 1)
-    ))
-    direction.normalize()
-    
-    # Move outward at mid_frame
-    explosion_location = center + direction * explosion_strength
-    obj.location = explosion_location
-    obj.keyframe_insert(data_path="location", frame=mid_frame)
-    
-    # Add rotation during explosion
-    obj.rotation_euler = (0, 0, 0)
-    obj.keyframe_insert(data_path="rotation_euler", frame=start_frame)
-    
-    # Random rotation at mid_frame
-    obj.rotation_euler = (
-        random.uniform(0, math.pi * 2),
-        random.uniform(0, math.pi * 2),
-        random.uniform(0, math.pi * 2)
-    )
-    obj.keyframe_insert(data_path="rotation_euler", frame=mid_frame)
-    
-    # Smooth the animation with Bezier curves
-    for fcurve in obj.animation_data.action.fcurves:
-        for kf in fcurve.keyframe_points:
-            kf.interpolation = 'BEZIER'
-            kf.handle_left_type = 'AUTO'
-            kf.handle_right_type = 'AUTO'
+
+keyframe_baker.apply_channels(mesh_objects, baked["channels"])
 
 # Camera animation: Zoom out during explosion
 camera.keyframe_insert(data_path="location", frame=1)
@@ -700,123 +539,26 @@ for obj in mesh_objects:
 bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
 bpy.ops.object.location_clear()
 
-# Get the bounds of all objects combined
-min_x, min_y, min_z = float('inf'), float('inf'), float('inf')
-max_x, max_y, max_z = float('-inf'), float('-inf'), float('-inf')
-
-for obj in mesh_objects:
-    for v in obj.bound_box:
-        world_v = obj.matrix_world @ Vector(v)
-        min_x = min(min_x, world_v.x)
-        min_y = min(min_y, world_v.y)
-        min_z = min(min_z, world_v.z)
-        max_x = max(max_x, world_v.x)
-        max_y = max(max_y, world_v.y)
-        max_z = max(max_z, world_v.z)
-
-center_x = (min_x + max_x) / 2
-center_y = (min_y + max_y) / 2
-center_z = (min_z + max_z) / 2
-size = max(max_x - min_x, max_y - min_y, max_z - min_z)
+# Get the bounds of all objects combined (all bounding box corners at once)
+metadata = keyframe_baker.gather_object_metadata(mesh_objects)
+_, _, bounds_center, size = keyframe_baker.combined_bounds(metadata["bound_boxes"], metadata["matrices"])
+center_x, center_y, center_z = (float(c) for c in bounds_center)
 center = Vector((center_x, center_y, center_z))
 
 # Position camera to see the entire animation
 camera.location = Vector((center_x, center_y - size * 2.5, center_z + size))
 camera.rotation_euler = (math.radians(60), 0, 0)
 
-# Apply materials
-for obj in mesh_objects:
-    # Create new material
-    mat_name = f"FlowMaterial_{obj.name}"
-    mat = bpy.data.materials.new(name=mat_name)
-    mat.use_nodes = True
-    
-    # Get the principled BSDF node
-    principled = mat.node_tree.nodes.get('Principled BSDF')
-    if principled:
-        # Set initial values
-        principled.inputs['Base Color'].default_value = (0.8, 0.8, 0.8, 1.0)
-        principled.inputs['Metallic'].default_value = 0.3
-        principled.inputs['Roughness'].default_value = 0.5
-        principled.inputs['Alpha'].default_value = 0.0  # Start transparent
-    
-    # Assign material to object
-    if obj.data.materials:
-        obj.data.materials[0] = mat
-    else:
-        obj.data.materials.append(mat)
-
-# Sort objects based on X or Y position (typical flowchart progression)
-# Use Y for top-to-bottom flowcharts, X for left-to-right
-sorted_objects = sorted(mesh_objects, key=lambda obj: obj.location.y, reverse=True)
-
-# Animation: Sequential appearance and highlighting
-appear_frame_duration = int(total_frames * 0.7 / len(sorted_objects))
-highlight_frame_duration = int(appear_frame_duration * 0.7)
-
-for i, obj in enumerate(sorted_objects):
-    mat = obj.data.materials[0]
-    principled = mat.node_tree.nodes.get('Principled BSDF')
-    
-    # Calculate appearance frames
-    appear_start = i * appear_frame_duration + 1
-    appear_end = appear_start + int(appear_frame_duration * 0.3)
-    highlight_start = appear_end
-    highlight_end = highlight_start + highlight_frame_duration
-    
-    # Fade in animation
-    principled.inputs['Alpha'].default_value = 0.0
-    principled.inputs['Alpha'].keyframe_insert(data_path="default_value", frame=appear_start)
-    
-    principled.inputs['Alpha'].default_value = 1.0
-    principled.inputs['Alpha'].keyframe_insert(data_path="default_value", frame=appear_end)
-    
-    # Highlight animation (change color)
-    principled.inputs['Base Color'].default_value = (0.8, 0.8, 0.8, 1.0)
-    principled.inputs['Base Color'].keyframe_insert(data_path="default_value", frame=appear_end)
-    
-    principled.inputs['Base Color'].default_value = (0.2, 0.6, 1.0, 1.0)  # Blue highlight
-    principled.inputs['Base Color'].keyframe_insert(data_path="default_value", frame=highlight_start)
-    
-    principled.inputs['Base Color'].default_value = (0.8, 0.8, 0.8, 1.0)
-    principled.inputs['Base Color'].keyframe_insert(data_path="default_value", frame=highlight_end)
-    
-    # Scale animation
-    obj.scale = (0.1, 0.1, 0.1)  # Start small
-    obj.keyframe_insert(data_path="scale", frame=appear_start)
-    
-    obj.scale = (1.0, 1.0, 1.0)  # Normal scale
-    obj.keyframe_insert(data_path="scale", frame=appear_end)
-    
-    # Add slight bounce effect
-    if i < len(sorted_objects) - 1:
-        next_obj = sorted_objects[i + 1]
-        
-        # Add a slight movement to simulate "flowing" to the next object
-        flow_start = highlight_end
-        flow_end = flow_start + int(appear_frame_duration * 0.3)
-        
-        # Calculate direction to next object
-        direction = (next_obj.location - obj.location).normalized()
-        
-        # Save original location
-        original_location = obj.location.copy()
-        
-        # Move slightly towards next object
-        obj.location = original_location + direction * size * 0.1
-        obj.keyframe_insert(data_path="location", frame=flow_end - int(appear_frame_duration * 0.15))
-        
-        # Move back to original location
-        obj.location = original_location
-        obj.keyframe_insert(data_path="location", frame=flow_end)
-    
-    # Add easing to all animations
-    if obj.animation_data and obj.animation_data.action:
-        for fcurve in obj.animation_data.action.fcurves:
-            for kf in fcurve.keyframe_points:
-                kf.interpolation = 'BEZIER'
-                kf.handle_left_type = 'AUTO'
-                kf.handle_right_type = 'AUTO'
+# One shared material; per-object fades and highlights are driven through
+# the object color, starting transparent
+material = keyframe_baker.create_shared_material("FlowMaterial", metallic=0.3, roughness=0.5)
+keyframe_baker.assign_shared_material(mesh_objects, material, color=(0.8, 0.8, 0.8, 0.0))
+
+# Sequential appearance, highlighting and flow towards the next object,
+# with objects ordered top to bottom (typical flowchart progression)
+baked = keyframe_baker.flow_keyframes(metadata["locations"], total_frames, size)
+keyframe_baker.apply_channels(mesh_objects, baked["channels"])
+sorted_objects = [mesh_objects[i] for i in baked["order"]]
 
 # Camera animation: Follow the flow
 if len(sorted_objects) > 1:
@@ -865,24 +607,10 @@ for obj in mesh_objects:
 bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
 bpy.ops.object.location_clear()
 
-# Get the bounds of all objects combined
-min_x, min_y, min_z = float('inf'), float('inf'), float('inf')
-max_x, max_y, max_z = float('-inf'), float('-inf'), float('-inf')
-
-for obj in mesh_objects:
-    for v in obj.bound_box:
-        world_v = obj.matrix_world @ Vector(v)
-        min_x = min(min_x, world_v.x)
-        min_y = min(min_y, world_v.y)
-        min_z = min(min_z, world_v.z)
-        max_x = max(max_x, world_v.x)
-        max_y = max(max_y, world_v.y)
-        max_z = max(max_z, world_v.z)
-
-center_x = (min_x + max_x) / 2
-center_y = (min_y + max_y) / 2
-center_z = (min_z + max_z) / 2
-size = max(max_x - min_x, max_y - min_y, max_z - min_z)
+# Get the bounds of all objects combined (all bounding box corners at once)
+metadata = keyframe_baker.gather_object_metadata(mesh_objects)
+_, _, bounds_center, size = keyframe_baker.combined_bounds(metadata["bound_boxes"], metadata["matrices"])
+center_x, center_y, center_z = (float(c) for c in bounds_center)
 center = Vector((center_x, center_y, center_z))
 
 # Position camera to see the entire animation
@@ -894,210 +622,25 @@ bpy.ops.object.empty_add(location=center)
 empty = bpy.context.active_object
 empty.name = "NetworkCenter"
 
-# Find node and connection objects
-# Typically, in network diagrams:
-# - Nodes are larger, more square/round objects
-# - Connections are longer, thinner objects (lines, arrows)
-nodes = []
-connections = []
-
-for obj in mesh_objects:
-    # Calculate aspect ratio to differentiate nodes from connections
-    dimensions = obj.dimensions
-    max_dim = max(dimensions)
-    min_dim = min(dimensions)
-    aspect_ratio = max_dim / min_dim if min_dim > 0 else float('inf')
-    
-    # If aspect ratio is high, it's likely a connection (line)
-    if aspect_ratio > 3.0:
-        connections.append(obj)
-    else:
-        nodes.append(obj)
-
-# If we couldn't identify nodes and connections, use a heuristic
-if not nodes or len(nodes) < len(mesh_objects) * 0.2:
-    # Sort objects by volume
-    volumes = [(obj, obj.dimensions.x * obj.dimensions.y * obj.dimensions.z) for obj in mesh_objects]
-    volumes.sort(key=lambda x: x[1], reverse=True)
-    
-    # Take the largest 1/3 as nodes, the rest as connections
-    node_count = max(1, len(mesh_objects) // 3)
-    nodes = [item[0] for item in volumes[:node_count]]
-    connections = [item[0] for item in volumes[node_count:]]
-
-# Apply materials
-# Nodes get one color, connections another
-for obj in nodes:
-    # Create new material for nodes
-    mat_name = f"NodeMaterial_{obj.name}"
-    mat = bpy.data.materials.new(name=mat_name)
-    mat.use_nodes = True
-    
-    # Get the principled BSDF node
-    principled = mat.node_tree.nodes.get('Principled BSDF')
-    if principled:
-        # Set initial values
-        principled.inputs['Base Color'].default_value = (0.2, 0.6, 0.9, 1.0)  # Blue for nodes
-        principled.inputs['Metallic'].default_value = 0.5
-        principled.inputs['Roughness'].default_value = 0.3
-        principled.inputs['Alpha'].default_value = 0.0  # Start transparent
-    
-    # Assign material to object
-    if obj.data.materials:
-        obj.data.materials[0] = mat
-    else:
-        obj.data.materials.append(mat)
-
-for obj in connections:
-    # Create new material for connections
-    mat_name = f"ConnectionMaterial_{obj.name}"
-    mat = bpy.data.materials.new(name=mat_name)
-    mat.use_nodes = True
-    
-    # Get the principled BSDF node
-    principled = mat.node_tree.nodes.get('Principled BSDF')
-    if principled:
-        # Set initial values
-        principled.inputs['Base Color'].default_value = (0.9, 0.5, 0.1, 1.0)  # Orange for connections
-        principled.inputs['Metallic'].default_value = 0.7
-        principled.inputs['Roughness'].default_value = 0.2
-        principled.inputs['Alpha'].default_value = 0.0  # Start transparent
-    
-    # Assign material to object
-    if obj.data.materials:
-        obj.data.materials[0] = mat
-    else:
-        obj.data.materials.append(mat)
-
-# Animation: Network activation sequence
+# Find node and connection objects and precompute the activation sequence:
 # 1. Nodes appear first
 # 2. Connections appear, simulating data flow
 # 3. Pulse effect through the network
+baked = keyframe_baker.network_keyframes(metadata["dimensions"], total_frames)
+nodes = [mesh_objects[i] for i in baked["nodes"]]
+connections = [mesh_objects[i] for i in baked["connections"]]
 
-# Fade in nodes
-node_appear_duration = int(total_frames * 0.3)
-node_fade_in_time = int(node_appear_duration * 0.6 / len(nodes))
-
-for i, obj in enumerate(nodes):
-    mat = obj.data.materials[0]
-    principled = mat.node_tree.nodes.get('Principled BSDF')
-    
-    # Calculate appearance frames
-    appear_start = i * node_fade_in_time + 1
-    appear_end = appear_start + node_fade_in_time
-    
-    # Fade in animation
-    principled.inputs['Alpha'].default_value = 0.0
-    principled.inputs['Alpha'].keyframe_insert(data_path="default_value", frame=appear_start)
-    
-    principled.inputs['Alpha'].default_value = 1.0
-    principled.inputs['Alpha'].keyframe_insert(data_path="default_value", frame=appear_end)
-    
-    # Scale animation
-    obj.scale = (0.1, 0.1, 0.1)  # Start small
-    obj.keyframe_insert(data_path="scale", frame=appear_start)
-    
-    obj.scale = (1.0, 1.0, 1.0)  # Normal scale
-    obj.keyframe_insert(data_path="scale", frame=appear_end)
-
-# After nodes appear, animate connections
-connection_start_frame = node_appear_duration
-connection_duration = int(total_frames * 0.3)
-connection_fade_in_time = int(connection_duration * 0.8 / max(1, len(connections)))
-
-for i, obj in enumerate(connections):
-    mat = obj.data.materials[0]
-    principled = mat.node_tree.nodes.get('Principled BSDF')
-    
-    # Calculate appearance frames
-    appear_start = connection_start_frame + i * connection_fade_in_time
-    appear_end = appear_start + connection_fade_in_time
-    
-    # Fade in animation
-    principled.inputs['Alpha'].default_value = 0.0
-    principled.inputs['Alpha'].keyframe_insert(data_path="default_value", frame=appear_start)
-    
-    principled.inputs['Alpha'].default_value = 1.0
-    principled.inputs['Alpha'].keyframe_insert(data_path="default_value", frame=appear_end)
-    
-    # Scale animation for connections (only in one dimension to simulate drawing)
-    # Determine the main axis of the connection
-    dimensions = obj.dimensions
-    main_axis = 0  # X axis by default
-    if dimensions.y > dimensions.x and dimensions.y > dimensions.z:
-        main_axis = 1  # Y axis
-    elif dimensions.z > dimensions.x and dimensions.z > dimensions.y:
-        main_axis = 2  # Z axis
-    
-    # Create a custom scale vector
-    scale_vector = [1.0, 1.0, 1.0]
-    scale_vector[main_axis] = 0.01  # Start very thin
-    
-    obj.scale = tuple(scale_vector)
-    obj.keyframe_insert(data_path="scale", frame=appear_start)
-    
-    obj.scale = (1.0, 1.0, 1.0)  # Normal scale
-    obj.keyframe_insert(data_path="scale", frame=appear_end)
+# Apply materials
+# Nodes get one color, connections another; both start transparent and
+# fade/pulse through object attributes
+node_material = keyframe_baker.create_shared_material("NodeMaterial", metallic=0.5, roughness=0.3)
+keyframe_baker.assign_shared_material(nodes, node_material, color=(0.2, 0.6, 0.9, 0.0))  # Blue for nodes
 
-# Network pulse animation after all elements are visible
-pulse_start_frame = connection_start_frame + connection_duration
-pulse_duration = total_frames - pulse_start_frame - int(total_frames * 0.1)
-pulse_count = 2  # Number of pulses to show
+connection_material = keyframe_baker.create_shared_material("ConnectionMaterial", metallic=0.7, roughness=0.2)
+keyframe_baker.assign_shared_material(connections, connection_material, color=(0.9, 0.5, 0.1, 0.0))  # Orange for connections
 
-for pulse in range(pulse_count):
-    pulse_cycle_frames = pulse_duration / pulse_count
-    
-    # Animate through nodes with a pulse effect
-    for i, obj in enumerate(nodes):
-        # Calculate time offset for each node to create wave effect
-        offset = i * (pulse_cycle_frames * 0.8 / len(nodes))
-        
-        mat = obj.data.materials[0]
-        principled = mat.node_tree.nodes.get('Principled BSDF')
-        
-        # Normal color
-        principled.inputs['Emission'].default_value = (0, 0, 0, 1)
-        principled.inputs['Emission Strength'].default_value = 0
-        principled.inputs['Emission'].keyframe_insert(data_path="default_value", frame=pulse_start_frame + offset + pulse * pulse_cycle_frames)
-        principled.inputs['Emission Strength'].keyframe_insert(data_path="default_value", frame=pulse_start_frame + offset + pulse * pulse_cycle_frames)
-        
-        # Pulse color (glow effect)
-        principled.inputs['Emission'].default_value = (0.2, 0.8, 1.0, 1)  # Bright blue
-        principled.inputs['Emission Strength'].default_value = 2.0
-        principled.inputs['Emission'].keyframe_insert(data_path="default_value", frame=pulse_start_frame + offset + pulse_cycle_frames * 0.2 + pulse * pulse_cycle_frames)
-        principled.inputs['Emission Strength'].keyframe_insert(data_path="default_value", frame=pulse_start_frame + offset + pulse_cycle_frames * 0.2 + pulse * pulse_cycle_frames)
-        
-        # Back to normal
-        principled.inputs['Emission'].default_value = (0, 0, 0, 1)
-        principled.inputs['Emission Strength'].default_value = 0
-        principled.inputs['Emission'].keyframe_insert(data_path="default_value", frame=pulse_start_frame + offset + pulse_cycle_frames * 0.4 + pulse * pulse_cycle_frames)
-        principled.inputs['Emission Strength'].keyframe_insert(data_path="default_value", frame=pulse_start_frame + offset + pulse_cycle_frames * 0.4 + pulse * pulse_cycle_frames)
-
-    # Animate connections with pulse effect following nodes
-    for i, obj in enumerate(connections):
-        # Calculate time offset for each connection
-        offset = (i + len(nodes) * 0.8) * (pulse_cycle_frames * 0.8 / (len(nodes) + len(connections)))
-        
-        mat = obj.data.materials[0]
-        principled = mat.node_tree.nodes.get('Principled BSDF')
-        
-        # Normal color
-        principled.inputs['Emission'].default_value = (0, 0, 0, 1)
-        principled.inputs['Emission Strength'].default_value = 0
-        principled.inputs['Emission'].keyframe_insert(data_path="default_value", frame=pulse_start_frame + offset + pulse * pulse_cycle_frames)
-        principled.inputs['Emission Strength'].keyframe_insert(data_path="default_value", frame=pulse_start_frame + offset + pulse * pulse_cycle_frames)
-        
-        # Pulse color (glow effect)
-        principled.inputs['Emission'].default_value = (1.0, 0.6, 0.2, 1)  # Bright orange
-        principled.inputs['Emission Strength'].default_value = 2.0
-        principled.inputs['Emission'].keyframe_insert(data_path="default_value", frame=pulse_start_frame + offset + pulse_cycle_frames * 0.2 + pulse * pulse_cycle_frames)
-        principled.inputs['Emission Strength'].keyframe_insert(data_path="default_value", frame=pulse_start_frame + offset + pulse_cycle_frames * 0.2 + pulse * pulse_cycle_frames)
-        
-        # Back to normal
-        principled.inputs['Emission'].default_value = (0, 0, 0, 1)
-        principled.inputs['Emission Strength'].default_value = 0
-        principled.inputs['Emission'].keyframe_insert(data_path="default_value", frame=pulse_start_frame + offset + pulse_cycle_frames * 0.4 + pulse * pulse_cycle_frames)
-        principled.inputs['Emission Strength'].keyframe_insert(data_path="default_value", frame=pulse_start_frame + offset + pulse_cycle_frames * 0.4 + pulse * pulse_cycle_frames)
+# Animation: Network activation sequence
+keyframe_baker.apply_channels(mesh_objects, baked["channels"])
 
 # Camera animation: Slow rotation around the network
 empty.keyframe_insert(data_path="rotation_euler", frame=1)
@@ -1111,8 +654,8 @@ empty.keyframe_insert(data_path="rotation_euler", frame=int(total_frames * 0.66)
 empty.rotation_euler = (0, 0, math.radians(360))
 empty.keyframe_insert(data_path="rotation_euler", frame=total_frames)
 
-# Add easing to all animations
-for obj in mesh_objects + [empty, camera]:
+# Add easing to the rotation and camera animation
+for obj in [empty, camera]:
     if obj.animation_data and obj.animation_data.action:
         for fcurve in obj.animation_data.action.fcurves:
             for kf in fcurve.keyframe_points:
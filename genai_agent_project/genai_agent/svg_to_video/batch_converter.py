@@ -0,0 +1,229 @@
+"""
+Multi-file SVG to 3D batch conversion.
+
+Converting files one at a time launches a fresh Blender process per SVG, so
+a folder of hundreds of diagrams spends most of its time in Blender startup.
+This module shards the file list across a small number of long-lived Blender
+processes instead. Each process runs ``scripts/svg_to_3d_blender_batch.py``,
+converts its shard in a loop (resetting the scene between files), and prints
+one JSON result line per file, which is streamed back to the caller as soon
+as it is written.
+"""
+
+import os
+import json
+import time
+import queue
+import logging
+import tempfile
+import threading
+import subprocess
+from typing import Any, Dict, Iterator, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Prefix that marks a per-file result line in the Blender output
+RESULT_PREFIX = "[SVG2-3D-BATCH] "
+
+# Blender-side script that converts a manifest of files
+DEFAULT_BATCH_SCRIPT = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "scripts", "svg_to_3d_blender_batch.py"
+))
+
+
+def shard_files(jobs: List[Dict[str, Any]], shards: int) -> List[List[Dict[str, Any]]]:
+    """
+    Split jobs into interleaved shards.
+
+    Interleaving keeps shards balanced when the input is sorted by size or
+    complexity.
+
+    Args:
+        jobs: List of conversion jobs
+        shards: Maximum number of shards
+
+    Returns:
+        List of non-empty shards
+    """
+    shards = max(1, min(shards, len(jobs)))
+    return [jobs[i::shards] for i in range(shards) if jobs[i::shards]]
+
+
+def parse_result_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a per-file result line from the Blender output.
+
+    Args:
+        line: A line of Blender stdout
+
+    Returns:
+        Result dictionary, or None if the line is not a result line
+    """
+    line = line.strip()
+    if not line.startswith(RESULT_PREFIX):
+        return None
+
+    try:
+        return json.loads(line[len(RESULT_PREFIX):])
+    except json.JSONDecodeError:
+        logger.warning(f"Malformed batch result line: {line}")
+        return None
+
+
+class BlenderBatchConverter:
+    """
+    Convert many SVG files inside a few long-lived Blender processes.
+
+    Failures are isolated per file: a file that fails to convert is reported
+    as an error and the process moves on, and if a Blender process dies the
+    file it was working on is reported as failed and a new process is started
+    for the rest of the shard.
+    """
+
+    def __init__(self, blender_path: Optional[str] = None, processes: int = 2,
+                 script_path: Optional[str] = None, options: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the batch converter.
+
+        Args:
+            blender_path: Path to the Blender executable (defaults to BLENDER_PATH)
+            processes: Number of Blender processes to run in parallel
+            script_path: Blender-side batch script
+            options: Conversion options passed to every file (extrude_depth, ...)
+        """
+        self.blender_path = blender_path or os.environ.get("BLENDER_PATH", "blender")
+        self.processes = max(1, processes)
+        self.script_path = script_path or DEFAULT_BATCH_SCRIPT
+        self.options = options or {}
+
+    def convert(self, jobs: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Convert a batch of files, yielding per-file results as they finish.
+
+        Args:
+            jobs: List of dictionaries with ``svg_path`` and ``output_path``
+
+        Yields:
+            Result dictionaries with ``svg_path``, ``output_path``, ``status``
+            (``"success"`` or ``"error"``), ``error`` and ``elapsed``
+        """
+        if not jobs:
+            return
+
+        results = queue.Queue()
+        shards = shard_files(jobs, self.processes)
+        logger.info(f"Converting {len(jobs)} SVG files in {len(shards)} Blender processes")
+
+        threads = []
+        for index, shard in enumerate(shards):
+            thread = threading.Thread(
+                target=self._run_shard,
+                args=(index, shard, results),
+                name=f"blender-batch-{index}",
+                daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+
+        for _ in range(len(jobs)):
+            yield results.get()
+
+        for thread in threads:
+            thread.join()
+
+    def _build_command(self, manifest_path: str) -> List[str]:
+        """
+        Build the command line for one Blender process.
+
+        Args:
+            manifest_path: Path to the shard manifest
+
+        Returns:
+            Command as a list of arguments
+        """
+        return [
+            self.blender_path, "--background", "--factory-startup",
+            "--python", self.script_path, "--", manifest_path
+        ]
+
+    def _run_shard(self, index: int, shard: List[Dict[str, Any]], results: queue.Queue):
+        """Convert one shard, restarting Blender for the remainder if it dies."""
+        remaining = list(shard)
+
+        while remaining:
+            try:
+                reported = self._run_process(index, remaining, results)
+            except OSError as e:
+                logger.error(f"Could not start Blender process {index}: {str(e)}")
+                for job in remaining:
+                    results.put(self._error_result(job, f"Could not start Blender: {str(e)}"))
+                return
+
+            remaining = remaining[reported:]
+
+            if remaining:
+                # The process exited before reporting this file; treat the
+                # file as the cause and continue with the rest of the shard
+                failed = remaining.pop(0)
+                logger.error(f"Blender process {index} exited while converting {failed['svg_path']}")
+                results.put(self._error_result(failed, "Blender process exited during conversion"))
+
+    @staticmethod
+    def _error_result(job: Dict[str, Any], error: str) -> Dict[str, Any]:
+        """Build a failed result for a job that produced no result line."""
+        return {
+            "svg_path": job["svg_path"],
+            "output_path": job["output_path"],
+            "status": "error",
+            "error": error,
+            "elapsed": None
+        }
+
+    def _run_process(self, index: int, jobs: List[Dict[str, Any]], results: queue.Queue) -> int:
+        """
+        Run one Blender process over a list of jobs.
+
+        Args:
+            index: Shard index (for logging)
+            jobs: Jobs for this process
+            results: Queue that receives per-file results
+
+        Returns:
+            Number of jobs the process reported a result for
+
+        Raises:
+            OSError: If the Blender process could not be started
+        """
+        fd, manifest_path = tempfile.mkstemp(prefix=f"svg2_3d_batch_{index}_", suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"options": self.options, "jobs": jobs}, f)
+
+        reported = 0
+        start = time.time()
+        try:
+            process = subprocess.Popen(
+                self._build_command(manifest_path),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace"
+            )
+
+            for line in process.stdout:
+                result = parse_result_line(line)
+                if result is None:
+                    continue
+                results.put(result)
+                reported += 1
+
+            process.wait()
+            logger.info(f"Blender process {index} converted {reported}/{len(jobs)} files "
+                        f"in {time.time() - start:.1f}s (exit code {process.returncode})")
+        finally:
+            try:
+                os.remove(manifest_path)
+            except OSError:
+                pass
+
+        return reported
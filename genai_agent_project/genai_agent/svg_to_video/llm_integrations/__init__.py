@@ -9,10 +9,12 @@ This package provides multiple integration methods for LLMs:
 
 from .llm_factory import LLMFactory, get_llm_factory
 from .claude_direct import ClaudeDirectSVGGenerator, get_claude_direct
+from .provider_router import ProviderRouter
 
 __all__ = [
     'LLMFactory',
     'get_llm_factory',
     'ClaudeDirectSVGGenerator',
-    'get_claude_direct'
+    'get_claude_direct',
+    'ProviderRouter'
 ]
@@ -10,9 +10,14 @@ import requests
 import json
 import logging
 import time
-from typing import Dict, Any, Optional, List, Tuple
+import asyncio
+import threading
+from typing import Dict, Any, Optional, List, Tuple, Iterator, AsyncIterator
 import re
 
+from ...services.llm_limiter import estimate_tokens, get_llm_limiter, retry_after_seconds
+from ...services.prompt_prefix import PrefixedPrompt, anthropic_messages, get_prefix_stats, split_prompt
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -105,6 +110,39 @@ class ClaudeDirectSVGGenerator:
             lambda: self.generate_svg(concept, style, temperature)
         )
     
+    def generate_text(self, prompt: str, temperature: float = 0.2, max_tokens: int = 4000) -> str:
+        """
+        Generate text for a prompt, without SVG-specific prompting or extraction.
+        
+        Args:
+            prompt: The prompt for Claude
+            temperature: Temperature for generation (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
+            
+        Returns:
+            The response text
+        """
+        response = self._call_claude_api(prompt, temperature, max_tokens)
+        return "".join(item.get("text", "") for item in response.get("content", []) if item.get("type") == "text")
+    
+    async def generate_text_async(self, prompt: str, temperature: float = 0.2, max_tokens: int = 4000) -> str:
+        """
+        Generate text for a prompt asynchronously.
+        
+        Args:
+            prompt: The prompt for Claude
+            temperature: Temperature for generation (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
+            
+        Returns:
+            The response text
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: self.generate_text(prompt, temperature, max_tokens)
+        )
+    
     def _create_svg_prompt(self, concept: str, style: Optional[str] = None) -> str:
         """
         Create a more detailed prompt for Claude to generate better SVGs.
@@ -114,7 +152,8 @@ class ClaudeDirectSVGGenerator:
             style: Optional style guideline
             
         Returns:
-            A prompt string for Claude
+            A prompt for Claude: the instructions for the diagram type form a
+            cacheable prefix, the concept the suffix
         """
         # Determine specific diagram type based on style
         diagram_specific_instructions = ""
@@ -186,10 +225,8 @@ class ClaudeDirectSVGGenerator:
 - Create a visually balanced layout
             """
         
-        base_prompt = f"""
-I need you to create a detailed, professional-quality SVG diagram to visualize this concept:
-
-{concept}
+        prefix = f"""
+I need you to create a detailed, professional-quality SVG diagram to visualize the concept given at the end.
 
 Requirements:
 1. Generate ONLY valid SVG code - no explanations, markdown, or other content
@@ -213,22 +250,29 @@ Your response should contain ONLY the raw SVG code without any additional text,
 Make this a high-quality diagram that could be used in a professional presentation or documentation.
 """
         
+        suffix = f"""
+Concept to visualize:
+
+{concept}
+"""
         if style and not diagram_specific_instructions:
-            base_prompt += f"\nAdditional style guidelines: {style}"
+            suffix += f"\nAdditional style guidelines: {style}"
         
+        base_prompt = PrefixedPrompt(prefix, suffix)
         logger.debug(f"Created detailed SVG prompt: {base_prompt[:200]}...")
         return base_prompt
     
-    def _call_claude_api(self, prompt: str, temperature: float = 0.2) -> Dict[str, Any]:
+    def _build_request(self, prompt: str, temperature: float, max_tokens: int) -> Tuple[Dict[str, str], Dict[str, Any]]:
         """
-        Call the Claude API with the given prompt.
+        Build the headers and payload of a Messages API request.
         
         Args:
             prompt: The prompt for Claude
             temperature: Temperature for generation (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
             
         Returns:
-            The Claude API response as a dictionary
+            Tuple of (headers, payload)
         """
         headers = {
             "x-api-key": self.api_key,
@@ -238,22 +282,136 @@ Make this a high-quality diagram that could be used in a professional presentati
         
         payload = {
             "model": self.model,
-            "max_tokens": 4000,
+            "max_tokens": max_tokens,
             "temperature": temperature,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ]
+            **anthropic_messages(prompt)
         }
+        return headers, payload
+    
+    def stream_text(self, prompt: str, temperature: float = 0.2, max_tokens: int = 4000) -> Iterator[str]:
+        """
+        Stream the response text for a prompt as it is generated.
+        
+        Closing the generator closes the connection, which stops the generation.
+        
+        Args:
+            prompt: The prompt for Claude
+            temperature: Temperature for generation (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
+            
+        Yields:
+            Text deltas
+        """
+        headers, payload = self._build_request(prompt, temperature, max_tokens)
+        payload["stream"] = True
+        
+        logger.info(f"Streaming from Claude API with model: {self.model}")
+        with get_llm_limiter().limit_sync("anthropic", self.model, estimate_tokens(prompt, max_tokens)):
+            try:
+                response = requests.post(self.api_url, headers=headers, json=payload, stream=True, timeout=180)
+                self._check_rate_limit(response)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Error calling Claude API: {e}")
+                raise ValueError(f"Failed to generate text: {str(e)}")
+            
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[5:])
+                    event_type = event.get("type")
+                    if event_type == "message_start" and split_prompt(prompt)[0]:
+                        get_prefix_stats().record_anthropic_usage(event.get("message", {}).get("usage"))
+                    elif event_type == "content_block_delta":
+                        yield event.get("delta", {}).get("text", "")
+                    elif event_type == "error":
+                        raise ValueError(f"Claude API error: {event.get('error', {}).get('message', event)}")
+                    elif event_type == "message_stop":
+                        break
+            finally:
+                response.close()
+    
+    async def stream_text_async(self, prompt: str, temperature: float = 0.2, max_tokens: int = 4000) -> AsyncIterator[str]:
+        """
+        Stream the response text for a prompt asynchronously.
+        
+        The blocking stream is read in a worker thread. When the consumer stops
+        early, the thread closes the connection at the next chunk.
+        
+        Args:
+            prompt: The prompt for Claude
+            temperature: Temperature for generation (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
+            
+        Yields:
+            Text deltas
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+        
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # Event loop already closed
+                stop.set()
+        
+        def produce():
+            stream = self.stream_text(prompt, temperature, max_tokens)
+            try:
+                for text in stream:
+                    if stop.is_set():
+                        break
+                    put(text)
+            except Exception as e:
+                put(e)
+            finally:
+                stream.close()
+                put(done)
+        
+        loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+    
+    def _call_claude_api(self, prompt: str, temperature: float = 0.2, max_tokens: int = 4000) -> Dict[str, Any]:
+        """
+        Call the Claude API with the given prompt.
+        
+        Args:
+            prompt: The prompt for Claude
+            temperature: Temperature for generation (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
+            
+        Returns:
+            The Claude API response as a dictionary
+        """
+        headers, payload = self._build_request(prompt, temperature, max_tokens)
         
         try:
             logger.info(f"Calling Claude API with model: {self.model}")
             logger.info(f"Using API key: {self.api_key[:8]}...")
-            start_time = time.time()
-            response = requests.post(self.api_url, headers=headers, json=payload, timeout=180)
+            with get_llm_limiter().limit_sync("anthropic", self.model, estimate_tokens(prompt, max_tokens)):
+                start_time = time.time()
+                response = requests.post(self.api_url, headers=headers, json=payload, timeout=180)
+            self._check_rate_limit(response)
             response.raise_for_status()
             end_time = time.time()
             logger.info(f"Claude API call completed in {end_time - start_time:.2f} seconds")
-            return response.json()
+            data = response.json()
+            if split_prompt(prompt)[0]:
+                get_prefix_stats().record_anthropic_usage(data.get("usage"))
+            return data
         except requests.exceptions.RequestException as e:
             logger.error(f"Error calling Claude API: {e}")
             if hasattr(e, 'response') and e.response:
@@ -261,6 +419,16 @@ Make this a high-quality diagram that could be used in a professional presentati
                 logger.error(f"Response body: {e.response.text}")
             raise ValueError(f"Failed to generate SVG: {str(e)}")
     
+    def _check_rate_limit(self, response: requests.Response) -> None:
+        """
+        Pause further Claude requests after a rate limit (429) or overloaded (529) response.
+        
+        Args:
+            response: The Claude API response
+        """
+        if response.status_code in (429, 529):
+            get_llm_limiter().backoff("anthropic", self.model, retry_after_seconds(response.headers))
+    
     def _extract_svg(self, response: Dict[str, Any]) -> str:
         """
         Extract the SVG content from the Claude API response.
@@ -8,9 +8,12 @@ Supports Claude, OpenAI, and Ollama models for SVG generation.
 import os
 import logging
 import asyncio
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, AsyncIterator
 from pathlib import Path
 
+from ...services.llm_limiter import estimate_tokens, get_llm_limiter, retry_after_seconds
+from .provider_router import is_rate_limit_error
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -310,12 +313,15 @@ class LangChainLLMService:
                 messages = [HumanMessage(content=prompt)]
                 
                 # Generate response
-                response = await llm.agenerate([messages])
+                async with self._limit(provider, llm, prompt):
+                    response = await llm.agenerate([messages])
                 
                 # Extract and return the text content
                 return response.generations[0][0].text
                 
             except Exception as e:
+                if is_rate_limit_error(e):
+                    self._backoff(provider, llm, e)
                 if attempt < max_retries:
                     logger.warning(f"Generation error, retrying ({attempt+1}/{max_retries}): {str(e)}")
                     await asyncio.sleep(1)  # Add a small delay before retrying
@@ -326,6 +332,73 @@ class LangChainLLMService:
         if temperature != 0.7 and hasattr(llm, "temperature"):
             llm.temperature = original_temperature
     
+    async def stream_text(
+        self,
+        prompt: str,
+        provider: str = None,
+        temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """
+        Stream text from the specified LLM provider as it is generated.
+        
+        Providers without streaming support yield the whole response at once.
+        
+        Args:
+            prompt: The prompt to send to the LLM
+            provider: The LLM provider to use
+            temperature: Temperature for generation (0.0 to 1.0)
+            
+        Yields:
+            Text chunks
+            
+        Raises:
+            ValueError: If no providers are available
+        """
+        if not self.providers:
+            raise ValueError("No LLM providers available. Please check API keys.")
+        
+        if not provider or provider not in self.providers:
+            provider = list(self.providers.keys())[0]
+            logger.warning(f"Requested provider not available, using {provider} instead")
+        
+        llm = self.providers[provider]
+        if not hasattr(llm, "astream"):
+            yield await self.generate_text(prompt, provider, temperature)
+            return
+        
+        original_temperature = getattr(llm, "temperature", None)
+        if original_temperature is not None:
+            llm.temperature = temperature
+        try:
+            async with self._limit(provider, llm, prompt):
+                try:
+                    async for chunk in llm.astream([HumanMessage(content=prompt)]):
+                        yield chunk.content
+                except Exception as e:
+                    if is_rate_limit_error(e):
+                        self._backoff(provider, llm, e)
+                    raise
+        finally:
+            if original_temperature is not None:
+                llm.temperature = original_temperature
+    
+    def _limiter_key(self, provider: str, llm: Any):
+        """Limiter provider name and model for a LangChain provider."""
+        model = getattr(llm, "model_name", None) or getattr(llm, "model", None)
+        return ("anthropic" if provider == "claude" else provider), model
+    
+    def _limit(self, provider: str, llm: Any, prompt: str):
+        """Admission to the shared LLM limiter for one request."""
+        limiter_provider, model = self._limiter_key(provider, llm)
+        max_tokens = getattr(llm, "max_tokens", None) or getattr(llm, "max_tokens_to_sample", None) or 0
+        return get_llm_limiter().limit(limiter_provider, model, estimate_tokens(prompt, max_tokens))
+    
+    def _backoff(self, provider: str, llm: Any, error: Exception):
+        """Pause a provider in the shared limiter after a rate limit error."""
+        limiter_provider, model = self._limiter_key(provider, llm)
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        get_llm_limiter().backoff(limiter_provider, model, retry_after_seconds(headers))
+    
     def get_available_providers(self) -> List[str]:
         """
         Get a list of available providers.
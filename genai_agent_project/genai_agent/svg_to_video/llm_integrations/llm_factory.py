@@ -12,11 +12,14 @@ import os
 import logging
 import importlib.util
 import asyncio
-from typing import Dict, Any, List, Optional, Union
+import time
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
 
 # Import integrations
 from .claude_direct import get_claude_direct, ClaudeDirectSVGGenerator
 from .redis_llm_service import get_redis_llm_service, RedisLLMServiceWrapper
+from .provider_router import ProviderRouter
+from ...services.prompt_prefix import PrefixedPrompt
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -30,6 +33,20 @@ except ImportError:
     LANGCHAIN_AVAILABLE = False
     logger.warning("LangChain integration not available")
 
+# Fixed instructions of the SVG prompt, sent as a cacheable prefix
+SVG_PROMPT_PREFIX = """
+Create an SVG diagram that represents the concept given below.
+
+Requirements:
+- Use standard SVG elements (rect, circle, path, text, etc.)
+- Include appropriate colors and styling
+- Ensure the diagram is clear and readable
+- Add proper text labels
+- Use viewBox="0 0 800 600" for dimensions
+- Wrap the entire SVG in <svg> tags
+- Do not include any explanation, just the SVG code
+"""
+
 class LLMFactory:
     """
     Factory class for managing LLM integrations for SVG generation.
@@ -54,6 +71,13 @@ class LLMFactory:
         self.langchain_service = None
         self.claude_direct = None
         
+        # Time-to-valid-SVG statistics per provider
+        self.svg_timings: Dict[str, Dict[str, Any]] = {}
+        
+        # Latency-aware routing between providers
+        self.router = ProviderRouter()
+        self.custom_providers: Dict[str, Any] = {}
+        
         # Initialize integrations based on settings
         self._initialize_integrations()
     
@@ -136,24 +160,15 @@ class LLMFactory:
         
         return provider_list
     
-    async def generate_svg(
-        self, 
-        provider: str, 
-        concept: str, 
-        style: Optional[str] = None, 
-        temperature: float = 0.7
-    ) -> str:
+    def _resolve_provider(self, provider: str) -> Tuple[str, Dict[str, Any]]:
         """
-        Generate an SVG diagram using the specified provider.
+        Look up a provider, falling back to the first available one.
         
         Args:
             provider: Provider ID to use
-            concept: The concept to visualize
-            style: Optional style guidelines
-            temperature: Temperature for generation
             
         Returns:
-            The generated SVG content
+            Tuple of (provider ID, provider info)
             
         Raises:
             ValueError: If the provider is not available
@@ -171,63 +186,368 @@ class LLMFactory:
         if not provider_info.get("available", False):
             raise ValueError(f"Provider {provider} is not available")
         
-        # Prepare prompt for SVG generation
-        svg_prompt = f"""
-Create an SVG diagram that represents the following concept:
-
-{concept}
-
-Requirements:
-- Use standard SVG elements (rect, circle, path, text, etc.)
-- Include appropriate colors and styling
-- Ensure the diagram is clear and readable
-- Add proper text labels
-- Use viewBox="0 0 800 600" for dimensions
-- Wrap the entire SVG in <svg> tags
-- Do not include any explanation, just the SVG code
-
-{f"Style guidelines: {style}" if style else ""}
-
-SVG Diagram:
-"""
+        return provider, provider_info
+    
+    async def _route(self, provider: Optional[str], request, hedge: Optional[bool] = None):
+        """
+        Run a request through the provider router.
         
+        Args:
+            provider: Provider requested by the caller (None or unknown: best available)
+            request: Coroutine function taking the provider ID to use
+            hedge: Override the router's hedging setting
+            
+        Returns:
+            The result of the first successful request
+        """
+        candidates = [provider_id for provider_id, info in self.providers.items() if info.get("available", False)]
+        if not candidates:
+            raise ValueError("No LLM providers available")
+        if provider and provider not in self.providers:
+            logger.warning(f"Provider {provider} not found, routing to the best available provider")
+        return await self.router.call(candidates, request, preferred=provider, hedge=hedge)
+    
+    def register_provider(self, provider_id: str, client: Any, name: Optional[str] = None,
+                          description: Optional[str] = None):
+        """
+        Register a provider backed by a custom client.
+        
+        The client needs an async generate_text(prompt, temperature, max_tokens)
+        method and may provide an async generator stream_text with the same
+        arguments.
+        
+        Args:
+            provider_id: Provider ID
+            client: Client object
+            name: Display name
+            description: Description
+        """
+        self.custom_providers[provider_id] = client
+        self.providers[provider_id] = {
+            "name": name or provider_id,
+            "description": description or f"Custom provider {provider_id}",
+            "available": True,
+            "integration_type": "custom"
+        }
+    
+    def get_provider_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the router's latency and health statistics per provider.
+        
+        Returns:
+            Dictionary of provider ID to samples, error rate, p50/p95 latency and health
+        """
+        return self.router.snapshot()
+    
+    async def generate_text(
+        self,
+        provider: str,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4000
+    ) -> str:
+        """
+        Generate text for a prompt using the specified provider.
+        
+        The request is routed by the provider router: the requested provider
+        while it is healthy, otherwise the fastest healthy one, with failover
+        and optional hedging (see ProviderRouter).
+        
+        Args:
+            provider: Provider ID to use
+            prompt: The prompt to send
+            temperature: Temperature for generation
+            max_tokens: Maximum number of tokens to generate (direct integration only)
+            
+        Returns:
+            The generated text
+            
+        Raises:
+            ValueError: If no provider is available
+        """
+        return await self._route(
+            provider,
+            lambda routed: self._generate_text(routed, prompt, temperature, max_tokens)
+        )
+    
+    async def _generate_text(self, provider: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        """Generate text with one specific provider."""
+        provider, provider_info = self._resolve_provider(provider)
         integration_type = provider_info.get("integration_type")
         
         try:
-            # Handle different integration types
-            if integration_type == "redis" and self.redis_service:
-                response = await self.redis_service.generate_text(
-                    prompt=svg_prompt,
+            if integration_type == "custom":
+                return await self.custom_providers[provider].generate_text(prompt, temperature, max_tokens)
+            
+            elif integration_type == "redis" and self.redis_service:
+                return await self.redis_service.generate_text(
+                    prompt=prompt,
                     provider=provider,
                     temperature=temperature
                 )
-                return response
             
             elif integration_type == "langchain" and self.langchain_service:
-                # Extract the actual provider name (remove "langchain-" prefix)
-                langchain_provider = provider.replace("langchain-", "")
-                response = await self.langchain_service.generate_text(
-                    prompt=svg_prompt,
-                    provider=langchain_provider,
+                return await self.langchain_service.generate_text(
+                    prompt=prompt,
+                    provider=provider.replace("langchain-", ""),
                     temperature=temperature
                 )
-                return response
             
             elif integration_type == "direct" and self.claude_direct:
-                response = await self.claude_direct.generate_svg_async(
-                    concept=concept,
-                    style=style,
-                    temperature=temperature
+                return await self.claude_direct.generate_text_async(
+                    prompt=prompt,
+                    temperature=temperature,
+                    max_tokens=max_tokens
                 )
-                return response
             
             else:
                 raise ValueError(f"Cannot handle provider {provider} with integration type {integration_type}")
             
+        except Exception as e:
+            logger.error(f"Error generating text with provider {provider}: {str(e)}")
+            raise
+    
+    async def generate_svg(
+        self, 
+        provider: str, 
+        concept: str, 
+        style: Optional[str] = None, 
+        temperature: float = 0.7,
+        mode: Optional[str] = None
+    ) -> str:
+        """
+        Generate an SVG diagram using the specified provider.
+        
+        Args:
+            provider: Provider ID to use
+            concept: The concept to visualize
+            style: Optional style guidelines (or diagram type in graph mode)
+            temperature: Temperature for generation
+            mode: "svg" to have the LLM write the SVG markup, or "graph" to have it
+                return a compact JSON graph that is laid out and rendered locally
+                (defaults to the SVG_GENERATION_MODE environment variable, then "svg")
+            
+        Returns:
+            The generated SVG content
+            
+        Raises:
+            ValueError: If the provider is not available
+        """
+        mode = (mode or os.environ.get("SVG_GENERATION_MODE", "svg")).lower()
+        if mode == "graph":
+            return await self.generate_graph_svg(provider, concept, style, temperature)
+        
+        try:
+            return await self._route(
+                provider,
+                lambda routed: self.stream_svg(routed, self._svg_prompt(routed, concept, style), temperature)
+            )
         except Exception as e:
             logger.error(f"Error generating SVG with provider {provider}: {str(e)}")
             raise
     
+    def _svg_prompt(self, provider: str, concept: str, style: Optional[str] = None) -> str:
+        """
+        Build the SVG generation prompt for a provider.
+        
+        Args:
+            provider: Provider ID the prompt is for
+            concept: The concept to visualize
+            style: Optional style guidelines
+            
+        Returns:
+            The prompt
+        """
+        if self.providers[provider].get("integration_type") == "direct" and self.claude_direct:
+            # The direct integration uses its own, more detailed SVG prompt
+            return self.claude_direct._create_svg_prompt(concept, style)
+        
+        return PrefixedPrompt(SVG_PROMPT_PREFIX, f"""
+Concept:
+
+{concept}
+
+{f"Style guidelines: {style}" if style else ""}
+
+SVG Diagram:
+""")
+    
+    async def stream_text(
+        self,
+        provider: str,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4000
+    ) -> AsyncIterator[str]:
+        """
+        Stream text for a prompt using the specified provider.
+        
+        Integrations without streaming support (the Redis LLM service) yield
+        the whole response at once.
+        
+        Args:
+            provider: Provider ID to use
+            prompt: The prompt to send
+            temperature: Temperature for generation
+            max_tokens: Maximum number of tokens to generate (direct integration only)
+            
+        Yields:
+            Text chunks
+            
+        Raises:
+            ValueError: If the provider is not available
+        """
+        provider, provider_info = self._resolve_provider(provider)
+        integration_type = provider_info.get("integration_type")
+        
+        if integration_type == "custom" and hasattr(self.custom_providers[provider], "stream_text"):
+            stream = self.custom_providers[provider].stream_text(prompt, temperature, max_tokens)
+        elif integration_type == "direct" and self.claude_direct:
+            stream = self.claude_direct.stream_text_async(prompt, temperature, max_tokens)
+        elif integration_type == "langchain" and self.langchain_service:
+            stream = self.langchain_service.stream_text(prompt, provider.replace("langchain-", ""), temperature)
+        else:
+            yield await self._generate_text(provider, prompt, temperature, max_tokens)
+            return
+        
+        try:
+            async for text in stream:
+                yield text
+        finally:
+            await stream.aclose()
+    
+    async def stream_svg(self, provider: str, prompt: str, temperature: float = 0.7) -> str:
+        """
+        Stream an SVG response, stopping as soon as it is complete.
+        
+        The response is checked for well-formedness as it arrives: the request
+        is closed when the root </svg> closes, dropping any trailing text, and
+        aborted as soon as the markup is malformed. Time to valid SVG is
+        recorded per provider (see get_svg_timings).
+        
+        Args:
+            provider: Provider ID to use
+            prompt: The SVG generation prompt
+            temperature: Temperature for generation
+            
+        Returns:
+            The SVG markup, from <svg to </svg>
+            
+        Raises:
+            MalformedSVGError: If the response is not well-formed SVG
+        """
+        # Imported here: the svg_generator package imports this module
+        from ..svg_generator.svg_stream import SVGStreamValidator
+        
+        provider, _ = self._resolve_provider(provider)
+        validator = SVGStreamValidator()
+        start = time.perf_counter()
+        first_chunk = None
+        
+        stream = self.stream_text(provider, prompt, temperature)
+        try:
+            async for text in stream:
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+                if validator.feed(text):
+                    break
+            svg = validator.close()
+        except Exception:
+            self._record_svg_timing(provider, None, first_chunk)
+            raise
+        finally:
+            await stream.aclose()
+        
+        elapsed = time.perf_counter() - start
+        self._record_svg_timing(provider, elapsed, first_chunk)
+        logger.info(f"Valid SVG from {provider} in {elapsed:.2f}s "
+                    f"(first chunk {first_chunk:.2f}s, {len(svg)} chars)")
+        return svg
+    
+    def _record_svg_timing(self, provider: str, elapsed: Optional[float], first_chunk: Optional[float]):
+        """Add one SVG generation to the per-provider timings (elapsed None = failed)."""
+        timing = self.svg_timings.setdefault(provider, {
+            "count": 0,
+            "failures": 0,
+            "total_seconds": 0.0,
+            "min_seconds": None,
+            "max_seconds": None,
+            "last_seconds": None,
+            "total_first_chunk_seconds": 0.0,
+        })
+        if elapsed is None:
+            timing["failures"] += 1
+            return
+        
+        timing["count"] += 1
+        timing["total_seconds"] += elapsed
+        timing["min_seconds"] = elapsed if timing["min_seconds"] is None else min(timing["min_seconds"], elapsed)
+        timing["max_seconds"] = elapsed if timing["max_seconds"] is None else max(timing["max_seconds"], elapsed)
+        timing["last_seconds"] = elapsed
+        timing["total_first_chunk_seconds"] += first_chunk or 0.0
+    
+    def get_svg_timings(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get time-to-valid-SVG statistics per provider.
+        
+        Returns:
+            Dictionary of provider ID to count, failures, mean/min/max/last
+            seconds to a valid SVG and mean seconds to the first chunk
+        """
+        timings = {}
+        for provider, timing in self.svg_timings.items():
+            count = timing["count"]
+            timings[provider] = {
+                "count": count,
+                "failures": timing["failures"],
+                "mean_seconds": timing["total_seconds"] / count if count else None,
+                "min_seconds": timing["min_seconds"],
+                "max_seconds": timing["max_seconds"],
+                "last_seconds": timing["last_seconds"],
+                "mean_first_chunk_seconds": timing["total_first_chunk_seconds"] / count if count else None,
+            }
+        return timings
+    
+    async def generate_graph_svg(
+        self,
+        provider: str,
+        concept: str,
+        diagram_type: Optional[str] = None,
+        temperature: float = 0.7
+    ) -> str:
+        """
+        Generate an SVG diagram in graph mode.
+        
+        The LLM only returns a compact JSON graph of the diagram (nodes, edges,
+        groups), which is a fraction of the tokens of SVG markup; the layout
+        engine positions and draws it.
+        
+        Args:
+            provider: Provider ID to use
+            concept: The concept to visualize
+            diagram_type: Diagram type (flowchart, network, sequence)
+            temperature: Temperature for generation
+            
+        Returns:
+            The rendered SVG content
+            
+        Raises:
+            GraphSpecError: If the response is not a usable graph
+        """
+        # Imported here: the svg_generator package imports this module
+        from ..svg_generator.graph_layout import graph_prompt, parse_graph_spec, graph_to_svg, GRAPH_MAX_TOKENS
+        
+        response = await self.generate_text(
+            provider=provider,
+            prompt=graph_prompt(concept, diagram_type),
+            temperature=temperature,
+            max_tokens=GRAPH_MAX_TOKENS
+        )
+        graph = parse_graph_spec(response, diagram_type)
+        logger.info(f"Graph spec from {provider}: {len(graph['nodes'])} nodes, {len(graph['edges'])} edges, "
+                    f"{len(response)} chars")
+        return graph_to_svg(graph)
+    
     async def close(self):
         """Close all LLM service connections."""
         if self.redis_service:
@@ -0,0 +1,308 @@
+"""
+Latency-Aware Provider Routing
+
+ProviderRouter keeps a sliding window of latencies and outcomes for every
+LLM provider and decides which provider a request goes to: the requested
+provider while it is healthy, otherwise the fastest healthy one. Failed
+requests fail over to the next provider. With hedging enabled, a request
+that is still running after its provider's p95 latency gets a second,
+hedged request to the next provider; the first to succeed wins and the
+other is cancelled.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RATE_LIMIT_MARKERS = ("429", "rate limit", "rate_limit", "too many requests", "overloaded")
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Check whether an error looks like a rate limit or overload response.
+
+    Args:
+        error: Exception raised by a provider
+
+    Returns:
+        True if the provider should be given a cooldown
+    """
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status in (429, 529):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+class ProviderStats:
+    """Sliding window of request outcomes for one provider."""
+
+    def __init__(self, window_seconds: float = 300.0, max_samples: int = 200):
+        """
+        Create an empty window.
+
+        Args:
+            window_seconds: Samples older than this are dropped
+            max_samples: Maximum number of samples kept
+        """
+        self.window_seconds = window_seconds
+        self.samples: Deque[Tuple[float, Optional[float]]] = deque(maxlen=max_samples)
+        self.cooldown_until = 0.0
+
+    def _prune(self, now: float):
+        while self.samples and self.samples[0][0] < now - self.window_seconds:
+            self.samples.popleft()
+
+    def record(self, latency: Optional[float], now: Optional[float] = None):
+        """
+        Record a request outcome.
+
+        Args:
+            latency: Seconds the successful request took, or None for a failure
+            now: Current time (defaults to time.monotonic())
+        """
+        now = time.monotonic() if now is None else now
+        self._prune(now)
+        self.samples.append((now, latency))
+
+    def latencies(self) -> List[float]:
+        """Sorted latencies of the successful requests in the window."""
+        self._prune(time.monotonic())
+        return sorted(latency for _, latency in self.samples if latency is not None)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Latency percentile of successful requests (nearest rank).
+
+        Args:
+            percent: Percentile, 0-100
+
+        Returns:
+            Latency in seconds, or None without successful samples
+        """
+        latencies = self.latencies()
+        if not latencies:
+            return None
+        rank = max(math.ceil(percent / 100 * len(latencies)), 1)
+        return latencies[rank - 1]
+
+    def error_rate(self) -> float:
+        """Fraction of failed requests in the window."""
+        self._prune(time.monotonic())
+        if not self.samples:
+            return 0.0
+        return sum(latency is None for _, latency in self.samples) / len(self.samples)
+
+    def __len__(self) -> int:
+        self._prune(time.monotonic())
+        return len(self.samples)
+
+class ProviderRouter:
+    """Route requests to the fastest healthy provider, with optional hedging."""
+
+    def __init__(
+        self,
+        window_seconds: float = 300.0,
+        max_samples: int = 200,
+        min_samples: int = 5,
+        max_error_rate: float = 0.5,
+        cooldown_seconds: float = 30.0,
+        hedge: Optional[bool] = None,
+        max_attempts: int = 2
+    ):
+        """
+        Create a router.
+
+        Args:
+            window_seconds: Length of the sliding window per provider
+            max_samples: Maximum samples kept per provider
+            min_samples: Samples needed before error rates and p95 are trusted
+            max_error_rate: Providers failing more often than this are unhealthy
+            cooldown_seconds: How long a rate-limited provider is skipped
+            hedge: Send hedged requests after the p95 latency (defaults to the
+                LLM_HEDGE_REQUESTS environment variable)
+            max_attempts: Providers tried for one request, including failover
+        """
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.cooldown_seconds = cooldown_seconds
+        if hedge is None:
+            hedge = os.environ.get("LLM_HEDGE_REQUESTS", "false").lower() in ("1", "true", "yes")
+        self.hedge = hedge
+        self.max_attempts = max_attempts
+
+        self.stats: Dict[str, ProviderStats] = {}
+
+    def _stats(self, provider: str) -> ProviderStats:
+        stats = self.stats.get(provider)
+        if stats is None:
+            stats = self.stats[provider] = ProviderStats(self.window_seconds, self.max_samples)
+        return stats
+
+    def is_healthy(self, provider: str) -> bool:
+        """
+        Check whether a provider should receive requests.
+
+        Args:
+            provider: Provider ID
+
+        Returns:
+            False while the provider is rate-limited or failing too often
+        """
+        stats = self._stats(provider)
+        if stats.cooldown_until > time.monotonic():
+            return False
+        return len(stats) < self.min_samples or stats.error_rate() <= self.max_error_rate
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        """
+        Seconds to wait before hedging a request to a provider.
+
+        Args:
+            provider: Provider ID
+
+        Returns:
+            The provider's p95 latency, or None if there are too few samples
+        """
+        stats = self._stats(provider)
+        if len(stats.latencies()) < self.min_samples:
+            return None
+        return stats.percentile(95)
+
+    def rank(self, providers: List[str], preferred: Optional[str] = None) -> List[str]:
+        """
+        Order providers for a request.
+
+        The preferred provider comes first while it is healthy. Other healthy
+        providers follow by median latency (providers without samples keep
+        their given order after the measured ones), then unhealthy ones.
+
+        Args:
+            providers: Candidate provider IDs
+            preferred: Provider requested by the caller
+
+        Returns:
+            Providers in the order they should be tried
+        """
+        def key(item):
+            index, provider = item
+            if provider == preferred and self.is_healthy(provider):
+                return (0, 0, 0.0, index)
+            median = self._stats(provider).percentile(50)
+            return (1 if self.is_healthy(provider) else 2, median is None, median or 0.0, index)
+
+        return [provider for _, provider in sorted(enumerate(providers), key=key)]
+
+    def record_success(self, provider: str, latency: float):
+        """Record a successful request."""
+        self._stats(provider).record(latency)
+
+    def record_failure(self, provider: str, error: Optional[BaseException] = None):
+        """Record a failed request, starting a cooldown for rate limits."""
+        stats = self._stats(provider)
+        stats.record(None)
+        if error is not None and is_rate_limit_error(error):
+            stats.cooldown_until = time.monotonic() + self.cooldown_seconds
+            logger.warning(f"Provider {provider} is rate limited, skipping it for {self.cooldown_seconds:.0f}s")
+
+    async def call(
+        self,
+        providers: List[str],
+        request: Callable[[str], Awaitable[T]],
+        preferred: Optional[str] = None,
+        hedge: Optional[bool] = None
+    ) -> T:
+        """
+        Run a request on the best provider, failing over and hedging as configured.
+
+        Args:
+            providers: Candidate provider IDs
+            request: Coroutine function taking a provider ID
+            preferred: Provider requested by the caller
+            hedge: Override the router's hedging setting for this request
+
+        Returns:
+            The result of the first successful request
+
+        Raises:
+            ValueError: If there are no providers
+            Exception: The last provider error if every attempt failed
+        """
+        ranked = self.rank(providers, preferred)
+        if not ranked:
+            raise ValueError("No LLM providers available")
+        hedge = self.hedge if hedge is None else hedge
+
+        pending: Dict[asyncio.Task, Tuple[str, float]] = {}
+        queue = ranked[:max(self.max_attempts, 1) + (1 if hedge else 0)]
+        last_error: Optional[BaseException] = None
+
+        def start(provider: str):
+            pending[asyncio.ensure_future(request(provider))] = (provider, time.monotonic())
+
+        start(queue.pop(0))
+        try:
+            while pending:
+                timeout = None
+                if hedge and queue and len(pending) == 1:
+                    (provider, started), = pending.values()
+                    delay = self.hedge_delay(provider)
+                    if delay is not None:
+                        timeout = max(delay - (time.monotonic() - started), 0)
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    provider, _ = next(iter(pending.values()))
+                    hedge_provider = queue.pop(0)
+                    logger.info(f"Provider {provider} slower than its p95, hedging with {hedge_provider}")
+                    start(hedge_provider)
+                    continue
+
+                for task in done:
+                    provider, started = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        self.record_success(provider, time.monotonic() - started)
+                        return task.result()
+                    logger.warning(f"Provider {provider} failed: {str(error)}")
+                    self.record_failure(provider, error)
+                    last_error = error
+
+                if not pending and queue:
+                    start(queue.pop(0))
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        raise last_error
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Current routing statistics.
+
+        Returns:
+            Dictionary of provider ID to samples, error rate, p50/p95 latency
+            and health
+        """
+        now = time.monotonic()
+        return {
+            provider: {
+                "samples": len(stats),
+                "error_rate": stats.error_rate(),
+                "p50_seconds": stats.percentile(50),
+                "p95_seconds": stats.percentile(95),
+                "healthy": self.is_healthy(provider),
+                "cooldown_seconds": max(stats.cooldown_until - now, 0.0)
+            }
+            for provider, stats in self.stats.items()
+        }
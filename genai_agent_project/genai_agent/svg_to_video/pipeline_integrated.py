@@ -8,8 +8,11 @@ and rendering.
 
 import os
 import sys
+import uuid
+import inspect
 import logging
 import tempfile
+import asyncio
 import subprocess
 from pathlib import Path
 
@@ -18,6 +21,7 @@ from .svg_generator import SVGGenerator
 from .svg_to_3d import SVGTo3DConverter
 from .animation.model_animator import ModelAnimator
 from .rendering.video_renderer import VideoRenderer
+from .pipeline_scheduler import PipelineScheduler, PipelineStage
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -31,6 +35,14 @@ class SVGToVideoPipeline:
     text descriptions.
     """
     
+    # Default worker pool size per stage for batch runs
+    DEFAULT_STAGE_WORKERS = {
+        "svg_generation": 2,
+        "svg_to_3d": 1,
+        "animation": 1,
+        "rendering": 1
+    }
+    
     def __init__(self, blender_path=None, output_dir=None):
         """
         Initialize the SVG to Video pipeline.
@@ -65,6 +77,9 @@ class SVGToVideoPipeline:
         self.model_animator = ModelAnimator(blender_path=self.blender_path)
         self.video_renderer = VideoRenderer(blender_path=self.blender_path)
         
+        # Scheduler of the most recent batch run
+        self.scheduler = None
+        
         # Set up output subdirectories
         self.svg_dir = os.path.join(self.output_dir, "svg")
         self.models_dir = os.path.join(self.output_dir, "models")
@@ -101,7 +116,119 @@ class SVGToVideoPipeline:
         Returns:
             dict: Dictionary with paths to all generated files and status
         """
-        result = {
+        job = self._create_job(
+            description, diagram_type=diagram_type, name=name, provider=provider,
+            animation_type=animation_type, video_quality=video_quality,
+            duration=duration, video_format=video_format, **kwargs
+        )
+        
+        try:
+            job = asyncio.run(self._run_job(job))
+        
+        except Exception as e:
+            logger.error(f"Error in SVG to Video pipeline: {str(e)}")
+            job["status"] = "error"
+            job["error"] = str(e)
+        
+        job.pop("params", None)
+        return job
+    
+    def generate_videos_batch(self, jobs, stage_workers=None):
+        """
+        Generate videos for a batch of descriptions with overlapping stages.
+        
+        Unlike calling ``generate_video`` in a loop, each stage has its own
+        worker pool, so the SVG for the next job is generated while the
+        previous job is still being converted, animated or rendered.
+        
+        Args:
+            jobs (list): List of dicts with the keyword arguments of
+                ``generate_video`` (``description`` is required)
+            stage_workers (dict, optional): Number of workers per stage, keyed
+                by stage name (svg_generation, svg_to_3d, animation, rendering)
+        
+        Returns:
+            dict: Results in submission order and per-stage scheduler stats
+        """
+        workers = dict(self.DEFAULT_STAGE_WORKERS)
+        workers.update(stage_workers or {})
+        
+        stages = [
+            PipelineStage(stage_name, self._guard_stage(stage_name, stage), workers.get(stage_name, 1))
+            for stage_name, stage in self._get_stages()
+        ]
+        self.scheduler = PipelineScheduler(stages)
+        
+        pending = [self._create_job(**job) for job in jobs]
+        results = asyncio.run(self.scheduler.run(pending))
+        
+        for result in results:
+            result.pop("params", None)
+        
+        return {
+            "status": "success" if all(r["status"] == "success" for r in results) else "partial",
+            "results": results,
+            "stats": self.scheduler.get_stats()
+        }
+    
+    async def _run_job(self, job):
+        """Run the stages of one job in order, stopping at the first failure."""
+        for _, stage in self._get_stages():
+            job = await stage(job) if inspect.iscoroutinefunction(stage) else stage(job)
+            if job["status"] == "error":
+                break
+        return job
+    
+    def get_scheduler_stats(self):
+        """
+        Get per-stage queue depths and utilization of the last batch run.
+        
+        Returns:
+            dict: Scheduler statistics, or None if no batch has run yet
+        """
+        if not self.scheduler:
+            return None
+        return self.scheduler.get_stats()
+    
+    def _get_stages(self):
+        """
+        Get the ordered (name, callable) pairs of the pipeline stages.
+        
+        SVG generation and SVG to 3D conversion are coroutines and run on the
+        scheduler's event loop; animation and rendering block on Blender and
+        run in their stage's thread pool.
+        """
+        return [
+            ("svg_generation", self._run_svg_generation),
+            ("svg_to_3d", self._run_svg_to_3d),
+            ("animation", self._run_animation),
+            ("rendering", self._run_rendering)
+        ]
+    
+    def _guard_stage(self, stage_name, stage):
+        """Wrap a stage so exceptions are recorded on the job's step."""
+        if inspect.iscoroutinefunction(stage):
+            async def run_async(job):
+                try:
+                    return await stage(job)
+                except Exception as e:
+                    logger.error(f"Error in SVG to Video pipeline ({stage_name}): {str(e)}")
+                    return self._fail_step(job, stage_name, str(e))
+            return run_async
+        
+        def run(job):
+            try:
+                return stage(job)
+            except Exception as e:
+                logger.error(f"Error in SVG to Video pipeline ({stage_name}): {str(e)}")
+                return self._fail_step(job, stage_name, str(e))
+        return run
+    
+    def _create_job(self, description, diagram_type="flowchart", name=None, provider=None,
+                    animation_type="simple", video_quality="medium",
+                    duration=10.0, video_format="MP4", **kwargs):
+        """Create the result dictionary that is passed from stage to stage."""
+        return {
             "status": "in_progress",
             "steps": {
                 "svg_generation": {"status": "pending"},
@@ -110,140 +237,166 @@ class SVGToVideoPipeline:
                 "rendering": {"status": "pending"}
             },
             "files": {},
-            "error": None
+            "error": None,
+            "params": {
+                "description": description,
+                "diagram_type": diagram_type,
+                "name": name,
+                "provider": provider,
+                "animation_type": animation_type,
+                "video_quality": video_quality,
+                "duration": duration,
+                "video_format": video_format,
+                "options": kwargs
+            }
         }
-        
+    
+    def _fail_step(self, job, step, error_msg):
+        """Mark a step (and the whole job) as failed."""
+        job["status"] = "error"
+        job["error"] = error_msg
+        job["steps"][step]["status"] = "error"
+        job["steps"][step]["error"] = error_msg
+        return job
+    
+    async def _generate_svg(self, description, diagram_type="flowchart", name=None, provider=None, **kwargs):
+        """Generate an SVG and save it to the SVG directory."""
         try:
-            # Step 1: Generate SVG
-            logger.info(f"Generating SVG from description: {description[:50]}...")
-            svg_result = self.svg_generator.generate_svg(
-                description, 
-                diagram_type=diagram_type,
-                name=name,
+            svg_code = await self.svg_generator.generate_svg(
+                description,
                 provider=provider,
-                **kwargs.get("svg_options", {})
-            )
-            
-            if not svg_result or svg_result.get("status") != "success":
-                error_msg = "SVG generation failed"
-                if svg_result and svg_result.get("error"):
-                    error_msg += f": {svg_result['error']}"
-                
-                result["status"] = "error"
-                result["error"] = error_msg
-                result["steps"]["svg_generation"]["status"] = "error"
-                result["steps"]["svg_generation"]["error"] = error_msg
-                return result
-            
-            # Update result with SVG information
-            result["steps"]["svg_generation"]["status"] = "success"
-            result["files"]["svg_path"] = svg_result["file_path"]
-            result["files"]["svg_code"] = svg_result["code"]
-            
-            svg_path = svg_result["file_path"]
-            
-            # Step 2: Convert SVG to 3D
-            logger.info(f"Converting SVG to 3D: {svg_path}...")
-            
-            # Generate output path for 3D model
-            svg_name = os.path.basename(svg_path)
-            model_name = f"{os.path.splitext(svg_name)[0]}_3d.obj"
-            model_path = os.path.join(self.models_dir, model_name)
-            
-            # Convert SVG to 3D
-            model_path = self.svg_to_3d_converter.convert_svg_to_3d(
-                svg_path, 
-                output_file=model_path,
-                **kwargs.get("model_options", {})
-            )
-            
-            if not model_path:
-                error_msg = "SVG to 3D conversion failed"
-                result["status"] = "error"
-                result["error"] = error_msg
-                result["steps"]["svg_to_3d"]["status"] = "error"
-                result["steps"]["svg_to_3d"]["error"] = error_msg
-                return result
-            
-            # Update result with 3D model information
-            result["steps"]["svg_to_3d"]["status"] = "success"
-            result["files"]["model_path"] = model_path
-            
-            # Step 3: Animate the 3D model
-            logger.info(f"Animating 3D model: {model_path}...")
-            
-            # Generate output path for animated model
-            animated_model_name = f"{os.path.splitext(svg_name)[0]}_animated.blend"
-            animated_model_path = os.path.join(self.animations_dir, animated_model_name)
-            
-            # Animate the model
-            animated_model_path = self.model_animator.animate_model(
-                model_path,
-                output_path=animated_model_path,
-                animation_type=animation_type,
-                duration=duration,
-                **kwargs.get("animation_options", {})
-            )
-            
-            if not animated_model_path:
-                error_msg = "Model animation failed"
-                result["status"] = "error"
-                result["error"] = error_msg
-                result["steps"]["animation"]["status"] = "error"
-                result["steps"]["animation"]["error"] = error_msg
-                return result
-            
-            # Update result with animated model information
-            result["steps"]["animation"]["status"] = "success"
-            result["files"]["animated_model_path"] = animated_model_path
-            
-            # Step 4: Render the animation to video
-            logger.info(f"Rendering animation to video: {animated_model_path}...")
-            
-            # Generate output path for video
-            video_name = f"{os.path.splitext(svg_name)[0]}_video.{video_format.lower()}"
-            video_path = os.path.join(self.videos_dir, video_name)
-            
-            # Render the video
-            video_path = self.video_renderer.render_video(
-                animated_model_path,
-                output_path=video_path,
-                quality=video_quality,
-                duration=duration,
-                output_format=video_format,
-                **kwargs.get("render_options", {})
+                diagram_type=diagram_type,
+                **kwargs
             )
-            
-            if not video_path:
-                error_msg = "Video rendering failed"
-                result["status"] = "error"
-                result["error"] = error_msg
-                result["steps"]["rendering"]["status"] = "error"
-                result["steps"]["rendering"]["error"] = error_msg
-                return result
-            
-            # Update result with video information
-            result["steps"]["rendering"]["status"] = "success"
-            result["files"]["video_path"] = video_path
-            
-            # Successfully completed all steps
-            result["status"] = "success"
-            
-            # Add final output information
-            result["output"] = {
-                "video_path": video_path,
-                "video_name": video_name,
-                "duration": duration,
-                "format": video_format
-            }
-            
-            return result
+        except (ValueError, RuntimeError) as e:
+            return {"status": "error", "error": str(e)}
         
-        except Exception as e:
-            logger.error(f"Error in SVG to Video pipeline: {str(e)}")
-            result["status"] = "error"
-            result["error"] = str(e)
-            return result
+        file_name = name or str(uuid.uuid4())
+        if not file_name.lower().endswith(".svg"):
+            file_name += ".svg"
+        file_path = os.path.join(self.svg_dir, file_name)
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(svg_code)
+        
+        return {"status": "success", "file_path": file_path, "code": svg_code}
+    
+    async def _run_svg_generation(self, job):
+        """Step 1: Generate SVG from the job description."""
+        params = job["params"]
+        
+        logger.info(f"Generating SVG from description: {params['description'][:50]}...")
+        svg_result = await self._generate_svg(
+            params["description"], 
+            diagram_type=params["diagram_type"],
+            name=params["name"],
+            provider=params["provider"],
+            **params["options"].get("svg_options", {})
+        )
+        
+        if svg_result["status"] != "success":
+            error_msg = "SVG generation failed"
+            if svg_result and svg_result.get("error"):
+                error_msg += f": {svg_result['error']}"
+            return self._fail_step(job, "svg_generation", error_msg)
+        
+        # Update result with SVG information
+        job["steps"]["svg_generation"]["status"] = "success"
+        job["files"]["svg_path"] = svg_result["file_path"]
+        job["files"]["svg_code"] = svg_result["code"]
+        return job
+    
+    async def _run_svg_to_3d(self, job):
+        """Step 2: Convert the generated SVG to a 3D model."""
+        svg_path = job["files"]["svg_path"]
+        logger.info(f"Converting SVG to 3D: {svg_path}...")
+        
+        # Generate output path for 3D model
+        svg_name = os.path.basename(svg_path)
+        model_name = f"{os.path.splitext(svg_name)[0]}_3d.obj"
+        model_path = os.path.join(self.models_dir, model_name)
+        
+        # Convert SVG to 3D
+        converted = await self.svg_to_3d_converter.convert_svg_to_3d(
+            svg_path, 
+            model_path,
+            **job["params"]["options"].get("model_options", {})
+        )
+        
+        if not converted:
+            return self._fail_step(job, "svg_to_3d", "SVG to 3D conversion failed")
+        
+        # Update result with 3D model information
+        job["steps"]["svg_to_3d"]["status"] = "success"
+        job["files"]["model_path"] = model_path
+        return job
+    
+    def _run_animation(self, job):
+        """Step 3: Animate the 3D model."""
+        params = job["params"]
+        model_path = job["files"]["model_path"]
+        logger.info(f"Animating 3D model: {model_path}...")
+        
+        # Generate output path for animated model
+        svg_name = os.path.basename(job["files"]["svg_path"])
+        animated_model_name = f"{os.path.splitext(svg_name)[0]}_animated.blend"
+        animated_model_path = os.path.join(self.animations_dir, animated_model_name)
+        
+        # Animate the model
+        animated_model_path = self.model_animator.animate_model(
+            model_path,
+            output_path=animated_model_path,
+            animation_type=params["animation_type"],
+            duration=params["duration"],
+            **params["options"].get("animation_options", {})
+        )
+        
+        if not animated_model_path:
+            return self._fail_step(job, "animation", "Model animation failed")
+        
+        # Update result with animated model information
+        job["steps"]["animation"]["status"] = "success"
+        job["files"]["animated_model_path"] = animated_model_path
+        return job
+    
+    def _run_rendering(self, job):
+        """Step 4: Render the animation to video."""
+        params = job["params"]
+        animated_model_path = job["files"]["animated_model_path"]
+        logger.info(f"Rendering animation to video: {animated_model_path}...")
+        
+        # Generate output path for video
+        svg_name = os.path.basename(job["files"]["svg_path"])
+        video_name = f"{os.path.splitext(svg_name)[0]}_video.{params['video_format'].lower()}"
+        video_path = os.path.join(self.videos_dir, video_name)
+        
+        # Render the video
+        video_path = self.video_renderer.render_video(
+            animated_model_path,
+            output_path=video_path,
+            quality=params["video_quality"],
+            duration=params["duration"],
+            output_format=params["video_format"],
+            **params["options"].get("render_options", {})
+        )
+        
+        if not video_path:
+            return self._fail_step(job, "rendering", "Video rendering failed")
+        
+        # Update result with video information
+        job["steps"]["rendering"]["status"] = "success"
+        job["files"]["video_path"] = video_path
+        
+        # Successfully completed all steps
+        job["status"] = "success"
+        
+        # Add final output information
+        job["output"] = {
+            "video_path": video_path,
+            "video_name": video_name,
+            "duration": params["duration"],
+            "format": params["video_format"]
+        }
+        return job
     
     def generate_svg_only(self, description, diagram_type="flowchart", name=None, provider=None, **kwargs):
         """
@@ -263,15 +416,13 @@ class SVGToVideoPipeline:
         """
         try:
             # Generate SVG
-            svg_result = self.svg_generator.generate_svg(
+            return asyncio.run(self._generate_svg(
                 description, 
                 diagram_type=diagram_type,
                 name=name,
                 provider=provider,
                 **kwargs
-            )
-            
-            return svg_result
+            ))
         
         except Exception as e:
             logger.error(f"Error in SVG generation: {str(e)}")
@@ -302,13 +453,13 @@ class SVGToVideoPipeline:
                 output_path = os.path.join(self.models_dir, model_name)
             
             # Convert SVG to 3D
-            model_path = self.svg_to_3d_converter.convert_svg_to_3d(
+            converted = asyncio.run(self.svg_to_3d_converter.convert_svg_to_3d(
                 svg_path, 
-                output_file=output_path,
+                output_path,
                 **kwargs
-            )
+            ))
             
-            if not model_path:
+            if not converted:
                 return {
                     "status": "error",
                     "error": "SVG to 3D conversion failed"
@@ -316,7 +467,7 @@ class SVGToVideoPipeline:
             
             return {
                 "status": "success",
-                "model_path": model_path,
+                "model_path": output_path,
                 "message": "SVG converted to 3D model successfully"
             }
         
@@ -0,0 +1,229 @@
+"""
+Stage-level scheduler for the SVG to Video pipeline.
+
+Running a batch of descriptions through ``SVGToVideoPipeline.generate_video``
+walks every job through all four stages before the next job starts, so the
+LLM backend sits idle while Blender renders and the render CPUs sit idle
+while the LLM generates. This module pipelines jobs across stages instead:
+each stage owns its own queue and worker pool, and a job is handed to the
+next stage as soon as the current one finishes, so job N+1 generates its SVG
+while job N is still rendering.
+"""
+
+import time
+import asyncio
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class PipelineStage:
+    """
+    A single stage of the pipeline with its own queue and worker pool.
+
+    The stage function receives the job dictionary and returns it (or a
+    replacement). Returning a job whose ``status`` is ``"error"`` stops the
+    job from being handed to any later stage.
+    """
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any], workers: int = 1):
+        """
+        Initialize a pipeline stage.
+
+        Args:
+            name: Stage name (used in results and statistics)
+            func: Callable that processes a job; may be sync or async
+            workers: Number of jobs this stage processes concurrently
+        """
+        if workers < 1:
+            raise ValueError(f"Stage '{name}' needs at least one worker")
+
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.is_async = inspect.iscoroutinefunction(func)
+
+        # Runtime state, (re)created by the scheduler for each run
+        self.queue: Optional[asyncio.Queue] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.busy_time = 0.0
+        self.max_queue_depth = 0
+
+    def reset(self):
+        """Reset runtime state before a new run."""
+        self.queue = asyncio.Queue()
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.busy_time = 0.0
+        self.max_queue_depth = 0
+
+    def get_stats(self, elapsed: float) -> Dict[str, Any]:
+        """
+        Get statistics for this stage.
+
+        Args:
+            elapsed: Wall time of the run so far in seconds
+
+        Returns:
+            Dictionary with queue depth, in-flight count and utilization
+        """
+        capacity = elapsed * self.workers
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_time": round(self.busy_time, 3),
+            "utilization": round(min(self.busy_time / capacity, 1.0), 3) if capacity > 0 else 0.0
+        }
+
+
+class PipelineScheduler:
+    """
+    Pipelined multi-job scheduler.
+
+    Jobs are submitted to the first stage and flow through the stages in
+    order. Each stage runs up to ``workers`` jobs at once, so independent
+    stages (LLM generation, conversion, rendering) overlap across jobs.
+    """
+
+    def __init__(self, stages: List[PipelineStage]):
+        """
+        Initialize the scheduler.
+
+        Args:
+            stages: Ordered list of pipeline stages
+        """
+        if not stages:
+            raise ValueError("PipelineScheduler needs at least one stage")
+
+        self.stages = stages
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._results: Dict[int, Dict[str, Any]] = {}
+        self._pending = 0
+        self._done: Optional[asyncio.Event] = None
+
+    async def run(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run a batch of jobs through all stages.
+
+        Args:
+            jobs: List of job dictionaries; each is passed to the first stage
+
+        Returns:
+            List of finished job dictionaries in submission order
+        """
+        self._started_at = time.monotonic()
+        self._finished_at = None
+        self._results = {}
+        self._pending = len(jobs)
+        self._done = asyncio.Event()
+
+        if not jobs:
+            self._finished_at = time.monotonic()
+            return []
+
+        workers = []
+        for index, stage in enumerate(self.stages):
+            stage.reset()
+            if not stage.is_async:
+                stage.executor = ThreadPoolExecutor(
+                    max_workers=stage.workers,
+                    thread_name_prefix=f"pipeline-{stage.name}"
+                )
+            for _ in range(stage.workers):
+                workers.append(asyncio.create_task(self._worker(index)))
+
+        first = self.stages[0]
+        for job_id, job in enumerate(jobs):
+            job.setdefault("job_id", job_id)
+            first.queue.put_nowait((job_id, job))
+        first.max_queue_depth = first.queue.qsize()
+
+        try:
+            await self._done.wait()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for stage in self.stages:
+                if stage.executor:
+                    stage.executor.shutdown(wait=False)
+                    stage.executor = None
+            self._finished_at = time.monotonic()
+
+        return [self._results[job_id] for job_id in range(len(jobs))]
+
+    async def _worker(self, index: int):
+        """Process jobs from the queue of the stage at ``index``."""
+        stage = self.stages[index]
+        loop = asyncio.get_running_loop()
+
+        while True:
+            job_id, job = await stage.queue.get()
+            stage.in_flight += 1
+            start = time.monotonic()
+
+            try:
+                if stage.is_async:
+                    job = await stage.func(job)
+                else:
+                    job = await loop.run_in_executor(stage.executor, stage.func, job)
+            except Exception as e:
+                logger.error(f"Pipeline stage '{stage.name}' failed for job {job_id}: {str(e)}")
+                job["status"] = "error"
+                job["error"] = str(e)
+            finally:
+                stage.busy_time += time.monotonic() - start
+                stage.in_flight -= 1
+                stage.queue.task_done()
+
+            if job.get("status") == "error":
+                stage.failed += 1
+                self._finish(job_id, job)
+                continue
+
+            stage.processed += 1
+
+            if index + 1 < len(self.stages):
+                next_stage = self.stages[index + 1]
+                next_stage.queue.put_nowait((job_id, job))
+                next_stage.max_queue_depth = max(next_stage.max_queue_depth, next_stage.queue.qsize())
+            else:
+                self._finish(job_id, job)
+
+    def _finish(self, job_id: int, job: Dict[str, Any]):
+        """Record a finished job and signal completion once all are done."""
+        self._results[job_id] = job
+        self._pending -= 1
+        if self._pending <= 0:
+            self._done.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get per-stage queue depths and utilization.
+
+        Returns:
+            Dictionary with elapsed time, remaining jobs and per-stage stats
+        """
+        if self._started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished_at or time.monotonic()) - self._started_at
+
+        return {
+            "elapsed": round(elapsed, 3),
+            "pending_jobs": self._pending,
+            "stages": {stage.name: stage.get_stats(elapsed) for stage in self.stages}
+        }
@@ -0,0 +1,716 @@
+"""
+Graph Layout Engine for SVG Diagrams
+
+In graph mode the LLM describes a diagram as a compact JSON graph instead of
+writing SVG markup:
+
+    {"type": "flowchart", "title": "Login",
+     "nodes": [{"id": "a", "label": "Start", "shape": "ellipse"}, ...],
+     "edges": [["a", "b"], ["b", "c", "yes"], ...],
+     "groups": [{"id": "g1", "label": "Backend", "nodes": ["b", "c"]}]}
+
+This module validates that graph, lays it out and renders the SVG locally:
+- flowchart: layered (Sugiyama-style) layout, top to bottom
+- network: force-directed (Fruchterman-Reingold) layout
+- sequence: participants as columns, messages as rows
+
+It has no dependencies outside the standard library.
+"""
+
+import json
+import math
+import random
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+DIAGRAM_TYPES = ("flowchart", "network", "sequence")
+
+# Aliases the LLM (or callers) use for the supported diagram types
+TYPE_ALIASES = {
+    "flow": "flowchart",
+    "process": "flowchart",
+    "tree": "flowchart",
+    "hierarchy": "flowchart",
+    "graph": "network",
+    "architecture": "network",
+    "system": "network",
+    "sequence_diagram": "sequence",
+    "timeline": "sequence",
+}
+
+WIDTH = 800
+HEIGHT = 600
+MARGIN = 30
+TITLE_HEIGHT = 40
+
+NODE_WIDTH = 130
+NODE_HEIGHT = 50
+LAYER_GAP = 60
+NODE_GAP = 30
+MAX_SCALE = 1.3
+
+FONT_SIZE = 14
+LINE_LENGTH = 16
+MAX_LINES = 3
+
+PALETTE = ["#4285F4", "#34A853", "#FBBC05", "#EA4335", "#8E44AD", "#16A085", "#E67E22", "#2C3E50"]
+GROUP_FILLS = ["#E8F0FE", "#E6F4EA", "#FEF7E0", "#FCE8E6", "#F3E5F5", "#E0F2F1"]
+
+# Graph specs are small, so the response can be capped well below SVG markup
+GRAPH_MAX_TOKENS = 1024
+
+GRAPH_PROMPT = """Describe this {diagram_type} diagram as a compact JSON graph:
+
+{concept}
+
+Reply with only minified JSON in this form, no explanation:
+{{"type":"{diagram_type}","title":"...","nodes":[{{"id":"a","label":"...","shape":"rect|diamond|ellipse","group":"g"}}],"edges":[["a","b","optional label"]],"groups":[{{"id":"g","label":"..."}}]}}
+
+Rules:
+- Short ids, labels of at most 4 words
+- type is one of flowchart, network, sequence
+- For sequence diagrams nodes are participants in order and edges are messages in order
+- shape and group are optional; omit groups if there are none
+"""
+
+Point = Tuple[float, float]
+
+class GraphSpecError(ValueError):
+    """Raised when a graph spec cannot be parsed or is not a usable graph."""
+
+def graph_prompt(concept: str, diagram_type: Optional[str] = None) -> str:
+    """
+    Build the prompt asking an LLM for a graph spec.
+
+    Args:
+        concept: Text description of the diagram
+        diagram_type: Diagram type (flowchart, network, sequence)
+
+    Returns:
+        Prompt text
+    """
+    kind = str(diagram_type or "flowchart").lower().strip()
+    kind = TYPE_ALIASES.get(kind, kind)
+    return GRAPH_PROMPT.format(concept=concept, diagram_type=kind if kind in DIAGRAM_TYPES else "flowchart")
+
+def parse_graph_spec(text: str, diagram_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse and normalize a graph spec from an LLM response.
+
+    The JSON object may be wrapped in prose or a code fence. Nodes may be
+    given as strings or objects, edges as [source, target, label] lists or
+    objects with source/target (or from/to), and nodes that only appear in
+    edges or groups are added.
+
+    Args:
+        text: LLM response containing the JSON graph
+        diagram_type: Diagram type to use when the spec does not name one
+
+    Returns:
+        Normalized graph with type, title, nodes, edges and groups
+
+    Raises:
+        GraphSpecError: If no valid graph is found
+    """
+    start = text.find("{")
+    end = text.rfind("}")
+    if start < 0 or end <= start:
+        raise GraphSpecError("No JSON object found in response")
+
+    try:
+        spec = json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise GraphSpecError(f"Invalid graph JSON: {str(e)}")
+
+    if not isinstance(spec, dict):
+        raise GraphSpecError("Graph spec must be a JSON object")
+
+    return normalize_graph(spec, diagram_type)
+
+def normalize_graph(spec: Dict[str, Any], diagram_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Normalize a graph spec dictionary.
+
+    Args:
+        spec: Graph spec as decoded from JSON
+        diagram_type: Diagram type to use when the spec does not name one
+
+    Returns:
+        Normalized graph
+
+    Raises:
+        GraphSpecError: If the spec has no nodes
+    """
+    kind = str(spec.get("type") or diagram_type or "flowchart").lower().strip()
+    kind = TYPE_ALIASES.get(kind, kind)
+    if kind not in DIAGRAM_TYPES:
+        kind = "flowchart"
+
+    nodes: Dict[str, Dict[str, Any]] = {}
+
+    def add_node(node_id, label=None, shape=None, group=None):
+        node_id = str(node_id)
+        node = nodes.setdefault(node_id, {"id": node_id, "label": node_id, "shape": None, "group": None})
+        if label is not None:
+            node["label"] = str(label)
+        if shape:
+            node["shape"] = str(shape).lower()
+        if group is not None:
+            node["group"] = str(group)
+        return node_id
+
+    for item in spec.get("nodes") or []:
+        if isinstance(item, dict):
+            node_id = item.get("id", item.get("label"))
+            if node_id is None:
+                continue
+            add_node(node_id, item.get("label"), item.get("shape") or item.get("kind"), item.get("group"))
+        elif isinstance(item, (str, int, float)):
+            add_node(item)
+
+    edges = []
+    for item in spec.get("edges") or []:
+        if isinstance(item, dict):
+            source = item.get("source", item.get("from"))
+            target = item.get("target", item.get("to"))
+            label = item.get("label")
+        elif isinstance(item, (list, tuple)) and len(item) >= 2:
+            source, target = item[0], item[1]
+            label = item[2] if len(item) > 2 else None
+        else:
+            continue
+        if source is None or target is None:
+            continue
+        edges.append({
+            "source": add_node(source),
+            "target": add_node(target),
+            "label": str(label) if label not in (None, "") else None
+        })
+
+    groups = []
+    for index, item in enumerate(spec.get("groups") or []):
+        if isinstance(item, dict):
+            group_id = str(item.get("id", item.get("label", f"group{index}")))
+            label = str(item.get("label", group_id))
+            for node_id in item.get("nodes") or []:
+                add_node(node_id, group=group_id)
+        else:
+            group_id = label = str(item)
+        groups.append({"id": group_id, "label": label})
+
+    # Groups referenced only from nodes
+    known_groups = {group["id"] for group in groups}
+    for node in nodes.values():
+        if node["group"] is not None and node["group"] not in known_groups:
+            known_groups.add(node["group"])
+            groups.append({"id": node["group"], "label": node["group"]})
+
+    if not nodes:
+        raise GraphSpecError("Graph spec has no nodes")
+
+    return {
+        "type": kind,
+        "title": str(spec["title"]) if spec.get("title") else None,
+        "nodes": list(nodes.values()),
+        "edges": edges,
+        "groups": groups
+    }
+
+def graph_to_svg(graph: Dict[str, Any], width: int = WIDTH, height: int = HEIGHT) -> str:
+    """
+    Lay out a normalized graph and render it as SVG.
+
+    Args:
+        graph: Normalized graph from parse_graph_spec or normalize_graph
+        width: Width of the SVG viewBox
+        height: Height of the SVG viewBox
+
+    Returns:
+        SVG content as a string
+    """
+    if graph["type"] == "sequence":
+        return _render_sequence(graph, width, height)
+
+    if graph["type"] == "network":
+        positions, routes = force_layout(graph)
+    else:
+        positions, routes = layered_layout(graph)
+
+    return _render_graph(graph, positions, routes, width, height)
+
+def layered_layout(graph: Dict[str, Any], sweeps: int = 8) -> Tuple[Dict[str, Point], List[List[Point]]]:
+    """
+    Layered (Sugiyama-style) layout, top to bottom.
+
+    Cycles are broken by reversing DFS back edges, nodes are assigned to
+    layers by longest path, long edges get dummy nodes, and node order within
+    layers is improved with barycenter sweeps, keeping the order with the
+    fewest crossings.
+
+    Args:
+        graph: Normalized graph
+        sweeps: Number of down/up barycenter sweeps
+
+    Returns:
+        Node centers and one polyline per edge, in layout units
+    """
+    node_ids = [node["id"] for node in graph["nodes"]]
+    edges = [(edge["source"], edge["target"]) for edge in graph["edges"] if edge["source"] != edge["target"]]
+
+    # Break cycles by reversing back edges found by DFS
+    successors: Dict[str, List[str]] = {node_id: [] for node_id in node_ids}
+    for source, target in edges:
+        successors[source].append(target)
+
+    state: Dict[str, int] = {}
+    back_edges = set()
+    for root in node_ids:
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node_id, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                state[node_id] = 2
+                stack.pop()
+            elif state.get(child) == 1:
+                back_edges.add((node_id, child))
+            elif child not in state:
+                state[child] = 1
+                stack.append((child, iter(successors[child])))
+
+    dag_edges = [(target, source) if (source, target) in back_edges else (source, target)
+                 for source, target in edges]
+
+    # Longest-path layering in topological order
+    predecessors: Dict[str, List[str]] = {node_id: [] for node_id in node_ids}
+    in_degree = {node_id: 0 for node_id in node_ids}
+    dag_successors: Dict[str, List[str]] = {node_id: [] for node_id in node_ids}
+    for source, target in dag_edges:
+        predecessors[target].append(source)
+        dag_successors[source].append(target)
+        in_degree[target] += 1
+
+    layer = {}
+    queue = [node_id for node_id in node_ids if in_degree[node_id] == 0]
+    while queue:
+        node_id = queue.pop(0)
+        layer[node_id] = max((layer[p] + 1 for p in predecessors[node_id]), default=0)
+        for child in dag_successors[node_id]:
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                queue.append(child)
+
+    # Split long edges with dummy nodes so every edge spans one layer
+    layers: List[List[str]] = [[] for _ in range(max(layer.values()) + 1)]
+    for node_id in node_ids:
+        layers[layer[node_id]].append(node_id)
+
+    chains = []
+    down: Dict[str, List[str]] = {}
+    up: Dict[str, List[str]] = {}
+    for index, (source, target) in enumerate(dag_edges):
+        chain = [source]
+        for depth in range(layer[source] + 1, layer[target]):
+            dummy = f"\0{index}:{depth}"
+            layers[depth].append(dummy)
+            chain.append(dummy)
+        chain.append(target)
+        for upper, lower in zip(chain, chain[1:]):
+            down.setdefault(upper, []).append(lower)
+            up.setdefault(lower, []).append(upper)
+        chains.append(chain)
+
+    # Barycenter crossing reduction
+    best = [list(nodes) for nodes in layers]
+    best_crossings = _count_crossings(best, down)
+    for sweep in range(sweeps):
+        if sweep % 2 == 0:
+            for depth in range(1, len(layers)):
+                _order_by_barycenter(layers[depth], layers[depth - 1], up)
+        else:
+            for depth in range(len(layers) - 2, -1, -1):
+                _order_by_barycenter(layers[depth], layers[depth + 1], down)
+        crossings = _count_crossings(layers, down)
+        if crossings < best_crossings:
+            best = [list(nodes) for nodes in layers]
+            best_crossings = crossings
+        if best_crossings == 0:
+            break
+
+    # Coordinates: layers are rows, nodes evenly spaced and centered in each row
+    widest = max(len(nodes) for nodes in best)
+    positions: Dict[str, Point] = {}
+    for depth, nodes in enumerate(best):
+        offset = (widest - len(nodes)) * (NODE_WIDTH + NODE_GAP) / 2
+        for position, node_id in enumerate(nodes):
+            positions[node_id] = (
+                offset + position * (NODE_WIDTH + NODE_GAP) + NODE_WIDTH / 2,
+                depth * (NODE_HEIGHT + LAYER_GAP) + NODE_HEIGHT / 2
+            )
+
+    routes = []
+    chain_index = 0
+    for edge in graph["edges"]:
+        source, target = edge["source"], edge["target"]
+        if source == target:
+            routes.append([positions[source], positions[source]])
+            continue
+        points = [positions[node_id] for node_id in chains[chain_index]]
+        if (source, target) in back_edges:
+            points.reverse()
+        routes.append(points)
+        chain_index += 1
+
+    return {node_id: positions[node_id] for node_id in node_ids}, routes
+
+def _order_by_barycenter(nodes: List[str], fixed: List[str], neighbours: Dict[str, List[str]]):
+    """Sort a layer by the mean position of each node's neighbours in the fixed layer."""
+    index = {node_id: position for position, node_id in enumerate(fixed)}
+    current = {node_id: position for position, node_id in enumerate(nodes)}
+
+    def barycenter(node_id):
+        linked = [index[n] for n in neighbours.get(node_id, []) if n in index]
+        return sum(linked) / len(linked) if linked else current[node_id]
+
+    nodes.sort(key=lambda node_id: (barycenter(node_id), current[node_id]))
+
+def _count_crossings(layers: List[List[str]], down: Dict[str, List[str]]) -> int:
+    """Count edge crossings between adjacent layers."""
+    crossings = 0
+    for upper, lower in zip(layers, layers[1:]):
+        lower_index = {node_id: position for position, node_id in enumerate(lower)}
+        segments = [(position, lower_index[child])
+                    for position, node_id in enumerate(upper)
+                    for child in down.get(node_id, []) if child in lower_index]
+        for i, (a1, b1) in enumerate(segments):
+            for a2, b2 in segments[i + 1:]:
+                if (a1 - a2) * (b1 - b2) < 0:
+                    crossings += 1
+    return crossings
+
+def force_layout(graph: Dict[str, Any], iterations: int = 300,
+                 seed: int = 0) -> Tuple[Dict[str, Point], List[List[Point]]]:
+    """
+    Force-directed (Fruchterman-Reingold) layout.
+
+    Nodes start on a circle (jittered with a fixed seed, so the layout is
+    deterministic), repel each other and are pulled together along edges and
+    towards other members of their group.
+
+    Args:
+        graph: Normalized graph
+        iterations: Number of simulation steps
+        seed: Random seed for the initial jitter
+
+    Returns:
+        Node centers and one straight polyline per edge, in layout units
+    """
+    node_ids = [node["id"] for node in graph["nodes"]]
+    count = len(node_ids)
+    area = WIDTH * HEIGHT
+    k = math.sqrt(area / count) * 0.75
+
+    rng = random.Random(seed)
+    radius = min(WIDTH, HEIGHT) / 3
+    positions = {
+        node_id: [
+            WIDTH / 2 + radius * math.cos(2 * math.pi * i / count) + rng.uniform(-1, 1),
+            HEIGHT / 2 + radius * math.sin(2 * math.pi * i / count) + rng.uniform(-1, 1)
+        ]
+        for i, node_id in enumerate(node_ids)
+    }
+
+    springs = [(edge["source"], edge["target"], 1.0) for edge in graph["edges"] if edge["source"] != edge["target"]]
+    members: Dict[str, List[str]] = {}
+    for node in graph["nodes"]:
+        if node["group"] is not None:
+            members.setdefault(node["group"], []).append(node["id"])
+    for group_nodes in members.values():
+        for i, a in enumerate(group_nodes):
+            for b in group_nodes[i + 1:]:
+                springs.append((a, b, 0.3))
+
+    temperature = WIDTH / 10
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        displacement = {node_id: [0.0, 0.0] for node_id in node_ids}
+
+        for i, a in enumerate(node_ids):
+            ax, ay = positions[a]
+            for b in node_ids[i + 1:]:
+                dx = ax - positions[b][0]
+                dy = ay - positions[b][1]
+                distance = math.hypot(dx, dy) or 0.01
+                force = k * k / distance
+                displacement[a][0] += dx / distance * force
+                displacement[a][1] += dy / distance * force
+                displacement[b][0] -= dx / distance * force
+                displacement[b][1] -= dy / distance * force
+
+        for a, b, weight in springs:
+            dx = positions[a][0] - positions[b][0]
+            dy = positions[a][1] - positions[b][1]
+            distance = math.hypot(dx, dy) or 0.01
+            force = weight * distance * distance / k
+            displacement[a][0] -= dx / distance * force
+            displacement[a][1] -= dy / distance * force
+            displacement[b][0] += dx / distance * force
+            displacement[b][1] += dy / distance * force
+
+        for node_id in node_ids:
+            dx, dy = displacement[node_id]
+            length = math.hypot(dx, dy)
+            if length > 0:
+                step = min(length, temperature)
+                positions[node_id][0] += dx / length * step
+                positions[node_id][1] += dy / length * step
+        temperature -= cooling
+
+    centers = {node_id: (x, y) for node_id, (x, y) in positions.items()}
+    routes = [[centers[edge["source"]], centers[edge["target"]]] for edge in graph["edges"]]
+    return centers, routes
+
+def _fit(positions: Dict[str, Point], width: int, height: int, top: float) -> Tuple[float, float, float]:
+    """Scale and offset that fit node boxes into the viewBox below `top`."""
+    xs = [x for x, _ in positions.values()]
+    ys = [y for _, y in positions.values()]
+    min_x, max_x = min(xs) - NODE_WIDTH / 2, max(xs) + NODE_WIDTH / 2
+    min_y, max_y = min(ys) - NODE_HEIGHT / 2, max(ys) + NODE_HEIGHT / 2
+
+    available_width = width - 2 * MARGIN
+    available_height = height - top - MARGIN
+    scale = min(available_width / (max_x - min_x), available_height / (max_y - min_y), MAX_SCALE)
+
+    offset_x = MARGIN + (available_width - (max_x - min_x) * scale) / 2 - min_x * scale
+    offset_y = top + (available_height - (max_y - min_y) * scale) / 2 - min_y * scale
+    return scale, offset_x, offset_y
+
+def _wrap(label: str) -> List[str]:
+    """Split a label into at most MAX_LINES short lines."""
+    lines: List[str] = []
+    for word in label.split():
+        if lines and len(lines[-1]) + len(word) < LINE_LENGTH:
+            lines[-1] += " " + word
+        else:
+            lines.append(word)
+    if len(lines) > MAX_LINES:
+        lines = lines[:MAX_LINES]
+        lines[-1] = lines[-1][:LINE_LENGTH - 1] + "…"
+    return lines or [""]
+
+def _text(x: float, y: float, label: str, size: float, fill: str = "#202124", weight: str = "normal") -> List[str]:
+    """Centered, possibly multi-line text elements."""
+    lines = _wrap(label)
+    first = y - (len(lines) - 1) * size * 0.6 + size * 0.35
+    return [
+        f'<text x="{x:.1f}" y="{first + i * size * 1.2:.1f}" font-family="Arial, sans-serif" '
+        f'font-size="{size:.1f}" font-weight="{weight}" text-anchor="middle" fill="{fill}">{escape(line)}</text>'
+        for i, line in enumerate(lines)
+    ]
+
+def _node_shape(node: Dict[str, Any], kind: str, edges: List[Dict[str, Any]]) -> str:
+    """Shape for a node: explicit shape, else a default for its role in the diagram."""
+    shape = node["shape"]
+    if shape in ("rect", "rectangle", "box", "process"):
+        return "rect"
+    if shape in ("diamond", "decision", "rhombus"):
+        return "diamond"
+    if shape in ("ellipse", "oval", "start", "end", "terminal", "circle"):
+        return "ellipse"
+    if kind == "network":
+        return "ellipse"
+    if kind == "flowchart":
+        label = node["label"].lower()
+        outgoing = [edge for edge in edges if edge["source"] == node["id"]]
+        if label.endswith("?") or (len(outgoing) > 1 and any(edge["label"] for edge in outgoing)):
+            return "diamond"
+        if label in ("start", "end", "begin", "stop", "done", "finish"):
+            return "ellipse"
+    return "rect"
+
+def _boundary(center: Point, toward: Point, shape: str, half_width: float, half_height: float) -> Point:
+    """Point where the segment from a node center toward another point leaves the node."""
+    dx = toward[0] - center[0]
+    dy = toward[1] - center[1]
+    if dx == 0 and dy == 0:
+        return center
+    if shape == "ellipse":
+        t = 1 / math.sqrt((dx / half_width) ** 2 + (dy / half_height) ** 2)
+    elif shape == "diamond":
+        t = 1 / (abs(dx) / half_width + abs(dy) / half_height)
+    else:
+        t = min(half_width / abs(dx) if dx else math.inf, half_height / abs(dy) if dy else math.inf)
+    t = min(t, 1.0)
+    return center[0] + dx * t, center[1] + dy * t
+
+def _arrow(tip: Point, base: Point, size: float, color: str) -> str:
+    """Arrowhead polygon at `tip`, pointing away from `base`."""
+    angle = math.atan2(tip[1] - base[1], tip[0] - base[0])
+    left = (tip[0] - size * math.cos(angle - 0.4), tip[1] - size * math.sin(angle - 0.4))
+    right = (tip[0] - size * math.cos(angle + 0.4), tip[1] - size * math.sin(angle + 0.4))
+    points = " ".join(f"{x:.1f},{y:.1f}" for x, y in (tip, left, right))
+    return f'<polygon points="{points}" fill="{color}"/>'
+
+def _svg_open(width: int, height: int, title: Optional[str]) -> List[str]:
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
+        f'<rect x="0" y="0" width="{width}" height="{height}" fill="#FFFFFF"/>'
+    ]
+    if title:
+        parts.extend(_text(width / 2, TITLE_HEIGHT / 2 + 6, title, FONT_SIZE + 6, weight="bold"))
+    return parts
+
+def _render_graph(graph: Dict[str, Any], positions: Dict[str, Point], routes: List[List[Point]],
+                  width: int, height: int) -> str:
+    """Render a laid-out flowchart or network."""
+    top = MARGIN + (TITLE_HEIGHT if graph["title"] else 0)
+    scale, offset_x, offset_y = _fit(positions, width, height, top)
+
+    def place(point: Point) -> Point:
+        return point[0] * scale + offset_x, point[1] * scale + offset_y
+
+    centers = {node_id: place(point) for node_id, point in positions.items()}
+    half_width = NODE_WIDTH * scale / 2
+    half_height = NODE_HEIGHT * scale / 2
+    if graph["type"] == "network":
+        half_width = half_height = min(half_width, half_height * 1.2)
+    font_size = max(FONT_SIZE * min(scale, 1.0), 8)
+
+    nodes = {node["id"]: node for node in graph["nodes"]}
+    shapes = {node_id: _node_shape(node, graph["type"], graph["edges"]) for node_id, node in nodes.items()}
+    group_index = {group["id"]: i for i, group in enumerate(graph["groups"])}
+
+    parts = _svg_open(width, height, graph["title"])
+
+    # Group boxes behind their members
+    padding = 12 * scale + 6
+    for group in graph["groups"]:
+        members = [centers[node["id"]] for node in graph["nodes"] if node["group"] == group["id"]]
+        if not members:
+            continue
+        x1 = min(x for x, _ in members) - half_width - padding
+        x2 = max(x for x, _ in members) + half_width + padding
+        y1 = min(y for _, y in members) - half_height - padding - font_size
+        y2 = max(y for _, y in members) + half_height + padding
+        fill = GROUP_FILLS[group_index[group["id"]] % len(GROUP_FILLS)]
+        parts.append(f'<rect x="{x1:.1f}" y="{y1:.1f}" width="{x2 - x1:.1f}" height="{y2 - y1:.1f}" rx="10" '
+                     f'fill="{fill}" stroke="#9AA0A6" stroke-dasharray="6,4"/>')
+        parts.append(f'<text x="{x1 + 8:.1f}" y="{y1 + font_size + 2:.1f}" font-family="Arial, sans-serif" '
+                     f'font-size="{font_size:.1f}" fill="#5F6368">{escape(group["label"])}</text>')
+
+    # Edges, clipped to the node outlines
+    edge_color = "#5F6368"
+    arrow_size = max(10 * min(scale, 1.0), 6)
+    for edge, route in zip(graph["edges"], routes):
+        points = [place(point) for point in route]
+        source, target = edge["source"], edge["target"]
+        if source == target:
+            x, y = centers[source]
+            loop = f"M {x + half_width:.1f} {y:.1f} C {x + half_width + 40:.1f} {y - 40:.1f}, " \
+                   f"{x + 40:.1f} {y - half_height - 40:.1f}, {x:.1f} {y - half_height:.1f}"
+            parts.append(f'<path d="{loop}" fill="none" stroke="{edge_color}" stroke-width="2"/>')
+            parts.append(_arrow((x, y - half_height), (x + 10, y - half_height - 20), arrow_size, edge_color))
+            continue
+
+        points[0] = _boundary(centers[source], points[1], shapes[source], half_width, half_height)
+        points[-1] = _boundary(centers[target], points[-2], shapes[target], half_width, half_height)
+        if len(points) == 2:
+            (x1, y1), (x2, y2) = points
+            parts.append(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+                         f'stroke="{edge_color}" stroke-width="2"/>')
+        else:
+            polyline = " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+            parts.append(f'<polyline points="{polyline}" fill="none" stroke="{edge_color}" stroke-width="2"/>')
+        parts.append(_arrow(points[-1], points[-2], arrow_size, edge_color))
+
+        if edge["label"]:
+            middle = len(points) // 2
+            (ax, ay), (bx, by) = points[middle - 1], points[middle]
+            parts.append(f'<text x="{(ax + bx) / 2 + 6:.1f}" y="{(ay + by) / 2 - 4:.1f}" '
+                         f'font-family="Arial, sans-serif" font-size="{font_size * 0.85:.1f}" '
+                         f'fill="#3C4043">{escape(edge["label"])}</text>')
+
+    # Nodes
+    for node_id, node in nodes.items():
+        x, y = centers[node_id]
+        group = node["group"]
+        color = PALETTE[(group_index[group] + 1 if group in group_index else 0) % len(PALETTE)]
+        shape = shapes[node_id]
+        if shape == "ellipse":
+            parts.append(f'<ellipse cx="{x:.1f}" cy="{y:.1f}" rx="{half_width:.1f}" ry="{half_height:.1f}" '
+                         f'fill="{color}" stroke="#202124" stroke-width="1.5"/>')
+        elif shape == "diamond":
+            points = f"{x:.1f},{y - half_height:.1f} {x + half_width:.1f},{y:.1f} " \
+                     f"{x:.1f},{y + half_height:.1f} {x - half_width:.1f},{y:.1f}"
+            parts.append(f'<polygon points="{points}" fill="{color}" stroke="#202124" stroke-width="1.5"/>')
+        else:
+            parts.append(f'<rect x="{x - half_width:.1f}" y="{y - half_height:.1f}" width="{2 * half_width:.1f}" '
+                         f'height="{2 * half_height:.1f}" rx="6" fill="{color}" stroke="#202124" stroke-width="1.5"/>')
+        parts.extend(_text(x, y, node["label"], font_size, fill="#FFFFFF", weight="bold"))
+
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+def _render_sequence(graph: Dict[str, Any], width: int, height: int) -> str:
+    """
+    Render a sequence diagram on a grid.
+
+    Participants are columns in declaration order; each edge is a message
+    in its own row, in order, drawn as an arrow between lifelines.
+    """
+    participants = [node["id"] for node in graph["nodes"]]
+    labels = {node["id"]: node["label"] for node in graph["nodes"]}
+    messages = graph["edges"]
+
+    top = MARGIN + (TITLE_HEIGHT if graph["title"] else 0)
+    column = (width - 2 * MARGIN) / len(participants)
+    box_width = min(column - 10, NODE_WIDTH * MAX_SCALE)
+    box_height = NODE_HEIGHT
+    row = min((height - top - box_height - MARGIN - 10) / (len(messages) + 1), 70)
+    font_size = FONT_SIZE if box_width >= NODE_WIDTH * 0.8 else max(FONT_SIZE * box_width / NODE_WIDTH, 8)
+
+    columns = {node_id: MARGIN + column * (i + 0.5) for i, node_id in enumerate(participants)}
+    bottom = top + box_height + row * (len(messages) + 1)
+
+    parts = _svg_open(width, height, graph["title"])
+    for i, node_id in enumerate(participants):
+        x = columns[node_id]
+        color = PALETTE[i % len(PALETTE)]
+        parts.append(f'<line x1="{x:.1f}" y1="{top + box_height:.1f}" x2="{x:.1f}" y2="{bottom:.1f}" '
+                     f'stroke="#9AA0A6" stroke-width="1.5" stroke-dasharray="6,4"/>')
+        parts.append(f'<rect x="{x - box_width / 2:.1f}" y="{top:.1f}" width="{box_width:.1f}" '
+                     f'height="{box_height:.1f}" rx="6" fill="{color}" stroke="#202124" stroke-width="1.5"/>')
+        parts.extend(_text(x, top + box_height / 2, labels[node_id], font_size, fill="#FFFFFF", weight="bold"))
+
+    edge_color = "#202124"
+    for i, message in enumerate(messages):
+        y = top + box_height + row * (i + 1)
+        x1 = columns[message["source"]]
+        x2 = columns[message["target"]]
+        label = message["label"] or ""
+        if x1 == x2:
+            loop = f"{x1:.1f},{y - row * 0.25:.1f} {x1 + 40:.1f},{y - row * 0.25:.1f} " \
+                   f"{x1 + 40:.1f},{y + row * 0.25:.1f} {x1 + 4:.1f},{y + row * 0.25:.1f}"
+            parts.append(f'<polyline points="{loop}" fill="none" stroke="{edge_color}" stroke-width="1.5"/>')
+            parts.append(_arrow((x1, y + row * 0.25), (x1 + 10, y + row * 0.25), 9, edge_color))
+            text_x = x1 + 46
+            anchor = "start"
+        else:
+            parts.append(f'<line x1="{x1:.1f}" y1="{y:.1f}" x2="{x2:.1f}" y2="{y:.1f}" '
+                         f'stroke="{edge_color}" stroke-width="1.5"/>')
+            parts.append(_arrow((x2, y), (x1, y), 9, edge_color))
+            text_x = (x1 + x2) / 2
+            anchor = "middle"
+        if label:
+            parts.append(f'<text x="{text_x:.1f}" y="{y - 6:.1f}" font-family="Arial, sans-serif" '
+                         f'font-size="{font_size * 0.9:.1f}" text-anchor="{anchor}" '
+                         f'fill="#3C4043">{escape(label)}</text>')
+
+    parts.append("</svg>")
+    return "\n".join(parts)
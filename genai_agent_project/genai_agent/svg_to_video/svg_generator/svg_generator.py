@@ -38,6 +38,8 @@ except ImportError:
 
 # Import our LLM factory
 from ..llm_integrations import get_llm_factory
+from ...services.prompt_prefix import PrefixedPrompt
+from .svg_stream import MalformedSVGError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -84,12 +86,15 @@ class SVGGenerator:
             logger.info(f"SVG Generator initialized with providers: {self._available_providers}")
     
     def _initialize_templates(self):
-        """Initialize prompt templates for SVG generation."""
+        """
+        Initialize prompt templates for SVG generation.
+        
+        Each template is the fixed instruction part of the prompt; the concept
+        is appended after it, so the template can be cached as a prompt prefix.
+        """
         # Base template for SVG generation
         self.svg_prompt_template = """
-        Create an SVG diagram that represents the following concept:
-        
-        {concept}
+        Create an SVG diagram that represents the concept given below.
         
         Requirements:
         - Use standard SVG elements (rect, circle, path, text, etc.)
@@ -99,15 +104,11 @@ class SVGGenerator:
         - Use viewBox="0 0 800 600" for dimensions
         - Wrap the entire SVG in <svg> tags
         - Do not include any explanation, just the SVG code
-        
-        SVG Diagram:
         """
         
         # Template for flowchart diagrams
         self.flowchart_template = """
-        Create a flowchart diagram in SVG format that represents the following process:
-        
-        {concept}
+        Create a flowchart diagram in SVG format that represents the process given below.
         
         Requirements:
         - Use standard SVG elements (rect, circle, path, text, etc.)
@@ -119,15 +120,11 @@ class SVGGenerator:
         - Use viewBox="0 0 800 600" for dimensions
         - Wrap the entire SVG in <svg> tags
         - Do not include any explanation, just the SVG code
-        
-        SVG Diagram:
         """
         
         # Template for network diagrams
         self.network_template = """
-        Create a network diagram in SVG format that represents the following system:
-        
-        {concept}
+        Create a network diagram in SVG format that represents the system given below.
         
         Requirements:
         - Use standard SVG elements (rect, circle, path, text, etc.)
@@ -139,8 +136,6 @@ class SVGGenerator:
         - Use viewBox="0 0 800 600" for dimensions
         - Wrap the entire SVG in <svg> tags
         - Do not include any explanation, just the SVG code
-        
-        SVG Diagram:
         """
     
     async def generate_svg(
@@ -149,7 +144,8 @@ class SVGGenerator:
         provider: str = None, 
         diagram_type: str = None, 
         max_retries: int = 2,
-        temperature: float = 0.4
+        temperature: float = 0.4,
+        mode: str = None
     ) -> str:
         """
         Generate an SVG diagram based on a concept description.
@@ -160,6 +156,8 @@ class SVGGenerator:
             diagram_type: Type of diagram to generate (flowchart, network, etc.)
             max_retries: Maximum number of retry attempts
             temperature: Temperature for generation (0.0 to 1.0)
+            mode: "svg" for LLM-written markup, "graph" for a JSON graph rendered
+                by the local layout engine (see LLMFactory.generate_svg)
             
         Returns:
             SVG content as a string
@@ -192,7 +190,8 @@ class SVGGenerator:
                     provider=provider,
                     concept=concept,
                     style=diagram_type,
-                    temperature=temperature
+                    temperature=temperature,
+                    mode=mode
                 )
                 
                 # Extract SVG content if needed
@@ -206,6 +205,13 @@ class SVGGenerator:
                     continue
                 raise ValueError("Generated content is not valid SVG")
                 
+            except MalformedSVGError as e:
+                # Streaming aborted the response early; retry right away
+                if attempt < max_retries:
+                    logger.warning(f"Malformed SVG, retrying ({attempt+1}/{max_retries}): {str(e)}")
+                    continue
+                raise RuntimeError(f"Failed to generate SVG: {str(e)}")
+                
             except Exception as e:
                 if attempt < max_retries:
                     logger.warning(f"SVG generation error, retrying ({attempt+1}/{max_retries}): {str(e)}")
@@ -244,20 +250,20 @@ class SVGGenerator:
             diagram_type: Type of diagram (flowchart, network, sequence, etc.)
             
         Returns:
-            Formatted prompt
+            Prompt with the template as its cacheable prefix
         """
-        if not diagram_type:
-            return self.svg_prompt_template.format(concept=concept)
-        
         # Use specialized templates for different diagram types
-        diagram_type = diagram_type.lower()
-        if diagram_type == "flowchart":
-            return self.flowchart_template.format(concept=concept)
-        elif diagram_type == "network":
-            return self.network_template.format(concept=concept)
-        else:
-            # For any other diagram type, use the base template
-            return self.svg_prompt_template.format(concept=concept)
+        template = self.svg_prompt_template
+        if diagram_type and diagram_type.lower() == "flowchart":
+            template = self.flowchart_template
+        elif diagram_type and diagram_type.lower() == "network":
+            template = self.network_template
+        
+        return PrefixedPrompt(template, f"""
+        {concept}
+        
+        SVG Diagram:
+        """)
     
     def save_svg(self, svg_content: str, filename: str = None) -> str:
         """
@@ -304,6 +310,15 @@ class SVGGenerator:
         """
         return self._available_providers
     
+    def get_generation_timings(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get time-to-valid-SVG statistics per provider.
+        
+        Returns:
+            Dictionary of provider name to timing statistics
+        """
+        return self.llm_factory.get_svg_timings()
+    
     def is_provider_available(self, provider: str) -> bool:
         """
         Check if a specific provider is available.
@@ -0,0 +1,125 @@
+"""
+Incremental SVG Validation for Streamed LLM Responses
+
+SVGStreamValidator is fed response chunks as they arrive. It skips any text
+before the opening <svg tag, checks well-formedness with an incremental XML
+parser and reports completion as soon as the root </svg> closes, so the
+caller can stop the request there and drop whatever the model adds after
+the markup. Malformed markup raises at the chunk where it becomes
+detectable instead of after the whole completion.
+"""
+
+import logging
+import re
+from typing import Optional
+from xml.parsers import expat
+
+logger = logging.getLogger(__name__)
+
+SVG_START = re.compile(rb"<svg[\s>/]")
+
+class MalformedSVGError(ValueError):
+    """Raised when a streamed response is not well-formed SVG."""
+
+class SVGStreamValidator:
+    """Incremental well-formedness check for a streamed SVG response."""
+
+    def __init__(self, max_bytes: int = 2 * 1024 * 1024):
+        """
+        Create a validator for one response.
+
+        Args:
+            max_bytes: Abort responses whose SVG grows beyond this size
+        """
+        self.max_bytes = max_bytes
+        self.complete = False
+
+        self._pending = b""
+        self._data = bytearray()
+        self._depth = 0
+        self._end = None
+        self._parser = None
+
+    def feed(self, text: str) -> bool:
+        """
+        Feed the next chunk of the response.
+
+        Args:
+            text: Response chunk
+
+        Returns:
+            True once the root </svg> element has been closed
+
+        Raises:
+            MalformedSVGError: If the markup so far is not well-formed
+        """
+        if self.complete:
+            return True
+
+        chunk = text.encode("utf-8")
+        if self._parser is None:
+            # Wait for the opening tag, keeping a short tail in case it is split across chunks
+            self._pending += chunk
+            match = SVG_START.search(self._pending)
+            if not match:
+                self._pending = self._pending[-4:]
+                return False
+            chunk = self._pending[match.start():]
+            self._pending = b""
+            self._start_parser()
+
+        self._data += chunk
+        if len(self._data) > self.max_bytes:
+            raise MalformedSVGError(f"SVG exceeds {self.max_bytes} bytes")
+
+        try:
+            self._parser.Parse(chunk, False)
+        except expat.ExpatError as e:
+            # Anything after the root element is not our concern
+            if self._end is None:
+                raise MalformedSVGError(f"Malformed SVG: {expat.ErrorString(e.code)} "
+                                        f"at line {e.lineno}, column {e.offset}")
+
+        if self._end is not None:
+            self.complete = True
+        return self.complete
+
+    def close(self) -> str:
+        """
+        Finish the response.
+
+        Returns:
+            The SVG markup, from <svg to the closing </svg>
+
+        Raises:
+            MalformedSVGError: If the response did not contain a complete SVG
+        """
+        if self._parser is None:
+            raise MalformedSVGError("No <svg> element in response")
+        if not self.complete:
+            raise MalformedSVGError("Response ended before </svg>")
+        return self.svg
+
+    @property
+    def svg(self) -> Optional[str]:
+        """The complete SVG markup, or None while it is incomplete."""
+        if self._end is None:
+            return None
+        return bytes(self._data[:self._end]).decode("utf-8")
+
+    def _start_parser(self):
+        self._parser = expat.ParserCreate("utf-8")
+        self._parser.StartElementHandler = self._start_element
+        self._parser.EndElementHandler = self._end_element
+
+    def _start_element(self, name, attributes):
+        self._depth += 1
+
+    def _end_element(self, name):
+        self._depth -= 1
+        if self._depth == 0:
+            # CurrentByteIndex points at the end tag, which ends at the next '>'
+            index = self._parser.CurrentByteIndex
+            self._end = self._data.index(b">", index) + 1
+            # Stop parsing: trailing chatter would be reported as junk after the root
+            raise expat.ExpatError("root element closed")
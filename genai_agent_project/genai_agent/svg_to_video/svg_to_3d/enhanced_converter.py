@@ -13,7 +13,7 @@ import math
 import mathutils
 from mathutils import Vector, Matrix
 
-from .svg_utils import log, hex_to_rgb, clean_scene
+from .svg_utils import log, hex_to_rgb, clean_scene, INSTANCEABLE_TYPES
 from .svg_parser import SVGParser
 from .enhanced_materials import EnhancedSVGMaterialHandler
 from .enhanced_geometry import GeometryEnhancer
@@ -24,7 +24,8 @@ class EnhancedSVGTo3DConverter:
     """Convert SVG elements to professional-grade 3D Blender objects."""
     
     def __init__(self, svg_path, extrude_depth=0.1, scale_factor=0.01, 
-                 style_preset='technical', use_enhanced_features=True, debug=False):
+                 style_preset='technical', use_enhanced_features=True, debug=False,
+                 merge_meshes=False, instance_shapes=False, cache_glyphs=False, bake_labels=False):
         """
         Initialize the enhanced SVG to 3D converter.
         
@@ -35,6 +36,10 @@ class EnhancedSVGTo3DConverter:
             style_preset: Visual style preset ('technical', 'organic', 'glossy', 'metal')
             use_enhanced_features: Whether to use enhanced features (materials, geometry, etc.)
             debug: Enable debug output
+            merge_meshes: Join elements sharing materials into single meshes
+            instance_shapes: Share mesh data between identical shapes
+            cache_glyphs: Build text labels from cached glyph meshes
+            bake_labels: Bake all text labels into a single mesh
         """
         self.svg_path = svg_path
         self.extrude_depth = extrude_depth
@@ -42,6 +47,10 @@ class EnhancedSVGTo3DConverter:
         self.style_preset = style_preset
         self.use_enhanced_features = use_enhanced_features
         self.debug = debug
+        self.merge_meshes = merge_meshes
+        self.instance_shapes = instance_shapes
+        self.cache_glyphs = cache_glyphs
+        self.bake_labels = bake_labels
         
         self.parser = SVGParser(svg_path, debug)
         self.width = 0
@@ -61,6 +70,10 @@ class EnhancedSVGTo3DConverter:
         # Storage for created objects
         self.created_objects = []
         self.group_objects = {}
+        self.shape_instances = {}
+        self.instance_count = 0
+        self.glyph_cache = {}
+        self.label_meshes = {}
     
     def debug_log(self, message):
         """Debug logging function."""
@@ -102,7 +115,24 @@ class EnhancedSVGTo3DConverter:
             import traceback
             traceback.print_exc()
             return False
-    
+
+    def get_text_material(self, style):
+        """Get the material apply_material_to_object gives a text object."""
+        fill_color = style.get('fill', '#000000')
+        opacity = float(style.get('opacity', 1.0))
+        fill_opacity = float(style.get('fill-opacity', opacity))
+
+        if self.use_enhanced_features:
+            return self.material_handler.get_text_material(fill_color, fill_opacity, use_presets=True)
+        else:
+            return self.material_handler.get_text_material(fill_color, fill_opacity)
+
+    def get_text_geometry(self):
+        """Get the extrusion and bevel a text curve ends up with after apply_material_to_object."""
+        geometry = {'extrude': self.extrude_depth, 'bevel_depth': self.extrude_depth * 0.1}
+        geometry.update(self.material_handler.get_text_geometry())
+        return geometry
+
     def classify_element(self, element_type, style):
         """
         Determine semantic class of an element for specialized handling.
@@ -148,8 +178,15 @@ class EnhancedSVGTo3DConverter:
             
             log(f"Creating 3D object of type {element_type}")
             
+            # Reuse the mesh of an identical shape if one was already built
+            prototype = None
+            if self.instance_shapes and element_type in INSTANCEABLE_TYPES:
+                prototype = self.find_shape_instance(element)
+            
             # Create base object using appropriate function
-            if element_type == 'rect':
+            if prototype:
+                obj = self.instance_shape(prototype, element)
+            elif element_type == 'rect':
                 obj = self.create_3d_rect(element)
             elif element_type == 'circle':
                 obj = self.create_3d_circle(element)
@@ -173,8 +210,12 @@ class EnhancedSVGTo3DConverter:
             
             # If object was created successfully
             if obj:
-                # Apply geometry enhancements
-                obj = self.enhance_object_geometry(obj, element_type, element.get('style', {}))
+                # Apply geometry enhancements (instances share the enhanced prototype
+                # mesh, cached labels share the glyph meshes)
+                if not prototype and not (self.cache_glyphs and element_type == 'text'):
+                    obj = self.enhance_object_geometry(obj, element_type, element.get('style', {}))
+                    if self.instance_shapes and element_type in INSTANCEABLE_TYPES:
+                        obj = self.register_shape_instance(obj, element)
                 
                 # Store object for later organization
                 self.created_objects.append(obj)
@@ -207,6 +248,12 @@ class EnhancedSVGTo3DConverter:
     
     from .svg_converter_group import create_3d_group
     from .svg_converter_path import create_3d_path
+    from .svg_converter_merge import merge_objects_by_material, merge_object_group
+    from .svg_converter_instance import find_shape_instance, instance_shape, register_shape_instance
+    from .svg_converter_text import (
+        evaluate_text_meshes, ensure_glyphs, build_label_mesh,
+        create_3d_text_cached, bake_text_labels
+    )
     
     def setup_camera_and_lighting(self):
         """
@@ -318,6 +365,16 @@ class EnhancedSVGTo3DConverter:
                     log(f"Failed to create object for {element['type']}")
             
             log(f"Created {created_objects} 3D objects out of {len(self.elements)} elements")
+            if self.instance_shapes:
+                log(f"Shared geometry: {len(self.shape_instances)} unique shapes, {self.instance_count} instances")
+            
+            # Bake all labels into one mesh
+            if self.bake_labels:
+                self.created_objects = self.bake_text_labels(self.created_objects)
+            
+            # Join elements into one mesh per material set
+            if self.merge_meshes:
+                self.created_objects = self.merge_objects_by_material(self.created_objects)
             
             # Verify objects in scene
             scene_objects = [obj for obj in bpy.context.scene.objects if obj.type not in ['CAMERA', 'LIGHT', 'EMPTY']]
@@ -355,7 +412,8 @@ class EnhancedSVGTo3DConverter:
 
 
 # Factory function to get appropriate converter
-def get_svg_converter(svg_path, extrude_depth=0.1, scale_factor=0.01, use_enhanced=True, style_preset='technical', debug=False):
+def get_svg_converter(svg_path, extrude_depth=0.1, scale_factor=0.01, use_enhanced=True, style_preset='technical', debug=False,
+                      merge_meshes=False, instance_shapes=False, cache_glyphs=False, bake_labels=False):
     """Return appropriate SVG converter based on settings"""
     if use_enhanced:
         return EnhancedSVGTo3DConverter(
@@ -364,7 +422,11 @@ def get_svg_converter(svg_path, extrude_depth=0.1, scale_factor=0.01, use_enhanc
             scale_factor=scale_factor,
             style_preset=style_preset,
             use_enhanced_features=True,
-            debug=debug
+            debug=debug,
+            merge_meshes=merge_meshes,
+            instance_shapes=instance_shapes,
+            cache_glyphs=cache_glyphs,
+            bake_labels=bake_labels
         )
     else:
         # Import the original converter for fallback
@@ -373,5 +435,9 @@ def get_svg_converter(svg_path, extrude_depth=0.1, scale_factor=0.01, use_enhanc
             svg_path, 
             extrude_depth=extrude_depth,
             scale_factor=scale_factor,
-            debug=debug
+            debug=debug,
+            merge_meshes=merge_meshes,
+            instance_shapes=instance_shapes,
+            cache_glyphs=cache_glyphs,
+            bake_labels=bake_labels
         )
@@ -337,6 +337,41 @@ class EnhancedSVGMaterialHandler:
         self.preset_cache[cache_key] = material
         return material
     
+    def get_text_material(self, fill_color, fill_opacity=1.0, use_presets=True, style_preset='technical'):
+        """
+        Get the fill material of a text object
+        
+        Args:
+            fill_color: Hex color string
+            fill_opacity: Fill opacity (0-1)
+            use_presets: Whether to use material presets
+            style_preset: Style preset to use
+            
+        Returns:
+            Blender material
+        """
+        # Text material based on style preset
+        if use_presets:
+            if style_preset == 'professional':
+                return self.get_material_preset('professional', fill_color)
+            return self.get_material_preset('glossy', fill_color)
+        return self.create_fill_material(fill_color, fill_opacity, 'text')
+    
+    def get_text_geometry(self, style_preset='technical'):
+        """
+        Get the extrusion and bevel of text curves
+        
+        Args:
+            style_preset: Style preset to use
+            
+        Returns:
+            Dictionary of text curve settings
+        """
+        if style_preset == 'professional':
+            # Reduced extrusion and bevel with smoother edges for a cleaner look
+            return {'extrude': 0.03, 'bevel_depth': 0.003, 'bevel_resolution': 3}
+        return {'extrude': 0.05, 'bevel_depth': 0.005, 'bevel_resolution': 2}
+    
     def apply_materials_to_object(self, obj, style, element_type=None, use_presets=True, style_preset='technical'):
         """
         Apply enhanced materials to an object based on SVG style
@@ -514,28 +549,14 @@ class EnhancedSVGMaterialHandler:
             elif obj.type == 'FONT':
                 # For text objects
                 if fill_color and fill_color.lower() != 'none':
-                    # Text material based on style preset
-                    if use_presets:
-                        if style_preset == 'professional':
-                            fill_mat = self.get_material_preset('professional', fill_color)
-                        else:
-                            fill_mat = self.get_material_preset('glossy', fill_color)
-                    else:
-                        fill_mat = self.create_fill_material(fill_color, fill_opacity, 'text')
-                    
+                    fill_mat = self.get_text_material(fill_color, fill_opacity, use_presets, style_preset)
                     if fill_mat:
                         obj.data.materials.append(fill_mat)
                         log(f"  Applied enhanced text material: {fill_mat.name}")
                 
                 # Set text extrusion - adjusted based on style
-                if style_preset == 'professional':
-                    obj.data.extrude = 0.03  # Reduced extrusion for professional style
-                    obj.data.bevel_depth = 0.003  # Reduced bevel for cleaner look
-                    obj.data.bevel_resolution = 3  # Higher resolution for smoother edges
-                else:
-                    obj.data.extrude = 0.05
-                    obj.data.bevel_depth = 0.005
-                    obj.data.bevel_resolution = 2
+                for setting, value in self.get_text_geometry(style_preset).items():
+                    setattr(obj.data, setting, value)
             
             # Add custom properties for animation system
             obj['material_class'] = element_class
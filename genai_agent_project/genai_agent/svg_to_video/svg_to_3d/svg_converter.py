@@ -19,7 +19,8 @@ from .svg_parser import SVGParser
 class SVGTo3DConverter:
     """Convert SVG elements to 3D Blender objects."""
     
-    def __init__(self, svg_path, extrude_depth=0.1, scale_factor=0.01, debug=False):
+    def __init__(self, svg_path, extrude_depth=0.1, scale_factor=0.01, debug=False, merge_meshes=False,
+                 instance_shapes=False, cache_glyphs=False, bake_labels=False):
         """
         Initialize the SVG to 3D converter.
         
@@ -28,17 +29,29 @@ class SVGTo3DConverter:
             extrude_depth: Depth for 3D extrusion (default: 0.1)
             scale_factor: Scale factor for SVG to Blender space (default: 0.01)
             debug: Enable debug output
+            merge_meshes: Join elements sharing materials into single meshes
+            instance_shapes: Share mesh data between identical shapes
+            cache_glyphs: Build text labels from cached glyph meshes
+            bake_labels: Bake all text labels into a single mesh
         """
         self.svg_path = svg_path
         self.extrude_depth = extrude_depth
         self.scale_factor = scale_factor
         self.debug = debug
+        self.merge_meshes = merge_meshes
+        self.instance_shapes = instance_shapes
+        self.cache_glyphs = cache_glyphs
+        self.bake_labels = bake_labels
         self.parser = SVGParser(svg_path, debug)
         self.width = 0
         self.height = 0
         self.elements = []
         self.material_cache = {}
         self.group_objects = {}
+        self.shape_instances = {}
+        self.instance_count = 0
+        self.glyph_cache = {}
+        self.label_meshes = {}
     
     def debug_log(self, message):
         """Debug logging function."""
@@ -47,13 +60,19 @@ class SVGTo3DConverter:
     
     # Import creation methods from separate modules
     from .svg_converter_create import (
-        create_material, apply_material_to_object, 
+        create_material, apply_material_to_object, get_text_material, get_text_geometry,
         create_3d_object, create_3d_rect, create_3d_circle, 
         create_3d_ellipse, create_3d_line, create_3d_polyline, 
         create_3d_polygon, create_3d_text
     )
     from .svg_converter_group import create_3d_group
     from .svg_converter_path import create_3d_path
+    from .svg_converter_merge import merge_objects_by_material, merge_object_group
+    from .svg_converter_instance import find_shape_instance, instance_shape, register_shape_instance
+    from .svg_converter_text import (
+        evaluate_text_meshes, ensure_glyphs, build_label_mesh,
+        create_3d_text_cached, bake_text_labels
+    )
     
     # Import scene setup methods from separate module
     from .svg_converter_scene import (
@@ -96,6 +115,20 @@ class SVGTo3DConverter:
                     log(f"Failed to create object for {element['type']}")
             
             log(f"Created {created_objects} 3D objects out of {len(self.elements)} elements")
+            if self.instance_shapes:
+                log(f"Shared geometry: {len(self.shape_instances)} unique shapes, {self.instance_count} instances")
+            
+            # Bake all labels into one mesh
+            if self.bake_labels:
+                self.bake_text_labels(
+                    [obj for obj in bpy.context.scene.objects if obj.type not in ['CAMERA', 'LIGHT', 'EMPTY']]
+                )
+            
+            # Join elements into one mesh per material set
+            if self.merge_meshes:
+                self.merge_objects_by_material(
+                    [obj for obj in bpy.context.scene.objects if obj.type not in ['CAMERA', 'LIGHT', 'EMPTY']]
+                )
             
             # Verify objects in scene
             scene_objects = [obj for obj in bpy.context.scene.objects if obj.type not in ['CAMERA', 'LIGHT', 'EMPTY']]
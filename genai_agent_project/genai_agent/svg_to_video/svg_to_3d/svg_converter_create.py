@@ -11,7 +11,7 @@ import traceback
 import math
 from mathutils import Vector
 
-from .svg_utils import log, hex_to_rgb
+from .svg_utils import log, hex_to_rgb, INSTANCEABLE_TYPES
 from .svg_converter_materials_fixed import SVGMaterialHandler
 
 
@@ -45,11 +45,49 @@ def apply_material_to_object(self, obj, style):
         return False
 
 
+def get_text_material(self, style):
+    """Get the material apply_material_to_object gives a text object."""
+    if not hasattr(self, 'material_handler'):
+        self.material_handler = SVGMaterialHandler()
+    
+    fill_color = style.get('fill', '#000000')
+    opacity = float(style.get('opacity', 1.0))
+    fill_opacity = float(style.get('fill-opacity', opacity))
+    
+    return self.material_handler.get_text_material(fill_color, fill_opacity)
+
+
+def get_text_geometry(self):
+    """Get the extrusion and bevel a text curve ends up with after apply_material_to_object."""
+    if not hasattr(self, 'material_handler'):
+        self.material_handler = SVGMaterialHandler()
+    
+    geometry = {'extrude': self.extrude_depth, 'bevel_depth': self.extrude_depth * 0.1}
+    geometry.update(self.material_handler.get_text_geometry())
+    return geometry
+
+
 def create_3d_object(self, element):
     """Create a 3D object from an SVG element."""
     try:
         element_type = element.get('type', 'unknown')
         
+        # Reuse the mesh of an identical shape if one was already built
+        if getattr(self, 'instance_shapes', False) and element_type in INSTANCEABLE_TYPES:
+            prototype = self.find_shape_instance(element)
+            if prototype:
+                return self.instance_shape(prototype, element)
+            
+            if element_type == 'rect':
+                obj = self.create_3d_rect(element)
+            elif element_type == 'circle':
+                obj = self.create_3d_circle(element)
+            elif element_type == 'ellipse':
+                obj = self.create_3d_ellipse(element)
+            else:
+                obj = self.create_3d_polygon(element)
+            return self.register_shape_instance(obj, element)
+        
         if element_type == 'rect':
             return self.create_3d_rect(element)
         elif element_type == 'circle':
@@ -472,6 +510,10 @@ def create_3d_polygon(self, element):
 
 def create_3d_text(self, element):
     """Create a 3D text from SVG text element."""
+    # Assemble the label from cached glyph meshes if enabled
+    if getattr(self, 'cache_glyphs', False):
+        return self.create_3d_text_cached(element)
+    
     try:
         # Extract text properties
         x = element['x']
@@ -526,6 +568,7 @@ def create_3d_text(self, element):
         
         # Set object name
         obj.name = f"Text_{len(bpy.data.objects)}"
+        obj['svg_label'] = text
         
         log(f"Text created successfully: {obj.name}")
         return obj
@@ -0,0 +1,109 @@
+"""
+SVG to 3D Converter Instancing Methods
+
+This module contains the shape instancing methods for the SVG to 3D converter.
+
+LLM-generated diagrams repeat identical boxes, circles and arrowheads many
+times. With instancing enabled the first shape with a given fingerprint
+(geometry normalized for translation, plus style) is built as usual and
+converted to a mesh; every later identical shape becomes a linked duplicate
+that shares that mesh datablock and is only moved into place, so memory,
+.blend size and conversion time scale with the number of unique shapes.
+"""
+
+import bpy
+from mathutils import Vector
+from .svg_utils import log, shape_fingerprint
+
+
+def find_shape_instance(self, element):
+    """
+    Look up a previously built shape identical to an element.
+
+    Args:
+        element: Parsed SVG element
+
+    Returns:
+        Tuple (prototype object, prototype anchor), or None if there is none
+    """
+    key, _ = shape_fingerprint(element)
+    if key is None:
+        return None
+    return self.shape_instances.get(key)
+
+
+def instance_shape(self, prototype_entry, element):
+    """
+    Place a linked duplicate of a prototype shape for an element.
+
+    Args:
+        prototype_entry: Tuple (prototype object, prototype anchor)
+        element: Parsed SVG element to place
+
+    Returns:
+        New object sharing the prototype's mesh data
+    """
+    prototype, prototype_anchor = prototype_entry
+    _, anchor = shape_fingerprint(element)
+
+    # SVG y points down, Blender y points up
+    offset = Vector((
+        (anchor[0] - prototype_anchor[0]) * self.scale_factor,
+        (prototype_anchor[1] - anchor[1]) * self.scale_factor,
+        0
+    ))
+
+    obj = prototype.copy()
+    obj.parent = None
+    bpy.context.collection.objects.link(obj)
+    obj.location = prototype.matrix_world.translation + offset
+    obj.name = f"{element['type'].capitalize()}_{len(bpy.data.objects)}"
+
+    self.instance_count += 1
+    log(f"Instanced {element['type']} from {prototype.name}: {obj.name}")
+    return obj
+
+
+def register_shape_instance(self, obj, element):
+    """
+    Turn a newly built shape into a shareable mesh prototype.
+
+    The evaluated geometry (curve fill, extrusion and modifiers) is baked
+    into a mesh so that duplicates share the tessellation as well.
+
+    Args:
+        obj: Object built for the element
+        element: Parsed SVG element
+
+    Returns:
+        The mesh object that replaces obj
+    """
+    key, anchor = shape_fingerprint(element)
+    if key is None or obj is None:
+        return obj
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+    if not mesh.materials:
+        for slot in obj.material_slots:
+            mesh.materials.append(slot.material)
+
+    mesh_obj = bpy.data.objects.new(obj.name, mesh)
+    mesh_obj.matrix_basis = obj.matrix_basis.copy()
+    for collection in obj.users_collection:
+        collection.objects.link(mesh_obj)
+    for prop in obj.keys():
+        mesh_obj[prop] = obj[prop]
+
+    data = obj.data
+    name = obj.name
+    bpy.data.objects.remove(obj, do_unlink=True)
+    if data is not None and data.users == 0:
+        if isinstance(data, bpy.types.Mesh):
+            bpy.data.meshes.remove(data)
+        else:
+            bpy.data.curves.remove(data)
+    mesh_obj.name = name
+
+    self.shape_instances[key] = (mesh_obj, anchor)
+    return mesh_obj
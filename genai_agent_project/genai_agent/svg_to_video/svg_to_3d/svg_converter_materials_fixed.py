@@ -83,6 +83,14 @@ class SVGMaterialHandler:
         """Create a fill material"""
         return self.create_material(color, opacity, 'fill')
     
+    def get_text_material(self, color, opacity=1.0):
+        """Get the fill material of a text object"""
+        return self.create_fill_material(color, opacity)
+    
+    def get_text_geometry(self):
+        """Get the text curve settings (the bevel is left to the converter)"""
+        return {'extrude': 0.05}
+    
     def apply_materials_to_object(self, obj, style):
         """Apply materials to object based on SVG style"""
         fill_color = style.get('fill', '#000000')
@@ -184,13 +192,14 @@ class SVGMaterialHandler:
         elif obj.type == 'FONT':
             # For text objects
             if fill_color and fill_color.lower() != 'none':
-                fill_mat = self.create_fill_material(fill_color, fill_opacity)
+                fill_mat = self.get_text_material(fill_color, fill_opacity)
                 if fill_mat:
                     obj.data.materials.append(fill_mat)
                     log(f"  Applied fill material to text: {fill_mat.name}")
             
             # Set text extrusion
-            obj.data.extrude = 0.05
+            for setting, value in self.get_text_geometry().items():
+                setattr(obj.data, setting, value)
         
         # Set object transparency flags
         if obj.data.materials:
@@ -0,0 +1,155 @@
+"""
+SVG to 3D Converter Merge Method
+
+This module contains the merged-mesh output mode for the SVG to 3D converter.
+
+Every SVG element normally becomes its own Blender object (and usually a curve
+datablock as well), so a dense diagram produces thousands of tiny objects that
+slow down depsgraph evaluation, animation, saving and BVH builds. In merged
+mode the evaluated geometry of all elements that share the same materials is
+joined into a single mesh with bmesh. Each merged object keeps a table that
+maps the original SVG elements to their face ranges, and every face carries
+the index of its element in an integer face attribute, so animation can still
+address individual elements.
+"""
+
+import bpy
+import bmesh
+import json
+from .svg_utils import log
+
+# Custom property holding the element -> face range table of a merged object
+ELEMENT_FACES_PROPERTY = "svg_element_faces"
+
+# Integer face attribute holding the element index of each face
+ELEMENT_ATTRIBUTE = "svg_element"
+
+# Object types whose evaluated geometry can be merged
+MERGEABLE_TYPES = {'MESH', 'CURVE', 'FONT'}
+
+
+def merge_objects_by_material(self, objects):
+    """
+    Join objects that share materials into one mesh object per material set.
+
+    Args:
+        objects: Objects created from SVG elements
+
+    Returns:
+        List of merged objects (plus any objects that could not be merged)
+    """
+    try:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+
+        # Group by collection and material slots so each merged mesh keeps
+        # its materials and stays in the collection of its elements
+        groups = {}
+        unmerged = []
+        for obj in objects:
+            if obj is None or obj.type not in MERGEABLE_TYPES:
+                if obj is not None:
+                    unmerged.append(obj)
+                continue
+
+            collection = obj.users_collection[0] if obj.users_collection else bpy.context.scene.collection
+            materials = tuple(slot.material for slot in obj.material_slots)
+            key = (collection.name, tuple(m.name if m else None for m in materials))
+            groups.setdefault(key, (collection, materials, []))[2].append(obj)
+
+        merged_objects = []
+        for collection, materials, group in groups.values():
+            merged_objects.append(self.merge_object_group(group, collection, materials, depsgraph))
+
+        # Remove the original objects and their now unused data
+        for collection, materials, group in groups.values():
+            for obj in group:
+                data = obj.data
+                bpy.data.objects.remove(obj, do_unlink=True)
+                if data is not None and data.users == 0:
+                    if isinstance(data, bpy.types.Mesh):
+                        bpy.data.meshes.remove(data)
+                    else:
+                        bpy.data.curves.remove(data)
+
+        log(f"Merged {sum(len(g[2]) for g in groups.values())} objects into {len(merged_objects)} meshes")
+        return merged_objects + unmerged
+    except Exception as e:
+        log(f"Error merging objects: {e}")
+        import traceback
+        traceback.print_exc()
+        return objects
+
+
+def merge_object_group(self, objects, collection, materials, depsgraph):
+    """
+    Join the evaluated geometry of a group of objects into one mesh object.
+
+    Args:
+        objects: Objects sharing the same collection and materials
+        collection: Collection that receives the merged object
+        materials: Material slots shared by the objects
+        depsgraph: Evaluated dependency graph
+
+    Returns:
+        The merged Blender object
+    """
+    bm = bmesh.new()
+    element_layer = bm.faces.layers.int.new(ELEMENT_ATTRIBUTE)
+    element_faces = []
+
+    for index, obj in enumerate(objects):
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+
+        first_vert = len(bm.verts)
+        first_face = len(bm.faces)
+
+        # from_mesh appends to the existing geometry
+        bm.from_mesh(mesh)
+        evaluated.to_mesh_clear()
+
+        bm.verts.ensure_lookup_table()
+        bm.faces.ensure_lookup_table()
+        bmesh.ops.transform(bm, matrix=obj.matrix_world, verts=bm.verts[first_vert:])
+        for face in bm.faces[first_face:]:
+            face[element_layer] = index
+
+        element_faces.append({
+            "element": obj.get('svg_element') or obj.name,
+            "name": obj.name,
+            "type": obj.get('svg_type', obj.type.lower()),
+            "first_face": first_face,
+            "face_count": len(bm.faces) - first_face
+        })
+
+    name = materials[0].name if materials and materials[0] else "Unassigned"
+    mesh = bpy.data.meshes.new(f"Merged_{name}")
+    bm.to_mesh(mesh)
+    bm.free()
+
+    for material in materials:
+        mesh.materials.append(material)
+
+    merged = bpy.data.objects.new(f"Merged_{name}", mesh)
+    collection.objects.link(merged)
+    merged[ELEMENT_FACES_PROPERTY] = json.dumps(element_faces)
+
+    log(f"Merged {len(objects)} objects into {merged.name} ({len(mesh.polygons)} faces)")
+    return merged
+
+
+def get_element_faces(obj, element):
+    """
+    Look up the face range of an SVG element inside a merged object.
+
+    Args:
+        obj: Merged Blender object
+        element: Element id or original object name
+
+    Returns:
+        Tuple (first_face, face_count), or None if the element is not in the object
+    """
+    for entry in json.loads(obj.get(ELEMENT_FACES_PROPERTY, "[]")):
+        if element in (entry["element"], entry["name"]):
+            return entry["first_face"], entry["face_count"]
+    return None
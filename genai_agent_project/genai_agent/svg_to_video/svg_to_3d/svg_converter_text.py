@@ -0,0 +1,297 @@
+"""
+SVG to 3D Converter Text Methods
+
+This module contains the glyph-cached text creation methods for the SVG to 3D
+converter.
+
+A Blender text curve re-tessellates and extrudes every glyph of its body, so
+diagrams full of short repeated labels spend most of their conversion time
+building the same glyphs over and over. With glyph caching enabled each glyph
+is tessellated and extruded once per (font, size, character); labels are then
+assembled by copying the cached glyph geometry into a label mesh, and labels
+with identical text share that mesh. Optionally all labels of a diagram are
+baked into a single mesh.
+"""
+
+import bpy
+import bmesh
+import json
+from .svg_utils import log
+from .svg_converter_merge import ELEMENT_FACES_PROPERTY, ELEMENT_ATTRIBUTE
+
+# Character used to measure glyph advances
+ADVANCE_PROBE = "H"
+
+
+def find_font(font_family):
+    """
+    Find a loaded font matching an SVG font family.
+
+    Args:
+        font_family: SVG font-family value
+
+    Returns:
+        Blender font, or None to use the default font
+    """
+    for font in bpy.data.fonts:
+        if font_family.lower() in font.name.lower():
+            return font
+    return None
+
+
+def evaluate_text_meshes(self, font, bodies):
+    """
+    Tessellate several text bodies with one depsgraph evaluation.
+
+    Args:
+        font: Blender font (or None for the default font)
+        bodies: List of strings to tessellate
+
+    Returns:
+        Dictionary mapping each body to a new mesh
+    """
+    # Same extrusion and bevel as text curves after the material handler
+    geometry = self.get_text_geometry()
+
+    temp_objects = []
+    for body in bodies:
+        curve = bpy.data.curves.new("GlyphCache", 'FONT')
+        curve.body = body
+        for setting, value in geometry.items():
+            setattr(curve, setting, value)
+        if font:
+            curve.font = font
+        obj = bpy.data.objects.new("GlyphCache", curve)
+        bpy.context.scene.collection.objects.link(obj)
+        temp_objects.append((body, obj))
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    meshes = {}
+    for body, obj in temp_objects:
+        meshes[body] = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+        curve = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        bpy.data.curves.remove(curve)
+    return meshes
+
+
+def max_x(mesh):
+    """Get the largest x coordinate of a mesh (0 for empty meshes)."""
+    return max((v.co.x for v in mesh.vertices), default=0.0)
+
+
+def ensure_glyphs(self, font, font_size, text):
+    """
+    Make sure every character of a text is in the glyph cache.
+
+    Each glyph is stored as (mesh or None for blank glyphs, advance). The
+    advance of a character c is measured as the extent of "HcH" minus the
+    extent of "HH", which also works for spaces.
+
+    Args:
+        font: Blender font (or None for the default font)
+        font_size: SVG font size
+        text: Label text
+    """
+    font_name = font.name if font else "default"
+    missing = sorted({c for c in text if (font_name, font_size, c) not in self.glyph_cache})
+    if not missing:
+        return
+
+    bodies = list(missing) + [ADVANCE_PROBE + c + ADVANCE_PROBE for c in missing]
+    reference_key = (font_name, font_size, None)
+    if reference_key not in self.glyph_cache:
+        bodies.append(ADVANCE_PROBE * 2)
+
+    meshes = self.evaluate_text_meshes(font, bodies)
+
+    if reference_key not in self.glyph_cache:
+        self.glyph_cache[reference_key] = (None, max_x(meshes[ADVANCE_PROBE * 2]))
+    reference = self.glyph_cache[reference_key][1]
+
+    for c in missing:
+        glyph = meshes[c]
+        if not glyph.polygons:
+            bpy.data.meshes.remove(glyph)
+            glyph = None
+        advance = max_x(meshes[ADVANCE_PROBE + c + ADVANCE_PROBE]) - reference
+        self.glyph_cache[(font_name, font_size, c)] = (glyph, advance)
+
+    for body, mesh in meshes.items():
+        if len(body) > 1:
+            bpy.data.meshes.remove(mesh)
+
+    log(f"Cached {len(missing)} glyphs for font {font_name} size {font_size}")
+
+
+def build_label_mesh(self, font, font_size, text):
+    """
+    Assemble a label mesh from cached glyph meshes.
+
+    Args:
+        font: Blender font (or None for the default font)
+        font_size: SVG font size
+        text: Label text
+
+    Returns:
+        Mesh shared by all labels with the same font, size and text
+    """
+    font_name = font.name if font else "default"
+    key = (font_name, font_size, text)
+    if key in self.label_meshes:
+        return self.label_meshes[key]
+
+    self.ensure_glyphs(font, font_size, text)
+
+    bm = bmesh.new()
+    cursor = 0.0
+    for c in text:
+        glyph, advance = self.glyph_cache[(font_name, font_size, c)]
+        if glyph is not None:
+            first_vert = len(bm.verts)
+            bm.from_mesh(glyph)
+            bm.verts.ensure_lookup_table()
+            bmesh.ops.translate(bm, vec=(cursor, 0, 0), verts=bm.verts[first_vert:])
+        cursor += advance
+
+    mesh = bpy.data.meshes.new(f"Label_{text}")
+    bm.to_mesh(mesh)
+    bm.free()
+
+    # One slot whose material is set per object, so differently colored
+    # labels can share the mesh
+    mesh.materials.append(None)
+
+    self.label_meshes[key] = mesh
+    return mesh
+
+
+def create_3d_text_cached(self, element):
+    """Create a 3D text from SVG text element using the glyph cache."""
+    try:
+        # Extract text properties
+        x = element['x']
+        y = element['y']
+        text = element['text']
+
+        log(f"Creating cached 3D text: x={x}, y={y}, text='{text}'")
+
+        # Convert to Blender coordinates
+        bx = (x - self.width/2) * self.scale_factor
+        by = (self.height/2 - y) * self.scale_factor
+
+        # Font settings
+        font_size = float(element['style'].get('font-size', 12))
+        font_family = element['style'].get('font-family', 'Arial')
+        font = find_font(font_family)
+
+        mesh = self.build_label_mesh(font, font_size, text)
+
+        # Same scale as the text curve path
+        text_scale = (font_size / 8.0) * self.scale_factor
+
+        obj = bpy.data.objects.new(f"Text_{len(bpy.data.objects)}", mesh)
+        bpy.context.collection.objects.link(obj)
+        obj.location = (bx, by, 0)
+        obj.scale = (text_scale, text_scale, text_scale)
+
+        # Apply the fill material on the object, not the shared mesh
+        fill_color = element['style'].get('fill', '#000000')
+        if fill_color and fill_color.lower() != 'none':
+            material = self.get_text_material(element['style'])
+            obj.material_slots[0].link = 'OBJECT'
+            obj.material_slots[0].material = material
+            obj.color = material.diffuse_color
+
+        obj['svg_label'] = text
+
+        log(f"Text created successfully: {obj.name}")
+        return obj
+    except Exception as e:
+        log(f"Error creating cached 3D text: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def bake_text_labels(self, objects):
+    """
+    Bake all label objects into a single mesh.
+
+    Each label keeps its material through a material slot on the baked mesh,
+    and its faces are recorded in the same element table and face attribute
+    used by the merged-mesh mode.
+
+    Args:
+        objects: Candidate objects; only labels (svg_label set) are baked
+
+    Returns:
+        List of objects with the labels replaced by the baked object
+    """
+    labels = [obj for obj in objects if obj is not None and obj.get('svg_label') is not None
+              and obj.type in ('MESH', 'FONT')]
+    if not labels:
+        return objects
+
+    label_ids = {id(obj) for obj in labels}
+    remaining = [obj for obj in objects if id(obj) not in label_ids]
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    bm = bmesh.new()
+    element_layer = bm.faces.layers.int.new(ELEMENT_ATTRIBUTE)
+    materials = []
+    element_faces = []
+
+    for index, obj in enumerate(labels):
+        material = obj.active_material
+        if material not in materials:
+            materials.append(material)
+        material_index = materials.index(material)
+
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+
+        first_vert = len(bm.verts)
+        first_face = len(bm.faces)
+        bm.from_mesh(mesh)
+        evaluated.to_mesh_clear()
+
+        bm.verts.ensure_lookup_table()
+        bm.faces.ensure_lookup_table()
+        bmesh.ops.transform(bm, matrix=obj.matrix_world, verts=bm.verts[first_vert:])
+        for face in bm.faces[first_face:]:
+            face[element_layer] = index
+            face.material_index = material_index
+
+        element_faces.append({
+            "element": obj.get('svg_element') or obj.name,
+            "name": obj.name,
+            "type": "text",
+            "text": obj['svg_label'],
+            "first_face": first_face,
+            "face_count": len(bm.faces) - first_face
+        })
+
+    mesh = bpy.data.meshes.new("Labels")
+    bm.to_mesh(mesh)
+    bm.free()
+    for material in materials:
+        mesh.materials.append(material)
+
+    collection = labels[0].users_collection[0] if labels[0].users_collection else bpy.context.scene.collection
+    baked = bpy.data.objects.new("Labels", mesh)
+    collection.objects.link(baked)
+    baked[ELEMENT_FACES_PROPERTY] = json.dumps(element_faces)
+
+    for obj in labels:
+        data = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if data is not None and data.users == 0:
+            if isinstance(data, bpy.types.Mesh):
+                bpy.data.meshes.remove(data)
+            else:
+                bpy.data.curves.remove(data)
+
+    log(f"Baked {len(labels)} labels into {baked.name} ({len(mesh.polygons)} faces)")
+    return remaining + [baked]
@@ -54,3 +54,45 @@ def clean_scene():
         bpy.data.materials.remove(material)
     
     log("Scene cleaned")
+
+
+# Element types whose geometry is shared between identical shapes
+INSTANCEABLE_TYPES = ('rect', 'circle', 'ellipse', 'polygon')
+
+
+def shape_fingerprint(element, precision=4):
+    """
+    Fingerprint the geometry and style of an SVG shape independent of position.
+    
+    Args:
+        element: Parsed SVG element
+        precision: Decimal places used when comparing coordinates
+    
+    Returns:
+        Tuple (fingerprint, anchor) where anchor is the SVG point the geometry
+        is positioned by, or (None, None) if the element cannot be instanced
+    """
+    element_type = element.get('type')
+    if element_type not in INSTANCEABLE_TYPES:
+        return None, None
+    
+    try:
+        if element_type == 'rect':
+            anchor = (element['x'], element['y'])
+            geometry = (element['width'], element['height'], element.get('rx', 0), element.get('ry', 0))
+        elif element_type == 'circle':
+            anchor = (element['cx'], element['cy'])
+            geometry = (element['r'],)
+        elif element_type == 'ellipse':
+            anchor = (element['cx'], element['cy'])
+            geometry = (element['rx'], element['ry'])
+        else:
+            points = element['points']
+            anchor = tuple(points[0])
+            geometry = tuple(coord for x, y in points for coord in (x - anchor[0], y - anchor[1]))
+    except (KeyError, IndexError, TypeError):
+        return None, None
+    
+    geometry = tuple(round(float(value), precision) for value in geometry)
+    style = tuple(sorted((str(key), str(value)) for key, value in element.get('style', {}).items()))
+    return (element_type, geometry, style), anchor
@@ -30,7 +30,15 @@ class BlenderScriptTool(Tool):
         """
         super().__init__(
             name="blender_script",
-            description="Executes Python scripts in Blender"
+            description="Executes Python scripts in Blender",
+            parameters_schema={
+                "type": "object",
+                "properties": {
+                    "script": {"type": "string"},
+                    "format": {"type": "string", "enum": ["json", "text"]}
+                },
+                "required": ["script"]
+            }
         )
         
         self.redis_bus = redis_bus
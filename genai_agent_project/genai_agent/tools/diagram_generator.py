@@ -12,6 +12,8 @@ from genai_agent.tools.registry import Tool
 from genai_agent.services.redis_bus import RedisMessageBus
 from genai_agent.services.llm import LLMService
 from genai_agent.services.asset_manager import AssetManager
+from genai_agent.services.prompt_prefix import PrefixedPrompt
+from genai_agent.services.llm_json import extract_code_block
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +39,18 @@ class DiagramGeneratorTool(Tool):
         """
         super().__init__(
             name="diagram_generator",
-            description="Generates diagrams and visualizations from descriptions"
+            description="Generates diagrams and visualizations from descriptions",
+            parameters_schema={
+                "type": "object",
+                "properties": {
+                    "description": {"type": "string"},
+                    "diagram_type": {"type": "string",
+                                     "enum": ["flowchart", "erd", "uml", "scene_layout", "hierarchy"]},
+                    "format": {"type": "string", "enum": ["mermaid", "svg", "dot"]},
+                    "name": {"type": "string"}
+                },
+                "required": ["description"]
+            }
         )
         
         self.redis_bus = redis_bus
@@ -186,22 +199,10 @@ class DiagramGeneratorTool(Tool):
                 response = self._get_fallback_diagram(diagram_type, output_format)
             
             # Extract code from response
-            import re
-            
-            if output_format == 'mermaid':
-                pattern = r'```mermaid\s*(.*?)\s*```'
-            elif output_format == 'svg':
-                pattern = r'```svg\s*(.*?)\s*```'
-            elif output_format == 'dot':
-                pattern = r'```dot\s*(.*?)\s*```'
-            else:
-                pattern = r'```(?:.*?)\s*(.*?)\s*```'
-                
-            code_match = re.search(pattern, response, re.DOTALL)
+            language = output_format if output_format in ('mermaid', 'svg', 'dot') else None
+            diagram_code = extract_code_block(response, language)
             
-            if code_match:
-                diagram_code = code_match.group(1)
-            else:
+            if diagram_code is None:
                 # If no code block found, try to find anything that looks like diagram code
                 lines = response.split('\n')
                 diagram_lines = []
@@ -240,12 +241,11 @@ class DiagramGeneratorTool(Tool):
             output_format: Output format
             
         Returns:
-            LLM prompt
+            LLM prompt; the instructions for the diagram type and format form a
+            cacheable prefix, the description the suffix
         """
         # Base prompt template
-        prompt = f"""Generate a {diagram_type} diagram based on the following description:
-
-Description: {description}
+        prompt = f"""Generate a {diagram_type} diagram based on the description given at the end.
 
 Please create the diagram in {output_format} format.
 """
@@ -341,7 +341,9 @@ Ensure the DOT syntax is correct for use with GraphViz.
 Only return the diagram code without additional explanations or notes.
 """
         
-        return prompt
+        return PrefixedPrompt(prompt, f"""
+Description: {description}
+""")
     
     def _get_fallback_diagram(self, diagram_type: str, output_format: str) -> str:
         """
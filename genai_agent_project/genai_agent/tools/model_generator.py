@@ -12,9 +12,36 @@ from genai_agent.tools.registry import Tool
 from genai_agent.services.redis_bus import RedisMessageBus
 from genai_agent.services.llm import LLMService
 from genai_agent.services.asset_manager import AssetManager
+from genai_agent.services.prompt_prefix import PrefixedPrompt
+from genai_agent.services.llm_json import extract_code_block
 
 logger = logging.getLogger(__name__)
 
+# Fixed instructions of the model prompt, sent as a cacheable prefix
+MODEL_PROMPT_PREFIX = """Generate a Blender Python script to create a 3D model based on the description given at the end.
+
+Your script should:
+1. Create the model procedurally using Blender's Python API
+2. Add appropriate materials and textures based on the description
+3. Set up proper naming for objects and materials
+4. Include comments explaining key parts of the code
+5. Be ready to run in Blender without modifications
+6. Generate output in the following format for status reporting:
+
+```python
+# At the end of your script, include this (with the model name given below):
+output = {
+    "status": "success",
+    "message": "Model '<name>' created successfully",
+    "objects_created": [list of object names created],
+    "model_description": "[brief description of what was created]"
+}
+```
+
+Focus on creating a clean, efficient script that produces a high-quality model.
+Only return the Python code, no explanations needed.
+"""
+
 class ModelGeneratorTool(Tool):
     """
     Tool for generating 3D models from descriptions
@@ -32,7 +59,17 @@ class ModelGeneratorTool(Tool):
         """
         super().__init__(
             name="model_generator",
-            description="Generates and executes 3D models from text descriptions"
+            description="Generates and executes 3D models from text descriptions",
+            parameters_schema={
+                "type": "object",
+                "properties": {
+                    "description": {"type": "string"},
+                    "model_type": {"type": "string"},
+                    "style": {"type": "string"},
+                    "name": {"type": "string"}
+                },
+                "required": ["description"]
+            }
         )
         
         self.redis_bus = redis_bus
@@ -240,12 +277,9 @@ bpy.ops.wm.save_as_mainfile(filepath="{model_file_path}")
             response = self._get_fallback_model_script(description, model_type, style, name)
         
         # Extract code from response
-        import re
-        script_match = re.search(r'```python\s*(.*?)\s*```', response, re.DOTALL)
+        script = extract_code_block(response, "python")
         
-        if script_match:
-            script = script_match.group(1)
-        else:
+        if script is None:
             # If no code block found, use the whole response
             script = response
         
@@ -262,38 +296,16 @@ bpy.ops.wm.save_as_mainfile(filepath="{model_file_path}")
             name: Model name
             
         Returns:
-            LLM prompt
+            LLM prompt whose fixed instructions form a cacheable prefix
         """
-        return f"""Generate a Blender Python script to create a 3D model based on the following description.
-
+        return PrefixedPrompt(MODEL_PROMPT_PREFIX, f"""
 Description: {description}
 Model Type: {model_type}
 Style: {style}
 Name: {name}
 
-Your script should:
-1. Create the model procedurally using Blender's Python API
-2. Add appropriate materials and textures based on the description
-3. Set up proper naming for objects and materials
-4. Include comments explaining key parts of the code
-5. Be ready to run in Blender without modifications
-6. Generate output in the following format for status reporting:
-
 ```python
-# At the end of your script, include this:
-output = {{
-    "status": "success",
-    "message": "Model '{name}' created successfully",
-    "objects_created": [list of object names created],
-    "model_description": "[brief description of what was created]"
-}}
-```
-
-Focus on creating a clean, efficient script that produces a high-quality model.
-Only return the Python code, no explanations needed.
-
-```python
-"""
+""")
     
     def _get_fallback_model_script(self, description: str, model_type: str, style: str, name: str) -> str:
         """
@@ -13,16 +13,19 @@ class Tool:
     Base class for all tools
     """
     
-    def __init__(self, name: str, description: str):
+    def __init__(self, name: str, description: str, parameters_schema: Optional[Dict[str, Any]] = None):
         """
         Initialize tool
         
         Args:
             name: Tool name
             description: Tool description
+            parameters_schema: JSON schema of the tool's parameters, used to
+                constrain LLM execution plans (default: any object)
         """
         self.name = name
         self.description = description
+        self.parameters_schema = parameters_schema or {"type": "object"}
     
     async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -45,9 +48,67 @@ class Tool:
         """
         return {
             "name": self.name,
-            "description": self.description
+            "description": self.description,
+            "parameters": self.parameters_schema
         }
 
+class LazyTool(Tool):
+    """
+    Tool registered by name whose module is imported on first use
+
+    Tool modules pull in heavy dependencies (LLM clients, Blender helpers),
+    so the import and instantiation are deferred until the tool is executed
+    or its description is needed.
+    """
+    
+    def __init__(self, name: str, module_path: str, class_name: str, **kwargs):
+        """
+        Initialize lazy tool
+        
+        Args:
+            name: Tool name
+            module_path: Module defining the tool class
+            class_name: Tool class name
+            **kwargs: Arguments for the tool class (e.g. redis_bus, config)
+        """
+        self.name = name
+        self.module_path = module_path
+        self.class_name = class_name
+        self.kwargs = kwargs
+        self.tool: Optional[Tool] = None
+    
+    @property
+    def loaded(self) -> bool:
+        """Whether the tool module has been imported"""
+        return self.tool is not None
+    
+    def load(self) -> Tool:
+        """
+        Import and instantiate the tool
+        
+        Returns:
+            Tool instance
+        """
+        if self.tool is None:
+            tool_class = ToolRegistry.load_tool_class(self.module_path, self.class_name)
+            self.tool = tool_class(**self.kwargs)
+            logger.info(f"Loaded tool: {self.name}")
+        return self.tool
+    
+    @property
+    def description(self) -> str:
+        return self.load().description
+    
+    @property
+    def parameters_schema(self) -> Dict[str, Any]:
+        return self.load().parameters_schema
+    
+    async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.load().execute(parameters)
+    
+    def get_info(self) -> Dict[str, Any]:
+        return {**self.load().get_info(), "name": self.name}
+
 class ToolRegistry:
     """
     Registry for tools
@@ -77,6 +138,21 @@ class ToolRegistry:
         logger.info(f"Registered tool: {tool.name}")
         return True
     
+    def register_lazy_tool(self, name: str, module_path: str, class_name: str, **kwargs) -> bool:
+        """
+        Register a tool by name without importing its module
+        
+        Args:
+            name: Tool name
+            module_path: Module defining the tool class
+            class_name: Tool class name
+            **kwargs: Arguments for the tool class
+            
+        Returns:
+            True if registered successfully, False otherwise
+        """
+        return self.register_tool(LazyTool(name, module_path, class_name, **kwargs))
+    
     def unregister_tool(self, tool_name: str) -> bool:
         """
         Unregister a tool
@@ -123,7 +199,14 @@ class ToolRegistry:
         Returns:
             List of tool information dictionaries
         """
-        return [tool.get_info() for tool in self.tools.values()]
+        tool_info = []
+        for tool in self.tools.values():
+            try:
+                tool_info.append(tool.get_info())
+            except Exception as e:
+                # A lazily loaded tool whose import or constructor fails is skipped
+                logger.error(f"Tool {tool.name} unavailable: {str(e)}")
+        return tool_info
     
     async def execute_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -3,9 +3,7 @@ Scene Generator Tool for creating 3D scenes from descriptions
 """
 
 import logging
-import json
 import uuid
-import re
 import traceback
 from typing import Dict, Any, List, Optional
 
@@ -13,9 +11,24 @@ from genai_agent.tools.registry import Tool
 from genai_agent.services.redis_bus import RedisMessageBus
 from genai_agent.services.llm import LLMService
 from genai_agent.services.scene_manager import SceneManager
+from genai_agent.services.prompt_prefix import PrefixedPrompt
+from genai_agent.services.structured_output import SCENE_SCHEMA
 
 logger = logging.getLogger(__name__)
 
+# Fixed instructions of the scene prompt, sent as a cacheable prefix; the
+# output format is given by SCENE_SCHEMA
+SCENE_PROMPT_PREFIX = """
+Define a 3D scene from the description, style and name given at the end.
+
+Include:
+- A camera (position at distance to view the scene)
+- At least one light source
+- 2-3 objects related to the scene description
+
+Positions, rotations (in radians) and scales are [x, y, z]. Material colors are RGBA values between 0 and 1.
+"""
+
 class SceneGeneratorTool(Tool):
     """
     Tool for generating 3D scenes from descriptions
@@ -31,7 +44,16 @@ class SceneGeneratorTool(Tool):
         """
         super().__init__(
             name="scene_generator",
-            description="Generates 3D scenes from text descriptions"
+            description="Generates 3D scenes from text descriptions",
+            parameters_schema={
+                "type": "object",
+                "properties": {
+                    "description": {"type": "string"},
+                    "style": {"type": "string"},
+                    "name": {"type": "string"}
+                },
+                "required": ["description"]
+            }
         )
         
         self.redis_bus = redis_bus
@@ -156,27 +178,14 @@ class SceneGeneratorTool(Tool):
             if self.llm_service:
                 # Use LLM service
                 logger.info(f"Generating scene for '{description}' with style '{style}'")
-                response = await self.llm_service.generate(prompt, parameters={'temperature': 0.7})
-                
-                # Log raw response for debugging (truncated)
-                log_response = response
-                if len(log_response) > 500:
-                    log_response = log_response[:500] + "..."
-                logger.debug(f"Raw LLM response: {log_response}")
-                
-                # Check for error responses
-                if isinstance(response, str) and response.startswith("Error:"):
-                    logger.warning(f"LLM service returned an error: {response}")
-                    logger.info("Using fallback scene data due to LLM error")
-                    return self._get_fallback_scene_data(description, style, name)
-                
-                # Extract and parse JSON using multiple methods
-                scene_data = self._extract_json_from_response(response)
+                # The response is constrained to SCENE_SCHEMA and validated as it streams
+                scene_data = await self.llm_service.generate_structured(
+                    prompt, SCENE_SCHEMA, "scene", parameters={'temperature': 0.7}
+                )
                 if scene_data:
                     return scene_data
                 
-                # If extraction failed, use fallback
-                logger.warning("Could not extract valid JSON from LLM response, using fallback")
+                logger.warning("LLM did not return a valid scene, using fallback")
                 return self._get_fallback_scene_data(description, style, name)
             else:
                 # Fallback for development/testing
@@ -187,113 +196,6 @@ class SceneGeneratorTool(Tool):
             logger.error(traceback.format_exc())
             return self._get_fallback_scene_data(description, style, name)
     
-    def _extract_json_from_response(self, response: str) -> Optional[Dict[str, Any]]:
-        """
-        Extract JSON from LLM response using multiple methods
-        
-        Args:
-            response: LLM response text
-            
-        Returns:
-            Extracted JSON data or None if extraction failed
-        """
-        # Log the response for debugging
-        log_response = response
-        if len(log_response) > 500:
-            log_response = log_response[:500] + "..."
-        logger.debug(f"Attempting to extract JSON from: {log_response}")
-        
-        # Method 1: Direct JSON parsing
-        try:
-            scene_data = json.loads(response)
-            logger.info("Successfully parsed direct JSON response")
-            return scene_data
-        except json.JSONDecodeError:
-            logger.debug("Direct JSON parsing failed, trying alternatives")
-        
-        # Method 2: Extract from code block
-        try:
-            json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-                # Clean up common issues before parsing
-                json_str = re.sub(r'//.*?(?:\n|$)', '', json_str, flags=re.MULTILINE)  # Remove // comments
-                json_str = re.sub(r'/\*.*?\*/', '', json_str, flags=re.DOTALL)  # Remove /* */ comments
-                scene_data = json.loads(json_str)
-                logger.info("Successfully parsed JSON from code block")
-                return scene_data
-        except (json.JSONDecodeError, AttributeError):
-            logger.debug("JSON code block extraction failed")
-        
-        # Method 3: Find JSON-like structure with regex - look for largest valid JSON object
-        try:
-            # Find all potential JSON objects in the response
-            potential_jsons = []
-            bracket_pattern = re.compile(r'\{([^{}]|\{[^{}]*\})*\}')
-            for match in bracket_pattern.finditer(response):
-                potential_json = match.group(0)
-                try:
-                    # Remove comments and other invalid JSON syntax
-                    cleaned = re.sub(r'//.*?(?:\n|$)', '', potential_json, flags=re.MULTILINE)  # Remove // comments
-                    cleaned = re.sub(r'/\*.*?\*/', '', cleaned, flags=re.DOTALL)  # Remove /* */ comments
-                    cleaned = re.sub(r',\s*\}', '}', cleaned)  # Remove trailing commas
-                    # Replace single quotes with double quotes for keys and string values
-                    cleaned = re.sub(r"'([^']*)'\s*:", r'"\1":', cleaned)  # Replace 'key': with "key":
-                    cleaned = re.sub(r":\s*'([^']*)'([,\}])", r':"\1"\2', cleaned)  # Replace :'value' with :"value"
-                    
-                    # Attempt to parse
-                    parsed = json.loads(cleaned)
-                    # Store if valid
-                    potential_jsons.append((cleaned, len(cleaned)))
-                except json.JSONDecodeError:
-                    continue
-            
-            # If we found any valid JSON objects, return the largest one
-            if potential_jsons:
-                # Sort by size (largest first)
-                potential_jsons.sort(key=lambda x: x[1], reverse=True)
-                largest_json_str, _ = potential_jsons[0]
-                scene_data = json.loads(largest_json_str)
-                logger.info("Successfully parsed JSON using advanced regex extraction")
-                return scene_data
-        except Exception as e:
-            logger.debug(f"Advanced JSON structure extraction failed: {str(e)}")
-            logger.debug(traceback.format_exc())
-        
-        # Method 4: Find JSON-like structure with simple brace matching
-        try:
-            # Find the first { that has a matching }
-            start_idx = response.find('{')
-            if start_idx >= 0:
-                # Find the matching closing brace
-                brace_count = 0
-                for i in range(start_idx, len(response)):
-                    if response[i] == '{':
-                        brace_count += 1
-                    elif response[i] == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            # Extract the JSON substring
-                            json_str = response[start_idx:i+1]
-                            
-                            # Clean up common issues
-                            json_str = re.sub(r'//.*?(?:\n|$)', '', json_str, flags=re.MULTILINE)  # Remove // comments
-                            json_str = re.sub(r'/\*.*?\*/', '', json_str, flags=re.DOTALL)  # Remove /* */ comments
-                            json_str = re.sub(r',\s*\}', '}', json_str)  # Remove trailing commas
-                            # Replace single quotes with double quotes for keys and string values
-                            json_str = re.sub(r"'([^']*)'\s*:", r'"\1":', json_str)  # Replace 'key': with "key":
-                            json_str = re.sub(r":\s*'([^']*)'([,\}])", r':"\1"\2', json_str)  # Replace :'value' with :"value"
-                            
-                            scene_data = json.loads(json_str)
-                            logger.info("Successfully parsed JSON using brace matching")
-                            return scene_data
-        except (json.JSONDecodeError, AttributeError, IndexError):
-            logger.debug("Simple brace matching extraction failed")
-        
-        # If all methods fail, return None
-        logger.warning("All JSON extraction methods failed")
-        return None
-    
     def _create_scene_generation_prompt(self, description: str, style: str, name: str) -> str:
         """
         Create scene generation prompt
@@ -304,43 +206,13 @@ class SceneGeneratorTool(Tool):
             name: Scene name
             
         Returns:
-            LLM prompt
+            LLM prompt whose fixed instructions form a cacheable prefix
         """
-        return f"""Your task is to output ONLY a valid JSON object to define a 3D scene. No explanations or comments, just the JSON.
-
+        return PrefixedPrompt(SCENE_PROMPT_PREFIX, f"""
 Description: {description}
 Style: {style}
 Name: {name}
-
-The JSON object must have this structure:
-{{
-  "name": "{name}",
-  "description": "{description}",
-  "objects": [
-    {{
-      "id": "uuid-here",
-      "type": "cube",  // Use types like: cube, sphere, plane, camera, light
-      "name": "Object Name",
-      "position": [0, 0, 0],
-      "rotation": [0, 0, 0],
-      "scale": [1, 1, 1],
-      "properties": {{
-        "material": {{
-          "name": "Material Name",
-          "color": [1, 0, 0, 1]  // RGBA values between 0 and 1
-        }}
-      }}
-    }}
-  ]
-}}
-
-Include:
-- A camera (position at distance to view the scene)
-- At least one light source
-- 2-3 objects related to the scene description
-
-IMPORTANT: Your response must be ONLY valid JSON with NO comments or explanations. Don't include backticks (```) or 'json' text.
-"""
+""")
     
     def _get_fallback_scene_data(self, description: str, style: str, name: str) -> Dict[str, Any]:
         """
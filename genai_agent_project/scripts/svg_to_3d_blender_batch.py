@@ -0,0 +1,96 @@
+"""
+SVG to 3D Blender Batch Script
+
+This script is executed by Blender to convert many SVG files in one process.
+It reads a JSON manifest, converts each file in turn (resetting the scene
+between files), and prints one JSON result line per file so the caller can
+stream results while the batch is still running.
+
+Usage: blender -b --factory-startup -P svg_to_3d_blender_batch.py -- <manifest_json>
+
+The manifest has the form:
+    {"options": {...}, "jobs": [{"svg_path": "...", "output_path": "..."}, ...]}
+"""
+
+import sys
+import os
+import bpy
+import json
+import time
+import traceback
+
+# Make the single-file conversion script importable
+script_dir = os.path.dirname(os.path.realpath(__file__))
+if script_dir not in sys.path:
+    sys.path.append(script_dir)
+
+from svg_to_3d_blender_enhanced import convert_svg_to_3d, log
+
+# Must match RESULT_PREFIX in genai_agent.svg_to_video.batch_converter
+RESULT_PREFIX = "[SVG2-3D-BATCH] "
+
+def reset_scene():
+    """Reset Blender to an empty scene and drop data left by the previous file"""
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    # Orphaned meshes, curves and materials survive a scene reset otherwise
+    if hasattr(bpy.data, "orphans_purge"):
+        bpy.data.orphans_purge(do_recursive=True)
+
+def report(job, status, error=None, elapsed=None):
+    """Print a result line for one file"""
+    result = {
+        "svg_path": job.get("svg_path"),
+        "output_path": job.get("output_path"),
+        "status": status,
+        "error": error,
+        "elapsed": round(elapsed, 3) if elapsed is not None else None
+    }
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+def convert_job(job, options):
+    """
+    Convert one file, isolating any failure to that file
+
+    Args:
+        job: Dictionary with svg_path and output_path
+        options: Conversion options shared by all files
+    """
+    start = time.time()
+    try:
+        reset_scene()
+
+        output_dir = os.path.dirname(job["output_path"])
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        if convert_svg_to_3d(job["svg_path"], job["output_path"], options):
+            report(job, "success", elapsed=time.time() - start)
+        else:
+            report(job, "error", "Conversion failed", time.time() - start)
+    except Exception as e:
+        traceback.print_exc()
+        report(job, "error", str(e), time.time() - start)
+
+def main():
+    """Main function called when script is run directly"""
+    if "--" not in sys.argv or len(sys.argv) <= sys.argv.index("--") + 1:
+        log("Usage: blender -b -P svg_to_3d_blender_batch.py -- <manifest_json>")
+        return 1
+
+    manifest_path = sys.argv[sys.argv.index("--") + 1]
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+
+    options = manifest.get("options", {})
+    jobs = manifest.get("jobs", [])
+    log(f"Batch converting {len(jobs)} SVG files")
+
+    for job in jobs:
+        convert_job(job, options)
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -45,6 +45,10 @@ def convert_svg_to_3d(svg_path, blend_output_path, options=None):
             - use_enhanced: Whether to use enhanced conversion (default: True)
             - style_preset: Visual style preset ('technical', 'organic', 'glossy', etc.)
             - debug: Enable debug output
+            - merge_meshes: Join elements sharing materials into single meshes (default: False)
+            - instance_shapes: Share mesh data between identical shapes (default: False)
+            - cache_glyphs: Build text labels from cached glyph meshes (default: False)
+            - bake_labels: Bake all text labels into a single mesh (default: False)
     
     Returns:
         Boolean indicating success
@@ -62,9 +66,15 @@ def convert_svg_to_3d(svg_path, blend_output_path, options=None):
         use_enhanced = bool(options.get('use_enhanced', True))
         style_preset = str(options.get('style_preset', 'technical'))
         debug = bool(options.get('debug', False))
+        merge_meshes = bool(options.get('merge_meshes', False))
+        instance_shapes = bool(options.get('instance_shapes', False))
+        cache_glyphs = bool(options.get('cache_glyphs', False))
+        bake_labels = bool(options.get('bake_labels', False))
         
         log(f"Conversion options: extrude_depth={extrude_depth}, scale_factor={scale_factor}, " +
-            f"use_enhanced={use_enhanced}, style_preset={style_preset}, debug={debug}")
+            f"use_enhanced={use_enhanced}, style_preset={style_preset}, debug={debug}, " +
+            f"merge_meshes={merge_meshes}, instance_shapes={instance_shapes}, " +
+            f"cache_glyphs={cache_glyphs}, bake_labels={bake_labels}")
         
         # Get appropriate converter
         converter = get_svg_converter(
@@ -73,7 +83,11 @@ def convert_svg_to_3d(svg_path, blend_output_path, options=None):
             scale_factor=scale_factor,
             use_enhanced=use_enhanced,
             style_preset=style_preset,
-            debug=debug
+            debug=debug,
+            merge_meshes=merge_meshes,
+            instance_shapes=instance_shapes,
+            cache_glyphs=cache_glyphs,
+            bake_labels=bake_labels
         )
         
         # Clean the scene and convert SVG
@@ -0,0 +1,114 @@
+"""
+Local fake Ollama server that simulates model loading, for tests
+"""
+
+import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeOllamaServer:
+    """
+    Serves /api/generate, /api/ps and /api/tags on a local port.
+
+    Keeps up to max_loaded models in memory; requests for another model
+    evict the least recently used one and pay load_seconds. `reply` can be
+    set to a function of the request body returning the response text;
+    streamed requests receive it in chunks of chunk_size characters.
+
+    Token ids are characters. Like the Ollama runner, each loaded model keeps
+    the KV cache of its last prompt, and prompt_eval_count only counts the
+    characters after the prefix shared with it.
+    """
+
+    def __init__(self, max_loaded=1, load_seconds=0.0, reply=None, chunk_size=8):
+        self.max_loaded = max_loaded
+        self.load_seconds = load_seconds
+        self.reply = reply
+        self.chunk_size = chunk_size
+        self.loaded = []
+        self.cache = {}
+        self.loads = []
+        self.requests = []
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                models = [{"name": model} for model in server.loaded]
+                self._send({"models": models})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                result = server.generate(body)
+                if not body.get("stream"):
+                    self._send(result)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                text = result["response"]
+                chunks = [text[i:i + server.chunk_size] for i in range(0, len(text), server.chunk_size)]
+                try:
+                    for chunk in chunks:
+                        self.wfile.write((json.dumps({"model": result["model"], "response": chunk,
+                                                      "done": False}) + "\n").encode("utf-8"))
+                    self.wfile.write((json.dumps({**result, "response": ""}) + "\n").encode("utf-8"))
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client stopped reading
+                    pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def generate(self, body):
+        model = body["model"]
+        with self.lock:
+            self.requests.append(body)
+            if body.get("keep_alive") == 0:
+                if model in self.loaded:
+                    self.loaded.remove(model)
+                return {"model": model, "done": True, "done_reason": "unload"}
+
+            load_duration = 0
+            if model in self.loaded:
+                self.loaded.remove(model)
+            else:
+                self.loads.append(model)
+                time.sleep(self.load_seconds)
+                load_duration = int(self.load_seconds * 1e9) or 1
+                while len(self.loaded) >= self.max_loaded:
+                    self.cache.pop(self.loaded.pop(0), None)
+            self.loaded.append(model)
+
+            prompt = body.get("prompt", "")
+            cached = os.path.commonprefix([self.cache.get(model, ""), prompt])
+            # At least one token is always evaluated
+            evaluated = max(len(prompt) - len(cached), 1)
+            self.cache[model] = prompt
+        response = self.reply(body) if self.reply else f"{model}: {prompt}"
+        return {"model": model, "response": response, "done": True,
+                "load_duration": load_duration, "prompt_eval_count": evaluated}
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,225 @@
+"""
+In-memory stand-in for the asyncio Redis client used in tests
+"""
+
+import asyncio
+import fnmatch
+
+from redis.exceptions import ResponseError
+
+class FakePipeline:
+    """Queues commands and runs them on execute()"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+
+        def queue(*args, **kwargs):
+            self.commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        commands, self.commands = self.commands, []
+        return [await method(*args, **kwargs) for method, args, kwargs in commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.commands = []
+
+class FakeScript:
+    """Registered Lua script, run by its Python equivalent on the fake server"""
+
+    def __init__(self, redis, script):
+        self.redis = redis
+        self.script = script
+
+    async def __call__(self, keys=(), args=()):
+        handler = self.redis.scripts.get(self.script)
+        if handler is None:
+            raise ResponseError("NOSCRIPT No matching script")
+        return await handler(list(keys), list(args))
+
+class FakePubSub:
+    """Subscription of one client; messages arrive on an asyncio queue"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.channels = set()
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, *channels):
+        self.channels.update(channels)
+        self.redis.subscribers.append(self)
+
+    async def unsubscribe(self, *channels):
+        self.channels.difference_update(channels)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def close(self):
+        if self in self.redis.subscribers:
+            self.redis.subscribers.remove(self)
+
+class FakeRedis:
+    """The subset of Redis commands used by the services, on plain dicts"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.subscribers = []
+        # Lua script -> coroutine(keys, args) doing the same on the fake
+        self.scripts = {}
+
+    def register_script(self, script):
+        return FakeScript(self, script)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def publish(self, channel, message):
+        receivers = [pubsub for pubsub in self.subscribers if channel in pubsub.channels]
+        for pubsub in receivers:
+            pubsub.queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(receivers)
+
+    async def close(self):
+        return True
+
+    def _list(self, key, create=False):
+        value = self.data.get(key)
+        if value is None:
+            if not create:
+                return []
+            value = self.data[key] = []
+        if not isinstance(value, list):
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    async def get(self, key):
+        value = self.data.get(key)
+        if isinstance(value, (list, set, dict)):
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    async def mget(self, keys):
+        values = [self.data.get(key) for key in keys]
+        return [value if isinstance(value, (str, bytes, int)) else None for value in values]
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        return True
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    async def expire(self, key, ttl):
+        if key not in self.data:
+            return 0
+        self.ttls[key] = ttl
+        return 1
+
+    async def ttl(self, key):
+        if key not in self.data:
+            return -2
+        return self.ttls.get(key, -1)
+
+    async def rpush(self, key, *values):
+        items = self._list(key, create=True)
+        items.extend(values)
+        return len(items)
+
+    async def lrange(self, key, start, end):
+        items = self._list(key)
+        end = len(items) + end if end < 0 else end
+        start = max(len(items) + start, 0) if start < 0 else start
+        return items[start:end + 1]
+
+    async def ltrim(self, key, start, end):
+        self.data[key] = await self.lrange(key, start, end)
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.ttls.pop(key, None)
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def exists(self, *keys):
+        return sum(key in self.data for key in keys)
+
+    async def keys(self, pattern='*'):
+        return [key for key in self.data if fnmatch.fnmatchcase(key, pattern)]
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    async def decr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) - 1
+        return self.data[key]
+
+    async def sadd(self, key, *members):
+        values = self.data.setdefault(key, set())
+        added = len(set(members) - values)
+        values.update(members)
+        return added
+
+    async def srem(self, key, *members):
+        values = self.data.get(key, set())
+        removed = len(values & set(members))
+        values.difference_update(members)
+        if not values:
+            self.data.pop(key, None)
+        return removed
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    async def scard(self, key):
+        return len(self.data.get(key, set()))
+
+    async def smismember(self, key, members):
+        values = self.data.get(key, set())
+        return [int(member in values) for member in members]
+
+    async def zadd(self, key, mapping):
+        values = self.data.setdefault(key, {})
+        added = len(set(mapping) - set(values))
+        values.update(mapping)
+        return added
+
+    async def zrem(self, key, *members):
+        values = self.data.get(key, {})
+        removed = sum(values.pop(member, None) is not None for member in members)
+        if not values:
+            self.data.pop(key, None)
+        return removed
+
+    async def zrangebylex(self, key, min, max, start=None, num=None):
+        lower, upper = min[1:], max[1:]
+        members = sorted(member for member in self.data.get(key, {}) if lower <= member <= upper)
+        if start is not None and num is not None:
+            members = members[start:start + num]
+        return members
+
+class FakeRedisBus:
+    """Redis bus exposing a FakeRedis connection"""
+
+    def __init__(self):
+        self.redis = FakeRedis()
+
+    async def connect(self):
+        return True
@@ -0,0 +1,28 @@
+"""
+Local LLM provider stubs with injectable latency and failures, for tests
+"""
+
+import asyncio
+
+class StubLLMProvider:
+    """Returns a canned response after a delay, failing on request"""
+
+    def __init__(self, response="", latency=0.0, fail=False, error=None):
+        self.response = response
+        self.latency = latency
+        self.fail = fail
+        self.error = error or RuntimeError("stub provider failure")
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate_text(self, prompt, temperature, max_tokens):
+        self.calls += 1
+        latency = self.latency(self.calls) if callable(self.latency) else self.latency
+        try:
+            await asyncio.sleep(latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail(self.calls) if callable(self.fail) else self.fail:
+            raise self.error
+        return self.response
@@ -0,0 +1,216 @@
+"""
+Tests for streaming, content-addressed asset storage
+"""
+
+import unittest
+import asyncio
+import hashlib
+import logging
+import os
+import sys
+import shutil
+import tempfile
+import zipfile
+import json
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.services.asset_manager import AssetManager, RELEASE_SCRIPT
+from genai_agent.services.content_store import ContentStore
+from tests.fake_redis import FakeRedisBus
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+async def chunked(data, size):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+def make_redis_bus():
+    """Fake Redis bus running the content release script"""
+    bus = FakeRedisBus()
+
+    async def release(keys, args):
+        if await bus.redis.decr(keys[0]) > 0:
+            return 0
+        await bus.redis.delete(keys[0])
+        return 1
+
+    bus.redis.scripts[RELEASE_SCRIPT] = release
+    return bus
+
+class TestContentStore(unittest.TestCase):
+    """Test cases for ContentStore"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ContentStore(self.temp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_ingest_hashes_while_streaming(self):
+        """Test that chunks are hashed and stored under hash-prefixed directories"""
+        data = os.urandom(10000)
+        content = asyncio.run(self.store.ingest(chunked(data, 1024), 'glb'))
+
+        digest = hashlib.sha256(data).hexdigest()
+        self.assertEqual(content['content_hash'], digest)
+        self.assertEqual(content['md5_hash'], hashlib.md5(data).hexdigest())
+        self.assertEqual(content['size'], len(data))
+        self.assertTrue(content['created'])
+        self.assertEqual(content['path'], os.path.join(self.temp_dir, digest[:2], digest[2:4], f"{digest}.glb"))
+        with open(content['path'], 'rb') as f:
+            self.assertEqual(f.read(), data)
+
+    def test_identical_content_is_stored_once(self):
+        """Test that ingesting identical content reuses the stored file"""
+        first = asyncio.run(self.store.ingest(chunked(b'model data', 3), 'fbx'))
+        second = asyncio.run(self.store.ingest(chunked(b'model data', 5), 'fbx'))
+
+        self.assertEqual(first['path'], second['path'])
+        self.assertFalse(second['created'])
+        self.assertEqual(os.listdir(self.store.temp_path), [])
+
+    def test_ingest_does_not_block_event_loop(self):
+        """Test that other tasks run while content is hashed and written"""
+        async def run():
+            ticks = 0
+            done = asyncio.Event()
+
+            async def heartbeat():
+                nonlocal ticks
+                while not done.is_set():
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.ensure_future(heartbeat())
+            await self.store.ingest(chunked(b'x' * (8 * 1024 * 1024), 1024 * 1024), 'bin')
+            done.set()
+            await task
+            return ticks
+
+        self.assertGreater(asyncio.run(run()), 1)
+
+class TestAssetManagerContentStore(unittest.TestCase):
+    """Test cases for content-addressed assets in AssetManager"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = AssetManager(make_redis_bus(), {'storage_path': self.temp_dir})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_duplicate_assets_share_refcounted_content(self):
+        """Test that duplicate uploads share one file until the last asset is deleted"""
+        async def run():
+            first = await self.manager.store_asset_stream(chunked(b'texture', 2), 'wood.exr')
+            second = await self.manager.store_asset_from_memory(b'texture', 'copy.exr')
+
+            first_path = await self.manager.get_asset_path(first)
+            second_path = await self.manager.get_asset_path(second)
+            self.assertEqual(first_path, second_path)
+
+            metadata = await self.manager.get_asset_metadata(second)
+            self.assertEqual(metadata['category'], 'texture')
+            self.assertEqual(metadata['file_size'], 7)
+            self.assertEqual(metadata['filename'], 'copy.exr')
+
+            self.assertTrue(await self.manager.delete_asset(first))
+            self.assertTrue(os.path.exists(second_path))
+            self.assertTrue(await self.manager.delete_asset(second))
+            self.assertFalse(os.path.exists(second_path))
+            self.assertIsNone(await self.manager.get_asset_metadata(second))
+
+        asyncio.run(run())
+
+    def test_content_kept_when_release_fails(self):
+        """Test that content is only removed when its reference count was deleted"""
+        async def run():
+            asset_id = await self.manager.store_asset_from_memory(b'mesh', 'cube.obj')
+            path = await self.manager.get_asset_path(asset_id)
+            metadata = await self.manager.get_asset_metadata(asset_id)
+
+            # Scripting unavailable: the count is left alone and so is the file
+            self.manager.redis_bus.redis.scripts.clear()
+            self.assertFalse(await self.manager._release_content(metadata['content_hash'], 'obj'))
+            self.assertTrue(os.path.exists(path))
+
+        asyncio.run(run())
+
+    def test_store_asset_from_file(self):
+        """Test that storing a file streams it into the content store"""
+        source = os.path.join(self.temp_dir, 'cube.obj')
+        with open(source, 'wb') as f:
+            f.write(b'v 0 0 0\n' * 1000)
+
+        async def run():
+            asset_id = await self.manager.store_asset(source, {'tags': ['cube']})
+            metadata = await self.manager.get_asset_metadata(asset_id)
+            self.assertEqual(metadata['category'], 'model')
+            self.assertEqual(metadata['tags'], ['cube'])
+            path = await self.manager.get_asset_path(asset_id)
+            self.assertTrue(path.endswith(f"{metadata['content_hash']}.obj"))
+
+            self.assertIsNone(await self.manager.store_asset(os.path.join(self.temp_dir, 'missing.obj')))
+
+        asyncio.run(run())
+
+class TestAssetPacks(unittest.TestCase):
+    """Test cases for streaming asset pack import and export"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = AssetManager(make_redis_bus(), {'storage_path': os.path.join(self.temp_dir, 'assets')})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_import_streams_members_into_content_store(self):
+        """Test that a pack is imported without extraction and duplicates share content"""
+        pack = os.path.join(self.temp_dir, 'pack.zip')
+        with zipfile.ZipFile(pack, 'w') as zip_ref:
+            zip_ref.writestr('textures/bark.png', b'bark' * 1000)
+            zip_ref.writestr('textures/bark_copy.png', b'bark' * 1000)
+            zip_ref.writestr('models/tree.obj', b'v 1 2 3\n')
+            zip_ref.writestr('manifest.json', json.dumps({'tree.obj': {'tags': ['forest']}}))
+
+        result = asyncio.run(self.manager.import_asset_pack(pack))
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['imported_count'], 3)
+        by_name = {item['filename']: item['metadata'] for item in result['imported']}
+        self.assertEqual(by_name['tree.obj']['tags'], ['forest'])
+        self.assertEqual(by_name['bark.png']['content_hash'], by_name['bark_copy.png']['content_hash'])
+        self.assertFalse(os.path.exists(os.path.join(self.manager.storage_path, 'temp')))
+
+        async def check():
+            redis = self.manager.redis_bus.redis
+            key = f"asset_blob:{by_name['bark.png']['content_hash']}.png"
+            self.assertEqual(redis.data[key], 2)
+            self.assertEqual([a['filename'] for a in await self.manager.search_assets('forest')], ['tree.obj'])
+
+        asyncio.run(check())
+
+    def test_export_round_trip(self):
+        """Test that exported packs contain the assets and their manifest"""
+        async def run():
+            texture = await self.manager.store_asset_from_memory(b'\x89PNG' * 100, 'wall.png')
+            model = await self.manager.store_asset_from_memory(b'v 0 0 0\n' * 100, 'wall.obj')
+            output = os.path.join(self.temp_dir, 'export.zip')
+            return await self.manager.export_asset_pack([texture, model, 'missing'], output)
+
+        result = asyncio.run(run())
+
+        self.assertEqual(result['exported_count'], 2)
+        self.assertEqual(result['errors'], [{'asset_id': 'missing', 'error': 'Asset not found'}])
+        with zipfile.ZipFile(result['output_path']) as zip_ref:
+            self.assertEqual(zip_ref.read('wall.obj'), b'v 0 0 0\n' * 100)
+            self.assertEqual(zip_ref.getinfo('wall.png').compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zip_ref.getinfo('wall.obj').compress_type, zipfile.ZIP_DEFLATED)
+            self.assertIn('wall.png', json.loads(zip_ref.read('manifest.json')))
+
+if __name__ == "__main__":
+    unittest.main()
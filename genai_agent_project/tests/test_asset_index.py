@@ -0,0 +1,94 @@
+"""
+Tests for the inverted asset search index
+"""
+
+import unittest
+import asyncio
+import logging
+import os
+import sys
+import shutil
+import tempfile
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.services.asset_index import tokenize, metadata_tokens
+from genai_agent.services.asset_manager import AssetManager
+from tests.fake_redis import FakeRedisBus
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+class TestTokenize(unittest.TestCase):
+    """Test cases for metadata tokenization"""
+
+    def test_tokenize_splits_on_punctuation(self):
+        """Test that filenames are split into lowercase words"""
+        self.assertEqual(tokenize("Oak_Tree-LOD2.glb"), ["oak", "tree", "lod2", "glb"])
+
+    def test_metadata_tokens_skip_identifiers(self):
+        """Test that tags are indexed and hashes are not"""
+        tokens = metadata_tokens({
+            'id': 'abc-123',
+            'filename': 'rock.fbx',
+            'tags': ['Granite', 'outdoor'],
+            'md5_hash': 'ffff',
+            'file_size': 10
+        })
+        self.assertEqual(tokens, {'rock', 'fbx', 'granite', 'outdoor'})
+
+class TestAssetSearch(unittest.TestCase):
+    """Test cases for AssetManager.search_assets"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = AssetManager(FakeRedisBus(), {'storage_path': self.temp_dir})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    async def store(self, filename, **metadata):
+        return await self.manager.store_asset_from_memory(filename.encode(), filename, metadata)
+
+    def test_prefix_search_and_category_filter(self):
+        """Test that every query word must prefix-match and category filters apply"""
+        async def run():
+            tree = await self.store('oak_tree.glb', tags=['forest'])
+            bark = await self.store('oak_bark.png', tags=['forest', 'wood'])
+            await self.store('pine_tree.glb', tags=['forest'])
+
+            names = lambda results: sorted(r['filename'] for r in results)
+            self.assertEqual(names(await self.manager.search_assets('oak')), ['oak_bark.png', 'oak_tree.glb'])
+            self.assertEqual(names(await self.manager.search_assets('fore tre')), ['oak_tree.glb', 'pine_tree.glb'])
+            self.assertEqual(names(await self.manager.search_assets('OAK', category='texture')), ['oak_bark.png'])
+            self.assertEqual(await self.manager.search_assets('granite'), [])
+
+            # Updates and deletes keep the index current
+            await self.manager.update_asset_metadata(tree, {'tags': ['park']})
+            self.assertEqual(names(await self.manager.search_assets('forest oak')), ['oak_bark.png'])
+            self.assertEqual(names(await self.manager.search_assets('park')), ['oak_tree.glb'])
+
+            await self.manager.delete_asset(bark)
+            self.assertEqual(await self.manager.search_assets('wood'), [])
+            self.assertEqual(await self.manager.search_assets('bark'), [])
+
+        asyncio.run(run())
+
+    def test_index_is_built_for_existing_assets(self):
+        """Test that assets stored before the index existed are indexed on first search"""
+        async def run():
+            asset_id = await self.store('crate.obj', tags=['prop'])
+
+            # Simulate an asset store that predates the index
+            redis = self.manager.redis_bus.redis
+            for key in [key for key in redis.data if key.startswith('asset_index:')]:
+                del redis.data[key]
+
+            results = await self.manager.search_assets('prop')
+            self.assertEqual([r['id'] for r in results], [asset_id])
+
+        asyncio.run(run())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Tests for backend startup time and lazily loaded tools
+"""
+
+import unittest
+import asyncio
+import logging
+import types
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+from genai_agent.tools.registry import ToolRegistry, Tool, LazyTool
+from benchmark_backend_startup import measure_startup, heavy_imports
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+# Time budget for the backend's own imports (FastAPI excluded)
+STARTUP_BUDGET_MS = float(os.environ.get("GENAI_STARTUP_BUDGET_MS", "400"))
+
+class CountingTool(Tool):
+    """Tool counting its instances"""
+
+    instances = 0
+
+    def __init__(self, redis_bus=None, config=None):
+        super().__init__(name="counting", description="Counts", parameters_schema={"type": "object"})
+        self.config = config
+        CountingTool.instances += 1
+
+    async def execute(self, parameters):
+        return {"status": "success", "config": self.config, "parameters": parameters}
+
+class BrokenTool(Tool):
+    """Tool whose constructor fails"""
+
+    def __init__(self, redis_bus=None, config=None):
+        raise KeyError("output_dir")
+
+class TestLazyTools(unittest.TestCase):
+    """Test cases for tools registered by name"""
+
+    def setUp(self):
+        CountingTool.instances = 0
+        self.module = types.ModuleType("lazy_tool_module")
+        self.module.CountingTool = CountingTool
+        self.module.BrokenTool = BrokenTool
+        sys.modules["lazy_tool_module"] = self.module
+        self.registry = ToolRegistry()
+
+    def tearDown(self):
+        sys.modules.pop("lazy_tool_module", None)
+
+    def test_tool_loaded_on_first_execution(self):
+        """Test that a tool is instantiated once, when first executed"""
+        self.registry.register_lazy_tool("counting", "lazy_tool_module", "CountingTool", config={"a": 1})
+        tool = self.registry.get_tool("counting")
+
+        self.assertIsInstance(tool, LazyTool)
+        self.assertFalse(tool.loaded)
+        self.assertEqual(CountingTool.instances, 0)
+
+        for _ in range(2):
+            result = asyncio.run(self.registry.execute_tool("counting", {"x": 1}))
+            self.assertEqual(result["config"], {"a": 1})
+
+        self.assertTrue(tool.loaded)
+        self.assertEqual(CountingTool.instances, 1)
+
+    def test_tool_info_uses_registered_name(self):
+        """Test that tool info comes from the loaded tool under the registered name"""
+        self.registry.register_lazy_tool("alias", "lazy_tool_module", "CountingTool")
+
+        info = self.registry.get_tool_info()
+
+        self.assertEqual(info, [{"name": "alias", "description": "Counts", "parameters": {"type": "object"}}])
+
+    def test_missing_module_reported_on_use(self):
+        """Test that a tool whose module is missing fails when used, not when registered"""
+        self.assertTrue(self.registry.register_lazy_tool("missing", "no_such_tool_module", "Tool"))
+
+        result = asyncio.run(self.registry.execute_tool("missing", {}))
+
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(self.registry.get_tool_info(), [])
+
+    def test_failing_constructor_skipped(self):
+        """Test that a tool whose constructor raises is left out of the tool info"""
+        self.registry.register_lazy_tool("broken", "lazy_tool_module", "BrokenTool")
+        self.registry.register_lazy_tool("counting", "lazy_tool_module", "CountingTool")
+
+        self.assertEqual([info["name"] for info in self.registry.get_tool_info()], ["counting"])
+        result = asyncio.run(self.registry.execute_tool("broken", {}))
+        self.assertEqual(result["status"], "error")
+
+class TestBackendStartup(unittest.TestCase):
+    """Test cases for backend import time"""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            cls.total_us, cls.modules = measure_startup(runs=3)
+        except Exception as e:
+            raise unittest.SkipTest(f"Backend cannot be imported here: {e}")
+
+    def test_heavy_modules_not_imported(self):
+        """Test that routers, tools and LLM integrations are not imported at startup"""
+        self.assertEqual(heavy_imports(self.modules), [])
+
+    def test_startup_within_budget(self):
+        """Test that the backend's own imports stay within the startup budget"""
+        self.assertLess(self.total_us / 1000, STARTUP_BUDGET_MS)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Tests for the multi-file Blender batch converter
+"""
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import logging
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.svg_to_video.batch_converter import (
+    BlenderBatchConverter, shard_files, parse_result_line, RESULT_PREFIX
+)
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+# Stand-in for Blender: follows the batch script protocol, fails files named
+# "bad*" and kills the whole process on files named "crash*"
+FAKE_BLENDER_SCRIPT = '''
+import sys, os, json
+manifest = json.load(open(sys.argv[sys.argv.index("--") + 1]))
+with open(os.path.join(os.path.dirname(manifest["jobs"][0]["output_path"]), "launches.log"), "a") as log:
+    log.write("launch\\n")
+print("Blender startup noise", flush=True)
+for job in manifest["jobs"]:
+    name = os.path.basename(job["svg_path"])
+    if name.startswith("crash"):
+        os._exit(1)
+    status = "error" if name.startswith("bad") else "success"
+    result = dict(job, status=status, error=None if status == "success" else "Conversion failed", elapsed=0.0)
+    print(%r + json.dumps(result), flush=True)
+''' % RESULT_PREFIX
+
+class FakeBlenderBatchConverter(BlenderBatchConverter):
+    """Batch converter that runs the fake Blender script with this interpreter"""
+
+    def _build_command(self, manifest_path):
+        return [sys.executable, self.script_path, "--", manifest_path]
+
+class TestBatchConverter(unittest.TestCase):
+    """Test cases for BlenderBatchConverter"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.script_path = os.path.join(self.temp_dir, "fake_blender.py")
+        with open(self.script_path, "w") as f:
+            f.write(FAKE_BLENDER_SCRIPT)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def make_jobs(self, names):
+        return [
+            {"svg_path": os.path.join(self.temp_dir, name), "output_path": os.path.join(self.temp_dir, name + ".blend")}
+            for name in names
+        ]
+
+    def launches(self):
+        with open(os.path.join(self.temp_dir, "launches.log")) as f:
+            return len(f.readlines())
+
+    def test_shard_files_interleaves(self):
+        """Test that shards are balanced and cover every job"""
+        shards = shard_files(list(range(7)), 3)
+        self.assertEqual(shards, [[0, 3, 6], [1, 4], [2, 5]])
+        self.assertEqual(shard_files([1], 4), [[1]])
+
+    def test_parse_result_line(self):
+        """Test that only prefixed JSON lines are results"""
+        self.assertIsNone(parse_result_line("Read blend: startup"))
+        self.assertIsNone(parse_result_line(RESULT_PREFIX + "{not json"))
+        self.assertEqual(parse_result_line(RESULT_PREFIX + '{"status": "success"}\n'), {"status": "success"})
+
+    def test_one_process_per_shard(self):
+        """Test that many files are converted by a few processes"""
+        converter = FakeBlenderBatchConverter(processes=2, script_path=self.script_path)
+        jobs = self.make_jobs([f"diagram_{i}.svg" for i in range(10)])
+
+        results = list(converter.convert(jobs))
+
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all(r["status"] == "success" for r in results))
+        self.assertEqual(sorted(r["svg_path"] for r in results), sorted(j["svg_path"] for j in jobs))
+        self.assertEqual(self.launches(), 2)
+
+    def test_failures_are_isolated_per_file(self):
+        """Test that a failing file and a crashing process only affect one file each"""
+        converter = FakeBlenderBatchConverter(processes=1, script_path=self.script_path)
+        jobs = self.make_jobs(["a.svg", "bad.svg", "b.svg", "crash.svg", "c.svg"])
+
+        results = {os.path.basename(r["svg_path"]): r for r in converter.convert(jobs)}
+
+        self.assertEqual(results["bad.svg"]["status"], "error")
+        self.assertEqual(results["crash.svg"]["status"], "error")
+        self.assertIn("exited", results["crash.svg"]["error"])
+        for name in ["a.svg", "b.svg", "c.svg"]:
+            self.assertEqual(results[name]["status"], "success")
+
+        # The crash restarted Blender once for the rest of the shard
+        self.assertEqual(self.launches(), 2)
+
+    def test_missing_blender_fails_every_file(self):
+        """Test that an unstartable Blender reports every file as failed"""
+        converter = BlenderBatchConverter(blender_path=os.path.join(self.temp_dir, "missing"), processes=2)
+        results = list(converter.convert(self.make_jobs(["a.svg", "b.svg", "c.svg"])))
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r["status"] == "error" for r in results))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Tests for graph-mode SVG generation and the graph layout engine
+"""
+
+import unittest
+import asyncio
+import logging
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.svg_to_video.svg_generator.graph_layout import (
+    parse_graph_spec, graph_to_svg, layered_layout, force_layout, GraphSpecError
+)
+from genai_agent.svg_to_video.llm_integrations.llm_factory import LLMFactory
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+FLOWCHART = """```json
+{"type":"flowchart","title":"Login","nodes":[{"id":"s","label":"Start"},{"id":"a","label":"Enter password"},
+{"id":"v","label":"Valid?"},{"id":"d","label":"Dashboard"},{"id":"e","label":"Show error"}],
+"edges":[["s","a"],["a","v"],["v","d","yes"],["v","e","no"],["e","a"],["s","d"]]}
+```"""
+
+def elements(svg, tag):
+    return ET.fromstring(svg).findall(f".//{SVG_NS}{tag}")
+
+def texts(svg):
+    return [element.text for element in elements(svg, "text")]
+
+class TestParseGraphSpec(unittest.TestCase):
+    """Test cases for parse_graph_spec"""
+
+    def test_spec_is_normalized(self):
+        """Test that fenced JSON, string nodes, dict edges and implicit nodes are accepted"""
+        graph = parse_graph_spec('Here you go: {"nodes":["a"],"edges":[{"from":"a","to":"b","label":"x"}],'
+                                 '"groups":[{"id":"g","label":"Tier","nodes":["b"]}]}', "network")
+
+        self.assertEqual(graph["type"], "network")
+        self.assertEqual([node["id"] for node in graph["nodes"]], ["a", "b"])
+        self.assertEqual(graph["edges"], [{"source": "a", "target": "b", "label": "x"}])
+        self.assertEqual(graph["nodes"][1]["group"], "g")
+        self.assertEqual(graph["groups"], [{"id": "g", "label": "Tier"}])
+
+    def test_invalid_specs_are_rejected(self):
+        """Test that responses without a usable graph raise GraphSpecError"""
+        for text in ("<svg></svg>", '{"nodes": [', '{"nodes": []}'):
+            with self.assertRaises(GraphSpecError):
+                parse_graph_spec(text)
+
+class TestLayouts(unittest.TestCase):
+    """Test cases for the layout algorithms"""
+
+    def test_layered_layout_follows_edges(self):
+        """Test that edges point down the layers and long and cycle edges are routed"""
+        graph = parse_graph_spec(FLOWCHART)
+        positions, routes = layered_layout(graph)
+
+        y = {node_id: position[1] for node_id, position in positions.items()}
+        self.assertLess(y["s"], y["a"])
+        self.assertLess(y["a"], y["v"])
+        self.assertLess(y["v"], y["d"])
+        self.assertEqual(y["d"], y["e"])
+        self.assertEqual(len(routes), len(graph["edges"]))
+
+        # The long s -> d edge is routed through a dummy node per layer
+        self.assertEqual(len(routes[5]), 4)
+        self.assertEqual(routes[5][0], positions["s"])
+        self.assertEqual(routes[5][-1], positions["d"])
+
+        # The e -> a cycle edge still runs from e to a
+        self.assertEqual(routes[4][0], positions["e"])
+        self.assertEqual(routes[4][-1], positions["a"])
+
+    def test_force_layout_is_deterministic(self):
+        """Test that the force layout separates nodes and gives the same result every time"""
+        graph = parse_graph_spec('{"type":"network","nodes":["lb","w1","w2","db"],'
+                                 '"edges":[["lb","w1"],["lb","w2"],["w1","db"],["w2","db"]]}')
+        positions, routes = force_layout(graph)
+
+        self.assertEqual(positions, force_layout(graph)[0])
+        points = list(positions.values())
+        for i, (x1, y1) in enumerate(points):
+            for x2, y2 in points[i + 1:]:
+                self.assertGreater(abs(x1 - x2) + abs(y1 - y2), 50)
+
+class TestGraphToSvg(unittest.TestCase):
+    """Test cases for graph_to_svg"""
+
+    def test_flowchart_svg(self):
+        """Test that a flowchart renders shapes, arrows and labels inside the viewBox"""
+        svg = graph_to_svg(parse_graph_spec(FLOWCHART))
+        root = ET.fromstring(svg)
+
+        self.assertEqual(root.get("viewBox"), "0 0 800 600")
+        self.assertEqual(len(elements(svg, "ellipse")), 1)       # Start
+        self.assertEqual(len(elements(svg, "polygon")), 1 + 6)  # Valid? and one arrowhead per edge
+        self.assertEqual(len(elements(svg, "polyline")), 2)     # s -> d and e -> a span two layers
+        for label in ("Login", "Start", "Valid?", "yes", "no"):
+            self.assertIn(label, texts(svg))
+
+        for rect in elements(svg, "rect"):
+            self.assertGreaterEqual(float(rect.get("x")), 0)
+            self.assertLessEqual(float(rect.get("x")) + float(rect.get("width")), 800)
+            self.assertLessEqual(float(rect.get("y")) + float(rect.get("height")), 600)
+
+    def test_sequence_svg(self):
+        """Test that sequence messages are drawn top to bottom between lifelines"""
+        svg = graph_to_svg(parse_graph_spec(
+            '{"type":"sequence","nodes":["Client","API"],"edges":[["Client","API","GET"],["API","Client","200 & ok"]]}'))
+
+        self.assertIn("200 & ok", texts(svg))
+        messages = [line for line in elements(svg, "line") if not line.get("stroke-dasharray")]
+        self.assertEqual(len(messages), 2)
+        self.assertLess(float(messages[0].get("y1")), float(messages[1].get("y1")))
+        self.assertLess(float(messages[0].get("x1")), float(messages[0].get("x2")))
+
+    def test_network_groups(self):
+        """Test that groups are drawn behind their members"""
+        svg = graph_to_svg(parse_graph_spec(
+            '{"type":"network","nodes":[{"id":"a","group":"g"},{"id":"b","group":"g"},"c"],'
+            '"edges":[["a","b"],["b","c"]],"groups":[{"id":"g","label":"Cluster"}]}'))
+
+        self.assertIn("Cluster", texts(svg))
+        self.assertEqual(len(elements(svg, "ellipse")), 3)
+
+class FakeClaudeDirect:
+    """Returns a canned response and records the request"""
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    async def generate_text_async(self, prompt, temperature, max_tokens):
+        self.calls.append((prompt, max_tokens))
+        return self.response
+
+class TestLLMFactoryGraphMode(unittest.TestCase):
+    """Test cases for LLMFactory.generate_svg in graph mode"""
+
+    def test_graph_mode_renders_locally(self):
+        """Test that graph mode asks for a capped JSON graph and returns rendered SVG"""
+        factory = LLMFactory(use_redis_service=False, use_langchain=False, use_direct_claude=False)
+        factory.claude_direct = FakeClaudeDirect(FLOWCHART)
+        factory.providers["claude-direct"] = {"name": "Claude Direct", "available": True, "integration_type": "direct"}
+
+        svg = asyncio.run(factory.generate_svg("claude-direct", "A login flow", "flowchart", mode="graph"))
+
+        prompt, max_tokens = factory.claude_direct.calls[0]
+        self.assertIn("A login flow", prompt)
+        self.assertIn("JSON", prompt)
+        self.assertLessEqual(max_tokens, 1024)
+        self.assertTrue(svg.startswith("<svg"))
+        self.assertIn("Dashboard", texts(svg))
+
+if __name__ == "__main__":
+    unittest.main()
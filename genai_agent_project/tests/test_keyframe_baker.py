@@ -0,0 +1,85 @@
+"""
+Tests for the precomputed keyframe baking used by ModelAnimator
+"""
+
+import unittest
+import os
+import sys
+
+import numpy as np
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.svg_to_video.animation import keyframe_baker
+
+class TestKeyframeBaker(unittest.TestCase):
+    """Test cases for keyframe_baker"""
+
+    def test_combined_bounds_matches_per_vertex_transform(self):
+        """Test vectorized bounds against transforming each corner individually"""
+        rng = np.random.default_rng(1)
+        bound_boxes = rng.uniform(-1, 1, (5, 8, 3))
+        matrices = np.tile(np.eye(4), (5, 1, 1))
+        matrices[:, :3, :3] = rng.uniform(-1, 1, (5, 3, 3))
+        matrices[:, :3, 3] = rng.uniform(-5, 5, (5, 3))
+
+        points = [m[:3, :3] @ v + m[:3, 3] for m, box in zip(matrices, bound_boxes) for v in box]
+        bounds_min, bounds_max, center, size = keyframe_baker.combined_bounds(bound_boxes, matrices)
+
+        np.testing.assert_allclose(bounds_min, np.min(points, axis=0))
+        np.testing.assert_allclose(bounds_max, np.max(points, axis=0))
+        np.testing.assert_allclose(center, (bounds_min + bounds_max) / 2)
+        self.assertAlmostEqual(size, float(np.max(bounds_max - bounds_min)))
+
+    def test_flow_keyframes_order_and_shapes(self):
+        """Test that flow objects appear top to bottom"""
+        locations = np.array([[0, 0, 0], [0, 5, 0], [0, 2, 0]], dtype=float)
+        baked = keyframe_baker.flow_keyframes(locations, 300, 5.0)
+
+        self.assertEqual(list(baked["order"]), [1, 2, 0])
+
+        channels = {(c["path"], c["first_index"]): c for c in baked["channels"]}
+        alpha = channels[("color", keyframe_baker.ALPHA_INDEX)]
+        self.assertEqual(alpha["values"].shape, (3, 2, 1))
+        self.assertTrue(np.all(np.diff(alpha["frames"][:, 0]) > 0))
+
+        # Highlights drive the RGB part of the object color
+        self.assertEqual(channels[("color", 0)]["values"].shape, (3, 2, 3))
+
+        # The last object has nothing to flow to
+        location = channels[("location", 0)]
+        self.assertEqual(list(location["indices"]), [1, 2])
+        np.testing.assert_allclose(location["values"][:, 1], locations[[1, 2]])
+
+    def test_network_classification(self):
+        """Test splitting network objects into nodes and connections"""
+        dimensions = np.array([
+            [1.0, 1.0, 0.1],
+            [1.0, 1.0, 0.1],
+            [5.0, 0.1, 0.1],
+            [1.0, 1.2, 0.1]
+        ])
+        # Flat objects count as connections by aspect ratio, so the
+        # volume heuristic decides
+        nodes, connections = keyframe_baker.classify_network_objects(dimensions)
+        self.assertEqual(len(nodes), 1)
+        self.assertEqual(sorted(np.concatenate([nodes, connections])), [0, 1, 2, 3])
+
+        baked = keyframe_baker.network_keyframes(dimensions, 300)
+        emission = [c for c in baked["channels"] if c["path"] == '["emission_color"]']
+        # Two pulses with three keys each
+        self.assertEqual(emission[0]["frames"].shape[1], 6)
+
+    def test_explode_keyframes_are_reproducible(self):
+        """Test that seeded explosions are deterministic"""
+        first = keyframe_baker.explode_keyframes(4, (0, 0, 0), 2.0, 300, seed=3)
+        second = keyframe_baker.explode_keyframes(4, (0, 0, 0), 2.0, 300, seed=3)
+
+        np.testing.assert_array_equal(first["colors"], second["colors"])
+        location = first["channels"][0]
+        distances = np.linalg.norm(location["values"][:, 1], axis=1)
+        np.testing.assert_allclose(distances, 3.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Tests for JSON and code block extraction from LLM responses
+"""
+
+import unittest
+import logging
+import os
+import sys
+import time
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.services.llm_json import extract_json, extract_code_block
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'llm_responses')
+
+class TestExtractJson(unittest.TestCase):
+    """Test cases for extract_json"""
+
+    def test_plain_json(self):
+        """Test that a response that is only JSON is returned as is"""
+        self.assertEqual(extract_json('{"a": [1, 2], "b": "x"}'), {"a": [1, 2], "b": "x"})
+
+    def test_fenced_json_with_comments_and_trailing_commas(self):
+        """Test that comments and trailing commas inside a code fence are removed"""
+        response = (
+            "Here you go:\n```json\n{\n  \"a\": 1, // first\n  /* second */ \"b\": [1, 2,],\n}\n```\n"
+            "The value of {a} is one."
+        )
+        self.assertEqual(extract_json(response), {"a": 1, "b": [1, 2]})
+
+    def test_comment_markers_inside_strings(self):
+        """Test that // and /* inside strings are kept"""
+        self.assertEqual(extract_json('{"url": "http://x/*y*/", "t": "a, }"}'),
+                         {"url": "http://x/*y*/", "t": "a, }"})
+
+    def test_single_quotes_and_python_literals(self):
+        """Test that single-quoted strings and True/False/None are converted"""
+        response = "{'name': 'It\\'s \"big\"', 'on': True, 'off': False, 'value': None}"
+        self.assertEqual(extract_json(response),
+                         {"name": "It's \"big\"", "on": True, "off": False, "value": None})
+
+    def test_stray_braces_before_object(self):
+        """Test that unbalanced braces in the prose do not hide the object after them"""
+        response = 'Use {name} or :{ and [x, y.\n{"objects": [{"id": 1}, {"id": 2}]}'
+        self.assertEqual(extract_json(response), {"objects": [{"id": 1}, {"id": 2}]})
+
+    def test_largest_value_wins(self):
+        """Test that the largest of several values is returned"""
+        response = 'First {"a": 1}, then {"a": 1, "b": {"c": 2}}, then {"d": 3}.'
+        self.assertEqual(extract_json(response), {"a": 1, "b": {"c": 2}})
+
+    def test_kind_filter(self):
+        """Test that kind restricts the result to objects or arrays"""
+        response = 'Steps: [{"tool_name": "a"}, {"tool_name": "b"},]'
+        self.assertEqual(extract_json(response, list), [{"tool_name": "a"}, {"tool_name": "b"}])
+        self.assertEqual(extract_json(response, dict), {"tool_name": "a"})
+        self.assertIsNone(extract_json("[[1], [2]]", dict))
+
+    def test_truncated_response_returns_nested_value(self):
+        """Test that a response cut off mid-object yields its largest complete value"""
+        response = '{"objects": [{"id": 1, "properties": {"color": [1, 0, 0]}}, {"id": 2, "pos'
+        self.assertEqual(extract_json(response), {"id": 1, "properties": {"color": [1, 0, 0]}})
+
+    def test_no_json(self):
+        """Test that responses without JSON return None"""
+        self.assertIsNone(extract_json(""))
+        self.assertIsNone(extract_json("I cannot help with that {"))
+
+    def test_corpus(self):
+        """Test that every captured response yields the expected value"""
+        expected = {
+            "graph_spec.txt": ("nodes", 4),
+            "scene_fenced_comments.txt": ("objects", 3),
+            "scene_plain.txt": ("objects", 4),
+            "scene_single_quotes.txt": ("objects", 4),
+            "scene_stray_braces.txt": ("objects", 4),
+        }
+        for name, (key, count) in expected.items():
+            with open(os.path.join(CORPUS_DIR, name), encoding="utf-8") as f:
+                value = extract_json(f.read(), dict)
+            self.assertEqual(len(value[key]), count, name)
+
+        with open(os.path.join(CORPUS_DIR, "task_plan.txt"), encoding="utf-8") as f:
+            self.assertEqual([step["tool_name"] for step in extract_json(f.read(), list)],
+                             ["scene_generator", "model_generator", "blender_script"])
+
+    def test_linear_on_pathological_input(self):
+        """Test that unclosed and deeply nested brackets do not cause backtracking"""
+        start = time.perf_counter()
+        self.assertIsNone(extract_json("{" * 20000))
+        self.assertIsNone(extract_json("{ 'a" * 20000))
+        self.assertEqual(extract_json("[" * 5000 + '{"a": 1}'), {"a": 1})
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+class TestExtractCodeBlock(unittest.TestCase):
+    """Test cases for extract_code_block"""
+
+    def test_first_block(self):
+        """Test that the first block is returned when no language is given"""
+        self.assertEqual(extract_code_block("x\n```\nA\n```\n```python\nB\n```"), "A")
+
+    def test_language_filter(self):
+        """Test that blocks with another language are skipped"""
+        response = "```json\n{}\n```\nThen:\n```Python\nimport bpy\n```"
+        self.assertEqual(extract_code_block(response, "python"), "import bpy")
+        self.assertIsNone(extract_code_block(response, "mermaid"))
+
+    def test_unclosed_block(self):
+        """Test that an unclosed block runs to the end of the response"""
+        self.assertEqual(extract_code_block("```mermaid\ngraph TD\n  A-->B\n", "mermaid"), "graph TD\n  A-->B")
+
+if __name__ == "__main__":
+    unittest.main()
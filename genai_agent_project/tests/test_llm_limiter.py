@@ -0,0 +1,190 @@
+"""
+Tests for the shared LLM concurrency and rate limiter
+"""
+
+import unittest
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.services.llm_limiter import (
+    LLMLimiter, TokenBucket, batch_priority, estimate_tokens, load_limits_from_env,
+    parse_priority, retry_after_seconds, BATCH, INTERACTIVE
+)
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+class TestHelpers(unittest.TestCase):
+    """Test cases for the limiter helper functions"""
+
+    def test_retry_after(self):
+        """Test Retry-After in seconds, as an HTTP date and missing"""
+        self.assertEqual(retry_after_seconds({"retry-after": "7"}), 7.0)
+        self.assertEqual(retry_after_seconds({"Retry-After": "Thu, 01 Jan 1970 00:00:00 GMT"}), 0.0)
+        self.assertEqual(retry_after_seconds({}, default=2.5), 2.5)
+        self.assertEqual(retry_after_seconds(None), 1.0)
+        self.assertEqual(retry_after_seconds({"retry-after": "soon"}, default=3.0), 3.0)
+
+    def test_priority(self):
+        """Test priority names and the batch context default"""
+        self.assertEqual(parse_priority("batch"), BATCH)
+        self.assertEqual(parse_priority(None), INTERACTIVE)
+        with batch_priority():
+            self.assertEqual(parse_priority(None), BATCH)
+            self.assertEqual(parse_priority("interactive"), INTERACTIVE)
+        self.assertEqual(parse_priority(None), INTERACTIVE)
+
+    def test_estimate_and_env(self):
+        """Test token estimates and environment overrides"""
+        self.assertEqual(estimate_tokens("x" * 400, 100), 200)
+        os.environ["LLM_LIMIT_OLLAMA_MAX_CONCURRENT"] = "2"
+        os.environ["LLM_LIMIT_OPENAI/GPT-4O_TOKENS_PER_MINUTE"] = "1000"
+        try:
+            limits = load_limits_from_env()
+        finally:
+            del os.environ["LLM_LIMIT_OLLAMA_MAX_CONCURRENT"]
+            del os.environ["LLM_LIMIT_OPENAI/GPT-4O_TOKENS_PER_MINUTE"]
+        self.assertEqual(limits["ollama"]["max_concurrent"], 2)
+        self.assertEqual(limits["openai/gpt-4o"]["tokens_per_minute"], 1000)
+
+    def test_token_bucket(self):
+        """Test that an empty bucket refills at its per-minute rate"""
+        bucket = TokenBucket(60)
+        bucket.updated = 0.0
+        self.assertEqual(bucket.wait_time(60, 0.0), 0.0)
+        bucket.take(60, 0.0)
+        self.assertAlmostEqual(bucket.wait_time(1, 0.0), 1.0)
+        self.assertAlmostEqual(bucket.wait_time(1, 0.5), 0.5)
+
+class TestLLMLimiter(unittest.TestCase):
+    """Test cases for LLMLimiter admission"""
+
+    def test_concurrency_cap(self):
+        """Test that no more than max_concurrent requests run at once"""
+        limiter = LLMLimiter({"ollama": {"max_concurrent": 2}})
+        running = []
+        peak = []
+
+        async def request():
+            async with limiter.limit("ollama", "llama3"):
+                running.append(1)
+                peak.append(len(running))
+                await asyncio.sleep(0.02)
+                running.pop()
+
+        async def run():
+            await asyncio.gather(*(request() for _ in range(6)))
+
+        asyncio.run(run())
+
+        self.assertEqual(max(peak), 2)
+        snapshot = limiter.snapshot()["ollama"]
+        self.assertEqual(snapshot["admitted"], 6)
+        self.assertEqual(snapshot["in_flight"], 0)
+        self.assertEqual(snapshot["queued"], 0)
+        self.assertGreater(snapshot["queue_wait_max_seconds"], 0.0)
+
+    def test_interactive_ahead_of_batch(self):
+        """Test that queued interactive requests are admitted before earlier batch requests"""
+        limiter = LLMLimiter({"anthropic": {"max_concurrent": 1}})
+        order = []
+
+        async def request(name, priority):
+            async with limiter.limit("anthropic", "claude", priority=priority):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        async def run():
+            first = asyncio.ensure_future(request("first", "batch"))
+            await asyncio.sleep(0)
+            batch = [asyncio.ensure_future(request(f"batch{i}", "batch")) for i in range(2)]
+            await asyncio.sleep(0)
+            interactive = asyncio.ensure_future(request("interactive", "interactive"))
+            await asyncio.gather(first, interactive, *batch)
+
+        asyncio.run(run())
+
+        self.assertEqual(order, ["first", "interactive", "batch0", "batch1"])
+
+    def test_request_rate(self):
+        """Test that the request bucket spaces out requests beyond the burst"""
+        limiter = LLMLimiter({"openai": {"requests_per_minute": 600}})
+
+        async def run():
+            start = time.monotonic()
+            for _ in range(602):
+                async with limiter.limit("openai", "gpt-4o"):
+                    pass
+            return time.monotonic() - start
+
+        # 600 requests fit the burst, the next two wait 0.1s each
+        self.assertGreater(asyncio.run(run()), 0.15)
+
+    def test_backoff_blocks_scope(self):
+        """Test that a Retry-After backoff delays the next request"""
+        limiter = LLMLimiter({})
+        limiter.backoff("anthropic", "claude", 0.1)
+
+        async def run():
+            start = time.monotonic()
+            async with limiter.limit("anthropic", "claude"):
+                pass
+            async with limiter.limit("anthropic", "other-model"):
+                pass
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(asyncio.run(run()), 0.09)
+        snapshot = limiter.snapshot()
+        self.assertEqual(snapshot["anthropic/claude"]["rate_limited"], 1)
+        self.assertEqual(snapshot["anthropic/other-model"]["rate_limited"], 0)
+
+    def test_cancelled_waiter_leaves_queue(self):
+        """Test that a cancelled wait does not hold a slot or a queue position"""
+        limiter = LLMLimiter({"ollama": {"max_concurrent": 1}})
+
+        async def run():
+            ticket = await limiter.acquire("ollama")
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(limiter.acquire("ollama"), 0.01)
+            ticket.release()
+            (await limiter.acquire("ollama")).release()
+
+        asyncio.run(run())
+        snapshot = limiter.snapshot()["ollama"]
+        self.assertEqual(snapshot["queued"], 0)
+        self.assertEqual(snapshot["in_flight"], 0)
+
+    def test_sync_callers_share_limits(self):
+        """Test that threads using limit_sync respect the same cap"""
+        limiter = LLMLimiter({"anthropic": {"max_concurrent": 1}})
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def request():
+            with limiter.limit_sync("anthropic", "claude"):
+                with lock:
+                    running[0] += 1
+                    peak[0] = max(peak[0], running[0])
+                time.sleep(0.01)
+                with lock:
+                    running[0] -= 1
+
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(peak[0], 1)
+        self.assertEqual(limiter.snapshot()["anthropic"]["admitted"], 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Tests for the append-only log storage of the Memory Service
+"""
+
+import unittest
+import asyncio
+import json
+import logging
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.services.memory_log import MemoryLog
+from genai_agent.services.memory import MemoryService
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+class TestMemoryLog(unittest.TestCase):
+    """Test cases for MemoryLog"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'memory.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def open_log(self, **kwargs):
+        log = MemoryLog(self.path, **kwargs)
+        self.addCleanup(log.close)
+        return log
+
+    def test_values_survive_reopen(self):
+        """Test that the index is rebuilt from the log"""
+        log = self.open_log()
+        log.put('a', b'1')
+        log.put('b', b'2')
+        log.put('a', b'3')
+        log.delete('b')
+        log.close()
+
+        log = self.open_log()
+        self.assertEqual(log.get('a'), b'3')
+        self.assertIsNone(log.get('b'))
+        self.assertEqual(log.keys(), ['a'])
+
+    def test_torn_write_is_truncated(self):
+        """Test that an incomplete record at the end of the log is dropped"""
+        log = self.open_log()
+        log.put('kept', b'value')
+        log.put('torn', b'x' * 100)
+        log.close()
+
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 10)
+
+        log = self.open_log()
+        self.assertEqual(log.keys(), ['kept'])
+        log.put('after', b'ok')
+        self.assertEqual(log.get('after'), b'ok')
+
+    def test_expiry_and_compaction(self):
+        """Test that expired and overwritten records are swept and compacted away"""
+        log = self.open_log(compact_min_bytes=0)
+        log.put('expired', b'old', expiration=time.time() - 1)
+        for i in range(50):
+            log.put('counter', str(i).encode())
+        log.put('keep', b'value', expiration=time.time() + 3600)
+
+        self.assertEqual(sorted(log.keys()), ['counter', 'keep'])
+        self.assertEqual(log.sweep(), 1)
+        self.assertGreater(log.garbage_ratio(), 0.9)
+
+        size = os.path.getsize(self.path)
+        log.maintain()
+        self.assertLess(os.path.getsize(self.path), size / 10)
+        self.assertEqual(log.get('counter'), b'49')
+        log.close()
+
+        log = self.open_log()
+        self.assertEqual(sorted(log.keys()), ['counter', 'keep'])
+
+class TestMemoryServiceLogStorage(unittest.TestCase):
+    """Test cases for MemoryService with log storage"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def create_service(self):
+        memory = MemoryService(None, {'storage_type': 'log', 'file_path': self.temp_dir, 'ttl': 0})
+        self.addCleanup(lambda: asyncio.run(memory.close()))
+        return memory
+
+    def test_memory_operations(self):
+        """Test store, list, history and delete on log storage"""
+        memory = self.create_service()
+
+        async def run():
+            await memory.store('context:scene', {'id': 'scene1'})
+            await memory.store_many({'context:mode': 'edit', 'other': [1]})
+            await memory.add_scene_history_entry('scene1', {'action': 'create'})
+            await memory.add_scene_history_entry('scene1', {'action': 'move'})
+
+            self.assertEqual(sorted(await memory.list_keys('context:*')), ['context:mode', 'context:scene'])
+            self.assertEqual(await memory.retrieve_matching('context:*'),
+                             {'context:scene': {'id': 'scene1'}, 'context:mode': 'edit'})
+            self.assertEqual(len(await memory.retrieve_scene_history('scene1')), 2)
+
+            await memory.delete('other')
+            self.assertIsNone(await memory.retrieve('other'))
+
+        asyncio.run(run())
+
+    def test_json_files_are_imported(self):
+        """Test that values of the 'file' storage type are imported into a new log"""
+        with open(os.path.join(self.temp_dir, 'greeting.json'), 'w') as f:
+            json.dump({'value': 'hello', 'timestamp': 0, 'expiration': 0}, f)
+        with open(os.path.join(self.temp_dir, 'stale.json'), 'w') as f:
+            json.dump({'value': 'old', 'timestamp': 0, 'expiration': 1}, f)
+
+        memory = self.create_service()
+        self.assertEqual(asyncio.run(memory.retrieve('greeting')), 'hello')
+        self.assertEqual(asyncio.run(memory.list_keys()), ['greeting'])
+
+if __name__ == "__main__":
+    unittest.main()
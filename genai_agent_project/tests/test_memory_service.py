@@ -0,0 +1,105 @@
+"""
+Tests for MemoryService list, bulk and context operations
+"""
+
+import unittest
+import asyncio
+import json
+import logging
+import os
+import sys
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.services.memory import MemoryService
+from genai_agent.core.context_manager import ContextManager
+from tests.fake_redis import FakeRedisBus
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+class TestRedisMemoryService(unittest.TestCase):
+    """Test cases for MemoryService with Redis storage"""
+
+    def setUp(self):
+        self.bus = FakeRedisBus()
+        self.memory = MemoryService(self.bus, {'storage_type': 'redis', 'ttl': 60})
+        self.redis = self.bus.redis
+
+    def test_history_is_appended_to_a_list(self):
+        """Test that history entries are appended without rewriting the history"""
+        async def run():
+            await self.memory.add_scene_history_entry('scene1', {'action': 'create'})
+            await self.memory.add_scene_history_entry('scene1', {'action': 'move'})
+            await self.memory.add_scene_history_entry('scene1', {'action': 'delete'})
+
+            self.assertEqual(len(self.redis.data['memory:scene_history:scene1']), 3)
+            self.assertEqual(self.redis.ttls['memory:scene_history:scene1'], 60)
+            self.assertEqual([e['action'] for e in await self.memory.retrieve_scene_history('scene1')],
+                             ['create', 'move', 'delete'])
+            self.assertEqual(await self.memory.retrieve_scene_history('scene1', start=-1),
+                             [{'action': 'delete'}])
+
+        asyncio.run(run())
+
+    def test_conversation_store_and_append(self):
+        """Test replacing, appending to and reading ranges of a conversation"""
+        async def run():
+            await self.memory.store_conversation('c1', [{'role': 'user', 'content': 'hi'}])
+            await self.memory.add_conversation_messages('c1', [{'role': 'assistant', 'content': 'hello'},
+                                                               {'role': 'user', 'content': 'bye'}])
+            messages = await self.memory.retrieve_conversation('c1')
+            self.assertEqual([m['content'] for m in messages], ['hi', 'hello', 'bye'])
+            self.assertEqual([m['content'] for m in await self.memory.retrieve_conversation('c1', 0, 1)],
+                             ['hi', 'hello'])
+
+            await self.memory.store_conversation('c1', [])
+            self.assertEqual(await self.memory.retrieve_conversation('c1'), [])
+
+        asyncio.run(run())
+
+    def test_legacy_history_is_migrated(self):
+        """Test that histories stored as one JSON string are converted on first use"""
+        async def run():
+            self.redis.data['memory:scene_history:old'] = json.dumps([{'action': 'create'}])
+
+            self.assertTrue(await self.memory.add_scene_history_entry('old', {'action': 'scale'}))
+            self.assertEqual([e['action'] for e in await self.memory.retrieve_scene_history('old')],
+                             ['create', 'scale'])
+
+            self.redis.data['memory:conversation:old'] = json.dumps([{'content': 'hi'}])
+            self.assertEqual(await self.memory.retrieve_conversation('old'), [{'content': 'hi'}])
+
+        asyncio.run(run())
+
+    def test_store_and_retrieve_many(self):
+        """Test bulk operations"""
+        async def run():
+            await self.memory.store_many({'a': {'x': 1}, 'b': 'text', 'c': [1, 2]})
+            self.assertEqual(await self.memory.retrieve_many(['a', 'b', 'missing']), {'a': {'x': 1}, 'b': 'text'})
+            self.assertEqual(await self.memory.retrieve_matching('*'), {'a': {'x': 1}, 'b': 'text', 'c': [1, 2]})
+
+            await self.memory.delete_many(['a', 'b'])
+            self.assertEqual(await self.memory.list_keys(), ['c'])
+
+        asyncio.run(run())
+
+    def test_full_context(self):
+        """Test that the full context is loaded from memory and can be cleared"""
+        async def run():
+            writer = ContextManager(self.memory)
+            await writer.update_contexts({'scene': 'scene1', 'selection': ['cube']})
+            await writer.update_context('mode', 'edit')
+
+            reader = ContextManager(self.memory)
+            self.assertEqual(await reader.get_full_context(),
+                             {'scene': 'scene1', 'selection': ['cube'], 'mode': 'edit'})
+
+            await reader.clear_context()
+            self.assertEqual(await ContextManager(self.memory).get_full_context(), {})
+
+        asyncio.run(run())
+
+if __name__ == "__main__":
+    unittest.main()
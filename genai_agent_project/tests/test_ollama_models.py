@@ -0,0 +1,178 @@
+"""
+Tests for Ollama keep-alive, preloading and model-affinity scheduling
+"""
+
+import unittest
+import asyncio
+import logging
+import os
+import sys
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.services.ollama_models import ModelAffinityScheduler, OllamaModelManager, get_ollama_manager
+from genai_agent.services.llm import LLMService
+from tests.fake_ollama import FakeOllamaServer
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+class TestModelAffinityScheduler(unittest.TestCase):
+    """Test cases for ModelAffinityScheduler"""
+
+    def run_requests(self, scheduler, models, priorities=None):
+        order = []
+
+        async def request(model):
+            order.append(model)
+            await asyncio.sleep(0.001)
+
+        async def run():
+            await asyncio.gather(*(
+                scheduler.run(model, lambda model=model: request(model),
+                              priorities[i] if priorities else None)
+                for i, model in enumerate(models)
+            ))
+
+        asyncio.run(run())
+        return order
+
+    def test_groups_requests_by_model(self):
+        """Test that interleaved requests run grouped by model"""
+        scheduler = ModelAffinityScheduler()
+        order = self.run_requests(scheduler, ["a", "b", "a", "c", "b", "a"])
+
+        self.assertEqual(order, ["a", "a", "a", "b", "b", "c"])
+        self.assertEqual(scheduler.switches, 2)
+
+    def test_max_batch_lets_other_models_run(self):
+        """Test that a long queue for one model yields after max_batch requests"""
+        scheduler = ModelAffinityScheduler(max_batch=2)
+        order = self.run_requests(scheduler, ["a", "a", "a", "a", "b"])
+
+        self.assertEqual(order, ["a", "a", "b", "a", "a"])
+
+    def test_interactive_model_goes_first(self):
+        """Test that the next model is chosen by the priority of its waiting requests"""
+        scheduler = ModelAffinityScheduler()
+        order = self.run_requests(scheduler, ["a", "b", "c"], ["batch", "batch", "interactive"])
+
+        self.assertEqual(order, ["a", "c", "b"])
+
+    def test_cancelled_request_leaves_queue(self):
+        """Test that a cancelled request neither runs nor blocks the queue"""
+        scheduler = ModelAffinityScheduler()
+        ran = []
+
+        async def request(name, delay=0.0):
+            await asyncio.sleep(delay)
+            ran.append(name)
+
+        async def run():
+            first = asyncio.ensure_future(scheduler.run("a", lambda: request("first", 0.02)))
+            await asyncio.sleep(0)
+            cancelled = asyncio.ensure_future(scheduler.run("b", lambda: request("cancelled")))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.gather(first, scheduler.run("c", lambda: request("last")), return_exceptions=True)
+
+        asyncio.run(run())
+        self.assertEqual(ran, ["first", "last"])
+        self.assertEqual(scheduler.snapshot()["running"], 0)
+
+class TestOllamaModelManager(unittest.TestCase):
+    """Test cases for OllamaModelManager against a fake Ollama server"""
+
+    def setUp(self):
+        self.server = FakeOllamaServer(max_loaded=1).start()
+        self.config = {"keep_alive": "30m", "model_keep_alive": {"coder": "5m"},
+                       "preload": ["llama3"], "max_loaded_models": 1}
+
+    def tearDown(self):
+        self.server.stop()
+
+    def create_service(self):
+        service = LLMService()
+        service.ollama = OllamaModelManager(self.server.base_url, self.config)
+        return service
+
+    def test_preload_and_keep_alive(self):
+        """Test that configured models are loaded at initialization and requests carry keep_alive"""
+        service = self.create_service()
+
+        async def run():
+            await service.initialize()
+            return await service.generate("hello", provider="ollama", model="coder")
+
+        self.assertEqual(asyncio.run(run()), "coder: hello")
+
+        warm_up, request = self.server.requests
+        self.assertEqual((warm_up["model"], warm_up["prompt"], warm_up["keep_alive"]), ("llama3", "", "30m"))
+        self.assertEqual((request["model"], request["keep_alive"]), ("coder", "5m"))
+
+        snapshot = service.ollama.snapshot()
+        self.assertEqual(snapshot["loaded"], ["coder"])
+        self.assertEqual([(e["event"], e["model"]) for e in snapshot["events"]],
+                         [("load", "llama3"), ("load", "coder"), ("unload", "llama3")])
+
+    def test_interleaved_requests_load_each_model_once(self):
+        """Test that concurrent requests alternating between models are grouped to avoid reloads"""
+        service = self.create_service()
+        service.initialized = True
+        models = ["llama3", "coder"] * 4
+
+        async def run():
+            return await asyncio.gather(*(
+                service.generate(f"prompt {i}", provider="ollama", model=model)
+                for i, model in enumerate(models)
+            ))
+
+        results = asyncio.run(run())
+
+        self.assertEqual(results, [f"{model}: prompt {i}" for i, model in enumerate(models)])
+        self.assertEqual(self.server.loads, ["llama3", "coder"])
+        self.assertEqual(service.ollama.loads, 2)
+
+    def test_refresh_and_unload(self):
+        """Test that expired and explicitly unloaded models are recorded"""
+        manager = OllamaModelManager(self.server.base_url, self.config)
+
+        async def run():
+            await manager.preload()
+            self.server.loaded.clear()
+            await manager.refresh()
+            await manager.warm_up("coder")
+            await manager.unload("coder")
+
+        asyncio.run(run())
+
+        self.assertEqual([(e["event"], e["model"], e["reason"]) for e in manager.events], [
+            ("load", "llama3", "request"),
+            ("unload", "llama3", "expired"),
+            ("load", "coder", "request"),
+            ("unload", "coder", "requested")
+        ])
+        self.assertEqual(manager.snapshot()["loaded"], [])
+        self.assertEqual(self.server.loaded, [])
+
+    def test_manager_shared_by_services(self):
+        """Test that services share one manager per server, which preloads once"""
+        base_url = self.server.base_url + "/"
+        manager = get_ollama_manager(base_url, self.config)
+        first, second = LLMService(), LLMService()
+        first.ollama = get_ollama_manager(self.server.base_url)
+        second.ollama = get_ollama_manager(self.server.base_url)
+
+        async def run():
+            await first.initialize()
+            await second.initialize()
+
+        asyncio.run(run())
+
+        self.assertIs(first.ollama, manager)
+        self.assertIs(second.ollama, manager)
+        self.assertEqual([request["model"] for request in self.server.requests], ["llama3"])
+
+if __name__ == "__main__":
+    unittest.main()
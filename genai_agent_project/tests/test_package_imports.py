@@ -0,0 +1,35 @@
+"""
+Tests for importing the svg_to_video package through its repository path
+"""
+
+import unittest
+import os
+import sys
+import subprocess
+
+# Directory containing genai_agent_project, as used by batch_convert_svg_to_3d.py
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+MODULES = (
+    "genai_agent_project.genai_agent.svg_to_video.llm_integrations.llm_factory",
+    "genai_agent_project.genai_agent.svg_to_video.svg_generator.svg_generator",
+    "genai_agent_project.genai_agent.svg_to_video.batch_converter",
+)
+
+class TestRepositoryPathImports(unittest.TestCase):
+    """Test cases for imports through genai_agent_project.genai_agent"""
+
+    def test_modules_import_without_genai_agent_on_path(self):
+        """Test that the package does not rely on genai_agent being importable at top level"""
+        for module in MODULES:
+            with self.subTest(module=module):
+                # A fresh interpreter whose path only has the repository root
+                result = subprocess.run(
+                    [sys.executable, "-c", f"import {module}"],
+                    cwd=REPO_ROOT, env=dict(os.environ, PYTHONPATH=REPO_ROOT),
+                    capture_output=True, text=True
+                )
+                self.assertEqual(result.returncode, 0, result.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Tests for the SVG to Video pipeline scheduler
+"""
+
+import unittest
+import asyncio
+import os
+import sys
+import time
+import logging
+import tempfile
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.svg_to_video.pipeline_scheduler import PipelineScheduler, PipelineStage
+
+# The pipeline imports the Blender converter, which needs Blender's mathutils
+try:
+    from genai_agent.svg_to_video.pipeline_integrated import SVGToVideoPipeline
+except ImportError:
+    SVGToVideoPipeline = None
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+def slow_stage(name, delay):
+    """Create a blocking stage that records its name on the job"""
+    def run(job):
+        time.sleep(delay)
+        job.setdefault("visited", []).append(name)
+        return job
+    return run
+
+class TestPipelineScheduler(unittest.TestCase):
+    """Test cases for PipelineScheduler"""
+
+    def test_stages_overlap_across_jobs(self):
+        """Test that later jobs start a stage while earlier jobs are in the next one"""
+        scheduler = PipelineScheduler([
+            PipelineStage("llm", slow_stage("llm", 0.1)),
+            PipelineStage("render", slow_stage("render", 0.1))
+        ])
+
+        start = time.monotonic()
+        results = asyncio.run(scheduler.run([{"status": "in_progress"} for _ in range(4)]))
+        elapsed = time.monotonic() - start
+
+        # Sequential execution would take 0.8s, pipelined takes ~0.5s
+        self.assertLess(elapsed, 0.7)
+        self.assertEqual([r["job_id"] for r in results], [0, 1, 2, 3])
+        for result in results:
+            self.assertEqual(result["visited"], ["llm", "render"])
+
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["pending_jobs"], 0)
+        self.assertEqual(stats["stages"]["llm"]["processed"], 4)
+        self.assertEqual(stats["stages"]["render"]["queue_depth"], 0)
+        self.assertGreater(stats["stages"]["render"]["utilization"], 0.5)
+
+    def test_failed_job_skips_later_stages(self):
+        """Test that errors stop a job without affecting the others"""
+        def failing(job):
+            if job["job_id"] == 1:
+                raise RuntimeError("boom")
+            return job
+
+        async def async_stage(job):
+            job["done"] = True
+            return job
+
+        scheduler = PipelineScheduler([
+            PipelineStage("first", failing),
+            PipelineStage("second", async_stage, workers=2)
+        ])
+        results = asyncio.run(scheduler.run([{"status": "in_progress"} for _ in range(3)]))
+
+        self.assertEqual(results[1]["status"], "error")
+        self.assertEqual(results[1]["error"], "boom")
+        self.assertNotIn("done", results[1])
+        self.assertTrue(results[0]["done"])
+        self.assertTrue(results[2]["done"])
+        self.assertEqual(scheduler.get_stats()["stages"]["first"]["failed"], 1)
+
+    def test_empty_batch(self):
+        """Test running an empty batch"""
+        scheduler = PipelineScheduler([PipelineStage("only", lambda job: job)])
+        self.assertEqual(asyncio.run(scheduler.run([])), [])
+
+class StubSVGGenerator:
+    """SVGGenerator returning an SVG string after a short await"""
+
+    def __init__(self):
+        self.concepts = []
+
+    async def generate_svg(self, concept, provider=None, diagram_type=None, **kwargs):
+        await asyncio.sleep(0.01)
+        self.concepts.append(concept)
+        if concept == "broken":
+            raise RuntimeError("Failed to generate SVG: no providers")
+        return f"<svg><text>{concept}</text></svg>"
+
+class StubSVGTo3DConverter:
+    """SVGTo3DConverter writing the model file"""
+
+    async def convert_svg_to_3d(self, svg_path, output_path, extrude_depth=None, scale_factor=None):
+        await asyncio.sleep(0.01)
+        with open(output_path, "w") as f:
+            f.write(f"# {svg_path}\n")
+        return True
+
+@unittest.skipIf(SVGToVideoPipeline is None, "SVG to Video pipeline needs Blender's mathutils")
+class TestPipelineStages(unittest.TestCase):
+    """Test cases for the SVG to Video pipeline stages on the scheduler"""
+
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.pipeline = SVGToVideoPipeline.__new__(SVGToVideoPipeline)
+        self.pipeline.svg_dir = os.path.join(self.output_dir.name, "svg")
+        self.pipeline.models_dir = os.path.join(self.output_dir.name, "models")
+        os.makedirs(self.pipeline.svg_dir)
+        os.makedirs(self.pipeline.models_dir)
+        self.pipeline.svg_generator = StubSVGGenerator()
+        self.pipeline.svg_to_3d_converter = StubSVGTo3DConverter()
+
+    def tearDown(self):
+        self.output_dir.cleanup()
+
+    def test_generation_and_conversion_stages(self):
+        """Test that the async stages await the generator and converter"""
+        stages = dict(self.pipeline._get_stages())
+        scheduler = PipelineScheduler([
+            PipelineStage(name, self.pipeline._guard_stage(name, stages[name]))
+            for name in ("svg_generation", "svg_to_3d")
+        ])
+        self.assertTrue(all(stage.is_async for stage in scheduler.stages))
+
+        jobs = [self.pipeline._create_job(concept, name=f"job{i}")
+                for i, concept in enumerate(["a login flow", "broken", "a build"])]
+        results = asyncio.run(scheduler.run(jobs))
+
+        first, broken, last = results
+        self.assertEqual(first["files"]["svg_code"], "<svg><text>a login flow</text></svg>")
+        with open(first["files"]["svg_path"], encoding="utf-8") as f:
+            self.assertEqual(f.read(), first["files"]["svg_code"])
+        self.assertEqual(first["files"]["model_path"], os.path.join(self.pipeline.models_dir, "job0_3d.obj"))
+        self.assertTrue(os.path.exists(first["files"]["model_path"]))
+        self.assertEqual(last["steps"]["svg_to_3d"]["status"], "success")
+
+        self.assertEqual(broken["status"], "error")
+        self.assertEqual(broken["steps"]["svg_generation"]["status"], "error")
+        self.assertIn("no providers", broken["error"])
+        self.assertEqual(broken["steps"]["svg_to_3d"]["status"], "pending")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Tests for prompt prefix reuse
+"""
+
+import unittest
+import asyncio
+import logging
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.services.prompt_prefix import (
+    PrefixedPrompt, PrefixCacheStats, OllamaPrefixTracker, anthropic_messages, split_prompt
+)
+from genai_agent.services.ollama_models import OllamaModelManager
+from genai_agent.services.llm import LLMService
+from genai_agent.svg_to_video.llm_integrations.claude_direct import ClaudeDirectSVGGenerator
+from genai_agent.tools.diagram_generator import DiagramGeneratorTool
+from tests.fake_ollama import FakeOllamaServer
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+class TestPrefixedPrompt(unittest.TestCase):
+    """Test cases for PrefixedPrompt and the Anthropic request fields"""
+
+    def test_prompt_is_prefix_plus_suffix(self):
+        """Test that a prefixed prompt reads as the full prompt text"""
+        prompt = PrefixedPrompt("Instructions.\n", "Task")
+        self.assertEqual(prompt, "Instructions.\nTask")
+        self.assertEqual(split_prompt(prompt), ("Instructions.\n", "Task"))
+        self.assertEqual(split_prompt("plain"), ("", "plain"))
+
+    def test_anthropic_cache_marker(self):
+        """Test that the prefix becomes a cached system block and the suffix the message"""
+        fields = anthropic_messages(PrefixedPrompt("Fixed", "Variable"))
+        self.assertEqual(fields["system"], [{"type": "text", "text": "Fixed", "cache_control": {"type": "ephemeral"}}])
+        self.assertEqual(fields["messages"], [{"role": "user", "content": "Variable"}])
+        self.assertEqual(anthropic_messages("plain"), {"messages": [{"role": "user", "content": "plain"}]})
+
+    def test_claude_direct_svg_prompt(self):
+        """Test that the SVG prompt keeps its instructions in a stable prefix"""
+        claude = ClaudeDirectSVGGenerator(api_key="test-key-0123456789")
+        first = claude._create_svg_prompt("a login flow", "flowchart")
+        second = claude._create_svg_prompt("a build pipeline", "flowchart")
+
+        self.assertEqual(first.prefix, second.prefix)
+        self.assertIn("a login flow", first.suffix)
+        _, payload = claude._build_request(first, 0.2, 100)
+        self.assertEqual(payload["system"][0]["text"], first.prefix)
+        self.assertEqual(payload["messages"][0]["content"], first.suffix)
+
+    def test_tool_prompt_prefix(self):
+        """Test that diagram prompts for the same type share a prefix"""
+        tool = DiagramGeneratorTool(None, {})
+        first = tool._create_diagram_generation_prompt("a parser", "flowchart", "mermaid")
+        second = tool._create_diagram_generation_prompt("a lexer", "flowchart", "mermaid")
+
+        self.assertEqual(first.prefix, second.prefix)
+        self.assertIn("Description: a lexer", second.suffix)
+
+    def test_anthropic_usage_hit_rate(self):
+        """Test that cache reads in the usage block count as hits"""
+        stats = PrefixCacheStats()
+        stats.record_anthropic_usage({"cache_creation_input_tokens": 1200, "cache_read_input_tokens": 0})
+        stats.record_anthropic_usage({"cache_read_input_tokens": 1200})
+
+        snapshot = stats.snapshot()["anthropic"]
+        self.assertEqual((snapshot["requests"], snapshot["hits"], snapshot["cached_tokens"]), (2, 1, 1200))
+        self.assertEqual(snapshot["hit_rate"], 0.5)
+
+class TestOllamaPrefixReuse(unittest.TestCase):
+    """Test cases for Ollama prefix reuse against a fake Ollama server"""
+
+    def setUp(self):
+        self.server = FakeOllamaServer(max_loaded=1).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_full_prompt_sent_and_cache_hits_recorded(self):
+        """Test that prompts are sent unchanged and KV cache reuse counts as a hit"""
+        service = LLMService()
+        service.ollama = OllamaModelManager(self.server.base_url, {})
+        service.initialized = True
+        prefix = "Long fixed instructions for every request. "
+        stats = PrefixCacheStats()
+
+        async def run():
+            with patch("genai_agent.services.ollama_models.get_prefix_stats", return_value=stats):
+                for task in ("first task", "second task", "third task"):
+                    await service.generate(PrefixedPrompt(prefix, task), provider="ollama", model="llama3")
+
+        asyncio.run(run())
+
+        self.assertEqual([request["prompt"] for request in self.server.requests],
+                         [prefix + task for task in ("first task", "second task", "third task")])
+        self.assertTrue(all("context" not in request for request in self.server.requests))
+
+        snapshot = stats.snapshot()["ollama"]
+        self.assertEqual((snapshot["requests"], snapshot["hits"]), (3, 2))
+        self.assertGreater(snapshot["cached_tokens"], 0)
+
+    def test_prefix_evicted_with_model(self):
+        """Test that a prefix is a miss again after its model was unloaded"""
+        tracker = OllamaPrefixTracker()
+        prompt = PrefixedPrompt("Fixed instructions. ", "task")
+
+        self.assertEqual(tracker.observe("llama3", prompt, 24), (False, 0))
+        self.assertEqual(tracker.observe("llama3", prompt, 4), (True, 20))
+        self.assertEqual(tracker.observe("llama3", prompt, 24), (False, 0))
+        self.assertEqual(tracker.observe("coder", prompt, 4)[0], False)
+
+if __name__ == "__main__":
+    unittest.main()
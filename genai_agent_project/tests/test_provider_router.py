@@ -0,0 +1,126 @@
+"""
+Tests for latency-aware provider routing and hedged requests
+"""
+
+import unittest
+import asyncio
+import logging
+import os
+import sys
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.svg_to_video.llm_integrations.provider_router import ProviderRouter, ProviderStats
+from genai_agent.svg_to_video.llm_integrations.llm_factory import LLMFactory
+from tests.stub_llm_providers import StubLLMProvider
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg"><rect width="1" height="1"/></svg>'
+
+class TestProviderStats(unittest.TestCase):
+    """Test cases for ProviderStats"""
+
+    def test_percentiles_and_error_rate(self):
+        """Test nearest-rank percentiles over successes and the failure fraction"""
+        stats = ProviderStats()
+        for latency in [0.1, 0.2, 0.3, 0.4, None]:
+            stats.record(latency)
+
+        self.assertEqual(stats.percentile(50), 0.2)
+        self.assertEqual(stats.percentile(95), 0.4)
+        self.assertAlmostEqual(stats.error_rate(), 0.2)
+
+    def test_window_drops_old_samples(self):
+        """Test that samples outside the window no longer count"""
+        stats = ProviderStats(window_seconds=10)
+        stats.record(None, now=0)
+        stats.record(1.0, now=100)
+        self.assertEqual(stats.error_rate(), 0.0)
+
+class TestProviderRouter(unittest.TestCase):
+    """Test cases for ProviderRouter.rank"""
+
+    def test_rank_prefers_healthy_and_fast(self):
+        """Test that the preferred provider wins while healthy and the fastest healthy provider otherwise"""
+        router = ProviderRouter(min_samples=3)
+        for _ in range(3):
+            router.record_success("slow", 2.0)
+            router.record_success("fast", 0.5)
+            router.record_failure("broken")
+
+        self.assertEqual(router.rank(["broken", "slow", "fast", "new"]), ["fast", "slow", "new", "broken"])
+        self.assertEqual(router.rank(["broken", "slow", "fast"], preferred="slow")[0], "slow")
+        self.assertEqual(router.rank(["broken", "slow", "fast"], preferred="broken")[0], "fast")
+
+    def test_rate_limited_provider_cools_down(self):
+        """Test that a rate limit error takes the provider out of rotation immediately"""
+        router = ProviderRouter()
+        router.record_failure("claude", RuntimeError("HTTP 429 Too Many Requests"))
+        self.assertFalse(router.is_healthy("claude"))
+        self.assertEqual(router.rank(["claude", "openai"], preferred="claude"), ["openai", "claude"])
+
+class TestLLMFactoryRouting(unittest.TestCase):
+    """Test cases for routing through LLMFactory with stub providers"""
+
+    def create_factory(self, hedge=False, **stubs):
+        factory = LLMFactory(use_redis_service=False, use_langchain=False, use_direct_claude=False)
+        factory.router = ProviderRouter(min_samples=3, hedge=hedge)
+        for provider_id, stub in stubs.items():
+            factory.register_provider(provider_id, stub)
+        return factory
+
+    def test_failover_and_health(self):
+        """Test that a failing provider fails over and is routed around once unhealthy"""
+        broken = StubLLMProvider(fail=True)
+        backup = StubLLMProvider(response="ok")
+        factory = self.create_factory(broken=broken, backup=backup)
+
+        async def run():
+            for _ in range(5):
+                self.assertEqual(await factory.generate_text("broken", "prompt"), "ok")
+
+        asyncio.run(run())
+
+        # Three failures make the provider unhealthy; later requests skip it
+        self.assertEqual(broken.calls, 3)
+        self.assertEqual(backup.calls, 5)
+        stats = factory.get_provider_stats()
+        self.assertFalse(stats["broken"]["healthy"])
+        self.assertEqual(stats["backup"]["error_rate"], 0.0)
+
+    def test_hedged_request_wins_and_loser_is_cancelled(self):
+        """Test that a request slower than its p95 is hedged and the slower request is cancelled"""
+        # Fast for the first requests, then a latency spike
+        primary = StubLLMProvider(response=SVG, latency=lambda call: 0.01 if call <= 3 else 5.0)
+        secondary = StubLLMProvider(response=SVG, latency=0.01)
+        factory = self.create_factory(hedge=True, primary=primary, secondary=secondary)
+
+        async def run():
+            for _ in range(3):
+                await factory.generate_svg("primary", "boxes", mode="svg")
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            svg = await factory.generate_svg("primary", "boxes", mode="svg")
+            return svg, loop.time() - start
+
+        svg, elapsed = asyncio.run(run())
+
+        self.assertEqual(svg, SVG)
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(secondary.calls, 1)
+        self.assertEqual(primary.cancelled, 1)
+
+    def test_no_hedge_without_latency_history(self):
+        """Test that requests are not hedged before the provider has a p95"""
+        primary = StubLLMProvider(response="ok", latency=0.05)
+        secondary = StubLLMProvider(response="ok")
+        factory = self.create_factory(hedge=True, primary=primary, secondary=secondary)
+
+        self.assertEqual(asyncio.run(factory.generate_text("primary", "prompt")), "ok")
+        self.assertEqual(secondary.calls, 0)
+
+if __name__ == "__main__":
+    unittest.main()
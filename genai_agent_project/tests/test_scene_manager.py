@@ -0,0 +1,65 @@
+"""
+Tests for the Scene Manager Blender export
+"""
+
+import unittest
+import os
+import sys
+import logging
+from unittest.mock import MagicMock
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.services.scene_manager import SceneManager
+from genai_agent.models.scene import Scene, SceneObject
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+class TestSceneManagerExport(unittest.TestCase):
+    """Test cases for SceneManager._export_to_blender"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.scene_manager = SceneManager(MagicMock())
+        self.scene = Scene(
+            id="scene-1",
+            name="Test Scene",
+            objects=[
+                SceneObject(id=f"cube-{i}", type="cube", name=f"Cube {i}", position=[i, 0, 0],
+                            properties={"material": {"name": "Red", "color": [1, 0, 0, 1]}})
+                for i in range(3)
+            ] + [
+                SceneObject(id="light-1", type="light", name="Key's Light", properties={"energy": 3.0})
+            ]
+        )
+
+    def test_export_uses_data_api(self):
+        """Test that the exported script avoids bpy.ops operators"""
+        result = self.scene_manager._export_to_blender(self.scene)
+        script = result["script"]
+
+        self.assertNotIn("bpy.ops", script)
+        self.assertEqual(script.count("_primitive_mesh('cube', 1.0)"), 3)
+        self.assertIn("\"Key's Light\"", script)
+        self.assertEqual(result["object_count"], 4)
+        compile(script, "export", "exec")
+
+    def test_unchanged_objects_reuse_cached_fragments(self):
+        """Test that only changed objects are regenerated"""
+        first = self.scene_manager._export_to_blender(self.scene)
+        self.assertEqual(first["cache"], {"hits": 0, "misses": 4})
+
+        self.scene.objects[1].position = [5, 5, 5]
+        second = self.scene_manager._export_to_blender(self.scene)
+        self.assertEqual(second["cache"], {"hits": 3, "misses": 1})
+        self.assertIn("(5, 5, 5)", second["script"])
+
+        # Removed objects are dropped from the cache
+        self.scene.objects.pop()
+        self.scene_manager._export_to_blender(self.scene)
+        self.assertNotIn("light-1", self.scene_manager._blender_fragments["scene-1"])
+
+if __name__ == "__main__":
+    unittest.main()
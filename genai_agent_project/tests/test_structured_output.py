@@ -0,0 +1,183 @@
+"""
+Tests for schema-constrained LLM output and streaming validation
+"""
+
+import unittest
+import asyncio
+import json
+import logging
+import os
+import sys
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.services.structured_output import (
+    SCENE_SCHEMA, TASK_CLASSIFICATION_SCHEMA, JSONStreamValidator, StructuredOutputError,
+    execution_plan_schema, validate
+)
+from genai_agent.services.llm import LLMService
+from genai_agent.services.ollama_models import OllamaModelManager
+from genai_agent.core.task_manager import TaskManager
+from genai_agent.tools.registry import Tool, ToolRegistry
+from tests.fake_ollama import FakeOllamaServer
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+TOOLS = [
+    {"name": "scene_generator", "description": "Generates scenes",
+     "parameters": {"type": "object", "properties": {"description": {"type": "string"}},
+                    "required": ["description"]}},
+    {"name": "blender_script", "description": "Runs scripts",
+     "parameters": {"type": "object", "properties": {"script": {"type": "string"}}, "required": ["script"]}}
+]
+
+class TestValidate(unittest.TestCase):
+    """Test cases for schema validation"""
+
+    def test_valid_classification(self):
+        """Test that a matching value has no errors"""
+        task = {"task_type": "scene_generation", "description": "A room", "parameters": {}}
+        self.assertEqual(validate(task, TASK_CLASSIFICATION_SCHEMA), [])
+
+    def test_errors(self):
+        """Test that missing keys, wrong types and values outside an enum are reported"""
+        errors = validate({"task_type": "dance", "description": 3}, TASK_CLASSIFICATION_SCHEMA)
+        self.assertEqual(len(errors), 3)
+        self.assertIn("$: missing 'parameters'", errors)
+
+    def test_boolean_is_not_a_number(self):
+        """Test that booleans do not pass as numbers"""
+        self.assertTrue(validate([True, 0, 0], {"type": "array", "items": {"type": "number"}}))
+        self.assertEqual(validate([1, 2.5, 0], {"type": "array", "items": {"type": "number"}}), [])
+
+    def test_plan_schema_matches_step_to_its_tool(self):
+        """Test that each step's parameters are checked against its tool's schema"""
+        schema = execution_plan_schema(TOOLS)
+        good = {"steps": [{"tool_name": "blender_script", "parameters": {"script": "x"}, "description": "d"}]}
+        wrong_parameters = {"steps": [{"tool_name": "blender_script", "parameters": {"description": "x"},
+                                       "description": "d"}]}
+        unknown_tool = {"steps": [{"tool_name": "shell", "parameters": {}, "description": "d"}]}
+
+        self.assertEqual(validate(good, schema), [])
+        self.assertTrue(validate(wrong_parameters, schema))
+        self.assertTrue(validate(unknown_tool, schema))
+        self.assertTrue(validate(good, execution_plan_schema([])))
+
+class TestJSONStreamValidator(unittest.TestCase):
+    """Test cases for JSONStreamValidator"""
+
+    def test_completes_at_closing_bracket(self):
+        """Test that the value is complete at its closing bracket, with brackets in strings ignored"""
+        validator = JSONStreamValidator({"type": "object", "required": ["a"]})
+        chunks = ['  {"a": "}', '{]\\"', '", "b": [1', ', 2]}', ' trailing text {']
+        done = [validator.feed(chunk) for chunk in chunks]
+
+        self.assertEqual(done, [False, False, False, True, True])
+        self.assertEqual(validator.result(), {"a": '}{]"', "b": [1, 2]})
+
+    def test_rejects_prose_immediately(self):
+        """Test that a response that does not start with the expected value fails on its first chunk"""
+        validator = JSONStreamValidator({"type": "object"})
+        with self.assertRaises(StructuredOutputError):
+            validator.feed("Sure! Here")
+        with self.assertRaises(StructuredOutputError):
+            JSONStreamValidator({"type": "object"}).feed("[1]")
+        with self.assertRaises(StructuredOutputError):
+            JSONStreamValidator({"type": "object"}).feed('{"a": [1}')
+
+    def test_truncated_and_mismatched_values(self):
+        """Test that incomplete values and values that break the schema are rejected"""
+        validator = JSONStreamValidator({"type": "object"})
+        validator.feed('{"a": 1')
+        with self.assertRaises(StructuredOutputError):
+            validator.result()
+
+        validator = JSONStreamValidator(SCENE_SCHEMA)
+        validator.feed('{"name": "x", "description": "y", "objects": []}')
+        with self.assertRaisesRegex(StructuredOutputError, "at least 1 items"):
+            validator.result()
+
+class TestStructuredGeneration(unittest.TestCase):
+    """Test cases for structured generation against a fake Ollama server"""
+
+    def setUp(self):
+        self.replies = {}
+        self.server = FakeOllamaServer(reply=self.reply, chunk_size=5).start()
+        self.service = LLMService()
+        self.service.initialized = True
+        self.service.config = dict(self.service.config, provider="ollama", model="llama3")
+        self.service.ollama = OllamaModelManager(self.server.base_url, {})
+
+    def tearDown(self):
+        self.server.stop()
+
+    def reply(self, body):
+        schema = body.get("format")
+        if schema == TASK_CLASSIFICATION_SCHEMA:
+            return self.replies.get("classification", "")
+        if schema and "steps" in schema.get("properties", {}):
+            return self.replies.get("plan", "")
+        return self.replies.get("default", "")
+
+    def test_schema_is_sent_as_format(self):
+        """Test that the schema is sent as Ollama's format and the streamed value is returned"""
+        self.replies["default"] = '{"value": [1, 2, 3]}\n\nextra'
+        schema = {"type": "object", "properties": {"value": {"type": "array"}}, "required": ["value"]}
+
+        value = asyncio.run(self.service.generate_structured("Give numbers", schema))
+
+        self.assertEqual(value, {"value": [1, 2, 3]})
+        request = self.server.requests[-1]
+        self.assertEqual(request["format"], schema)
+        self.assertTrue(request["stream"])
+
+    def test_invalid_value_returns_none(self):
+        """Test that a value that breaks the schema is rejected without a retry"""
+        self.replies["default"] = '{"other": 1}'
+        value = asyncio.run(self.service.generate_structured("x", {"type": "object", "required": ["value"]}))
+
+        self.assertIsNone(value)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_classify_task(self):
+        """Test that instructions are classified with the classification schema"""
+        task = {"task_type": "scene_generation", "description": "A forest", "parameters": {"style": "cartoon"}}
+        self.replies["classification"] = json.dumps(task)
+
+        self.assertEqual(asyncio.run(self.service.classify_task("Make a cartoon forest")), task)
+        self.assertIn("Make a cartoon forest", self.server.requests[-1]["prompt"])
+
+    def test_task_manager_plan(self):
+        """Test that TaskManager plans are constrained to the registered tools"""
+        registry = ToolRegistry()
+        for info in TOOLS:
+            registry.register_tool(Tool(info["name"], info["description"], info["parameters"]))
+        steps = [
+            {"tool_name": "scene_generator", "parameters": {"description": "forest"}, "description": "Scene"},
+            {"tool_name": "blender_script", "parameters": {"script": "render()"}, "description": "Render"}
+        ]
+        self.replies["plan"] = json.dumps({"steps": steps})
+        manager = TaskManager(self.service, registry, None)
+
+        plan = asyncio.run(manager.plan_execution("Render a forest"))
+
+        self.assertEqual([(task.tool_name, task.parameters) for task in plan.tasks],
+                         [("scene_generator", {"description": "forest"}), ("blender_script", {"script": "render()"})])
+        self.assertEqual(self.server.requests[-1]["format"], execution_plan_schema(registry.get_tool_info()))
+
+    def test_task_manager_fallback(self):
+        """Test that TaskManager falls back to a single step when no valid plan is returned"""
+        registry = ToolRegistry()
+        registry.register_tool(Tool("scene_generator", "Generates scenes"))
+        self.replies["plan"] = "I can't do that"
+        manager = TaskManager(self.service, registry, None)
+
+        plan = asyncio.run(manager.plan_execution("Render a forest"))
+
+        self.assertEqual([(task.tool_name, task.parameters) for task in plan.tasks],
+                         [("scene_generator", {"instruction": "Render a forest"})])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Tests for the SVG shape fingerprints used to instance repeated shapes
+"""
+
+import unittest
+import os
+import sys
+import importlib.util
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# svg_utils has no Blender dependencies, but its package does
+SVG_UTILS_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', 'genai_agent', 'svg_to_video', 'svg_to_3d', 'svg_utils.py'
+))
+spec = importlib.util.spec_from_file_location("svg_utils", SVG_UTILS_PATH)
+svg_utils = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(svg_utils)
+
+STYLE = {'fill': '#4285F4', 'stroke': '#000000'}
+
+class TestShapeFingerprint(unittest.TestCase):
+    """Test cases for shape_fingerprint"""
+
+    def test_translated_shapes_share_fingerprint(self):
+        """Test that position does not affect the fingerprint"""
+        first, first_anchor = svg_utils.shape_fingerprint(
+            {'type': 'rect', 'x': 10, 'y': 20, 'width': 40, 'height': 30, 'rx': 0, 'ry': 0, 'style': STYLE})
+        second, second_anchor = svg_utils.shape_fingerprint(
+            {'type': 'rect', 'x': 110, 'y': 220, 'width': 40, 'height': 30, 'rx': 0, 'ry': 0, 'style': dict(STYLE)})
+
+        self.assertEqual(first, second)
+        self.assertEqual(first_anchor, (10, 20))
+        self.assertEqual(second_anchor, (110, 220))
+
+    def test_polygon_points_are_normalized(self):
+        """Test that polygons are compared relative to their first point"""
+        arrow = [(0, 10), (5, 0), (10, 10)]
+        first, _ = svg_utils.shape_fingerprint({'type': 'polygon', 'points': arrow, 'style': STYLE})
+        second, anchor = svg_utils.shape_fingerprint(
+            {'type': 'polygon', 'points': [(x + 50.00001, y - 7) for x, y in arrow], 'style': STYLE})
+
+        self.assertEqual(first, second)
+        self.assertEqual(anchor, (50.00001, 3))
+
+    def test_geometry_and_style_differences(self):
+        """Test that different sizes or styles do not share a fingerprint"""
+        circle = {'type': 'circle', 'cx': 0, 'cy': 0, 'r': 15, 'style': STYLE}
+        bigger = dict(circle, r=16)
+        recolored = dict(circle, style={'fill': '#EA4335', 'stroke': '#000000'})
+
+        key, _ = svg_utils.shape_fingerprint(circle)
+        self.assertNotEqual(key, svg_utils.shape_fingerprint(bigger)[0])
+        self.assertNotEqual(key, svg_utils.shape_fingerprint(recolored)[0])
+
+    def test_unsupported_elements(self):
+        """Test that elements which are not instanced have no fingerprint"""
+        self.assertEqual(svg_utils.shape_fingerprint({'type': 'text', 'x': 0, 'y': 0, 'text': 'A'}), (None, None))
+        self.assertEqual(svg_utils.shape_fingerprint({'type': 'rect', 'x': 0}), (None, None))
+
+if __name__ == "__main__":
+    unittest.main()
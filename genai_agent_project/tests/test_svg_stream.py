@@ -0,0 +1,153 @@
+"""
+Tests for streamed SVG generation with incremental validation
+"""
+
+import unittest
+import asyncio
+import logging
+import os
+import sys
+import threading
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from genai_agent.svg_to_video.svg_generator.svg_stream import SVGStreamValidator, MalformedSVGError
+from genai_agent.svg_to_video.llm_integrations.llm_factory import LLMFactory
+from genai_agent.svg_to_video.llm_integrations.claude_direct import ClaudeDirectSVGGenerator
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 800 600"><g><text x="1">A &amp; B</text></g></svg>'
+RESPONSE = f'Here is the diagram:\n```xml\n<?xml version="1.0"?>\n{SVG}\n```\nThe diagram shows two boxes.'
+
+def chunks(text, size=5):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+class TestSVGStreamValidator(unittest.TestCase):
+    """Test cases for SVGStreamValidator"""
+
+    def test_completes_at_closing_tag(self):
+        """Test that preamble is skipped and completion is reported at </svg>, whatever the chunking"""
+        for size in (1, 3, 16, len(RESPONSE)):
+            validator = SVGStreamValidator()
+            fed = 0
+            for chunk in chunks(RESPONSE, size):
+                fed += len(chunk)
+                if validator.feed(chunk):
+                    break
+            self.assertEqual(validator.close(), SVG)
+            self.assertLess(fed, RESPONSE.index(SVG) + len(SVG) + size)
+
+    def test_malformed_markup_fails_early(self):
+        """Test that a mismatched tag raises at the chunk where it appears"""
+        validator = SVGStreamValidator()
+        validator.feed('<svg><g><rect/>')
+        with self.assertRaises(MalformedSVGError):
+            validator.feed('</svg>')
+
+    def test_incomplete_response(self):
+        """Test that responses without a complete SVG are rejected on close"""
+        validator = SVGStreamValidator()
+        validator.feed("I cannot draw that.")
+        with self.assertRaises(MalformedSVGError):
+            validator.close()
+
+        validator = SVGStreamValidator()
+        validator.feed("<svg><rect/>")
+        with self.assertRaises(MalformedSVGError):
+            validator.close()
+
+class FakeClaudeDirect:
+    """Streams canned responses and records how much of each was consumed"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.consumed = []
+        self.closed = 0
+
+    def _create_svg_prompt(self, concept, style=None):
+        return f"Draw {concept}"
+
+    async def stream_text_async(self, prompt, temperature, max_tokens):
+        response = self.responses.pop(0)
+        self.consumed.append(0)
+        try:
+            for chunk in chunks(response):
+                self.consumed[-1] += len(chunk)
+                yield chunk
+        finally:
+            self.closed += 1
+
+class TestLLMFactoryStreaming(unittest.TestCase):
+    """Test cases for LLMFactory.generate_svg streaming"""
+
+    def create_factory(self, *responses):
+        factory = LLMFactory(use_redis_service=False, use_langchain=False, use_direct_claude=False)
+        factory.claude_direct = FakeClaudeDirect(*responses)
+        factory.providers["claude-direct"] = {"name": "Claude Direct", "available": True, "integration_type": "direct"}
+        return factory
+
+    def test_stream_stops_at_closing_tag(self):
+        """Test that the stream is closed once the SVG is complete and timings are recorded"""
+        factory = self.create_factory(RESPONSE)
+
+        svg = asyncio.run(factory.generate_svg("claude-direct", "boxes", mode="svg"))
+
+        self.assertEqual(svg, SVG)
+        self.assertLess(factory.claude_direct.consumed[0], len(RESPONSE))
+        self.assertEqual(factory.claude_direct.closed, 1)
+
+        timings = factory.get_svg_timings()["claude-direct"]
+        self.assertEqual(timings["count"], 1)
+        self.assertEqual(timings["failures"], 0)
+        self.assertIsNotNone(timings["mean_seconds"])
+
+    def test_malformed_stream_is_aborted(self):
+        """Test that a malformed response is aborted before it ends"""
+        malformed = "<svg><g></rect>" + "<rect/>" * 200 + "</g></svg>"
+        factory = self.create_factory(malformed)
+
+        with self.assertRaises(MalformedSVGError):
+            asyncio.run(factory.generate_svg("claude-direct", "boxes", mode="svg"))
+
+        self.assertLess(factory.claude_direct.consumed[0], 30)
+        self.assertEqual(factory.get_svg_timings()["claude-direct"]["failures"], 1)
+
+class TestClaudeDirectStreaming(unittest.TestCase):
+    """Test cases for ClaudeDirectSVGGenerator.stream_text_async"""
+
+    def test_consumer_stopping_closes_stream(self):
+        """Test that the worker thread stops reading once the consumer stops"""
+        claude = ClaudeDirectSVGGenerator(api_key="test-key-0123456789")
+        closed = threading.Event()
+        release = threading.Event()
+
+        def stream_text(prompt, temperature, max_tokens):
+            try:
+                for i in range(1000):
+                    if i == 3:
+                        release.wait(5)
+                    yield f"<{i}>"
+            finally:
+                closed.set()
+
+        claude.stream_text = stream_text
+
+        async def run():
+            received = []
+            stream = claude.stream_text_async("prompt")
+            async for text in stream:
+                received.append(text)
+                if len(received) == 2:
+                    break
+            await stream.aclose()
+            release.set()
+            return received
+
+        self.assertEqual(asyncio.run(run()), ["<0>", "<1>"])
+        self.assertTrue(closed.wait(5))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Tests for glyph-cached SVG text labels
+"""
+
+import unittest
+import os
+import sys
+import logging
+import importlib.util
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# The converter only runs inside Blender
+HAS_BPY = importlib.util.find_spec("bpy") is not None
+
+if HAS_BPY:
+    import bpy
+    from genai_agent.svg_to_video.svg_to_3d.svg_converter import SVGTo3DConverter
+    from genai_agent.svg_to_video.svg_to_3d.enhanced_converter import EnhancedSVGTo3DConverter
+    from genai_agent.svg_to_video.svg_to_3d.enhanced_materials import EnhancedSVGMaterialHandler
+    from genai_agent.svg_to_video.svg_to_3d.svg_converter_materials_fixed import SVGMaterialHandler
+
+# Disable logging during tests
+logging.disable(logging.CRITICAL)
+
+ELEMENT = {'type': 'text', 'x': 40, 'y': 60, 'text': 'Node 1',
+           'style': {'fill': '#336699', 'font-size': '14', 'font-family': 'Arial'}}
+
+def make_converter(converter_class, **attributes):
+    """Create a converter for text elements only, without parsing an SVG file"""
+    converter = converter_class.__new__(converter_class)
+    converter.extrude_depth = 0.1
+    converter.scale_factor = 0.01
+    converter.width = 200
+    converter.height = 100
+    converter.debug = False
+    converter.cache_glyphs = False
+    converter.glyph_cache = {}
+    converter.label_meshes = {}
+    for name, value in attributes.items():
+        setattr(converter, name, value)
+    return converter
+
+@unittest.skipIf(not HAS_BPY, "Text conversion needs Blender")
+class TestCachedText(unittest.TestCase):
+    """Test cases for labels built from the glyph cache"""
+
+    def assert_same_text(self, converter):
+        uncached = converter.create_3d_text(ELEMENT)
+        converter.cache_glyphs = True
+        cached = converter.create_3d_text(ELEMENT)
+        bpy.context.view_layer.update()
+
+        # The text curve ends up with the geometry the glyphs are built with
+        for setting, value in converter.get_text_geometry().items():
+            self.assertAlmostEqual(getattr(uncached.data, setting), value, places=6)
+
+        self.assertIsNotNone(cached)
+        self.assertIs(cached.active_material, uncached.active_material)
+        for cached_size, uncached_size in zip(cached.dimensions, uncached.dimensions):
+            self.assertAlmostEqual(cached_size, uncached_size, places=4)
+
+    def test_enhanced_materials(self):
+        """Test that cached and uncached text share geometry and material with the enhanced handler"""
+        self.assert_same_text(make_converter(
+            EnhancedSVGTo3DConverter, style_preset='technical', use_enhanced_features=True,
+            material_handler=EnhancedSVGMaterialHandler()))
+
+    def test_basic_materials(self):
+        """Test that cached and uncached text share geometry and material with the basic handler"""
+        self.assert_same_text(make_converter(
+            EnhancedSVGTo3DConverter, style_preset='technical', use_enhanced_features=False,
+            material_handler=SVGMaterialHandler()))
+
+    def test_base_converter(self):
+        """Test that cached and uncached text share geometry and material with the base converter"""
+        self.assert_same_text(make_converter(SVGTo3DConverter))
+
+if __name__ == '__main__':
+    unittest.main()
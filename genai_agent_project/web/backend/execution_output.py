@@ -0,0 +1,383 @@
+"""
+Bounded, streaming output handling for long-running script executions
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def remove_log(log_path: str) -> bool:
+    """
+    Delete an execution log file
+
+    Args:
+        log_path: Log file
+
+    Returns:
+        True if the file was deleted
+    """
+    try:
+        os.remove(log_path)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        logger.warning(f"Could not delete execution log {log_path}: {str(e)}")
+        return False
+
+class ExecutionOutput:
+    """
+    Output of a single script execution
+
+    Keeps the most recent lines in a bounded ring buffer, appends every line
+    to a log file on disk, and coalesces lines into batches that are
+    delivered at most once per flush interval instead of once per line.
+    """
+
+    def __init__(self, execution_id: str, log_path: Optional[str] = None,
+                 max_lines: int = 1000, flush_interval: float = 0.1,
+                 on_flush: Optional[Callable[[str, List[str]], Awaitable[None]]] = None):
+        """
+        Initialize execution output
+
+        Args:
+            execution_id: Execution identifier
+            log_path: File that receives the full output (optional)
+            max_lines: Number of recent lines kept in memory
+            flush_interval: Seconds between batched deliveries
+            on_flush: Coroutine called with (execution_id, lines) per batch
+        """
+        self.execution_id = execution_id
+        self.log_path = log_path
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+
+        self.lines = deque(maxlen=max_lines)
+        self.total_lines = 0
+
+        self._pending: List[str] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._log_file = None
+
+        if log_path:
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            self._log_file = open(log_path, 'a', encoding='utf-8')
+
+    @property
+    def truncated(self) -> bool:
+        """Whether older lines have been dropped from the in-memory buffer"""
+        return self.total_lines > len(self.lines)
+
+    def append(self, line: str):
+        """
+        Record an output line
+
+        Args:
+            line: Output line (including its newline)
+        """
+        self.lines.append(line)
+        self.total_lines += 1
+
+        if self._log_file:
+            self._log_file.write(line)
+
+        if self.on_flush:
+            self._pending.append(line)
+            if self._flusher is None or self._flusher.done():
+                self._flusher = asyncio.ensure_future(self._flush_later())
+
+    def text(self) -> str:
+        """
+        Get the buffered output
+
+        Returns:
+            The most recent lines joined into one string
+        """
+        return "".join(self.lines)
+
+    async def _flush_later(self):
+        """Deliver pending lines after the flush interval"""
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self):
+        """Deliver pending lines now"""
+        if self._log_file:
+            self._log_file.flush()
+
+        if not self._pending or not self.on_flush:
+            return
+
+        batch, self._pending = self._pending, []
+        try:
+            await self.on_flush(self.execution_id, batch)
+        except Exception as e:
+            logger.error(f"Error delivering output for execution {self.execution_id}: {str(e)}")
+
+    async def close(self):
+        """Deliver remaining lines and close the log file"""
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+        await self.flush()
+
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+
+class ExecutionRegistry:
+    """
+    Registry of script executions with time-based expiry
+
+    Finished executions are removed, along with their log files, once they
+    are older than the TTL so neither grows without bound.
+    """
+
+    def __init__(self, ttl: float = 3600.0):
+        """
+        Initialize the registry
+
+        Args:
+            ttl: Seconds a finished execution is kept
+        """
+        self.ttl = ttl
+        self.executions: Dict[str, Dict[str, Any]] = {}
+
+    def __contains__(self, execution_id: str) -> bool:
+        self.prune()
+        return execution_id in self.executions
+
+    def __getitem__(self, execution_id: str) -> Dict[str, Any]:
+        return self.executions[execution_id]
+
+    def __setitem__(self, execution_id: str, execution: Dict[str, Any]):
+        execution.setdefault("created", time.time())
+        execution.setdefault("finished", None)
+        self.executions[execution_id] = execution
+
+    def get(self, execution_id: str, default=None):
+        return self.executions.get(execution_id, default)
+
+    def finish(self, execution_id: str, status: str, message: str):
+        """
+        Mark an execution as finished
+
+        Args:
+            execution_id: Execution identifier
+            status: Final status
+            message: Final message
+        """
+        execution = self.executions.get(execution_id)
+        if execution is not None:
+            execution["status"] = status
+            execution["message"] = message
+            execution["finished"] = time.time()
+
+    def prune(self) -> int:
+        """
+        Remove finished executions older than the TTL and their log files
+
+        Returns:
+            Number of executions removed
+        """
+        cutoff = time.time() - self.ttl
+        expired = [
+            execution_id for execution_id, execution in self.executions.items()
+            if execution.get("finished") and execution["finished"] < cutoff
+        ]
+        for execution_id in expired:
+            log_path = self.executions.pop(execution_id).get("log_path")
+            if log_path:
+                remove_log(log_path)
+        return len(expired)
+
+class ExecutionStore:
+    """
+    Script executions visible to every backend worker
+
+    Each execution is a JSON record (status, message, timestamps, output
+    line count, log file) plus a list of its most recent output lines.
+    With Redis (SharedState.redis) both live under shared keys, so any
+    worker can answer status and output requests; finished executions
+    expire after the TTL. Unfinished ones expire after the maximum runtime,
+    refreshed on every write, so the keys of an execution whose worker died
+    do not stay forever. Without Redis an in-process ExecutionRegistry is
+    used. Only the worker running an execution writes to it.
+    """
+
+    KEY_PREFIX = "genai:execution:"
+
+    def __init__(self, state, ttl: float = 3600.0, max_lines: int = 1000,
+                 max_runtime: float = 6 * 3600.0):
+        """
+        Initialize the store
+
+        Args:
+            state: SharedState providing the Redis client (None or no client: in process)
+            ttl: Seconds a finished execution is kept
+            max_lines: Number of recent output lines kept per execution
+            max_runtime: Seconds an unfinished execution is kept after its last update
+        """
+        self.state = state
+        self.ttl = ttl
+        self.max_runtime = max_runtime
+        self.max_lines = max_lines
+        self.local = ExecutionRegistry(ttl=ttl)
+
+    @property
+    def redis(self):
+        return getattr(self.state, "redis", None)
+
+    def _key(self, execution_id: str) -> str:
+        return f"{self.KEY_PREFIX}{execution_id}"
+
+    async def _save(self, execution_id: str, record: Dict[str, Any]):
+        key = self._key(execution_id)
+        ttl = self.ttl if record.get("finished") else max(self.ttl, self.max_runtime)
+        ttl = max(int(ttl), 1)
+        async with self.redis.pipeline() as pipe:
+            pipe.setex(key, ttl, json.dumps(record))
+            pipe.expire(f"{key}:output", ttl)
+            await pipe.execute()
+
+    async def create(self, execution_id: str, status: str, message: str, **fields):
+        """
+        Add an execution
+
+        Args:
+            execution_id: Execution identifier
+            status: Initial status
+            message: Initial message
+            **fields: Additional JSON-serializable fields (e.g. log_path)
+        """
+        record = {"status": status, "message": message, "total_lines": 0,
+                  "created": time.time(), "finished": None, **fields}
+        if self.redis is None:
+            self.local.prune()
+            self.local[execution_id] = {**record, "lines": deque(maxlen=self.max_lines)}
+            return
+        await self._save(execution_id, record)
+
+    async def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an execution
+
+        Args:
+            execution_id: Execution identifier
+
+        Returns:
+            The execution record, or None if it does not exist or has expired
+        """
+        if self.redis is None:
+            if execution_id not in self.local:
+                return None
+            return {key: value for key, value in self.local[execution_id].items() if key != "lines"}
+        data = await self.redis.get(self._key(execution_id))
+        return json.loads(data) if data else None
+
+    async def update(self, execution_id: str, **fields):
+        """
+        Update fields of an execution
+
+        Args:
+            execution_id: Execution identifier
+            **fields: Fields to set
+        """
+        if self.redis is None:
+            execution = self.local.get(execution_id)
+            if execution is not None:
+                execution.update(fields)
+            return
+        record = await self.get(execution_id)
+        if record is not None:
+            record.update(fields)
+            await self._save(execution_id, record)
+
+    async def finish(self, execution_id: str, status: str, message: str):
+        """
+        Mark an execution as finished; it expires after the TTL
+
+        Args:
+            execution_id: Execution identifier
+            status: Final status
+            message: Final message
+        """
+        await self.update(execution_id, status=status, message=message, finished=time.time())
+
+    async def append_output(self, execution_id: str, lines: List[str]):
+        """
+        Record a batch of output lines
+
+        Args:
+            execution_id: Execution identifier
+            lines: Output lines
+        """
+        if not lines:
+            return
+        if self.redis is None:
+            execution = self.local.get(execution_id)
+            if execution is not None:
+                execution["lines"].extend(lines)
+                execution["total_lines"] += len(lines)
+            return
+        key = f"{self._key(execution_id)}:output"
+        async with self.redis.pipeline() as pipe:
+            pipe.rpush(key, *lines)
+            pipe.ltrim(key, -self.max_lines, -1)
+            await pipe.execute()
+        record = await self.get(execution_id)
+        if record is not None:
+            record["total_lines"] = record.get("total_lines", 0) + len(lines)
+            await self._save(execution_id, record)
+
+    async def prune_logs(self, log_dir: str) -> int:
+        """
+        Delete the log files of expired executions
+
+        Log files are named after their execution. A file is deleted once it
+        has not been written for the TTL and its execution has expired, which
+        also covers executions of dead workers and of earlier runs.
+
+        Args:
+            log_dir: Directory of the execution log files
+
+        Returns:
+            Number of log files deleted
+        """
+        if not os.path.isdir(log_dir):
+            return 0
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for entry in os.scandir(log_dir):
+            if not entry.is_file() or not entry.name.endswith(".log"):
+                continue
+            try:
+                if entry.stat().st_mtime >= cutoff:
+                    continue
+            except OSError:
+                continue
+            if await self.get(entry.name[:-len(".log")]) is not None:
+                continue
+            if remove_log(entry.path):
+                removed += 1
+        return removed
+
+    async def output(self, execution_id: str) -> str:
+        """
+        Get the most recent output of an execution
+
+        Args:
+            execution_id: Execution identifier
+
+        Returns:
+            The most recent lines joined into one string
+        """
+        if self.redis is None:
+            execution = self.local.get(execution_id)
+            return "".join(execution["lines"]) if execution else ""
+        return "".join(await self.redis.lrange(f"{self._key(execution_id)}:output", 0, -1))
@@ -0,0 +1,109 @@
+"""
+Routers registered by name and imported on first use
+
+The optional route modules import heavy dependencies (LLM integrations,
+provider SDKs, the svg_to_video package), which dominated backend startup.
+They are registered with the path prefixes they serve and only imported and
+included in the app when the first request for one of those prefixes, or
+for the OpenAPI schema, arrives.
+"""
+
+import logging
+import importlib
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+class LazyRouters:
+    """Optional routers of an app, included on first request"""
+
+    def __init__(self, app):
+        """
+        Initialize lazy routers
+
+        Args:
+            app: FastAPI application the routers are included in
+        """
+        self.app = app
+        self.routers: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        self.loaded: Dict[str, bool] = {}
+
+    def register(self, name: str, module_path: str, prefixes: Tuple[str, ...]):
+        """
+        Register a router without importing its module
+
+        Routers sharing a prefix are included in registration order, so the
+        first registered router wins when two declare the same route.
+
+        Args:
+            name: Router name (for logging)
+            module_path: Module defining `router`
+            prefixes: Path prefixes served by the router
+        """
+        self.routers[name] = (module_path, prefixes)
+
+    def load(self, name: str) -> bool:
+        """
+        Import a router and include it in the app (once)
+
+        Args:
+            name: Router name
+
+        Returns:
+            True if the router is included
+        """
+        if name in self.loaded:
+            return self.loaded[name]
+
+        module_path, _ = self.routers[name]
+        try:
+            module = importlib.import_module(module_path)
+            self.app.include_router(module.router)
+            # Regenerate the OpenAPI schema with the new routes
+            self.app.openapi_schema = None
+            self.loaded[name] = True
+            logger.info(f"{name} routes loaded")
+        except ImportError as e:
+            logger.warning(f"{name} routes not loaded: {e}")
+            self.loaded[name] = False
+        return self.loaded[name]
+
+    def load_for_path(self, path: str) -> List[str]:
+        """
+        Include every router serving a path
+
+        Args:
+            path: Request path
+
+        Returns:
+            Names of the routers included by this call
+        """
+        loaded = []
+        for name, (_, prefixes) in self.routers.items():
+            if name in self.loaded:
+                continue
+            if any(path == prefix or path.startswith(prefix + "/") for prefix in prefixes):
+                if self.load(name):
+                    loaded.append(name)
+        return loaded
+
+    def load_all(self):
+        """Include every registered router"""
+        for name in self.routers:
+            self.load(name)
+
+class LazyRouterMiddleware:
+    """ASGI middleware including lazy routers before their first request"""
+
+    def __init__(self, app, routers: LazyRouters):
+        self.app = app
+        self.routers = routers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            if path == self.routers.app.openapi_url:
+                self.routers.load_all()
+            else:
+                self.routers.load_for_path(path)
+        await self.app(scope, receive, send)
@@ -23,61 +23,26 @@ if project_root not in sys.path:
     sys.path.append(project_root)
     logger.info(f"Added project root to Python path: {project_root}")
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException, status, File, UploadFile, Form, Body
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException, status, File, UploadFile, Form, Body, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
 # Import routes
 from genai_agent.services.llm_api_routes import add_llm_routes
 from genai_agent.services.settings_api import add_settings_routes
-try:
-    from routes.blender_routes import router as blender_routes_router
-    logger.info("Blender routes loaded")
-except ImportError as e:
-    logger.warning(f"Blender routes not loaded: {e}")
-    blender_routes_router = None
-
-try:
-    from routes.blender_integration_routes import router as blender_integration_router
-    logger.info("Blender integration routes loaded")
-except ImportError as e:
-    logger.warning(f"Blender integration routes not loaded: {e}")
-    blender_integration_router = None
-
-try:
-    from routes.debug_routes import router as debug_router
-except ImportError as e:
-    logger.warning(f"Debug routes not loaded: {e}")
-    debug_router = None
-
-try:
-    from routes.svg_generator_routes import router as svg_generator_router
-    logger.info("SVG Generator routes loaded")
-except ImportError as e:
-    logger.warning(f"SVG Generator routes not loaded: {e}")
-    svg_generator_router = None
-
-# Import the new SVG to 3D routes
-try:
-    from routes.svg_to_3d_routes import router as svg_to_3d_router
-    logger.info("SVG to 3D routes loaded")
-except ImportError as e:
-    logger.warning(f"SVG to 3D routes not loaded: {e}")
-    svg_to_3d_router = None
-
-# Import the new SVG import routes
-try:
-    from routes.svg_import_routes import router as svg_import_router
-    logger.info("SVG import routes loaded")
-except ImportError as e:
-    logger.warning(f"SVG import routes not loaded: {e}")
-    svg_import_router = None
-
-# Import GenAI Agent 3D components
-from genai_agent.agent import GenAIAgent
+# Import GenAI Agent 3D components (the agent itself is imported when
+# services are initialized)
 from genai_agent.services.redis_bus import RedisMessageBus
+from genai_agent.services.asset_manager import AssetManager
+from genai_agent.services.content_store import ContentStore, iter_upload
+try:
+    from web.backend.shared_state import get_shared_state
+    from web.backend.lazy_routes import LazyRouters, LazyRouterMiddleware
+except ImportError:
+    from shared_state import get_shared_state
+    from lazy_routes import LazyRouters, LazyRouterMiddleware
 
 # Create FastAPI app
 app = FastAPI(
@@ -124,26 +89,30 @@ else:
     else:
         logger.warning("No valid output directory found to mount for static file serving")
 
-# Include routers
-if blender_routes_router:
-    app.include_router(blender_routes_router)
-
-if blender_integration_router:
-    app.include_router(blender_integration_router)
+# In-memory catalog of output files for the listing and result endpoints
+from output_catalog import OutputCatalog, OUTPUT_CATEGORIES
 
-if debug_router:
-    app.include_router(debug_router)
-    
-if svg_generator_router:
-    app.include_router(svg_generator_router)
-
-# Include the new SVG to 3D routes
-if svg_to_3d_router:
-    app.include_router(svg_to_3d_router)
+catalog_reconcile = os.environ.get("OUTPUT_CATALOG_RECONCILE_SECONDS")
+catalog_reconcile = float(catalog_reconcile) if catalog_reconcile else None
+default_output_dir = os.path.join(parent_dir, "output")
+output_catalog = OutputCatalog(default_output_dir, OUTPUT_CATEGORIES, reconcile_interval=catalog_reconcile)
 
-# Include the new SVG import routes
-if svg_import_router:
-    app.include_router(svg_import_router)
+# Result files are served from the configured output directory
+if output_dir and os.path.exists(output_dir) and os.path.abspath(output_dir) != os.path.abspath(default_output_dir):
+    results_catalog = OutputCatalog(output_dir, reconcile_interval=catalog_reconcile)
+else:
+    results_catalog = output_catalog
+
+# Optional routers are imported on their first request; routers sharing
+# a prefix keep this order, so the first one wins on duplicate routes
+lazy_routers = LazyRouters(app)
+lazy_routers.register("Blender", "routes.blender_routes", ("/blender",))
+lazy_routers.register("Blender integration", "routes.blender_integration_routes", ("/blender",))
+lazy_routers.register("Debug", "routes.debug_routes", ("/debug",))
+lazy_routers.register("SVG Generator", "routes.svg_generator_routes", ("/svg-generator",))
+lazy_routers.register("SVG to 3D", "routes.svg_to_3d_routes", ("/svg-generator",))
+lazy_routers.register("SVG import", "routes.svg_import_routes", ("/svg-generator",))
+app.add_middleware(LazyRouterMiddleware, routers=lazy_routers)
 
 # Define models
 class InstructionRequest(BaseModel):
@@ -162,13 +131,18 @@ class ConfigurationRequest(BaseModel):
 # Initialize agent and services based on configuration
 agent = None
 redis_bus = None
+asset_manager = None
+
+# Uploads are stored content-addressed; without an asset manager they go here
+upload_dir = os.path.join(parent_dir, "uploads")
+upload_store = None
 
 # Check if running in test mode
 TEST_MODE = os.environ.get("GENAI_TEST_MODE", "false").lower() == "true"
 
 async def initialize_services():
-    """Initialize services and agent"""
-    global agent, redis_bus, TEST_MODE
+    """Initialize services and agent once per worker, at startup"""
+    global agent, redis_bus, asset_manager, TEST_MODE
 
     try:
         if TEST_MODE:
@@ -237,12 +211,20 @@ async def initialize_services():
             with open(config_path, 'r') as f:
                 config = yaml.safe_load(f)
             
-            # Initialize Redis bus
+            # Share WebSocket fan-out and execution state with the other workers
             redis_config = config.get('redis', {})
+            await get_shared_state().connect(redis_config)
+            
+            # Initialize Redis bus
             redis_bus = RedisMessageBus(redis_config)
             await redis_bus.connect()
             
-            # Initialize agent
+            # Initialize asset manager for uploads
+            assets_dir = config.get('paths', {}).get('assets_dir') or os.path.join(upload_dir, "assets")
+            asset_manager = AssetManager(redis_bus, {'storage_path': assets_dir})
+            
+            # Initialize agent; its tools are imported on first use
+            from genai_agent.agent import GenAIAgent
             agent = GenAIAgent(config)
             
             logger.info("Services initialized successfully")
@@ -251,10 +233,11 @@ async def initialize_services():
         logger.error(f"Error initializing services: {str(e)}")
         return False
 
-# Connection manager for WebSockets
+# Connection manager for the WebSockets of this worker
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        get_shared_state().on_message("broadcast", self.send_local)
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
@@ -267,7 +250,11 @@ class ConnectionManager:
         await websocket.send_json(message)
     
     async def broadcast(self, message: Dict[str, Any]):
-        for connection in self.active_connections:
+        """Send a message to the WebSockets of every worker"""
+        await get_shared_state().publish("broadcast", "all", message)
+    
+    async def send_local(self, topic: str, message: Dict[str, Any]):
+        for connection in list(self.active_connections):
             await connection.send_json(message)
 
 manager = ConnectionManager()
@@ -283,9 +270,7 @@ async def get_status():
     global agent, redis_bus
     
     if not agent or not redis_bus:
-        initialized = await initialize_services()
-        if not initialized:
-            return {"status": "error", "message": "Failed to initialize services"}
+        return {"status": "error", "message": "Services not initialized"}
     
     try:
         # Get Redis status
@@ -313,9 +298,7 @@ async def process_instruction(request: InstructionRequest):
     global agent
     
     if not agent:
-        initialized = await initialize_services()
-        if not initialized:
-            return {"status": "error", "message": "Failed to initialize services"}
+        return {"status": "error", "message": "Services not initialized"}
     
     try:
         result = await agent.process_instruction(request.instruction, request.context)
@@ -330,9 +313,7 @@ async def execute_tool(request: ToolRequest):
     global agent
     
     if not agent:
-        initialized = await initialize_services()
-        if not initialized:
-            return {"status": "error", "message": "Failed to initialize services"}
+        return {"status": "error", "message": "Services not initialized"}
     
     try:
         result = await agent.tool_registry.execute_tool(request.tool_name, request.parameters)
@@ -347,9 +328,7 @@ async def get_tools():
     global agent
     
     if not agent:
-        initialized = await initialize_services()
-        if not initialized:
-            return {"status": "error", "message": "Failed to initialize services"}
+        return {"status": "error", "message": "Services not initialized"}
     
     try:
         tools = agent.tool_registry.get_tools()
@@ -409,206 +388,120 @@ async def update_config(request: ConfigurationRequest):
 @app.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
     """Upload a file for processing"""
+    global upload_store
+    
     try:
-        # Create upload directory if it doesn't exist
-        upload_dir = os.path.join(parent_dir, "uploads")
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Save file
-        file_path = os.path.join(upload_dir, file.filename)
-        with open(file_path, "wb") as f:
-            f.write(await file.read())
+        # Stream the upload into the asset store when available
+        if asset_manager:
+            asset_id = await asset_manager.store_asset_stream(iter_upload(file), file.filename)
+            if asset_id:
+                metadata = await asset_manager.get_asset_metadata(asset_id)
+                return {
+                    "status": "success",
+                    "message": "File uploaded successfully",
+                    "filename": file.filename,
+                    "path": await asset_manager.get_asset_path(asset_id),
+                    "asset_id": asset_id,
+                    "content_hash": metadata["content_hash"],
+                    "size": metadata["file_size"]
+                }
+            logger.warning(f"Asset manager could not store {file.filename}, storing upload without metadata")
+            await file.seek(0)
+        
+        if upload_store is None:
+            upload_store = ContentStore(upload_dir)
+        
+        # Store the file under its content hash without buffering it
+        extension = os.path.splitext(file.filename)[1].lower()[1:]
+        content = await upload_store.ingest(iter_upload(file), extension)
         
         return {
             "status": "success", 
             "message": "File uploaded successfully",
             "filename": file.filename,
-            "path": file_path
+            "path": content["path"],
+            "content_hash": content["content_hash"],
+            "size": content["size"],
+            "deduplicated": not content["created"]
         }
     except Exception as e:
         logger.error(f"Error uploading file: {str(e)}")
         return {"status": "error", "message": str(e)}
 
+def catalog_listing(category: str, key: str, page: int, page_size: Optional[int], if_none_match: Optional[str]):
+    """
+    Build a paginated category listing from the output catalog
+
+    Args:
+        category: Catalog category
+        key: Response key holding the entries
+        page: 1-based page number
+        page_size: Entries per page (None for all entries)
+        if_none_match: ETag sent by the client
+
+    Returns:
+        JSON response with an ETag, or 304 if the client's copy is current
+    """
+    etag = output_catalog.etag(category, page, page_size)
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    entries, total = output_catalog.list(category, page, page_size)
+    content = {key: entries, "total": total}
+    if page_size is not None:
+        content.update({"page": page, "page_size": page_size})
+    return JSONResponse(content=content, headers={"ETag": etag})
+
 @app.get("/models")
-async def get_models():
+async def get_models(page: int = Query(1, ge=1), page_size: Optional[int] = Query(None, ge=1, le=1000),
+                     if_none_match: Optional[str] = Header(None)):
     """Get available models - direct handler for frontend compatibility"""
     try:
-        # Define output directories
-        output_dir = os.path.join(parent_dir, "output")
-        models_dir = os.path.join(output_dir, "models")
-        
-        # Ensure the directory exists
-        os.makedirs(models_dir, exist_ok=True)
-        
-        # Look for .blend files in the models directory
-        models = []
-        for root, dirs, files in os.walk(models_dir):
-            for file in files:
-                if file.endswith('.blend') or file.endswith('.py'):
-                    model_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(model_path, output_dir)
-                    models.append({
-                        "id": os.path.splitext(file)[0],
-                        "name": file,
-                        "path": rel_path,
-                        "size": os.path.getsize(model_path),
-                        "modified": os.path.getmtime(model_path)
-                    })
-        
-        # For compatibility, return the same format as the frontend expects
-        return {"models": models}
+        return catalog_listing("models", "models", page, page_size, if_none_match)
     except Exception as e:
         logger.error(f"Error getting models: {str(e)}")
         return {"status": "error", "message": str(e), "models": []}
 
 @app.get("/diagrams")
-async def get_diagrams():
+async def get_diagrams(page: int = Query(1, ge=1), page_size: Optional[int] = Query(None, ge=1, le=1000),
+                       if_none_match: Optional[str] = Header(None)):
     """Get available diagrams - direct handler for frontend compatibility"""
     try:
-        # Define output directories
-        output_dir = os.path.join(parent_dir, "output")
-        diagrams_dir = os.path.join(output_dir, "diagrams")
-        
-        # Ensure the directory exists
-        os.makedirs(diagrams_dir, exist_ok=True)
-        
-        # Look for diagram files in the diagrams directory
-        diagrams = []
-        for root, dirs, files in os.walk(diagrams_dir):
-            for file in files:
-                if file.endswith('.blend') or file.endswith('.py') or file.endswith('.svg') or file.endswith('.png'):
-                    diagram_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(diagram_path, output_dir)
-                    diagrams.append({
-                        "id": os.path.splitext(file)[0],
-                        "name": file,
-                        "path": rel_path,
-                        "size": os.path.getsize(diagram_path),
-                        "modified": os.path.getmtime(diagram_path)
-                    })
-        
-        # For compatibility, return the same format as the frontend expects
-        return {"diagrams": diagrams}
+        return catalog_listing("diagrams", "diagrams", page, page_size, if_none_match)
     except Exception as e:
         logger.error(f"Error getting diagrams: {str(e)}")
         return {"status": "error", "message": str(e), "diagrams": []}
 
 @app.get("/scenes")
-async def get_scenes():
+async def get_scenes(page: int = Query(1, ge=1), page_size: Optional[int] = Query(None, ge=1, le=1000),
+                     if_none_match: Optional[str] = Header(None)):
     """Get available scenes - direct handler for frontend compatibility"""
     try:
-        # Define output directories
-        output_dir = os.path.join(parent_dir, "output")
-        scenes_dir = os.path.join(output_dir, "scenes")
-        
-        # Ensure the directory exists
-        os.makedirs(scenes_dir, exist_ok=True)
-        
-        # Look for scene files in the scenes directory
-        scenes = []
-        for root, dirs, files in os.walk(scenes_dir):
-            for file in files:
-                if file.endswith('.blend') or file.endswith('.py'):
-                    scene_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(scene_path, output_dir)
-                    scenes.append({
-                        "id": os.path.splitext(file)[0],
-                        "name": file,
-                        "path": rel_path,
-                        "size": os.path.getsize(scene_path),
-                        "modified": os.path.getmtime(scene_path)
-                    })
-        
-        # For compatibility, return the same format as the frontend expects
-        return {"scenes": scenes}
+        return catalog_listing("scenes", "scenes", page, page_size, if_none_match)
     except Exception as e:
         logger.error(f"Error getting scenes: {str(e)}")
         return {"status": "error", "message": str(e), "scenes": []}
 
 @app.get("/blender-tools")
-async def get_blender_tools():
+async def get_blender_tools(page: int = Query(1, ge=1), page_size: Optional[int] = Query(None, ge=1, le=1000),
+                            if_none_match: Optional[str] = Header(None)):
     """Get available Blender tools - direct handler for frontend compatibility"""
     try:
-        # Define output directories
-        output_dir = os.path.join(parent_dir, "output")
-        tools_dir = os.path.join(output_dir, "tools")
-        
-        # Ensure the directory exists
-        os.makedirs(tools_dir, exist_ok=True)
-        
-        # Look for tool files in the tools directory
-        tools = []
-        for root, dirs, files in os.walk(tools_dir):
-            for file in files:
-                if file.endswith('.py'):
-                    tool_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(tool_path, output_dir)
-                    tools.append({
-                        "id": os.path.splitext(file)[0],
-                        "name": file,
-                        "path": rel_path,
-                        "size": os.path.getsize(tool_path),
-                        "modified": os.path.getmtime(tool_path)
-                    })
-        
-        # For compatibility, return the same format as the frontend expects
-        return {"tools": tools}
+        return catalog_listing("tools", "tools", page, page_size, if_none_match)
     except Exception as e:
         logger.error(f"Error getting Blender tools: {str(e)}")
         return {"status": "error", "message": str(e), "tools": []}
 
-@app.get("/results/{filename}")
+@app.get("/results/{filename:path}")
 async def get_result_file(filename: str):
     try:
-        # Get output directory from config
-        config_path = os.path.join(parent_dir, "config.yaml")
-        output_dir = None
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                try:
-                    config = yaml.safe_load(f)
-                    output_dir = config.get('paths', {}).get('output_dir')
-                except Exception as e:
-                    logger.warning(f"Error loading output directory from config: {e}")
-        
-        # Fallback to default if not found in config
-        if not output_dir or not os.path.exists(output_dir):
-            output_dir = os.path.join(parent_dir, "output")
-        
-        logger.info(f"Searching for {filename} in {output_dir}")
-        
-        # Search for the file in subdirectories
-        for root, dirs, files in os.walk(output_dir):
-            if filename in files:
-                file_path = os.path.join(root, filename)
-                logger.info(f"Found file at {file_path}")
-                return FileResponse(file_path)
-        
-        # If file not found in output directory, check relative paths like 'models/filename'
-        if '/' in filename:
-            parts = filename.split('/')
-            subdir = parts[0]
-            file_name = parts[-1]
-            
-            # Check in appropriate subdirectory
-            subdir_path = os.path.join(output_dir, subdir)
-            if os.path.exists(subdir_path):
-                for root, dirs, files in os.walk(subdir_path):
-                    if file_name in files:
-                        file_path = os.path.join(root, file_name)
-                        logger.info(f"Found file at {file_path}")
-                        return FileResponse(file_path)
-        
-        # If still not found, give more detailed error
-        logger.warning(f"File not found: {filename} in {output_dir}")
-        # List available files for debugging
-        available_files = []
-        for root, dirs, files in os.walk(output_dir):
-            for file in files:
-                available_files.append(os.path.join(os.path.relpath(root, output_dir), file))
-        
-        logger.info(f"Available files: {available_files[:10]}" + ("..." if len(available_files) > 10 else ""))
-        
+        # Look the file up by relative path or by name in the results catalog
+        file_path = results_catalog.find(filename)
+        if file_path and os.path.isfile(file_path):
+            logger.info(f"Found file at {file_path}")
+            return FileResponse(file_path)
+
+        logger.warning(f"File not found: {filename} in {results_catalog.root} ({len(results_catalog)} files indexed)")
         raise HTTPException(status_code=404, detail=f"File not found: {filename}")
     except HTTPException:
         raise
@@ -673,10 +566,8 @@ async def process_instruction_ws(instruction: str, context: Dict[str, Any], webs
     global agent
     
     if not agent:
-        initialized = await initialize_services()
-        if not initialized:
-            await manager.send_message({"type": "error", "message": "Failed to initialize services"}, websocket)
-            return
+        await manager.send_message({"type": "error", "message": "Services not initialized"}, websocket)
+        return
     
     try:
         # Send processing update
@@ -696,10 +587,8 @@ async def execute_tool_ws(tool_name: str, parameters: Dict[str, Any], websocket:
     global agent
     
     if not agent:
-        initialized = await initialize_services()
-        if not initialized:
-            await manager.send_message({"type": "error", "message": "Failed to initialize services"}, websocket)
-            return
+        await manager.send_message({"type": "error", "message": "Services not initialized"}, websocket)
+        return
     
     try:
         # Send processing update
@@ -717,22 +606,38 @@ async def execute_tool_ws(tool_name: str, parameters: Dict[str, Any], websocket:
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
+    await output_catalog.start()
+    if results_catalog is not output_catalog:
+        await results_catalog.start()
     await initialize_services()
+    
+    # Trade a slower start for no import delay on the first requests
+    if os.environ.get("GENAI_PRELOAD_ROUTES", "false").lower() == "true":
+        lazy_routers.load_all()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up on shutdown"""
     global agent, redis_bus
     
+    await output_catalog.stop()
+    if results_catalog is not output_catalog:
+        await results_catalog.stop()
+    
     if agent:
         await agent.close()
     
     if redis_bus:
         await redis_bus.disconnect()
+    
+    await get_shared_state().close()
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # Each worker initializes its own services at startup and shares state
+    # through Redis; reload is only available with a single worker
+    workers = int(os.environ.get("GENAI_WORKERS", "1"))
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=workers == 1, workers=workers)
 
 @app.get("/api/health")
 async def health_check():
@@ -0,0 +1,359 @@
+"""
+In-memory catalog of generated output files
+"""
+
+import os
+import asyncio
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# watchdog is optional; without it the catalog relies on periodic reconciles
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+# Listing categories: name -> (subdirectory of the output root, extensions)
+OUTPUT_CATEGORIES = {
+    "models": ("models", (".blend", ".py")),
+    "diagrams": ("diagrams", (".blend", ".py", ".svg", ".png")),
+    "scenes": ("scenes", (".blend", ".py")),
+    "tools": ("tools", (".py",)),
+}
+
+class _CatalogEventHandler(FileSystemEventHandler):
+    """Forward filesystem events to the catalog"""
+
+    def __init__(self, catalog: "OutputCatalog"):
+        self.catalog = catalog
+
+    def on_created(self, event):
+        if event.is_directory:
+            self.catalog.scan_directory(event.src_path)
+        else:
+            self.catalog.update_path(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.catalog.update_path(event.src_path)
+
+    def on_deleted(self, event):
+        self.catalog.remove_path(event.src_path)
+
+    def on_moved(self, event):
+        self.catalog.remove_path(event.src_path)
+        if event.is_directory:
+            self.catalog.scan_directory(event.dest_path)
+        else:
+            self.catalog.update_path(event.dest_path)
+
+class OutputCatalog:
+    """
+    Catalog of the files below an output directory
+
+    Listings and lookups are answered from memory instead of walking the
+    directory tree per request. The catalog is kept current by filesystem
+    events when watchdog is installed, and by a periodic reconcile (a full
+    walk whose differences are applied to the catalog) in any case, so
+    missed events are repaired eventually. The ETag of a category listing
+    is a digest of its entries (paths, sizes and modification times), so
+    every worker indexing the same directory returns the same ETag.
+    """
+
+    def __init__(self, root: str, categories: Optional[Dict[str, Tuple[str, Tuple[str, ...]]]] = None,
+                 reconcile_interval: Optional[float] = None, use_watcher: bool = True):
+        """
+        Initialize the catalog
+
+        Args:
+            root: Output directory to index
+            categories: Listing categories (name -> (subdirectory, extensions))
+            reconcile_interval: Seconds between full reconciles (defaults to
+                60 with a filesystem watcher and 5 without)
+            use_watcher: Use watchdog filesystem events when available
+        """
+        self.root = os.path.abspath(root)
+        self.categories = categories or {}
+        self.use_watcher = use_watcher and WATCHDOG_AVAILABLE
+        if reconcile_interval is None:
+            reconcile_interval = 60.0 if self.use_watcher else 5.0
+        self.reconcile_interval = reconcile_interval
+
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._by_category: Dict[str, Dict[str, Dict[str, Any]]] = {name: {} for name in self.categories}
+        self._digests: Dict[str, str] = {}
+        self._sorted: Dict[str, List[Dict[str, Any]]] = {}
+        self._observer = None
+        self._reconciler: Optional[asyncio.Task] = None
+
+    def _relative(self, path: str) -> Optional[str]:
+        """Get the catalog key of a path, or None if it is outside the root"""
+        rel_path = os.path.relpath(os.path.abspath(path), self.root)
+        if rel_path == "." or rel_path.startswith(".."):
+            return None
+        return rel_path.replace(os.sep, "/")
+
+    def _category_of(self, rel_path: str) -> Optional[str]:
+        """Get the listing category of a file"""
+        for name, (subdir, extensions) in self.categories.items():
+            if rel_path.startswith(subdir + "/") and rel_path.endswith(extensions):
+                return name
+        return None
+
+    def _touch(self, category: Optional[str]):
+        """Drop the cached listing and digest of a category after one of its files changed"""
+        if category is not None:
+            self._digests.pop(category, None)
+            self._sorted.pop(category, None)
+
+    def _put(self, rel_path: str, size: int, modified: float) -> bool:
+        """Add or update an entry; returns whether anything changed"""
+        entry = self._entries.get(rel_path)
+        if entry is not None and entry["size"] == size and entry["modified"] == modified:
+            return False
+
+        name = rel_path.rsplit("/", 1)[-1]
+        entry = {
+            "id": os.path.splitext(name)[0],
+            "name": name,
+            "path": rel_path,
+            "size": size,
+            "modified": modified
+        }
+        self._entries[rel_path] = entry
+        self._by_name.setdefault(name, set()).add(rel_path)
+
+        category = self._category_of(rel_path)
+        if category is not None:
+            self._by_category[category][rel_path] = entry
+        self._touch(category)
+        return True
+
+    def _drop(self, rel_path: str) -> bool:
+        """Remove an entry; returns whether it existed"""
+        entry = self._entries.pop(rel_path, None)
+        if entry is None:
+            return False
+
+        names = self._by_name.get(entry["name"])
+        if names is not None:
+            names.discard(rel_path)
+            if not names:
+                del self._by_name[entry["name"]]
+
+        category = self._category_of(rel_path)
+        if category is not None:
+            self._by_category[category].pop(rel_path, None)
+        self._touch(category)
+        return True
+
+    def _walk(self, directory: str) -> Dict[str, Tuple[int, float]]:
+        """Stat every file below a directory"""
+        found = {}
+        for root, dirs, files in os.walk(directory):
+            for file in files:
+                path = os.path.join(root, file)
+                rel_path = self._relative(path)
+                if rel_path is None:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                found[rel_path] = (stat.st_size, stat.st_mtime)
+        return found
+
+    def update_path(self, path: str):
+        """
+        Add or refresh a single file
+
+        Args:
+            path: Absolute path of the file
+        """
+        rel_path = self._relative(path)
+        if rel_path is None:
+            return
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.remove_path(path)
+            return
+        with self._lock:
+            self._put(rel_path, stat.st_size, stat.st_mtime)
+
+    def remove_path(self, path: str):
+        """
+        Remove a file, or every file below a directory
+
+        Args:
+            path: Absolute path of the file or directory
+        """
+        rel_path = self._relative(path)
+        if rel_path is None:
+            return
+        with self._lock:
+            if not self._drop(rel_path):
+                prefix = rel_path + "/"
+                for key in [key for key in self._entries if key.startswith(prefix)]:
+                    self._drop(key)
+
+    def scan_directory(self, directory: str):
+        """
+        Add every file below a directory
+
+        Args:
+            directory: Absolute path of the directory
+        """
+        found = self._walk(directory)
+        with self._lock:
+            for rel_path, (size, modified) in found.items():
+                self._put(rel_path, size, modified)
+
+    def reconcile(self) -> int:
+        """
+        Walk the whole output directory and apply the differences
+
+        Returns:
+            Number of entries added, updated or removed
+        """
+        for subdir, _ in self.categories.values():
+            os.makedirs(os.path.join(self.root, subdir), exist_ok=True)
+
+        found = self._walk(self.root)
+        changes = 0
+        with self._lock:
+            for rel_path in [key for key in self._entries if key not in found]:
+                changes += self._drop(rel_path)
+            for rel_path, (size, modified) in found.items():
+                changes += self._put(rel_path, size, modified)
+
+        if changes:
+            logger.debug(f"Output catalog reconcile applied {changes} changes")
+        return changes
+
+    def list(self, category: str, page: int = 1, page_size: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        List the files of a category, ordered by path
+
+        Args:
+            category: Category name
+            page: 1-based page number
+            page_size: Entries per page (None for all entries)
+
+        Returns:
+            Tuple (entries of the page, total number of entries)
+        """
+        with self._lock:
+            entries = self._sorted.get(category)
+            if entries is None:
+                entries = [dict(self._by_category[category][key]) for key in sorted(self._by_category[category])]
+                self._sorted[category] = entries
+
+        total = len(entries)
+        if page_size is None:
+            return list(entries), total
+        start = (max(page, 1) - 1) * page_size
+        return entries[start:start + page_size], total
+
+    def etag(self, category: str, *parts: Any) -> str:
+        """
+        Get the ETag of a category listing
+
+        Args:
+            category: Category name
+            parts: Extra values the response depends on (e.g. page parameters)
+
+        Returns:
+            Quoted ETag value
+        """
+        with self._lock:
+            digest = self._digests.get(category)
+            if digest is None:
+                entries = self._by_category[category]
+                listing = hashlib.sha1()
+                for key in sorted(entries):
+                    listing.update(f"{key}\0{entries[key]['size']}\0{entries[key]['modified']!r}\n".encode("utf-8"))
+                digest = self._digests[category] = listing.hexdigest()[:16]
+
+        suffix = "".join(f"-{part}" for part in parts)
+        return f'"{category}-{digest}{suffix}"'
+
+    def find(self, filename: str) -> Optional[str]:
+        """
+        Find a file by relative path or by file name
+
+        Misses are answered from memory; files the watcher has not reported
+        yet are picked up by the next periodic reconcile.
+
+        Args:
+            filename: Path relative to the root, or a bare file name
+
+        Returns:
+            Absolute path of the file, or None if it is not in the catalog
+        """
+        rel_path = self._lookup(filename)
+        if rel_path is None:
+            return None
+        return os.path.join(self.root, *rel_path.split("/"))
+
+    def _lookup(self, filename: str) -> Optional[str]:
+        """Resolve a relative path or file name to a catalog key"""
+        filename = filename.replace("\\", "/").strip("/")
+        with self._lock:
+            if filename in self._entries:
+                return filename
+            names = self._by_name.get(filename.rsplit("/", 1)[-1])
+            if names:
+                return min(names)
+        return None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def start(self):
+        """Build the catalog and start watching the output directory"""
+        os.makedirs(self.root, exist_ok=True)
+        await asyncio.get_running_loop().run_in_executor(None, self.reconcile)
+
+        if self.use_watcher:
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_CatalogEventHandler(self), self.root, recursive=True)
+                self._observer.start()
+            except Exception as e:
+                logger.warning(f"Could not watch {self.root}, using periodic reconcile only: {str(e)}")
+                self._observer = None
+
+        self._reconciler = asyncio.ensure_future(self._reconcile_periodically())
+        logger.info(f"Output catalog indexed {len(self)} files in {self.root} "
+                    f"(watcher: {'on' if self._observer else 'off'}, reconcile every {self.reconcile_interval}s)")
+
+    async def _reconcile_periodically(self):
+        """Reconcile the catalog in the background"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await loop.run_in_executor(None, self.reconcile)
+            except Exception as e:
+                logger.error(f"Error reconciling output catalog: {str(e)}")
+
+    async def stop(self):
+        """Stop watching the output directory"""
+        if self._reconciler:
+            self._reconciler.cancel()
+            self._reconciler = None
+        if self._observer:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
@@ -28,21 +28,45 @@ except ImportError:
         print("Warning: WebSocketManager import failed. Real-time updates will be disabled.")
         # Define a mock WebSocketManager if import fails
         class WebSocketManager:
-            async def connect(self, websocket): pass
-            async def disconnect(self, websocket): pass
+            async def connect(self, client_id, websocket): pass
+            def disconnect(self, client_id): pass
             async def broadcast(self, message): pass
+            def subscribe(self, client_id, topic): pass
+            async def publish(self, topic, message): pass
+
+try:
+    from web.backend.execution_output import ExecutionOutput, ExecutionStore
+    from web.backend.shared_state import get_shared_state
+except ImportError:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from execution_output import ExecutionOutput, ExecutionStore
+    from shared_state import get_shared_state
 
 # Create router
 router = APIRouter()
 
-# WebSocket manager for real-time updates
+# WebSocket manager for the sockets of this worker; updates published by
+# any worker reach them through the shared state
 ws_manager = WebSocketManager()
+get_shared_state().on_message("blender", ws_manager.publish)
 
 # Path to output directory
 BASE_OUTPUT_DIR = os.path.join(project_root, "output")
 
-# Dictionary to store script execution status
-script_executions = {}
+# Output handling limits
+OUTPUT_BUFFER_LINES = int(os.environ.get("BLENDER_OUTPUT_BUFFER_LINES", "1000"))
+OUTPUT_FLUSH_INTERVAL_MS = int(os.environ.get("BLENDER_OUTPUT_FLUSH_MS", "100"))
+EXECUTION_TTL_SECONDS = int(os.environ.get("BLENDER_EXECUTION_TTL", "3600"))
+EXECUTION_MAX_RUNTIME_SECONDS = int(os.environ.get("BLENDER_EXECUTION_MAX_RUNTIME", "21600"))
+
+# Full output of each execution is spilled to a log file here, deleted
+# once its execution has expired
+EXECUTION_LOG_DIR = os.path.join(BASE_OUTPUT_DIR, "logs", "blender_executions")
+
+# Script execution status and recent output, shared by all workers and
+# expired by TTL once finished (or after the maximum runtime without updates)
+script_executions = ExecutionStore(get_shared_state(), ttl=EXECUTION_TTL_SECONDS, max_lines=OUTPUT_BUFFER_LINES,
+                                   max_runtime=EXECUTION_MAX_RUNTIME_SECONDS)
 
 class BlenderScriptRequest(BaseModel):
     """Request model for executing a Blender script"""
@@ -126,22 +150,45 @@ def find_blender_executable():
     else:  # Linux
         return "blender"  # Use system Blender
 
+async def publish_execution_update(execution_id, status, message):
+    """Send a status update to the clients subscribed to an execution"""
+    await get_shared_state().publish("blender", execution_id, {"type": "blender_script_update", "data": {
+        "execution_id": execution_id,
+        "status": status,
+        "message": message
+    }})
+
+async def publish_execution_output(execution_id, lines):
+    """Record a batch of output lines and send it to the clients subscribed to an execution"""
+    await script_executions.append_output(execution_id, lines)
+    await get_shared_state().publish("blender", execution_id, {"type": "blender_script_output", "data": {
+        "execution_id": execution_id,
+        "line": "".join(lines),
+        "lines": lines
+    }})
+
 async def run_blender_script_task(script_path, execution_id, show_ui=False):
     """Background task to run a Blender script"""
+    log_path = os.path.join(EXECUTION_LOG_DIR, f"{execution_id}.log")
+    output = ExecutionOutput(
+        execution_id,
+        log_path=log_path,
+        max_lines=OUTPUT_BUFFER_LINES,
+        flush_interval=OUTPUT_FLUSH_INTERVAL_MS / 1000.0,
+        on_flush=publish_execution_output
+    )
+    
     try:
         # Update status to running
-        script_executions[execution_id] = {
-            "status": "running",
-            "message": "Script execution in progress",
-            "output": []
-        }
+        await script_executions.update(
+            execution_id,
+            status="running",
+            message="Script execution in progress",
+            log_path=log_path
+        )
         
-        # Notify connected clients
-        await ws_manager.broadcast({"type": "blender_script_update", "data": {
-            "execution_id": execution_id,
-            "status": "running",
-            "message": "Script execution in progress"
-        }})
+        # Notify subscribed clients
+        await publish_execution_update(execution_id, "running", "Script execution in progress")
         
         # Find Blender executable
         blender_path = find_blender_executable()
@@ -157,12 +204,9 @@ async def run_blender_script_task(script_path, execution_id, show_ui=False):
             cmd.extend(["--python", wrapper_path])
             
             # Update status with command
-            script_executions[execution_id]["message"] = f"Running command: {' '.join(cmd)}"
-            await ws_manager.broadcast({"type": "blender_script_update", "data": {
-                "execution_id": execution_id,
-                "status": "running",
-                "message": script_executions[execution_id]["message"]
-            }})
+            message = f"Running command: {' '.join(cmd)}"
+            await script_executions.update(execution_id, message=message)
+            await publish_execution_update(execution_id, "running", message)
             
             # Run the process
             process = await asyncio.create_subprocess_exec(
@@ -171,42 +215,27 @@ async def run_blender_script_task(script_path, execution_id, show_ui=False):
                 stderr=asyncio.subprocess.STDOUT
             )
             
-            # Stream the output
-            output_lines = []
+            # Stream the output; lines are kept in a bounded buffer, spilled
+            # to the log file and delivered to subscribers in batches
             while True:
                 line = await process.stdout.readline()
                 if not line:
                     break
-                    
-                line_text = line.decode('utf-8', errors='replace')
-                print(line_text, end='')
-                output_lines.append(line_text)
                 
-                # Store output
-                script_executions[execution_id]["output"] = output_lines
-                
-                # Send updates via WebSocket
-                await ws_manager.broadcast({"type": "blender_script_output", "data": {
-                    "execution_id": execution_id,
-                    "line": line_text
-                }})
+                output.append(line.decode('utf-8', errors='replace'))
             
             # Wait for completion
             await process.wait()
+            await output.close()
             
             if process.returncode == 0:
-                script_executions[execution_id]["status"] = "completed"
-                script_executions[execution_id]["message"] = "Script execution completed successfully"
+                status, message = "completed", "Script execution completed successfully"
             else:
-                script_executions[execution_id]["status"] = "failed"
-                script_executions[execution_id]["message"] = f"Script execution failed with exit code: {process.returncode}"
+                status, message = "failed", f"Script execution failed with exit code: {process.returncode}"
+            await script_executions.finish(execution_id, status, message)
             
-            # Notify connected clients
-            await ws_manager.broadcast({"type": "blender_script_update", "data": {
-                "execution_id": execution_id,
-                "status": script_executions[execution_id]["status"],
-                "message": script_executions[execution_id]["message"]
-            }})
+            # Notify subscribed clients
+            await publish_execution_update(execution_id, status, message)
             
         finally:
             # Clean up the temporary wrapper
@@ -217,19 +246,13 @@ async def run_blender_script_task(script_path, execution_id, show_ui=False):
                     pass
                     
     except Exception as e:
+        await output.close()
+        
         # Update status to failed
-        script_executions[execution_id] = {
-            "status": "failed",
-            "message": f"Error: {str(e)}",
-            "output": []
-        }
+        await script_executions.finish(execution_id, "failed", f"Error: {str(e)}")
         
-        # Notify connected clients
-        await ws_manager.broadcast({"type": "blender_script_update", "data": {
-            "execution_id": execution_id,
-            "status": "failed",
-            "message": f"Error: {str(e)}"
-        }})
+        # Notify subscribed clients
+        await publish_execution_update(execution_id, "failed", f"Error: {str(e)}")
 
 @router.post("/blender/execute", response_model=BlenderScriptResponse)
 async def execute_blender_script(request: BlenderScriptRequest, background_tasks: BackgroundTasks):
@@ -253,12 +276,11 @@ async def execute_blender_script(request: BlenderScriptRequest, background_tasks
     # Create a unique ID for this execution
     execution_id = str(uuid.uuid4())
     
+    # Delete the logs of expired executions
+    await script_executions.prune_logs(EXECUTION_LOG_DIR)
+    
     # Initialize the execution status
-    script_executions[execution_id] = {
-        "status": "queued",
-        "message": "Script execution queued",
-        "output": []
-    }
+    await script_executions.create(execution_id, "queued", "Script execution queued")
     
     # Start the execution in a background task
     background_tasks.add_task(
@@ -277,54 +299,66 @@ async def execute_blender_script(request: BlenderScriptRequest, background_tasks
 @router.get("/blender/status/{execution_id}")
 async def get_blender_script_status(execution_id: str):
     """Get the status of a Blender script execution"""
-    if execution_id not in script_executions:
+    execution = await script_executions.get(execution_id)
+    if execution is None:
         raise HTTPException(status_code=404, detail=f"Execution ID not found: {execution_id}")
     
     return {
         "execution_id": execution_id,
-        "status": script_executions[execution_id]["status"],
-        "message": script_executions[execution_id]["message"]
+        "status": execution["status"],
+        "message": execution["message"]
     }
 
 @router.get("/blender/output/{execution_id}")
 async def get_blender_script_output(execution_id: str):
     """Get the output of a Blender script execution"""
-    if execution_id not in script_executions:
+    execution = await script_executions.get(execution_id)
+    if execution is None:
         raise HTTPException(status_code=404, detail=f"Execution ID not found: {execution_id}")
     
+    # Recent output is shared, so any worker can answer
+    output = await script_executions.output(execution_id)
+    
     return {
         "execution_id": execution_id,
-        "status": script_executions[execution_id]["status"],
-        "message": script_executions[execution_id]["message"],
-        "output": "".join(script_executions[execution_id]["output"])
+        "status": execution["status"],
+        "message": execution["message"],
+        "output": output,
+        "total_lines": execution["total_lines"],
+        "truncated": execution["total_lines"] > len(output.splitlines(True)),
+        "log_file": execution.get("log_path")
     }
 
 @router.websocket("/ws/blender/{execution_id}")
 async def websocket_endpoint(websocket: WebSocket, execution_id: str):
     """WebSocket endpoint for real-time updates on script execution"""
     # Generate a client ID from execution_id
-    client_id = f"blender_{execution_id}"
+    client_id = f"blender_{execution_id}_{uuid.uuid4().hex[:8]}"
     await ws_manager.connect(client_id, websocket)
+    ws_manager.subscribe(client_id, execution_id)
     
     try:
         # Send initial status if the execution exists
-        if execution_id in script_executions:
+        execution = await script_executions.get(execution_id)
+        if execution is not None:
             await websocket.send_json({
                 "type": "blender_script_status",
                 "data": {
                     "execution_id": execution_id,
-                    "status": script_executions[execution_id]["status"],
-                    "message": script_executions[execution_id]["message"]
+                    "status": execution["status"],
+                    "message": execution["message"]
                 }
             })
             
             # Send existing output
-            if script_executions[execution_id]["output"]:
+            if execution["total_lines"]:
+                output = await script_executions.output(execution_id)
                 await websocket.send_json({
                     "type": "blender_script_full_output",
                     "data": {
                         "execution_id": execution_id,
-                        "output": "".join(script_executions[execution_id]["output"])
+                        "output": output,
+                        "truncated": execution["total_lines"] > len(output.splitlines(True))
                     }
                 })
         
@@ -193,7 +193,8 @@ async def generate_svg(
     description: str = Body(..., description="The description of the diagram"),
     diagram_type: str = Body("flowchart", description="Type of diagram"),
     provider: Optional[str] = Body(None, description="LLM provider to use"),
-    name: Optional[str] = Body(None, description="Name for the diagram")
+    name: Optional[str] = Body(None, description="Name for the diagram"),
+    mode: Optional[str] = Body(None, description="'svg' for LLM-written markup, 'graph' for a JSON graph laid out locally")
 ):
     """
     Generate an SVG diagram from a description using an LLM.
@@ -252,7 +253,8 @@ async def generate_svg(
                 provider=provider,
                 concept=description,
                 style=diagram_type,
-                temperature=0.4
+                temperature=0.4,
+                mode=mode
             )
             
             # Validate SVG content
@@ -330,6 +332,23 @@ async def get_providers():
             detail=f"Failed to get providers: {str(e)}"
         )
 
+@router.get("/svg-generator/timings")
+async def get_timings():
+    """
+    Get time-to-valid-SVG and routing statistics per LLM provider.
+    """
+    if not SVG_GENERATOR_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, 
+            detail="SVG Generator is not available. Check server logs for details."
+        )
+    
+    return {
+        "status": "success",
+        "timings": llm_factory.get_svg_timings(),
+        "routing": llm_factory.get_provider_stats()
+    }
+
 @router.get("/svg-generator/diagram-types")
 async def get_diagram_types():
     """
@@ -0,0 +1,175 @@
+"""
+State shared by all backend worker processes
+
+With `uvicorn main:app --workers N` each worker is a separate process with
+its own module globals and its own WebSocket connections. State that every
+worker must see therefore lives in Redis:
+- WebSocket messages are published on one Redis channel; every worker
+  listens on it and hands each message to the handler registered for its
+  namespace, which delivers it to the sockets that worker owns
+- script executions are stored by ExecutionStore (execution_output.py)
+  under keys shared by all workers
+
+Without Redis (test mode, or Redis unreachable at startup) messages are
+delivered in process, which is only correct with a single worker.
+"""
+
+import os
+import json
+import socket
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "genai:ws"
+
+class SharedState:
+    """Redis connection and WebSocket fan-out of one worker"""
+
+    def __init__(self, redis_client=None):
+        """
+        Initialize shared state
+
+        Args:
+            redis_client: asyncio Redis client (None delivers messages in process)
+        """
+        self.redis = redis_client
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.handlers: Dict[str, Callable[[str, Dict[str, Any]], Awaitable[None]]] = {}
+
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def shared(self) -> bool:
+        """Whether state is shared through Redis (required with more than one worker)"""
+        return self.redis is not None
+
+    def on_message(self, namespace: str, handler: Callable[[str, Dict[str, Any]], Awaitable[None]]):
+        """
+        Register the handler that delivers a namespace's messages to local sockets
+
+        Args:
+            namespace: Message namespace (e.g. "blender")
+            handler: Coroutine called with (topic, message)
+        """
+        self.handlers[namespace] = handler
+
+    async def connect(self, redis_config: Optional[Dict[str, Any]]) -> bool:
+        """
+        Connect to Redis and start listening for messages from other workers
+
+        Args:
+            redis_config: The redis section of config.yaml (None keeps state in process)
+
+        Returns:
+            True if state is shared through Redis
+        """
+        if redis_config is None:
+            logger.info("Shared state kept in process (single worker only)")
+            return False
+
+        client = redis.Redis(
+            host=str(redis_config.get('host', 'localhost')),
+            port=int(redis_config.get('port', 6379)),
+            db=int(redis_config.get('db', 0)),
+            password=redis_config.get('password'),
+            decode_responses=True
+        )
+        try:
+            await client.ping()
+        except Exception as e:
+            logger.warning(f"Redis unavailable, shared state kept in process (single worker only): {str(e)}")
+            await client.close()
+            return False
+
+        await self.start(client)
+        return True
+
+    async def start(self, redis_client):
+        """
+        Use a Redis client and start the message listener
+
+        Args:
+            redis_client: asyncio Redis client
+        """
+        self.redis = redis_client
+        self._pubsub = self.redis.pubsub()
+        await self._pubsub.subscribe(CHANNEL)
+        self._listener = asyncio.ensure_future(self._listen())
+        logger.info(f"Worker {self.worker_id} sharing state through Redis")
+
+    async def close(self):
+        """Stop the listener and close the Redis connection"""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(CHANNEL)
+            await self._pubsub.close()
+            self._pubsub = None
+        if self.redis is not None:
+            await self.redis.close()
+            self.redis = None
+
+    async def publish(self, namespace: str, topic: str, message: Dict[str, Any]):
+        """
+        Send a message to the subscribers of a topic on every worker
+
+        Args:
+            namespace: Message namespace
+            topic: Topic within the namespace (e.g. an execution ID)
+            message: JSON-serializable message
+        """
+        if self.redis is None:
+            await self._deliver(namespace, topic, message)
+            return
+        await self.redis.publish(CHANNEL, json.dumps({
+            "namespace": namespace,
+            "topic": topic,
+            "message": message
+        }))
+
+    async def _deliver(self, namespace: str, topic: str, message: Dict[str, Any]):
+        handler = self.handlers.get(namespace)
+        if handler is None:
+            return
+        try:
+            await handler(topic, message)
+        except Exception as e:
+            logger.error(f"Error delivering {namespace} message for {topic}: {str(e)}")
+
+    async def _listen(self):
+        """Deliver messages published by any worker"""
+        while True:
+            try:
+                async for item in self._pubsub.listen():
+                    if item.get("type") != "message":
+                        continue
+                    data = json.loads(item["data"])
+                    await self._deliver(data["namespace"], data["topic"], data["message"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Shared state listener error: {str(e)}")
+                await asyncio.sleep(1.0)
+
+# Singleton instance per worker
+_shared_state = SharedState()
+
+def get_shared_state() -> SharedState:
+    """
+    Get this worker's shared state
+
+    Returns:
+        SharedState instance
+    """
+    return _shared_state
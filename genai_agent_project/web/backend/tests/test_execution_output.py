@@ -0,0 +1,95 @@
+"""
+Tests for bounded Blender execution output and the execution registry
+"""
+
+import os
+import sys
+import time
+import asyncio
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from execution_output import ExecutionOutput, ExecutionRegistry, ExecutionStore
+
+def test_output_is_bounded_and_spilled_to_log(tmp_path):
+    """Test that only recent lines stay in memory while the log keeps everything"""
+    log_path = str(tmp_path / "logs" / "run.log")
+
+    async def run():
+        output = ExecutionOutput("run", log_path=log_path, max_lines=3)
+        for i in range(10):
+            output.append(f"line {i}\n")
+        await output.close()
+        return output
+
+    output = asyncio.run(run())
+
+    assert output.total_lines == 10
+    assert output.truncated
+    assert output.text() == "line 7\nline 8\nline 9\n"
+    with open(log_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 10
+
+def test_output_lines_are_delivered_in_batches():
+    """Test that lines appended together are delivered as one batch"""
+    batches = []
+
+    async def on_flush(execution_id, lines):
+        batches.append((execution_id, lines))
+
+    async def run():
+        output = ExecutionOutput("run", flush_interval=0.05, on_flush=on_flush)
+        for i in range(100):
+            output.append(f"{i}\n")
+        await asyncio.sleep(0.1)
+        output.append("last\n")
+        await output.close()
+
+    asyncio.run(run())
+
+    assert len(batches) == 2
+    assert len(batches[0][1]) == 100
+    assert batches[1] == ("run", ["last\n"])
+
+def test_registry_prunes_finished_executions():
+    """Test that finished executions expire after the TTL"""
+    registry = ExecutionRegistry(ttl=60)
+    registry["old"] = {"status": "running", "message": "", "output": None}
+    registry["active"] = {"status": "running", "message": "", "output": None}
+
+    registry.finish("old", "completed", "done")
+    registry["old"]["finished"] = time.time() - 120
+
+    assert "old" not in registry
+    assert "active" in registry
+    assert registry["active"]["finished"] is None
+
+def test_registry_deletes_logs_of_pruned_executions(tmp_path):
+    """Test that an expired execution's log file is deleted with it"""
+    log_path = tmp_path / "old.log"
+    log_path.write_text("output\n")
+    registry = ExecutionRegistry(ttl=60)
+    registry["old"] = {"status": "running", "message": "", "log_path": str(log_path)}
+
+    registry.finish("old", "completed", "done")
+    registry["old"]["finished"] = time.time() - 120
+
+    assert registry.prune() == 1
+    assert not log_path.exists()
+
+def test_store_deletes_logs_of_expired_executions(tmp_path):
+    """Test that old logs without an execution are deleted and the others kept"""
+    old = time.time() - 120
+    for name in ("gone", "running", "recent"):
+        (tmp_path / f"{name}.log").write_text("output\n")
+    for name in ("gone", "running"):
+        os.utime(tmp_path / f"{name}.log", (old, old))
+
+    async def run():
+        store = ExecutionStore(None, ttl=60)
+        await store.create("running", "running", "Script execution in progress")
+        return await store.prune_logs(str(tmp_path))
+
+    assert asyncio.run(run()) == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["recent.log", "running.log"]
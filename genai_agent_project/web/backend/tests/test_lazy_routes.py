@@ -0,0 +1,85 @@
+"""
+Tests for routers imported on first request
+"""
+
+import os
+import sys
+import types
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from lazy_routes import LazyRouters, LazyRouterMiddleware
+
+@pytest.fixture
+def router_modules():
+    """Register two fake route modules sharing a prefix"""
+    def make_module(name, reply):
+        router = APIRouter(prefix="/things")
+
+        @router.get("/health")
+        async def health():
+            return {"router": reply}
+
+        @router.get(f"/{reply}")
+        async def own():
+            return {"router": reply}
+
+        module = types.ModuleType(name)
+        module.router = router
+        return module
+
+    modules = {"lazy_first": make_module("lazy_first", "first"),
+               "lazy_second": make_module("lazy_second", "second")}
+    sys.modules.update(modules)
+    yield modules
+    for name in modules:
+        sys.modules.pop(name, None)
+
+def make_app():
+    app = FastAPI()
+
+    @app.get("/")
+    async def root():
+        return {"ok": True}
+
+    routers = LazyRouters(app)
+    routers.register("First", "lazy_first", ("/things",))
+    routers.register("Second", "lazy_second", ("/things",))
+    routers.register("Missing", "lazy_missing_module", ("/missing",))
+    app.add_middleware(LazyRouterMiddleware, routers=routers)
+    return app, routers
+
+def test_routers_included_on_first_matching_request(router_modules):
+    """Test that routers are only included when a request needs them"""
+    app, routers = make_app()
+    client = TestClient(app)
+
+    assert client.get("/").status_code == 200
+    assert routers.loaded == {}
+
+    # The first router registered for a prefix wins on duplicate routes
+    assert client.get("/things/health").json() == {"router": "first"}
+    assert client.get("/things/second").json() == {"router": "second"}
+    assert routers.loaded == {"First": True, "Second": True}
+
+def test_missing_router_is_not_retried(router_modules):
+    """Test that a router whose module is missing is skipped after one attempt"""
+    app, routers = make_app()
+    client = TestClient(app)
+
+    assert client.get("/missing/x").status_code == 404
+    assert client.get("/missing/x").status_code == 404
+    assert routers.loaded == {"Missing": False}
+
+def test_openapi_includes_every_router(router_modules):
+    """Test that the OpenAPI schema lists routes of routers not yet used"""
+    app, routers = make_app()
+    client = TestClient(app)
+
+    paths = client.get("/openapi.json").json()["paths"]
+
+    assert "/things/first" in paths
+    assert "/things/second" in paths
@@ -0,0 +1,91 @@
+"""
+Tests for the in-memory output catalog
+"""
+
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from output_catalog import OutputCatalog, OUTPUT_CATEGORIES
+
+def write_file(path, content="x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+@pytest.fixture
+def catalog(tmp_path):
+    write_file(str(tmp_path / "models" / "cube.blend"))
+    write_file(str(tmp_path / "models" / "nested" / "sphere.py"))
+    write_file(str(tmp_path / "models" / "notes.txt"))
+    write_file(str(tmp_path / "diagrams" / "flow.svg"))
+    catalog = OutputCatalog(str(tmp_path), OUTPUT_CATEGORIES, use_watcher=False)
+    catalog.reconcile()
+    return catalog
+
+def test_listing_filters_by_category_and_paginates(catalog):
+    """Test that listings only contain matching files and can be paged"""
+    entries, total = catalog.list("models")
+    assert total == 2
+    assert [entry["path"] for entry in entries] == ["models/cube.blend", "models/nested/sphere.py"]
+    assert entries[0]["id"] == "cube"
+
+    page, total = catalog.list("models", page=2, page_size=1)
+    assert total == 2
+    assert [entry["name"] for entry in page] == ["sphere.py"]
+
+    assert catalog.list("tools") == ([], 0)
+
+def test_etag_changes_only_with_its_category(catalog, tmp_path):
+    """Test that a category ETag changes when one of its files changes"""
+    models_etag = catalog.etag("models")
+    diagrams_etag = catalog.etag("diagrams")
+
+    write_file(str(tmp_path / "models" / "cone.blend"))
+    catalog.update_path(str(tmp_path / "models" / "cone.blend"))
+
+    assert catalog.etag("models") != models_etag
+    assert catalog.etag("diagrams") == diagrams_etag
+    assert catalog.list("models")[1] == 3
+
+    # Reconciling an unchanged tree keeps the ETag
+    models_etag = catalog.etag("models")
+    assert catalog.reconcile() == 0
+    assert catalog.etag("models") == models_etag
+
+def test_etag_is_shared_by_catalogs_of_the_same_tree(catalog, tmp_path):
+    """Test that separate catalogs (e.g. of other workers) return the same ETag"""
+    other = OutputCatalog(str(tmp_path), OUTPUT_CATEGORIES, use_watcher=False)
+    other.reconcile()
+
+    assert other.etag("models", 1, 50) == catalog.etag("models", 1, 50)
+
+    os.remove(str(tmp_path / "models" / "cube.blend"))
+    other.reconcile()
+    assert other.etag("models") != catalog.etag("models")
+
+def test_reconcile_repairs_missed_events(catalog, tmp_path):
+    """Test that a reconcile picks up changes that were not reported"""
+    os.remove(str(tmp_path / "models" / "cube.blend"))
+    write_file(str(tmp_path / "scenes" / "room.blend"))
+
+    assert catalog.reconcile() == 2
+    assert [entry["name"] for entry in catalog.list("models")[0]] == ["sphere.py"]
+    assert catalog.list("scenes")[1] == 1
+
+def test_find_by_path_and_name(catalog, tmp_path):
+    """Test lookups by relative path, by name and after a directory removal"""
+    assert catalog.find("models/nested/sphere.py") == str(tmp_path / "models" / "nested" / "sphere.py")
+    assert catalog.find("flow.svg") == str(tmp_path / "diagrams" / "flow.svg")
+
+    # A miss does not walk the tree; unreported files appear after a reconcile
+    write_file(str(tmp_path / "videos" / "clip.mp4"))
+    assert catalog.find("clip.mp4") is None
+    catalog.reconcile()
+    assert catalog.find("clip.mp4") == str(tmp_path / "videos" / "clip.mp4")
+
+    catalog.remove_path(str(tmp_path / "models"))
+    assert catalog.list("models") == ([], 0)
+    assert catalog.find("cube.blend") is None
@@ -0,0 +1,125 @@
+"""
+Tests for state shared between backend workers
+"""
+
+import os
+import sys
+import asyncio
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "tests")))
+
+from execution_output import ExecutionStore
+from shared_state import SharedState
+from fake_redis import FakeRedis
+
+def test_local_messages_reach_the_namespace_handler():
+    """Test that without Redis messages are delivered in process"""
+    received = []
+
+    async def handler(topic, message):
+        received.append((topic, message))
+
+    async def run():
+        state = SharedState()
+        state.on_message("blender", handler)
+        await state.publish("blender", "exec-1", {"type": "update"})
+        await state.publish("other", "exec-1", {"type": "ignored"})
+
+    asyncio.run(run())
+
+    assert received == [("exec-1", {"type": "update"})]
+
+def test_messages_fan_out_to_every_worker():
+    """Test that a message published by one worker reaches the sockets of all workers"""
+    received = {"a": [], "b": []}
+
+    async def run():
+        server = FakeRedis()
+        workers = {name: SharedState() for name in received}
+        for name, state in workers.items():
+            async def handler(topic, message, name=name):
+                received[name].append((topic, message))
+            state.on_message("blender", handler)
+            await state.start(server)
+
+        await workers["a"].publish("blender", "exec-1", {"type": "update", "n": 1})
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        for state in workers.values():
+            await state.close()
+
+    asyncio.run(run())
+
+    assert received["a"] == received["b"] == [("exec-1", {"type": "update", "n": 1})]
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_execution_store_keeps_status_and_recent_output(shared):
+    """Test execution records and bounded output, in process and through Redis"""
+    async def run():
+        state = SharedState(FakeRedis() if shared else None)
+        store = ExecutionStore(state, ttl=60, max_lines=3)
+
+        await store.create("exec-1", "queued", "Script execution queued")
+        await store.update("exec-1", status="running", log_path="/tmp/exec-1.log")
+        await store.append_output("exec-1", [f"line {i}\n" for i in range(5)])
+        await store.finish("exec-1", "completed", "done")
+
+        return state, await store.get("exec-1"), await store.output("exec-1"), await store.get("missing")
+
+    state, execution, output, missing = asyncio.run(run())
+
+    assert missing is None
+    assert execution["status"] == "completed"
+    assert execution["message"] == "done"
+    assert execution["log_path"] == "/tmp/exec-1.log"
+    assert execution["total_lines"] == 5
+    assert execution["finished"]
+    assert output == "line 2\nline 3\nline 4\n"
+    if shared:
+        assert state.redis.ttls["genai:execution:exec-1"] == 60
+        assert state.redis.ttls["genai:execution:exec-1:output"] == 60
+
+def test_unfinished_execution_expires_after_max_runtime():
+    """Test that an execution whose worker died does not keep its keys forever"""
+    async def run():
+        state = SharedState(FakeRedis())
+        store = ExecutionStore(state, ttl=60, max_runtime=600)
+
+        await store.create("exec-1", "running", "Script execution in progress")
+        await store.append_output("exec-1", ["hello\n"])
+        running = dict(state.redis.ttls)
+
+        # Every write refreshes the expiry
+        state.redis.ttls.clear()
+        await store.append_output("exec-1", ["again\n"])
+        refreshed = dict(state.redis.ttls)
+
+        await store.finish("exec-1", "completed", "done")
+        return running, refreshed, state.redis.ttls
+
+    running, refreshed, finished = asyncio.run(run())
+
+    for ttls in (running, refreshed):
+        assert ttls["genai:execution:exec-1"] == 600
+        assert ttls["genai:execution:exec-1:output"] == 600
+    assert finished["genai:execution:exec-1"] == 60
+    assert finished["genai:execution:exec-1:output"] == 60
+
+def test_execution_store_is_visible_to_other_workers():
+    """Test that an execution written by one worker is readable by another"""
+    async def run():
+        server = FakeRedis()
+        writer = ExecutionStore(SharedState(server))
+        reader = ExecutionStore(SharedState(server))
+
+        await writer.create("exec-1", "running", "Script execution in progress")
+        await writer.append_output("exec-1", ["hello\n"])
+        return await reader.get("exec-1"), await reader.output("exec-1")
+
+    execution, output = asyncio.run(run())
+
+    assert execution["status"] == "running"
+    assert output == "hello\n"
@@ -5,7 +5,7 @@ WebSocket Manager for real-time communication
 import logging
 import json
 import asyncio
-from typing import Dict, Any, List, Callable, Awaitable, Optional
+from typing import Dict, Any, List, Set, Callable, Awaitable, Optional
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
@@ -18,6 +18,8 @@ class WebSocketManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.listeners: Dict[str, List[Callable[[Dict[str, Any]], Awaitable[None]]]] = {}
+        self.subscriptions: Dict[str, Set[str]] = {}
+        self.send_timeout = 5.0
     
     async def connect(self, client_id: str, websocket: WebSocket):
         """
@@ -41,6 +43,60 @@ class WebSocketManager:
         if client_id in self.active_connections:
             del self.active_connections[client_id]
             logger.info(f"Client disconnected: {client_id}")
+        
+        for topic in list(self.subscriptions):
+            self.unsubscribe(client_id, topic)
+    
+    def subscribe(self, client_id: str, topic: str):
+        """
+        Subscribe a client to a topic
+        
+        Args:
+            client_id: Client identifier
+            topic: Topic name (e.g. an execution ID)
+        """
+        self.subscriptions.setdefault(topic, set()).add(client_id)
+    
+    def unsubscribe(self, client_id: str, topic: str):
+        """
+        Unsubscribe a client from a topic
+        
+        Args:
+            client_id: Client identifier
+            topic: Topic name
+        """
+        subscribers = self.subscriptions.get(topic)
+        if subscribers is not None:
+            subscribers.discard(client_id)
+            if not subscribers:
+                del self.subscriptions[topic]
+    
+    async def publish(self, topic: str, message: Dict[str, Any]):
+        """
+        Send a message to the clients subscribed to a topic
+        
+        Messages are sent to all subscribers concurrently with a timeout,
+        so one slow client does not hold up the others or the publisher.
+        
+        Args:
+            topic: Topic name
+            message: Message to send
+        """
+        client_ids = [
+            client_id for client_id in self.subscriptions.get(topic, ())
+            if client_id in self.active_connections
+        ]
+        if not client_ids:
+            return
+        
+        results = await asyncio.gather(*[
+            asyncio.wait_for(self.active_connections[client_id].send_json(message), self.send_timeout)
+            for client_id in client_ids
+        ], return_exceptions=True)
+        
+        for client_id, result in zip(client_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending message to client {client_id}: {str(result)}")
     
     async def send_message(self, client_id: str, message: Dict[str, Any]):
         """